@@ -0,0 +1,108 @@
+"""
+Benchmark: parsing of large autosave files. The streaming parser (``autosave_read_file``),
+which extracts PV names and values (including arrays), and the memory-mapped scanner
+(``autosave_read_pv_names``), which extracts only PV names, are compared with the original
+line-splitting loader. The peak memory allocated by the parser in the current process
+is measured using ``tracemalloc``. Files larger than 64 MB are scanned in parallel
+by ``autosave_read_pv_names`` (e.g. ``--n-lines 2000000``).
+
+Usage::
+
+    python benchmarks/bench_autosave_parser.py --n-lines 100000 --array-fraction 0.1
+"""
+
+import argparse
+import functools
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from save_and_restore_api import autosave_read_file, autosave_read_pv_names
+
+
+def write_autosave_file(file_name, *, n_lines, array_fraction, array_size):
+    """
+    Write the autosave file with ``n_lines`` PVs. The fraction ``array_fraction`` of PVs are arrays.
+    """
+    rng = random.Random(0)
+    with open(file_name, "w") as f:
+        f.write("# autosave R5.3\tAutomatically generated - DO NOT MODIFY - 210623-182305\n")
+        for n in range(n_lines):
+            if rng.random() < array_fraction:
+                elements = " ".join(f'"{rng.random():.6f}"' for _ in range(array_size))
+                f.write(f"SIM{{Dev:{n // 100}}}Array:{n}-SP @array@ {{ {elements} }}\n")
+            elif n % 10 == 0:
+                f.write(f'SIM{{Dev:{n // 100}}}Name:{n}-SP "device name {n}"\n')
+            else:
+                f.write(f"SIM{{Dev:{n // 100}}}Val:{n}-SP {rng.random():.6f}\n")
+        f.write("<END>\n")
+
+
+def load_pv_names_split(file_name):
+    """
+    Original loader: extracts only PV names, values are discarded.
+    """
+    pv_names = []
+    with open(file_name) as f:
+        for line in f:
+            ll = line.strip()
+            if ll.startswith("#") or ll.startswith("<"):
+                continue
+            pv_name = ll.split(" ")[0]
+            if pv_name:
+                pv_names.append(pv_name)
+    return pv_names
+
+
+def load_records_streaming(file_name):
+    n_records, n_arrays = 0, 0
+    for _, value in autosave_read_file(file_name):
+        n_records += 1
+        n_arrays += isinstance(value, list)
+    return n_records
+
+
+def measure(func, file_name, *, n_repeat):
+    times = []
+    for _ in range(n_repeat):
+        t0 = time.perf_counter()
+        result = func(file_name)
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    func(file_name)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    n_records = result if isinstance(result, int) else len(result)
+    return min(times), peak, n_records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n-lines", type=int, default=100000, help="Number of PVs in the file.")
+    parser.add_argument("--array-fraction", type=float, default=0.1, help="Fraction of array PVs.")
+    parser.add_argument("--array-size", type=int, default=20, help="Number of elements in arrays.")
+    parser.add_argument("--n-repeat", type=int, default=3, help="Number of repetitions (best time is shown).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_name = os.path.join(tmp_dir, "auto_settings.sav")
+        write_autosave_file(
+            file_name, n_lines=args.n_lines, array_fraction=args.array_fraction, array_size=args.array_size
+        )
+        file_size = os.path.getsize(file_name) / 2**20
+        print(f"File: {args.n_lines} PVs, {file_size:.1f} MB, array fraction: {args.array_fraction}\n")
+        print(f"{'parser':<28} {'records':>8} {'time, s':>8} {'lines/s':>10} {'peak memory, MB':>16}")
+        for name, func in (
+            ("split (names only, list)", load_pv_names_split),
+            ("streaming (names, values)", load_records_streaming),
+            ("mmap (names only, 1 proc)", functools.partial(autosave_read_pv_names, max_workers=1)),
+            ("mmap (names only, parallel)", autosave_read_pv_names),
+        ):
+            dt, peak, n_records = measure(func, file_name, n_repeat=args.n_repeat)
+            print(f"{name:<28} {n_records:>8} {dt:>8.3f} {args.n_lines / dt:>10.0f} {peak / 2**20:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: startup time of the ``save-and-restore`` CLI tool. The tool is started for
+the command lines that do not communicate with the server (help and invalid parameters).
+The wall clock time of the process is compared with the time of the process that
+only starts the interpreter and with the time of the process that imports the API.
+The slowest imports of the CLI module are reported using ``python -X importtime``.
+
+Usage::
+
+    python benchmarks/bench_cli_startup.py --n-repeat 20
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+_CLI = (
+    "import sys; sys.argv = ['save-and-restore'] + {args!r}; "
+    "from save_and_restore_api.tools.cli import main; main()"
+)
+
+COMMANDS = (
+    ("python (no imports)", "pass"),
+    ("import API (httpx)", "import save_and_restore_api.aio"),
+    ("CLI --help", _CLI.format(args=["--help"])),
+    ("CLI CONFIG GET --help", _CLI.format(args=["CONFIG", "GET", "--help"])),
+    ("CLI parameter error", _CLI.format(args=["CONFIG", "GET"])),
+)
+
+
+def measure(code, *, n_repeat):
+    """
+    Returns the median wall clock time of the process executing the code.
+    """
+    times = []
+    for _ in range(n_repeat):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], capture_output=True, check=False)
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times)
+
+
+def import_times(code):
+    """
+    Returns the list of ``(cumulative time (us), self time (us), module)`` reported
+    by ``python -X importtime``.
+    """
+    p = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=False
+    )
+    result = []
+    for line in p.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            self_time, cumulative, module = line[len("import time:") :].split("|")
+            if cumulative.strip().isdigit():
+                result.append((int(cumulative), int(self_time), module.rstrip()))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n-repeat", type=int, default=20, help="Number of runs (median time is shown).")
+    parser.add_argument("--n-imports", type=int, default=15, help="Number of the slowest imports to show.")
+    args = parser.parse_args()
+
+    print(f"{'command':<24} {'time, ms':>9}")
+    for name, code in COMMANDS:
+        print(f"{name:<24} {measure(code, n_repeat=args.n_repeat) * 1000:>9.1f}")
+
+    print(f"\nSlowest imports (CLI --help):\n{'cumulative, ms':>14} {'self, ms':>9}  module")
+    times = import_times(_CLI.format(args=["--help"]))
+    for cumulative, self_time, module in sorted(times, reverse=True)[: args.n_imports]:
+        print(f"{cumulative / 1000:>14.1f} {self_time / 1000:>9.1f}  {module}")
+
+
+if __name__ == "__main__":
+    main()
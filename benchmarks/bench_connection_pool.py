@@ -0,0 +1,123 @@
+"""
+Benchmark: throughput of concurrent ``snapshot_get`` requests for different sizes of
+the connection pool. The requests are sent to a local stub server, which simulates
+the latency of the Save-and-Restore service.
+
+Usage::
+
+    python benchmarks/bench_connection_pool.py --n-requests 400 --latency 0.01
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from save_and_restore_api import SaveRestoreAPI as SaveRestoreAPI_Threads
+from save_and_restore_api.aio import SaveRestoreAPI as SaveRestoreAPI_Async
+
+
+def _snapshot_data(n_pvs):
+    items = []
+    for n in range(n_pvs):
+        items.append(
+            {
+                "configPv": {"pvName": f"sim:pv{n}", "readOnly": False},
+                "value": {
+                    "type": {"name": "VDouble", "version": 1},
+                    "value": float(n),
+                    "alarm": {"severity": "NONE", "status": "NONE", "name": "NO_ALARM"},
+                    "time": {"unixSec": 1700000000, "nanoSec": 0, "userTag": 0},
+                },
+            }
+        )
+    return {"uniqueId": "snapshot-uid", "snapshotItems": items}
+
+
+def start_stub_server(*, latency, n_pvs):
+    """
+    Start the stub server in a background thread. Returns the server object and base URL.
+    """
+    payload = json.dumps(_snapshot_data(n_pvs)).encode("utf-8")
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive connections
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+        request_queue_size = 256  # Accept many concurrent connections
+
+    server = Server(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/save-restore"
+    return server, base_url
+
+
+def run_threads(*, base_url, n_requests, concurrency, max_connections):
+    with SaveRestoreAPI_Threads(base_url=base_url, max_connections=max_connections) as SR:
+        SR.snapshot_get("snapshot-uid")  # Warm up
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(SR.snapshot_get, ["snapshot-uid"] * n_requests))
+        return time.perf_counter() - t0
+
+
+def run_async(*, base_url, n_requests, concurrency, max_connections):
+    async def testing():
+        async with SaveRestoreAPI_Async(base_url=base_url, max_connections=max_connections) as SR:
+            await SR.snapshot_get("snapshot-uid")  # Warm up
+            sem = asyncio.Semaphore(concurrency)
+
+            async def get():
+                async with sem:
+                    await SR.snapshot_get("snapshot-uid")
+
+            t0 = time.perf_counter()
+            await asyncio.gather(*[get() for _ in range(n_requests)])
+            return time.perf_counter() - t0
+
+    return asyncio.run(testing())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n-requests", type=int, default=400, help="Number of requests per run.")
+    parser.add_argument("--concurrency", type=int, default=64, help="Number of concurrent requests.")
+    parser.add_argument("--latency", type=float, default=0.01, help="Simulated server latency, s.")
+    parser.add_argument("--n-pvs", type=int, default=100, help="Number of PVs in the snapshot.")
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(latency=args.latency, n_pvs=args.n_pvs)
+    try:
+        print(f"Requests: {args.n_requests}, concurrency: {args.concurrency}, latency: {args.latency} s\n")
+        print(f"{'client':<8} {'max_connections':>16} {'time, s':>10} {'requests/s':>12}")
+        for name, func in (("threads", run_threads), ("async", run_async)):
+            for max_connections in (1, 4, 16, 64):
+                dt = func(
+                    base_url=base_url,
+                    n_requests=args.n_requests,
+                    concurrency=args.concurrency,
+                    max_connections=max_connections,
+                )
+                print(f"{name:<8} {max_connections:>16} {dt:>10.3f} {args.n_requests / dt:>12.1f}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
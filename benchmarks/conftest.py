@@ -0,0 +1,85 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from tests.mock_server import MockServer
+
+from save_and_restore_api import SaveRestoreAPI as SaveRestoreAPI_Threads
+from save_and_restore_api.aio import SaveRestoreAPI as SaveRestoreAPI_Async
+
+
+class ClientRunner:
+    """
+    Executes API calls of the threaded or async client connected to the mock server, so that
+    the same benchmark measures both clients. The calls of the async client are executed in
+    the event loop created for the runner.
+
+    Parameters
+    ----------
+    library : str
+        ``"THREADS"`` or ``"ASYNC"``.
+    server : MockServer
+        Mock server.
+    """
+
+    def __init__(self, library, server):
+        self.library = library
+        self.server = server
+        if library == "THREADS":
+            self._loop = None
+            self.SR = SaveRestoreAPI_Threads(base_url=server.base_url, transport=server.transport())
+        else:
+            self._loop = asyncio.new_event_loop()
+            self.SR = SaveRestoreAPI_Async(base_url=server.base_url, transport=server.async_transport())
+        self.SR.open()
+
+    def run(self, result):
+        """
+        Returns the result of the API call (awaits the coroutine returned by the async client).
+        """
+        return self._loop.run_until_complete(result) if self._loop is not None else result
+
+    def call(self, name, *args, **kwargs):
+        """
+        Call the API method ``name`` and return the result.
+        """
+        return self.run(getattr(self.SR, name)(*args, **kwargs))
+
+    def call_concurrent(self, name, args, *, max_concurrency):
+        """
+        Call the API method ``name`` for each element of ``args`` (single argument). Up to
+        ``max_concurrency`` calls are executed concurrently in a pool of threads (threaded
+        client) or as concurrent tasks (async client). Returns the list of results.
+        """
+        func = getattr(self.SR, name)
+        if self._loop is None:
+            with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+                return list(executor.map(func, args))
+
+        async def call_all():
+            semaphore = asyncio.Semaphore(max_concurrency)
+
+            async def call_one(arg):
+                async with semaphore:
+                    return await func(arg)
+
+            return await asyncio.gather(*[call_one(_) for _ in args])
+
+        return self._loop.run_until_complete(call_all())
+
+    def close(self):
+        self.run(self.SR.close())
+        if self._loop is not None:
+            self._loop.close()
+
+
+@pytest.fixture
+def mock_server():
+    return MockServer()
+
+
+@pytest.fixture(params=["THREADS", "ASYNC"])
+def client(request, mock_server):
+    runner = ClientRunner(request.param, mock_server)
+    yield runner
+    runner.close()
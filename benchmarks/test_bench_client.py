@@ -0,0 +1,120 @@
+"""
+Benchmarks of the threaded and async clients against the in-process mock server (``tests/mock_server.py``).
+The benchmarks measure the overhead of a single API call, the throughput of concurrent requests
+with the simulated latency of the service and the peak memory used to load large snapshots.
+The benchmarks require ``pytest-benchmark``.
+
+Usage::
+
+    pytest benchmarks --benchmark-only
+    pytest benchmarks --benchmark-only --benchmark-json=benchmark.json
+    pytest benchmarks --benchmark-only --benchmark-compare --benchmark-compare-fail=mean:25%
+"""
+
+import tracemalloc
+
+import pytest
+from tests.mock_server import MockServer
+
+from .conftest import ClientRunner
+
+pytest.importorskip("pytest_benchmark")
+
+# Simulated latency of the service for the throughput benchmarks, s
+_LATENCY = 0.002
+
+
+# fmt: off
+@pytest.mark.parametrize("method", ["info_get", "node_get", "node_get_children", "config_get", "snapshot_get"])
+# fmt: on
+def test_bench_call_overhead(benchmark, client, method):
+    """
+    Overhead of a single API call (no latency): building the request, ``httpx``, JSON encoding
+    and decoding of small payloads.
+    """
+    config = client.server.create_config("/bench/config", n_pvs=10)
+    snapshot = client.server.create_snapshot(config["uniqueId"], name="snapshot")
+    args = {
+        "info_get": (),
+        "node_get": (config["uniqueId"],),
+        "node_get_children": (config["uniqueId"],),
+        "config_get": (config["uniqueId"],),
+        "snapshot_get": (snapshot["uniqueId"],),
+    }[method]
+
+    benchmark.group = f"call-overhead-{method}"
+    result = benchmark(client.call, method, *args)
+    assert result
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+@pytest.mark.parametrize("max_concurrency", [1, 16])
+# fmt: on
+def test_bench_throughput(benchmark, library, max_concurrency):
+    """
+    Throughput of concurrent ``snapshot_get()`` requests with the simulated latency of the service.
+    """
+    n_requests = 200
+    server = MockServer(latency=_LATENCY)
+    config = server.create_config("/bench/config", n_pvs=100)
+    uids = [server.create_snapshot(config["uniqueId"], name=f"snapshot-{_}")["uniqueId"] for _ in range(10)]
+    uids = [uids[_ % len(uids)] for _ in range(n_requests)]
+
+    runner = ClientRunner(library, server)
+    try:
+        benchmark.group = f"throughput-concurrency-{max_concurrency}"
+        kwargs = {"max_concurrency": max_concurrency}
+        results = benchmark.pedantic(runner.call_concurrent, args=("snapshot_get", uids), kwargs=kwargs, rounds=3)
+        assert len(results) == n_requests
+        if benchmark.stats:  # No statistics if the benchmarks are disabled
+            benchmark.extra_info["requests_per_second"] = n_requests / benchmark.stats.stats.mean
+    finally:
+        runner.close()
+
+
+def _peak_memory(func, *args):
+    """
+    Returns the peak memory (MB) allocated while ``func`` is executed.
+    """
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+# fmt: off
+@pytest.mark.parametrize("method", ["snapshot_get", "snapshot_get_items_stream"])
+@pytest.mark.parametrize("n_pvs, array_size", [(20000, 0), (1000, 1000)])
+# fmt: on
+def test_bench_large_snapshot(benchmark, client, method, n_pvs, array_size):
+    """
+    Time and peak memory (``extra_info["peak_memory_mb"]``) of loading large snapshots (scalar
+    values and arrays) using ``snapshot_get()`` and ``snapshot_get_items_stream()``.
+    """
+    config = client.server.create_config("/bench/config", n_pvs=n_pvs)
+    uid = client.server.create_snapshot(config["uniqueId"], name="snapshot", array_size=array_size)["uniqueId"]
+
+    if method == "snapshot_get":
+
+        def load():
+            return len(client.call("snapshot_get", uid)["snapshotItems"])
+
+    elif client.library == "THREADS":
+
+        def load():
+            return sum(1 for _ in client.SR.snapshot_get_items_stream(uid))
+
+    else:
+
+        async def count_items():
+            return sum([1 async for _ in client.SR.snapshot_get_items_stream(uid)])
+
+        def load():
+            return client.run(count_items())
+
+    benchmark.group = f"large-snapshot-{n_pvs}-pvs-{array_size}-elements"
+    assert benchmark.pedantic(load, rounds=3) == n_pvs
+    benchmark.extra_info["peak_memory_mb"] = round(_peak_memory(load), 2)
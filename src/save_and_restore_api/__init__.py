@@ -1,6 +1,64 @@
 from __future__ import annotations
 
-from ._api_threads import SaveRestoreAPI
+import importlib
+from typing import TYPE_CHECKING
+
 from ._version import version as __version__
 
-__all__ = ["__version__", "SaveRestoreAPI"]
+if TYPE_CHECKING:
+    from ._api_threads import SaveRestoreAPI
+    from ._autosave import AutosaveFormatError, autosave_parse_lines, autosave_read_file, autosave_read_pv_names
+    from ._instrumentation import RequestEvent, RequestStatsCollector
+    from ._request_limits import RequestLimits
+    from ._restore_plan import RestorePlan
+    from ._retry import RetryPolicy
+    from ._snapshot_diff import SnapshotDiff
+    from ._snapshot_export import SnapshotExportWriter
+    from ._snapshot_table import SnapshotTable
+
+__all__ = [
+    "__version__",
+    "AutosaveFormatError",
+    "RequestEvent",
+    "RequestLimits",
+    "RequestStatsCollector",
+    "RestorePlan",
+    "RetryPolicy",
+    "SaveRestoreAPI",
+    "SnapshotDiff",
+    "SnapshotExportWriter",
+    "SnapshotTable",
+    "autosave_parse_lines",
+    "autosave_read_file",
+    "autosave_read_pv_names",
+]
+
+# The public objects are imported on first access (PEP 562), so that importing the package
+#   (e.g. by the CLI tool to process '--help') does not import 'httpx'.
+_LAZY_IMPORTS = {
+    "AutosaveFormatError": "._autosave",
+    "RequestEvent": "._instrumentation",
+    "RequestLimits": "._request_limits",
+    "RequestStatsCollector": "._instrumentation",
+    "RestorePlan": "._restore_plan",
+    "RetryPolicy": "._retry",
+    "SaveRestoreAPI": "._api_threads",
+    "SnapshotDiff": "._snapshot_diff",
+    "SnapshotExportWriter": "._snapshot_export",
+    "SnapshotTable": "._snapshot_table",
+    "autosave_parse_lines": "._autosave",
+    "autosave_read_file": "._autosave",
+    "autosave_read_pv_names": "._autosave",
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
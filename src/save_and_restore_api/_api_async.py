@@ -1,18 +1,31 @@
+import asyncio
+import contextlib
+import functools
+import time
+
 import httpx
 
 from ._api_base import _SaveRestoreAPI_Base
 from ._api_threads import SaveRestoreAPI as _SaveRestoreAPI_Threads
+from ._snapshot_diff import SnapshotDiff
+from ._snapshot_table import SnapshotTable
 
 
 class SaveRestoreAPI(_SaveRestoreAPI_Base):
     def open(self):
         # Reusing docstrings from the threaded version
-        self._client = httpx.AsyncClient(base_url=self._base_url, timeout=self._timeout)
+        if self._client is None:
+            if self._shared_client is not None:
+                self._client = self._shared_client
+            else:
+                self._client = httpx.AsyncClient(**self._client_kwargs())
 
     async def close(self):
         # Reusing docstrings from the threaded version
-        await self._client.aclose()
-        self._client = None
+        if self._client is not None:
+            if self._owns_client:
+                await self._client.aclose()
+            self._client = None
 
     async def __aenter__(self):
         # Reusing docstrings from the threaded version
@@ -27,26 +40,152 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
         self, method, url, *, body_json=None, params=None, headers=None, data=None, timeout=None, auth=None
     ):
         # Reusing docstrings from the threaded version
+        key = self._coalesce_key(
+            method=method, url=url, params=params, body_json=body_json, headers=headers, data=data
+        )
+        kwargs = {
+            "body_json": body_json,
+            "params": params,
+            "headers": headers,
+            "data": data,
+            "timeout": timeout,
+            "auth": auth,
+        }
+        if key is None:
+            return await self._send_request(method, url, **kwargs)
+
+        task = self._coalesce_inflight.get(key, None)
+        if task is None:
+            task = asyncio.ensure_future(self._send_request(method, url, **kwargs))
+            task.add_done_callback(functools.partial(self._coalesce_done, key))
+            self._coalesce_inflight[key] = task
+            self._coalesce_count("requests")
+        else:
+            self._coalesce_count("coalesced")
+        # The shared request is not cancelled if one of the waiting calls is cancelled
+        return await asyncio.shield(task)
+
+    def _coalesce_done(self, key, task):
+        """
+        Remove the completed request from the list of requests in progress.
+        """
+        if self._coalesce_inflight.get(key, None) is task:
+            del self._coalesce_inflight[key]
+        if not task.cancelled():
+            task.exception()  # The exception is retrieved, so it is not logged if all calls were cancelled
+
+    async def _send_request(
+        self, method, url, *, body_json=None, params=None, headers=None, data=None, timeout=None, auth=None
+    ):
+        # Reusing docstrings from the threaded version
+        event = self._request_event_create(method=method, url=url)
         try:
-            client_response = None
-            kwargs = self._prepare_request(
-                method=method,
-                body_json=body_json,
-                params=params,
-                headers=headers,
-                data=data,
-                timeout=timeout,
-                auth=auth,
-            )
-            client_response = await self._client.request(method, url, **kwargs)
-            response = self._process_response(client_response=client_response)
-        except Exception:
-            response = self._process_comm_exception(
-                method=method, body_json=body_json, client_response=client_response
-            )
-
+            attempt = 0
+            while True:
+                attempt += 1
+                phase, t = "prepare", time.perf_counter()
+                try:
+                    client_response = None
+                    kwargs = self._prepare_request(
+                        method=method,
+                        body_json=body_json,
+                        params=params,
+                        headers=headers,
+                        data=data,
+                        timeout=timeout,
+                        auth=auth,
+                    )
+                    phase, t = "limit_wait", self._request_event_phase(event, phase, t)
+                    async with self._request_limit(method=method):
+                        phase, t = "network", self._request_event_phase(event, phase, t)
+                        client_response = await self._client.request(method, url, **kwargs)
+                    phase, t = "decode", self._request_event_phase(event, phase, t)
+                    response = self._process_response(client_response=client_response)
+                    self._request_event_phase(event, phase, t)
+                except Exception as ex:
+                    t = self._request_event_phase(event, phase, t)
+                    self._request_event_attempt(event, attempt=attempt, client_response=client_response)
+                    delay = self._retry_delay(method=method, attempt=attempt, exception=ex)
+                    if delay is not None:
+                        await asyncio.sleep(delay)
+                        self._request_event_phase(event, "retry_wait", t)
+                        continue
+                    response = self._process_comm_exception(
+                        method=method, body_json=body_json, client_response=client_response
+                    )
+
+                self._request_event_attempt(event, attempt=attempt, client_response=client_response)
+                if attempt > 1:
+                    self._retry_count("recovered")
+                break
+        except Exception as ex:
+            self._request_event_emit(event, exception=ex)
+            raise
+        self._request_event_emit(event)
         return response
 
+    async def _send_request_stream(self, method, url, *, key=None, params=None, timeout=None, auth=None):
+        # Reusing docstrings from the threaded version
+        event = self._request_event_create(method=method, url=url)
+        try:
+            attempt = 0
+            while True:
+                attempt, n_items = attempt + 1, 0
+                phase, t = "prepare", time.perf_counter()
+                try:
+                    client_response = None
+                    kwargs = self._prepare_request(method=method, params=params, timeout=timeout, auth=auth)
+                    phase, t = "limit_wait", self._request_event_phase(event, phase, t)
+                    async with contextlib.AsyncExitStack() as request_limit:
+                        await request_limit.enter_async_context(self._request_limit(method=method))
+                        phase, t = "network", self._request_event_phase(event, phase, t)
+                        async with self._client.stream(method, url, **kwargs) as stream_response:
+                            client_response = stream_response
+                            if client_response.is_error:
+                                await client_response.aread()
+                            client_response.raise_for_status()
+                            # The limit is released before the items are passed to the application
+                            await request_limit.aclose()
+                            parser = self._create_stream_parser(key=key)
+                            async for chunk in client_response.aiter_text():
+                                phase, t = "decode", self._request_event_phase(event, phase, t)
+                                items = parser.feed(chunk)
+                                phase, t = "network", self._request_event_phase(event, phase, t)
+                                for item in items:
+                                    n_items += 1
+                                    yield item
+                                # The time spent by the application processing the items is not included
+                                t = time.perf_counter()
+                            phase, t = "decode", self._request_event_phase(event, phase, t)
+                            items = parser.close()
+                            self._request_event_phase(event, phase, t)
+                            for item in items:
+                                yield item
+                except Exception as ex:
+                    t = self._request_event_phase(event, phase, t)
+                    self._request_event_attempt(event, attempt=attempt, client_response=client_response)
+                    # The request can not be retried once the items were passed to the application
+                    delay = None if n_items else self._retry_delay(method=method, attempt=attempt, exception=ex)
+                    if delay is not None:
+                        await asyncio.sleep(delay)
+                        self._request_event_phase(event, "retry_wait", t)
+                        continue
+                    self._process_comm_exception(method=method, body_json=None, client_response=client_response)
+
+                self._request_event_attempt(event, attempt=attempt, client_response=client_response)
+                if attempt > 1:
+                    self._retry_count("recovered")
+                break
+        except GeneratorExit:
+            # The application stopped reading the items
+            self._request_event_attempt(event, attempt=attempt, client_response=client_response)
+            self._request_event_emit(event)
+            raise
+        except Exception as ex:
+            self._request_event_emit(event, exception=ex)
+            raise
+        self._request_event_emit(event)
+
     # =============================================================================================
     #                         INFO-CONTROLLER API METHODS
     # =============================================================================================
@@ -94,38 +233,270 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
 
     async def node_get(self, uniqueNodeId):
         # Reusing docstrings from the threaded version
-        method, url = self._prepare_node_get(uniqueNodeId=uniqueNodeId)
-        return await self.send_request(method, url)
+        hit, response = self._node_cache_get("node", uniqueNodeId)
+        if not hit:
+            method, url = self._prepare_node_get(uniqueNodeId=uniqueNodeId)
+            response = await self.send_request(method, url)
+            self._node_cache_put("node", uniqueNodeId, response)
+        return response
 
     async def nodes_get(self, uniqueIds):
         # Reusing docstrings from the threaded version
         method, url, body_json = self._prepare_nodes_get(uniqueIds=uniqueIds)
         return await self.send_request(method, url, body_json=body_json)
 
+    async def nodes_get_bulk(self, uniqueIds, *, chunk_size=100, max_concurrency=4):
+        # Reusing docstrings from the threaded version
+        uniqueIds, chunks = self._prepare_nodes_get_bulk(
+            uniqueIds=uniqueIds, chunk_size=chunk_size, max_concurrency=max_concurrency
+        )
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def load_chunk(chunk):
+            async with semaphore:
+                try:
+                    return await self.nodes_get(chunk)
+                except self._request_exceptions as ex:
+                    return ex
+
+        chunk_results = await asyncio.gather(*[load_chunk(_) for _ in chunks])
+        return self._process_nodes_get_bulk(uniqueIds=uniqueIds, chunks=chunks, chunk_results=chunk_results)
+
     async def node_add(self, parentNodeId, *, node, auth=None, **kwargs):
         # Reusing docstrings from the threaded version
         method, url, params, body_json = self._prepare_node_add(parentNodeId=parentNodeId, node=node)
-        return await self.send_request(method, url, params=params, body_json=body_json, auth=auth)
+        try:
+            response = await self.send_request(method, url, params=params, body_json=body_json, auth=auth)
+        finally:
+            self._node_cache_invalidate([parentNodeId])
+        self._tree_index_add(parentNodeId, response)
+        return response
 
     async def node_delete(self, nodeId, *, auth=None):
         # Reusing docstrings from the threaded version
         method, url = self._prepare_node_delete(nodeId=nodeId)
-        return await self.send_request(method, url, auth=auth)
+        try:
+            response = await self.send_request(method, url, auth=auth)
+        finally:
+            self._node_cache_invalidate([nodeId], recursive=True, paths=True)
+        self._tree_index_remove([nodeId])
+        return response
 
     async def nodes_delete(self, uniqueIds, *, auth=None):
         # Reusing docstrings from the threaded version
         method, url, body_json = self._prepare_nodes_delete(uniqueIds=uniqueIds)
-        return await self.send_request(method, url, body_json=body_json, auth=auth)
+        try:
+            response = await self.send_request(method, url, body_json=body_json, auth=auth)
+        finally:
+            self._node_cache_invalidate(uniqueIds, recursive=True, paths=True)
+        self._tree_index_remove(uniqueIds)
+        return response
 
     async def node_get_children(self, uniqueNodeId):
         # Reusing docstrings from the threaded version
-        method, url = self._prepare_node_get_children(uniqueNodeId=uniqueNodeId)
-        return await self.send_request(method, url)
+        hit, response = self._node_cache_get("children", uniqueNodeId)
+        if not hit:
+            method, url = self._prepare_node_get_children(uniqueNodeId=uniqueNodeId)
+            response = await self.send_request(method, url)
+            self._node_cache_put("children", uniqueNodeId, response)
+        return response
 
     async def node_get_parent(self, uniqueNodeId):
         # Reusing docstrings from the threaded version
-        method, url = self._prepare_node_get_parent(uniqueNodeId=uniqueNodeId)
-        return await self.send_request(method, url)
+        hit, response = self._node_cache_get("parent", uniqueNodeId)
+        if not hit:
+            method, url = self._prepare_node_get_parent(uniqueNodeId=uniqueNodeId)
+            response = await self.send_request(method, url)
+            self._node_cache_put("parent", uniqueNodeId, response)
+        return response
+
+    async def walk(
+        self, uniqueNodeId, *, max_depth=None, node_types=None, descend_node_types=None, max_concurrency=8
+    ):
+        # Reusing docstrings from the threaded version
+        node_types, descend_node_types = self._prepare_walk(
+            max_depth=max_depth,
+            node_types=node_types,
+            max_concurrency=max_concurrency,
+            descend_node_types=descend_node_types,
+        )
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def load_children(uid):
+            async with semaphore:
+                return await self.node_get_children(uid)
+
+        pending = {asyncio.ensure_future(load_children(uniqueNodeId)): (uniqueNodeId, 1)}
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    parent_uid, depth = pending.pop(task)
+                    for node in task.result():
+                        if self._walk_descend(
+                            node=node, depth=depth, max_depth=max_depth, descend_node_types=descend_node_types
+                        ):
+                            node_uid = node["uniqueId"]
+                            pending[asyncio.ensure_future(load_children(node_uid))] = (node_uid, depth + 1)
+                        if node_types is None or node["nodeType"] in node_types:
+                            yield parent_uid, node
+        finally:
+            # The generator may be closed before the subtree is fully traversed
+            for task in pending:
+                task.cancel()
+
+    async def tree_index_load(self, uniqueNodeId=None, *, folders_only=False, max_concurrency=8):
+        # Reusing docstrings from the threaded version
+        uniqueNodeId, descend_node_types = self._prepare_tree_index_load(
+            uniqueNodeId=uniqueNodeId, folders_only=folders_only, max_concurrency=max_concurrency
+        )
+        root_path = None if uniqueNodeId == self.ROOT_NODE_UID else await self.structure_path_get(uniqueNodeId)
+        index = self._tree_index_create(root_uid=uniqueNodeId, root_path=root_path, folders_only=folders_only)
+        async for parent_uid, node in self.walk(
+            uniqueNodeId, descend_node_types=descend_node_types, max_concurrency=max_concurrency
+        ):
+            index.add(parent_uid, node)
+        self._tree_index = index
+        return index
+
+    async def tree_replicate(
+        self, source, uniqueNodeId, *, parentNodeId=None, uid_map=None, max_concurrency=8, auth=None
+    ):
+        # Reusing docstrings from the threaded version
+        parentNodeId, uid_map, result = self._prepare_tree_replicate(
+            source=source,
+            uniqueNodeId=uniqueNodeId,
+            parentNodeId=parentNodeId,
+            uid_map=uid_map,
+            max_concurrency=max_concurrency,
+        )
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def replicate_node(node, dst_parent_uid, data=None):
+            async with semaphore:
+                action, dst_uid = self._tree_replicate_action(node=node, uid_map=uid_map)
+                try:
+                    if action != "skip":
+                        dst_uid = await self._tree_replicate_copy(
+                            source,
+                            node,
+                            dst_parent_uid=dst_parent_uid,
+                            dst_uid=dst_uid,
+                            data=data,
+                            uids=result["uid_map"],
+                            auth=auth,
+                        )
+                except (*self._request_exceptions, RuntimeError) as ex:
+                    return action, None, ex, []
+                try:
+                    children = []
+                    if node["nodeType"] in self._WALK_CONTAINER_NODE_TYPES:
+                        children = await source.node_get_children(node["uniqueId"])
+                    return action, dst_uid, None, children
+                except self._request_exceptions as ex:
+                    return action, dst_uid, ex, []
+
+        async def load_composite(node, dst_parent_uid):
+            async with semaphore:
+                try:
+                    return node, dst_parent_uid, await source.composite_snapshot_get(node["uniqueId"]), None
+                except self._request_exceptions as ex:
+                    return node, dst_parent_uid, None, ex
+
+        pending, composites = {}, []
+
+        def submit(nodes):
+            for node, dst_parent_uid in nodes:
+                action, _ = self._tree_replicate_action(node=node, uid_map=uid_map)
+                if node["nodeType"] == "COMPOSITE_SNAPSHOT" and action != "skip":
+                    composites.append((node, dst_parent_uid))
+                else:
+                    pending[asyncio.ensure_future(replicate_node(node, dst_parent_uid))] = node
+
+        try:
+            if uniqueNodeId == source.ROOT_NODE_UID:
+                nodes = [(_, parentNodeId) for _ in await source.node_get_children(uniqueNodeId)]
+            else:
+                nodes = [(await source.node_get(uniqueNodeId), parentNodeId)]
+
+            submit(nodes)
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    node = pending.pop(task)
+                    action, dst_uid, error, children = task.result()
+                    self._tree_replicate_process(
+                        result=result, uid_map=uid_map, node=node, action=action, dst_uid=dst_uid, error=error
+                    )
+                    submit([(_, dst_uid) for _ in children])
+
+            # Composite snapshots are copied once all the referenced snapshots are copied
+            waiting = []
+            for node, dst_parent_uid, data, error in await asyncio.gather(
+                *[load_composite(*_) for _ in composites]
+            ):
+                if error is None:
+                    waiting.append((node, dst_parent_uid, data))
+                else:
+                    self._tree_replicate_process(
+                        result=result, uid_map=uid_map, node=node, action="add", dst_uid=None, error=error
+                    )
+            while waiting:
+                ready, waiting = self._tree_replicate_ready(waiting, result["uid_map"])
+                if not ready:
+                    # The remaining composite snapshots fail with the error
+                    ready, waiting = waiting, []
+                responses = await asyncio.gather(*[replicate_node(*_) for _ in ready])
+                for (node, _, _), (action, dst_uid, error, _) in zip(ready, responses):
+                    self._tree_replicate_process(
+                        result=result, uid_map=uid_map, node=node, action=action, dst_uid=dst_uid, error=error
+                    )
+        finally:
+            for task in pending:
+                task.cancel()
+            if uid_map is not None:
+                uid_map.close()
+
+        return result
+
+    async def _tree_replicate_copy(self, source, node, *, dst_parent_uid, dst_uid, data, uids, auth):
+        # Reusing docstrings from the threaded version
+        node_type, src_uid = node["nodeType"], node["uniqueId"]
+        new_node = self._tree_replicate_node(node=node, dst_uid=dst_uid)
+        if node_type == "FOLDER":
+            return (await self.node_add(dst_parent_uid, node=new_node, auth=auth))["uniqueId"]
+        elif node_type == "CONFIGURATION":
+            data = await source.config_get(src_uid)
+            data = self._tree_replicate_data(node=node, data=data, dst_uid=dst_uid, uid_map=uids)
+            if dst_uid is None:
+                response = await self.config_add(
+                    dst_parent_uid, configurationNode=new_node, configurationData=data, auth=auth
+                )
+            else:
+                response = await self.config_update(configurationNode=new_node, configurationData=data, auth=auth)
+            return response["configurationNode"]["uniqueId"]
+        elif node_type == "SNAPSHOT":
+            data = await source.snapshot_get(src_uid)
+            data = self._tree_replicate_data(node=node, data=data, dst_uid=dst_uid, uid_map=uids)
+            if dst_uid is None:
+                response = await self.snapshot_add(
+                    dst_parent_uid, snapshotNode=new_node, snapshotData=data, auth=auth
+                )
+            else:
+                response = await self.snapshot_update(snapshotNode=new_node, snapshotData=data, auth=auth)
+            return response["snapshotNode"]["uniqueId"]
+        elif node_type == "COMPOSITE_SNAPSHOT":
+            data = self._tree_replicate_data(node=node, data=data, dst_uid=dst_uid, uid_map=uids)
+            if dst_uid is None:
+                response = await self.composite_snapshot_add(
+                    dst_parent_uid, compositeSnapshotNode=new_node, compositeSnapshotData=data, auth=auth
+                )
+            else:
+                response = await self.composite_snapshot_update(
+                    compositeSnapshotNode=new_node, compositeSnapshotData=data, auth=auth
+                )
+            return response["compositeSnapshotNode"]["uniqueId"]
+        raise RuntimeError(f"Unsupported node type: {node_type!r}")
 
     # =============================================================================================
     #                         CONFIGURATION-CONTROLLER API METHODS
@@ -141,14 +512,24 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
         method, url, body_json = self._prepare_config_add(
             parentNodeId=parentNodeId, configurationNode=configurationNode, configurationData=configurationData
         )
-        return await self.send_request(method, url, body_json=body_json, auth=auth)
+        try:
+            response = await self.send_request(method, url, body_json=body_json, auth=auth)
+        finally:
+            self._node_cache_invalidate([parentNodeId])
+        self._tree_index_add(parentNodeId, response, key="configurationNode")
+        return response
 
     async def config_update(self, *, configurationNode, configurationData, auth=None):
         # Reusing docstrings from the threaded version
         method, url, body_json = self._prepare_config_update(
             configurationNode=configurationNode, configurationData=configurationData
         )
-        return await self.send_request(method, url, body_json=body_json, auth=auth)
+        try:
+            response = await self.send_request(method, url, body_json=body_json, auth=auth)
+        finally:
+            self._node_cache_invalidate([configurationNode.get("uniqueId", None)], paths=True)
+        self._tree_index_update(response, key="configurationNode")
+        return response
 
     # =============================================================================================
     #                         TAG-CONTROLLER API METHODS
@@ -162,12 +543,22 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
     async def tags_add(self, *, uniqueNodeIds, tag, auth=None):
         # Reusing docstrings from the threaded version
         method, url, body_json = self._prepare_tags_add(uniqueNodeIds=uniqueNodeIds, tag=tag)
-        return await self.send_request(method, url, body_json=body_json, auth=auth)
+        try:
+            response = await self.send_request(method, url, body_json=body_json, auth=auth)
+        finally:
+            self._node_cache_invalidate(uniqueNodeIds)
+        self._tree_index_update(response)
+        return response
 
     async def tags_delete(self, *, uniqueNodeIds, tag, auth=None):
         # Reusing docstrings from the threaded version
         method, url, body_json = self._prepare_tags_delete(uniqueNodeIds=uniqueNodeIds, tag=tag)
-        return await self.send_request(method, url, body_json=body_json, auth=auth)
+        try:
+            response = await self.send_request(method, url, body_json=body_json, auth=auth)
+        finally:
+            self._node_cache_invalidate(uniqueNodeIds)
+        self._tree_index_update(response)
+        return response
 
     # =============================================================================================
     #                         TAKE-SNAPSHOT-CONTROLLER API METHODS
@@ -183,7 +574,12 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
         method, url, params = self._prepare_take_snapshot_save(
             uniqueNodeId=uniqueNodeId, name=name, comment=comment
         )
-        return await self.send_request(method, url, params=params, auth=auth)
+        try:
+            response = await self.send_request(method, url, params=params, auth=auth)
+        finally:
+            self._node_cache_invalidate([uniqueNodeId])
+        self._tree_index_add(uniqueNodeId, response, key="snapshotNode")
+        return response
 
     # =============================================================================================
     #                         SNAPSHOT-CONTROLLER API METHODS
@@ -199,20 +595,173 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
         method, url, params, body_json = self._prepare_snapshot_add(
             parentNodeId=parentNodeId, snapshotNode=snapshotNode, snapshotData=snapshotData
         )
-        return await self.send_request(method, url, body_json=body_json, params=params, auth=auth)
+        try:
+            response = await self.send_request(method, url, body_json=body_json, params=params, auth=auth)
+        finally:
+            self._node_cache_invalidate([parentNodeId])
+        self._tree_index_add(parentNodeId, response, key="snapshotNode")
+        return response
 
     async def snapshot_update(self, *, snapshotNode, snapshotData, auth=None):
         # Reusing docstrings from the threaded version
         method, url, body_json = self._prepare_snapshot_update(
             snapshotNode=snapshotNode, snapshotData=snapshotData
         )
-        return await self.send_request(method, url, body_json=body_json, auth=auth)
+        try:
+            response = await self.send_request(method, url, body_json=body_json, auth=auth)
+        finally:
+            self._node_cache_invalidate([snapshotNode.get("uniqueId", None)], paths=True)
+        self._tree_index_update(response, key="snapshotNode")
+        return response
 
     async def snapshots_get(self):
         # Reusing docstrings from the threaded version
         method, url = self._prepare_snapshots_get()
         return await self.send_request(method, url)
 
+    async def snapshot_get_items_stream(self, uniqueId):
+        # Reusing docstrings from the threaded version
+        method, url = self._prepare_snapshot_get(uniqueId=uniqueId)
+        async for item in self._send_request_stream(method, url, key="snapshotItems"):
+            yield item
+
+    async def snapshots_get_stream(self):
+        # Reusing docstrings from the threaded version
+        method, url = self._prepare_snapshots_get()
+        async for item in self._send_request_stream(method, url):
+            yield item
+
+    async def snapshots_export(
+        self, file_name, *, uniqueIds=None, folderId=None, tag=None, file_format=None, chunk_size=10000
+    ):
+        # Reusing docstrings from the threaded version
+        from ._snapshot_export import SnapshotExportWriter
+
+        uniqueIds = self._prepare_snapshots_export(
+            file_name=file_name,
+            uniqueIds=uniqueIds,
+            folderId=folderId,
+            tag=tag,
+            file_format=file_format,
+            chunk_size=chunk_size,
+        )
+
+        if uniqueIds is not None:
+            nodes = await self.nodes_get(uniqueIds) if uniqueIds else []
+        elif folderId is not None:
+            nodes = [node async for _, node in self.walk(folderId, node_types="SNAPSHOT")]
+        else:
+            nodes = []
+            while True:
+                response = await self.search(self._snapshots_export_search_params(tag=tag, start=len(nodes)))
+                page = response.get("nodes", None) or []
+                nodes.extend(page)
+                if not page or len(nodes) >= response.get("hitCount", 0):
+                    break
+            nodes = [_ for _ in nodes if _.get("nodeType", None) == "SNAPSHOT"]
+
+        with SnapshotExportWriter(file_name, file_format=file_format, chunk_size=chunk_size) as writer:
+            for node in nodes:
+                snapshot_uid, snapshot_name = node["uniqueId"], node.get("name", None)
+                async for item in self.snapshot_get_items_stream(snapshot_uid):
+                    writer.append(item, snapshot_uid=snapshot_uid, snapshot_name=snapshot_name)
+            return {"snapshots": nodes, "items": writer.n_items}
+
+    async def snapshots_import_bulk(
+        self, snapshots, *, checkpoint=None, create_nodes=True, max_concurrency=4, auth=None
+    ):
+        # Reusing docstrings from the threaded version
+        checkpoint = self._prepare_snapshots_import_bulk(checkpoint=checkpoint, max_concurrency=max_concurrency)
+        result = {"snapshots": [], "skipped": [], "errors": []}
+        node_uids, lock = {}, asyncio.Lock()
+
+        async def import_snapshot(key, config_name, snapshot_node, snapshot_data):
+            try:
+                config_uid = node_uids.get(("CONFIGURATION", config_name), None)
+                if config_uid is None:
+                    # Folders and configurations are created only once
+                    async with lock:
+                        config_uid = await self._snapshots_import_config(
+                            config_name,
+                            snapshot_data=snapshot_data,
+                            node_uids=node_uids,
+                            create_nodes=create_nodes,
+                            auth=auth,
+                        )
+                response = await self.snapshot_add(
+                    config_uid, snapshotNode=snapshot_node, snapshotData=snapshot_data, auth=auth
+                )
+                return key, response, None
+            except (*self._request_exceptions, self.RequestParameterError, RuntimeError) as ex:
+                return key, None, ex
+
+        def process_completed(tasks):
+            for task in tasks:
+                key, response, error = task.result()
+                self._snapshots_import_process(
+                    result=result, checkpoint=checkpoint, key=key, response=response, error=error
+                )
+
+        async def iterate(snapshots):
+            if hasattr(snapshots, "__aiter__"):
+                async for snapshot in snapshots:
+                    yield snapshot
+            else:
+                for snapshot in snapshots:
+                    yield snapshot
+
+        pending = set()
+        try:
+            async for snapshot in iterate(snapshots):
+                entry = self._snapshots_import_entry(snapshot=snapshot, result=result, checkpoint=checkpoint)
+                if entry is None:
+                    continue
+                if len(pending) >= max_concurrency:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    process_completed(done)
+                pending.add(asyncio.create_task(import_snapshot(*entry)))
+            if pending:
+                done, pending = await asyncio.wait(pending)
+                process_completed(done)
+        finally:
+            for task in pending:
+                task.cancel()
+            if checkpoint is not None:
+                checkpoint.close()
+
+        return result
+
+    async def _snapshots_import_config(self, config_name, *, snapshot_data, node_uids, create_nodes, auth):
+        # Reusing docstrings from the threaded version
+        folders, name = self._snapshots_import_path(config_name)
+        parent_uid, path = self.ROOT_NODE_UID, ""
+        for node_type, node_name in [("FOLDER", _) for _ in folders] + [("CONFIGURATION", name)]:
+            path += f"/{node_name}"
+            key = (node_type, path)
+            if key not in node_uids:
+                try:
+                    nodes = await self.structure_path_nodes(path)
+                except self.HTTPClientError:
+                    nodes = []
+                uids = [_["uniqueId"] for _ in nodes if _["nodeType"] == node_type]
+                if uids:
+                    node_uids[key] = uids[0]
+                elif not create_nodes:
+                    raise RuntimeError(f"{node_type.capitalize()} node {path!r} does not exist")
+                elif node_type == "FOLDER":
+                    node = {"name": node_name, "nodeType": "FOLDER"}
+                    node_uids[key] = (await self.node_add(parent_uid, node=node, auth=auth))["uniqueId"]
+                else:
+                    response = await self.config_add(
+                        parent_uid,
+                        configurationNode={"name": node_name},
+                        configurationData={"pvList": self._snapshots_import_pv_list(snapshot_data)},
+                        auth=auth,
+                    )
+                    node_uids[key] = response["configurationNode"]["uniqueId"]
+            parent_uid = node_uids[key]
+        return parent_uid
+
     # =============================================================================================
     #                         COMPOSITE-SNAPSHOT-CONTROLLER API METHODS
     # =============================================================================================
@@ -232,6 +781,12 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
         method, url = self._prepare_composite_snapshot_get_items(uniqueId=uniqueId)
         return await self.send_request(method, url)
 
+    async def composite_snapshot_get_items_stream(self, uniqueId):
+        # Reusing docstrings from the threaded version
+        method, url = self._prepare_composite_snapshot_get_items(uniqueId=uniqueId)
+        async for item in self._send_request_stream(method, url):
+            yield item
+
     async def composite_snapshot_add(
         self, parentNodeId, *, compositeSnapshotNode, compositeSnapshotData, auth=None
     ):
@@ -241,7 +796,12 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
             compositeSnapshotNode=compositeSnapshotNode,
             compositeSnapshotData=compositeSnapshotData,
         )
-        return await self.send_request(method, url, params=params, body_json=body_json, auth=auth)
+        try:
+            response = await self.send_request(method, url, params=params, body_json=body_json, auth=auth)
+        finally:
+            self._node_cache_invalidate([parentNodeId])
+        self._tree_index_add(parentNodeId, response, key="compositeSnapshotNode")
+        return response
 
     async def composite_snapshot_update(self, *, compositeSnapshotNode, compositeSnapshotData, auth=None):
         # Reusing docstrings from the threaded version
@@ -249,7 +809,12 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
             compositeSnapshotNode=compositeSnapshotNode,
             compositeSnapshotData=compositeSnapshotData,
         )
-        return await self.send_request(method, url, body_json=body_json, auth=auth)
+        try:
+            response = await self.send_request(method, url, body_json=body_json, auth=auth)
+        finally:
+            self._node_cache_invalidate([compositeSnapshotNode.get("uniqueId", None)], paths=True)
+        self._tree_index_update(response, key="compositeSnapshotNode")
+        return response
 
     async def composite_snapshot_consistency_check(self, uniqueNodeIds, *, auth=None):
         # Reusing docstrings from the threaded version
@@ -270,6 +835,86 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
         method, url, body_json = self._prepare_restore_items(snapshotItems=snapshotItems)
         return await self.send_request(method, url, body_json=body_json, auth=auth)
 
+    async def restore_differences(
+        self, nodeId, *, tolerance=None, compareMode=None, skipReadback=None, dry_run=False, auth=None
+    ):
+        # Reusing docstrings from the threaded version
+        items_stream = getattr(self, self._prepare_restore_differences(node=await self.node_get(nodeId)))
+        compare_results = await self.compare(
+            nodeId, tolerance=tolerance, compareMode=compareMode, skipReadback=skipReadback
+        )
+        pv_names = self._restore_differences_pv_names(compare_results)
+        items = []
+        if pv_names:
+            items = [_ async for _ in items_stream(nodeId) if _["configPv"]["pvName"] in pv_names]
+        not_restored = None
+        if items and not dry_run:
+            not_restored = await self.restore_items(snapshotItems=items, auth=auth)
+        return self._process_restore_differences(
+            compare_results=compare_results,
+            pv_names=pv_names,
+            items=items,
+            not_restored=not_restored,
+            dry_run=dry_run,
+        )
+
+    async def restore_items_retry(self, snapshotItems, *, retry_policy=None, deadline=None, auth=None):
+        # Reusing docstrings from the threaded version
+        retry_policy, deadline_time, pending, result = self._prepare_restore_items_retry(
+            snapshotItems=snapshotItems, retry_policy=retry_policy, deadline=deadline
+        )
+        while pending:
+            try:
+                response = await self.restore_items(snapshotItems=pending, auth=auth)
+            except self._request_exceptions as ex:
+                response = ex
+            pending, delay = self._process_restore_items_retry(
+                result=result,
+                pending=pending,
+                response=response,
+                retry_policy=retry_policy,
+                deadline_time=deadline_time,
+            )
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+        return result
+
+    async def restore_items_staged(
+        self, snapshotItems, plan, *, chunk_size=1000, max_concurrency=4, stop_on_error=True, auth=None
+    ):
+        # Reusing docstrings from the threaded version
+        stages, result = self._prepare_restore_items_staged(
+            snapshotItems=snapshotItems, plan=plan, chunk_size=chunk_size, max_concurrency=max_concurrency
+        )
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def restore_chunk(chunk):
+            async with semaphore:
+                t = time.perf_counter()
+                try:
+                    response = await self.restore_items(snapshotItems=chunk, auth=auth)
+                except self._request_exceptions as ex:
+                    response = ex
+                return response, time.perf_counter() - t
+
+        for name, chunks in stages:
+            if stop_on_error and result["errors"]:
+                self._process_restore_stage(
+                    result=result, name=name, chunks=chunks, chunk_results=None, duration=0.0
+                )
+                continue
+            t = time.perf_counter()
+            chunk_results = await asyncio.gather(*[restore_chunk(_) for _ in chunks])
+            self._process_restore_stage(
+                result=result,
+                name=name,
+                chunks=chunks,
+                chunk_results=chunk_results,
+                duration=time.perf_counter() - t,
+            )
+        return result
+
     # =============================================================================================
     #                     COMPARISON-CONTROLLER API METHODS
     # =============================================================================================
@@ -281,6 +926,21 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
         )
         return await self.send_request(method, url, params=params)
 
+    async def snapshots_diff(self, snapshot1, snapshot2, *, tolerance=None, compareMode=None):
+        # Reusing docstrings from the threaded version
+        self._prepare_snapshots_diff(tolerance=tolerance, compareMode=compareMode)
+
+        async def load_snapshot(snapshot):
+            if not isinstance(snapshot, str):
+                return snapshot
+            table = SnapshotTable()
+            async for item in self.snapshot_get_items_stream(snapshot):
+                table.append(item)
+            return table
+
+        snapshots = await asyncio.gather(load_snapshot(snapshot1), load_snapshot(snapshot2))
+        return SnapshotDiff(*snapshots, tolerance=tolerance, compareMode=compareMode)
+
     # =============================================================================================
     #                     FILTER-CONTROLLER API METHODS
     # =============================================================================================
@@ -309,32 +969,52 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
         method, url, body_json, params = self._prepare_structure_move(
             nodeIds=nodeIds, newParentNodeId=newParentNodeId
         )
-        return await self.send_request(method, url, body_json=body_json, params=params, auth=auth)
+        try:
+            response = await self.send_request(method, url, body_json=body_json, params=params, auth=auth)
+        finally:
+            self._node_cache_invalidate([*nodeIds, newParentNodeId], paths=True)
+        self._tree_index_move(nodeIds, newParentNodeId)
+        return response
 
     async def structure_copy(self, nodeIds, newParentNodeId, *, auth=None):
         # Reusing docstrings from the threaded version
         method, url, body_json, params = self._prepare_structure_copy(
             nodeIds=nodeIds, newParentNodeId=newParentNodeId
         )
-        return await self.send_request(method, url, body_json=body_json, params=params, auth=auth)
+        try:
+            response = await self.send_request(method, url, body_json=body_json, params=params, auth=auth)
+        finally:
+            self._node_cache_invalidate([newParentNodeId])
+        self.tree_index_clear()
+        return response
 
     async def structure_path_get(self, uniqueNodeId):
         # Reusing docstrings from the threaded version
-        method, url = self._prepare_structure_path_get(uniqueNodeId=uniqueNodeId)
-        return await self.send_request(method, url)
+        hit, response = self._node_cache_get("path", uniqueNodeId)
+        if not hit:
+            method, url = self._prepare_structure_path_get(uniqueNodeId=uniqueNodeId)
+            response = await self.send_request(method, url)
+            self._node_cache_put("path", uniqueNodeId, response)
+        return response
 
     async def structure_path_nodes(self, path):
         # Reusing docstrings from the threaded version
-        method, url, params = self._prepare_structure_path_nodes(path=path)
-        return await self.send_request(method, url, params=params)
+        response = self._tree_index_path_nodes(path)
+        if response is None:
+            method, url, params = self._prepare_structure_path_nodes(path=path)
+            response = await self.send_request(method, url, params=params)
+        return response
 
 
+SaveRestoreAPI.__doc__ = _SaveRestoreAPI_Threads.__doc__
 SaveRestoreAPI.open.__doc__ = _SaveRestoreAPI_Threads.open.__doc__
 SaveRestoreAPI.close.__doc__ = _SaveRestoreAPI_Threads.close.__doc__
 SaveRestoreAPI.__aenter__.__doc__ = _SaveRestoreAPI_Threads.__enter__.__doc__
 SaveRestoreAPI.__aexit__.__doc__ = _SaveRestoreAPI_Threads.__exit__.__doc__
 
 SaveRestoreAPI.send_request.__doc__ = _SaveRestoreAPI_Threads.send_request.__doc__
+SaveRestoreAPI._send_request.__doc__ = _SaveRestoreAPI_Threads._send_request.__doc__
+SaveRestoreAPI._send_request_stream.__doc__ = _SaveRestoreAPI_Threads._send_request_stream.__doc__
 
 SaveRestoreAPI.info_get.__doc__ = _SaveRestoreAPI_Threads.info_get.__doc__
 SaveRestoreAPI.version_get.__doc__ = _SaveRestoreAPI_Threads.version_get.__doc__
@@ -342,11 +1022,16 @@ SaveRestoreAPI.login.__doc__ = _SaveRestoreAPI_Threads.login.__doc__
 SaveRestoreAPI.search.__doc__ = _SaveRestoreAPI_Threads.search.__doc__
 SaveRestoreAPI.node_get.__doc__ = _SaveRestoreAPI_Threads.node_get.__doc__
 SaveRestoreAPI.nodes_get.__doc__ = _SaveRestoreAPI_Threads.nodes_get.__doc__
+SaveRestoreAPI.nodes_get_bulk.__doc__ = _SaveRestoreAPI_Threads.nodes_get_bulk.__doc__
 SaveRestoreAPI.node_add.__doc__ = _SaveRestoreAPI_Threads.node_add.__doc__
 SaveRestoreAPI.node_delete.__doc__ = _SaveRestoreAPI_Threads.node_delete.__doc__
 SaveRestoreAPI.nodes_delete.__doc__ = _SaveRestoreAPI_Threads.nodes_delete.__doc__
 SaveRestoreAPI.node_get_children.__doc__ = _SaveRestoreAPI_Threads.node_get_children.__doc__
 SaveRestoreAPI.node_get_parent.__doc__ = _SaveRestoreAPI_Threads.node_get_parent.__doc__
+SaveRestoreAPI.walk.__doc__ = _SaveRestoreAPI_Threads.walk.__doc__
+SaveRestoreAPI.tree_index_load.__doc__ = _SaveRestoreAPI_Threads.tree_index_load.__doc__
+SaveRestoreAPI.tree_replicate.__doc__ = _SaveRestoreAPI_Threads.tree_replicate.__doc__
+SaveRestoreAPI._tree_replicate_copy.__doc__ = _SaveRestoreAPI_Threads._tree_replicate_copy.__doc__
 SaveRestoreAPI.config_get.__doc__ = _SaveRestoreAPI_Threads.config_get.__doc__
 SaveRestoreAPI.config_add.__doc__ = _SaveRestoreAPI_Threads.config_add.__doc__
 SaveRestoreAPI.config_update.__doc__ = _SaveRestoreAPI_Threads.config_update.__doc__
@@ -356,13 +1041,21 @@ SaveRestoreAPI.tags_delete.__doc__ = _SaveRestoreAPI_Threads.tags_delete.__doc__
 SaveRestoreAPI.take_snapshot_get.__doc__ = _SaveRestoreAPI_Threads.take_snapshot_get.__doc__
 SaveRestoreAPI.take_snapshot_save.__doc__ = _SaveRestoreAPI_Threads.take_snapshot_save.__doc__
 SaveRestoreAPI.snapshot_get.__doc__ = _SaveRestoreAPI_Threads.snapshot_get.__doc__
+SaveRestoreAPI.snapshot_get_items_stream.__doc__ = _SaveRestoreAPI_Threads.snapshot_get_items_stream.__doc__
 SaveRestoreAPI.snapshot_add.__doc__ = _SaveRestoreAPI_Threads.snapshot_add.__doc__
 SaveRestoreAPI.snapshot_update.__doc__ = _SaveRestoreAPI_Threads.snapshot_update.__doc__
 SaveRestoreAPI.snapshots_get.__doc__ = _SaveRestoreAPI_Threads.snapshots_get.__doc__
+SaveRestoreAPI.snapshots_get_stream.__doc__ = _SaveRestoreAPI_Threads.snapshots_get_stream.__doc__
+SaveRestoreAPI.snapshots_export.__doc__ = _SaveRestoreAPI_Threads.snapshots_export.__doc__
+SaveRestoreAPI.snapshots_import_bulk.__doc__ = _SaveRestoreAPI_Threads.snapshots_import_bulk.__doc__
+SaveRestoreAPI._snapshots_import_config.__doc__ = _SaveRestoreAPI_Threads._snapshots_import_config.__doc__
 
 SaveRestoreAPI.composite_snapshot_get.__doc__ = _SaveRestoreAPI_Threads.composite_snapshot_get.__doc__
 SaveRestoreAPI.composite_snapshot_get_nodes.__doc__ = _SaveRestoreAPI_Threads.composite_snapshot_get_nodes.__doc__
 SaveRestoreAPI.composite_snapshot_get_items.__doc__ = _SaveRestoreAPI_Threads.composite_snapshot_get_items.__doc__
+SaveRestoreAPI.composite_snapshot_get_items_stream.__doc__ = (
+    _SaveRestoreAPI_Threads.composite_snapshot_get_items_stream.__doc__
+)
 SaveRestoreAPI.composite_snapshot_add.__doc__ = _SaveRestoreAPI_Threads.composite_snapshot_add.__doc__
 SaveRestoreAPI.composite_snapshot_update.__doc__ = _SaveRestoreAPI_Threads.composite_snapshot_update.__doc__
 SaveRestoreAPI.composite_snapshot_consistency_check.__doc__ = (
@@ -371,7 +1064,11 @@ SaveRestoreAPI.composite_snapshot_consistency_check.__doc__ = (
 
 SaveRestoreAPI.restore_node.__doc__ = _SaveRestoreAPI_Threads.restore_node.__doc__
 SaveRestoreAPI.restore_items.__doc__ = _SaveRestoreAPI_Threads.restore_items.__doc__
+SaveRestoreAPI.restore_differences.__doc__ = _SaveRestoreAPI_Threads.restore_differences.__doc__
+SaveRestoreAPI.restore_items_retry.__doc__ = _SaveRestoreAPI_Threads.restore_items_retry.__doc__
+SaveRestoreAPI.restore_items_staged.__doc__ = _SaveRestoreAPI_Threads.restore_items_staged.__doc__
 SaveRestoreAPI.compare.__doc__ = _SaveRestoreAPI_Threads.compare.__doc__
+SaveRestoreAPI.snapshots_diff.__doc__ = _SaveRestoreAPI_Threads.snapshots_diff.__doc__
 SaveRestoreAPI.structure_move.__doc__ = _SaveRestoreAPI_Threads.structure_move.__doc__
 SaveRestoreAPI.structure_copy.__doc__ = _SaveRestoreAPI_Threads.structure_copy.__doc__
 SaveRestoreAPI.structure_path_get.__doc__ = _SaveRestoreAPI_Threads.structure_path_get.__doc__
@@ -1,9 +1,23 @@
 # import getpass
 import json
+import logging
+import threading
+import time
 from urllib.parse import quote
 
 import httpx
 
+from ._import_checkpoint import _ImportCheckpoint
+from ._instrumentation import RequestEvent
+from ._json_stream import _JSONArrayStreamParser
+from ._node_cache import _NodeCache
+from ._request_limits import _NO_REQUEST_LIMIT, RequestLimits, _RequestLimiter
+from ._restore_plan import RestorePlan
+from ._retry import RetryPolicy
+from ._tree_index import NodeTreeIndex
+
+logger = logging.getLogger(__name__)
+
 
 class RequestParameterError(Exception): ...
 
@@ -33,12 +47,109 @@ class _SaveRestoreAPI_Base:
 
     ROOT_NODE_UID = "44bef5de-e8e6-4014-af37-b8f6c8a939a2"
 
-    def __init__(self, *, base_url, timeout=5.0):
+    def __init__(
+        self,
+        *,
+        base_url,
+        timeout=5.0,
+        max_connections=100,
+        max_keepalive_connections=20,
+        keepalive_expiry=5.0,
+        http2=False,
+        transport=None,
+        client=None,
+        node_cache_size=0,
+        node_cache_ttl=60.0,
+        retry_policy=None,
+        request_hooks=None,
+        coalesce_requests=False,
+        request_limits=None,
+    ):
         self._base_url = base_url
         self._timeout = timeout
         self._client = None
         self._auth = None
 
+        # Parameters of the connection pool. The parameters are ignored if the transport
+        # or the client is passed to the constructor.
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._http2 = http2
+        # Shared transport and client are managed (closed) by the application.
+        self._transport = transport
+        self._shared_client = client
+
+        # The node cache is disabled if the size is 0
+        if isinstance(node_cache_size, bool) or not isinstance(node_cache_size, int) or node_cache_size < 0:
+            raise self.RequestParameterError(
+                f"Invalid 'node_cache_size': {node_cache_size!r}. Must be a non-negative integer."
+            )
+        if node_cache_ttl is not None and (
+            isinstance(node_cache_ttl, bool) or not isinstance(node_cache_ttl, (int, float)) or node_cache_ttl < 0
+        ):
+            raise self.RequestParameterError(
+                f"Invalid 'node_cache_ttl': {node_cache_ttl!r}. Must be a non-negative number or None."
+            )
+        self._node_cache = _NodeCache(maxsize=node_cache_size, ttl=node_cache_ttl) if node_cache_size else None
+
+        # The tree index is created by 'tree_index_load()'
+        self._tree_index = None
+
+        # Failed requests are not retried if the policy is None
+        if retry_policy is not None and not isinstance(retry_policy, RetryPolicy):
+            raise self.RequestParameterError(
+                f"Invalid 'retry_policy': {retry_policy!r}. Must be an instance of RetryPolicy or None."
+            )
+        self._retry_policy = retry_policy
+        self._retry_counters = {"retries": 0, "recovered": 0, "exhausted": 0}
+        self._retry_lock = threading.Lock()
+
+        # Request events are not created if there are no hooks
+        if request_hooks is not None and not isinstance(request_hooks, (list, tuple)):
+            raise self.RequestParameterError(
+                f"Invalid 'request_hooks': {request_hooks!r}. Must be a list of callables or None."
+            )
+        self._request_hooks = []
+        for hook in request_hooks or []:
+            if not callable(hook):
+                raise self.RequestParameterError(f"Request hook must be callable: {hook!r}")
+            self._request_hooks.append(hook)
+
+        # Identical concurrent GET requests share the in-flight request if coalescing is enabled
+        self._coalesce_requests = coalesce_requests
+        self._coalesce_inflight = {}
+        self._coalesce_counters = {"requests": 0, "coalesced": 0}
+        self._coalesce_lock = threading.Lock()
+
+        # The requests are not limited if there are no limiters ('read' and 'write' groups)
+        try:
+            request_limits = RequestLimits._groups(request_limits)
+        except ValueError as ex:
+            raise self.RequestParameterError(str(ex)) from ex
+        self._request_limiters = {group: _RequestLimiter(limits) for group, limits in request_limits.items()}
+
+    def _client_kwargs(self):
+        """
+        Returns parameters for creating ``httpx.Client`` or ``httpx.AsyncClient``.
+        """
+        kwargs = {"base_url": self._base_url, "timeout": self._timeout}
+        if self._transport is not None:
+            kwargs.update({"transport": self._transport})
+        else:
+            kwargs.update({"limits": self._limits, "http2": self._http2})
+        return kwargs
+
+    @property
+    def _owns_client(self):
+        """
+        True if the HTTP client (and its transport) was created by this object and must
+        be closed by this object.
+        """
+        return (self._shared_client is None) and (self._transport is None)
+
     @staticmethod
     def auth_gen(username, password):
         """
@@ -113,6 +224,384 @@ class _SaveRestoreAPI_Base:
         """
         self._auth = None
 
+    def node_cache_info(self):
+        """
+        Returns statistics of the node cache. The cache is enabled by setting ``node_cache_size``
+        parameter of the class constructor. The cache stores results of ``node_get()``,
+        ``node_get_children()``, ``node_get_parent()`` and ``structure_path_get()`` calls.
+        Cached entries are removed once they expire (``node_cache_ttl``) and when nodes are
+        modified using the API calls of this object. Changes made by other clients are not
+        detected until the entries expire.
+
+        Returns
+        -------
+        dict or None
+            Dictionary with the following keys: ``hits`` - number of cache hits, ``misses`` -
+            number of cache misses, ``maxsize`` - maximum number of entries, ``currsize`` - current
+            number of entries, ``ttl`` - lifetime of the entries in seconds. None if the cache
+            is disabled.
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            from save_and_restore_api import SaveRestoreAPI
+
+            with SaveRestoreAPI(base_url="http://localhost:8080/save-restore", node_cache_size=10000) as SR:
+                for _ in range(10):
+                    children = SR.node_get_children(SR.ROOT_NODE_UID)
+                print(SR.node_cache_info())  # 9 hits, 1 miss
+        """
+        return self._node_cache.info() if self._node_cache is not None else None
+
+    def node_cache_clear(self):
+        """
+        Remove all entries from the node cache. The hit and miss counters are not reset.
+        """
+        if self._node_cache is not None:
+            self._node_cache.clear()
+
+    def retry_info(self):
+        """
+        Returns the retry counters. The requests are retried if the retry policy is set
+        (``retry_policy`` parameter of the class constructor).
+
+        Returns
+        -------
+        dict
+            Dictionary with the following keys: ``retries`` - total number of retried attempts,
+            ``recovered`` - number of requests that succeeded after retries, ``exhausted`` - number
+            of retryable requests that failed after the maximum number of attempts.
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            from save_and_restore_api import RetryPolicy, SaveRestoreAPI
+
+            with SaveRestoreAPI(base_url="http://localhost:8080/save-restore", retry_policy=RetryPolicy()) as SR:
+                info = SR.info_get()
+                print(SR.retry_info())  # {'retries': 0, 'recovered': 0, 'exhausted': 0}
+        """
+        with self._retry_lock:
+            return dict(self._retry_counters)
+
+    def retry_info_reset(self):
+        """
+        Reset the retry counters.
+        """
+        with self._retry_lock:
+            self._retry_counters.update(dict.fromkeys(self._retry_counters, 0))
+
+    def _retry_count(self, counter):
+        with self._retry_lock:
+            self._retry_counters[counter] += 1
+
+    def _retry_delay(self, *, method, attempt, exception):
+        """
+        Returns the delay before the next attempt or None if the failed request should not be retried.
+        """
+        policy = self._retry_policy
+        if policy is None or not policy.is_retryable(method=method, exception=exception):
+            return None
+        if attempt >= policy.max_attempts:
+            if attempt > 1:
+                self._retry_count("exhausted")
+            return None
+        self._retry_count("retries")
+        return policy.get_delay(attempt=attempt, exception=exception)
+
+    def coalesce_info(self):
+        """
+        Returns the counters of coalesced requests. Identical concurrent GET requests are
+        coalesced if ``coalesce_requests`` parameter of the class constructor is True.
+
+        Returns
+        -------
+        dict
+            Dictionary with the following keys: ``requests`` - number of GET requests sent to
+            the server while coalescing was enabled, ``coalesced`` - number of calls that received
+            the result of an identical request that was already in progress.
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            import asyncio
+            from save_and_restore_api.aio import SaveRestoreAPI
+
+            async with SaveRestoreAPI(base_url="http://localhost:8080/save-restore", coalesce_requests=True) as SR:
+                await asyncio.gather(*[SR.node_get(SR.ROOT_NODE_UID) for _ in range(10)])
+                print(SR.coalesce_info())  # {'requests': 1, 'coalesced': 9}
+        """
+        with self._coalesce_lock:
+            return dict(self._coalesce_counters)
+
+    def _coalesce_count(self, counter):
+        with self._coalesce_lock:
+            self._coalesce_counters[counter] += 1
+
+    def _coalesce_key(self, *, method, url, params, body_json, headers, data):
+        """
+        Returns the key identifying identical requests or None if the request is not coalesced.
+        Only GET requests are coalesced. The authentication is not included in the key, since
+        it is not sent with GET requests.
+        """
+        if not self._coalesce_requests or method.upper() != "GET":
+            return None
+        try:
+            return (url, json.dumps([params, body_json, headers, data], sort_keys=True))
+        except (TypeError, ValueError):
+            # Parameters that can not be serialized (e.g. 'httpx.Headers'): send separate requests
+            return None
+
+    def request_limits_info(self):
+        """
+        Returns the limits and the statistics of the groups of requests limited using
+        ``request_limits`` parameter of the class constructor. The statistics may be used to
+        tune the limits: the requests are waiting in the queue if the limits are too strict.
+
+        Returns
+        -------
+        dict or None
+            Dictionary with the keys ``read`` and/or ``write`` (groups of requests). The values are
+            dictionaries with the following keys: ``max_concurrency``, ``rate``, ``burst`` - the limits,
+            ``in_progress`` - number of requests in progress, ``queued`` - number of requests waiting
+            in the queue, ``max_queued`` - maximum length of the queue, ``requests`` - number of sent
+            requests, ``delayed`` - number of requests that waited in the queue, ``wait_time`` and
+            ``max_wait_time`` - total and maximum time spent by the requests in the queue in seconds.
+            None if the requests are not limited.
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            from save_and_restore_api import RequestLimits, SaveRestoreAPI
+
+            base_url, request_limits = "http://localhost:8080/save-restore", RequestLimits(max_concurrency=10)
+            with SaveRestoreAPI(base_url=base_url, request_limits=request_limits) as SR:
+                info = SR.info_get()
+                print(SR.request_limits_info()["read"]["requests"])  # 1
+        """
+        if not self._request_limiters:
+            return None
+        return {group: limiter.info() for group, limiter in self._request_limiters.items()}
+
+    def request_limits_info_reset(self):
+        """
+        Reset the statistics of the limited requests. The current numbers of requests in progress
+        and in the queue are not changed.
+        """
+        for limiter in self._request_limiters.values():
+            limiter.info_reset()
+
+    def _request_limit(self, *, method):
+        """
+        Returns the limiter of the group of requests (context manager used for sending the request).
+        """
+        limiter = self._request_limiters.get("read" if method.upper() == "GET" else "write", None)
+        return limiter if limiter is not None else _NO_REQUEST_LIMIT
+
+    def request_hook_add(self, hook):
+        """
+        Register the request hook. The hook is a callable that accepts a single parameter
+        (``RequestEvent``). The hook is called once each API request is completed (successfully
+        or with an error) and receives the method, URL template, status code, transferred bytes
+        and the durations of the request phases. The hooks are called synchronously, so they
+        should return quickly. Exceptions raised by the hooks are logged and ignored.
+        ``RequestStatsCollector`` is a hook that accumulates the statistics of requests.
+
+        Parameters
+        ----------
+        hook : callable
+            Request hook, e.g. ``RequestStatsCollector`` object.
+
+        Returns
+        -------
+        None
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            from save_and_restore_api import SaveRestoreAPI
+
+            def print_event(event):
+                print(f"{event.method} {event.url_template}: {event.duration * 1000:.1f} ms")
+
+            with SaveRestoreAPI(base_url="http://localhost:8080/save-restore") as SR:
+                SR.request_hook_add(print_event)
+                info = SR.info_get()  # GET /: 2.3 ms
+                SR.request_hook_remove(print_event)
+        """
+        if not callable(hook):
+            raise self.RequestParameterError(f"Request hook must be callable: {hook!r}")
+        self._request_hooks.append(hook)
+
+    def request_hook_remove(self, hook):
+        """
+        Remove the request hook registered using ``request_hook_add()`` or passed to the class
+        constructor.
+
+        Parameters
+        ----------
+        hook : callable
+            Request hook.
+
+        Returns
+        -------
+        None
+        """
+        try:
+            self._request_hooks.remove(hook)
+        except ValueError:
+            raise self.RequestParameterError(f"Request hook is not registered: {hook!r}") from None
+
+    def _request_event_create(self, *, method, url):
+        """
+        Returns a new request event or None if no hooks are registered.
+        """
+        return RequestEvent(method=method, url=url) if self._request_hooks else None
+
+    @staticmethod
+    def _request_event_phase(event, phase, start):
+        """
+        Add the time elapsed since ``start`` to the duration of the request phase. Returns
+        the current time, which is the start of the next phase.
+        """
+        now = time.perf_counter()
+        if event is not None:
+            event.durations[phase] += now - start
+        return now
+
+    @staticmethod
+    def _request_event_attempt(event, *, attempt, client_response):
+        if event is not None:
+            event.attempts = attempt
+            event._update_from_response(client_response)
+
+    def _request_event_emit(self, event, *, exception=None):
+        """
+        Pass the completed request event to the hooks.
+        """
+        if event is None:
+            return
+        if exception is not None:
+            event.error = type(exception).__name__
+        for hook in list(self._request_hooks):
+            try:
+                hook(event)
+            except Exception as ex:
+                logger.exception("Request hook %r failed: %s", hook, ex)
+
+    def _node_cache_get(self, kind, uid):
+        if self._node_cache is not None:
+            return self._node_cache.get(kind, uid)
+        return False, None
+
+    def _node_cache_put(self, kind, uid, value):
+        if self._node_cache is not None:
+            self._node_cache.put(kind, uid, value)
+
+    def _node_cache_invalidate(self, uids, *, recursive=False, paths=False):
+        if self._node_cache is not None:
+            self._node_cache.invalidate(uids, recursive=recursive, paths=paths)
+
+    @property
+    def tree_index(self):
+        """
+        Local index of the tree of nodes (``NodeTreeIndex``) or None if the index is not loaded.
+        The index is loaded using ``tree_index_load()``. Once the index is loaded,
+        ``structure_path_nodes()`` finds the nodes in the index without sending requests to
+        the server. The paths inside the indexed subtree that are not in the index raise
+        ``HTTPClientError`` (404) as if the request was rejected by the server. The index is
+        updated when nodes are added, updated, moved or deleted using this object.
+        ``structure_copy()`` clears the index, since UIDs of the copied nodes are not returned
+        by the server.
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            from save_and_restore_api import SaveRestoreAPI
+
+            with SaveRestoreAPI(base_url="http://localhost:8080/save-restore") as SR:
+                SR.tree_index_load()
+                uid = SR.tree_index.uid_get("/detectors/imaging/eiger_config", node_type="CONFIGURATION")
+                parent_uid = SR.tree_index.parent_get(uid)
+        """
+        return self._tree_index
+
+    def tree_index_clear(self):
+        """
+        Clear (unload) the local index of the tree of nodes.
+        """
+        self._tree_index = None
+
+    def _tree_index_path_nodes(self, path):
+        """
+        Returns the list of nodes found in the tree index or None if the path is outside
+        the indexed subtree. The index contains all the nodes of the subtree, so the paths
+        inside the subtree that are not found in the index do not exist: ``HTTPClientError``
+        (404) is raised, consistent with the response of the server.
+        """
+        if self._tree_index is None or not self._tree_index.covers(path):
+            return None
+        nodes = self._tree_index.path_nodes(path)
+        if not nodes:
+            method, url, params = self._prepare_structure_path_nodes(path=path)
+            request = httpx.Request(method, httpx.URL(self._base_url.rstrip("/") + url, params=params))
+            response = httpx.Response(404, request=request)
+            message = f"404: Node not found in the tree index {request.url}"
+            raise self.HTTPClientError(message, request=request, response=response)
+        return nodes
+
+    def _tree_index_add(self, parent_uid, response, *, key=None):
+        """
+        Add the node returned by the server to the tree index. If ``key`` is specified, then
+        the node metadata is ``response[key]``.
+        """
+        if self._tree_index is not None:
+            node = response.get(key, None) if (key and isinstance(response, dict)) else response
+            if isinstance(node, dict):
+                self._tree_index.add(parent_uid, node)
+
+    def _tree_index_update(self, response, *, key=None):
+        """
+        Update metadata of the node (or the list of nodes) returned by the server. If ``key``
+        is specified, then the node metadata is ``response[key]``.
+        """
+        if self._tree_index is not None:
+            for node in response if isinstance(response, list) else [response]:
+                node = node.get(key, None) if (key and isinstance(node, dict)) else node
+                if isinstance(node, dict):
+                    self._tree_index.update(node)
+
+    def _tree_index_remove(self, uids):
+        if self._tree_index is not None:
+            self._tree_index.remove(uids)
+
+    def _tree_index_move(self, uids, new_parent_uid):
+        if self._tree_index is not None:
+            self._tree_index.move(uids, new_parent_uid)
+
+    def _prepare_tree_index_load(self, *, uniqueNodeId, folders_only, max_concurrency):
+        uniqueNodeId = uniqueNodeId or self.ROOT_NODE_UID
+        if not isinstance(folders_only, bool):
+            raise self.RequestParameterError(f"Invalid 'folders_only': {folders_only!r}. Must be a boolean.")
+        self._prepare_walk(max_depth=None, node_types=None, max_concurrency=max_concurrency)
+        return uniqueNodeId, "FOLDER" if folders_only else None
+
+    def _tree_index_create(self, *, root_uid, root_path, folders_only):
+        root_path = "/" if root_uid == self.ROOT_NODE_UID else root_path
+        return NodeTreeIndex(root_uid=root_uid, root_path=root_path, folders_only=folders_only)
+
     def _prepare_request(
         self, *, method, body_json=None, params=None, headers=None, data=None, timeout=None, auth=None
     ):
@@ -143,6 +632,14 @@ class _SaveRestoreAPI_Base:
                 response = client_response.text
         return response
 
+    def _create_stream_parser(self, *, key=None):
+        """
+        Returns the parser for streaming the elements of the JSON array from the response.
+        The array is the top-level element of the response if ``key`` is None, or the
+        ``response[key]`` array otherwise.
+        """
+        return _JSONArrayStreamParser(key=key)
+
     def _process_comm_exception(self, *, method, body_json, client_response):
         """
         The function must be called from ``except`` block and returns response with an error message
@@ -231,6 +728,39 @@ class _SaveRestoreAPI_Base:
         body_json = uniqueIds
         return method, url, body_json
 
+    def _prepare_nodes_get_bulk(self, *, uniqueIds, chunk_size, max_concurrency):
+        if not isinstance(chunk_size, int) or chunk_size < 1:
+            raise self.RequestParameterError(f"Invalid 'chunk_size': {chunk_size!r}. Must be a positive integer.")
+        if not isinstance(max_concurrency, int) or max_concurrency < 1:
+            raise self.RequestParameterError(
+                f"Invalid 'max_concurrency': {max_concurrency!r}. Must be a positive integer."
+            )
+        uniqueIds = list(uniqueIds)
+        chunks = [uniqueIds[n : n + chunk_size] for n in range(0, len(uniqueIds), chunk_size)]
+        return uniqueIds, chunks
+
+    def _process_nodes_get_bulk(self, *, uniqueIds, chunks, chunk_results):
+        """
+        Merge results of ``nodes_get()`` calls for the chunks of UIDs. The list ``chunk_results``
+        contains a list of nodes or an exception for each chunk. The nodes are returned
+        in the order of ``uniqueIds``.
+        """
+        nodes_by_uid, errors = {}, []
+        for chunk, result in zip(chunks, chunk_results):
+            if isinstance(result, Exception):
+                errors.append({"uniqueIds": chunk, "error": result})
+            else:
+                nodes_by_uid.update({_["uniqueId"]: _ for _ in result})
+        nodes = [nodes_by_uid[_] for _ in uniqueIds if _ in nodes_by_uid]
+        return {"nodes": nodes, "errors": errors}
+
+    @property
+    def _request_exceptions(self):
+        """
+        Exceptions raised by ``send_request()`` due to failed requests.
+        """
+        return (self.RequestTimeoutError, self.HTTPRequestError, self.HTTPClientError, self.HTTPServerError)
+
     def _prepare_node_add(self, *, parentNodeId, node):
         if "name" not in node or "nodeType" not in node:
             raise self.RequestParameterError(f"Parameters 'name' and 'nodeType' are required in 'node': {node!r}.")
@@ -258,6 +788,134 @@ class _SaveRestoreAPI_Base:
         method, url = "GET", f"/node/{uniqueNodeId}/parent"
         return method, url
 
+    # Types of nodes that may have children
+    _WALK_CONTAINER_NODE_TYPES = ("FOLDER", "CONFIGURATION")
+
+    def _prepare_walk(self, *, max_depth, node_types, max_concurrency, descend_node_types=None):
+        if max_depth is not None and (not isinstance(max_depth, int) or max_depth < 1):
+            raise self.RequestParameterError(f"Invalid 'max_depth': {max_depth!r}. Must be a positive integer.")
+        if not isinstance(max_concurrency, int) or max_concurrency < 1:
+            raise self.RequestParameterError(
+                f"Invalid 'max_concurrency': {max_concurrency!r}. Must be a positive integer."
+            )
+        if isinstance(node_types, str):
+            node_types = [node_types]
+        if isinstance(descend_node_types, str):
+            descend_node_types = [descend_node_types]
+        node_types = set(node_types) if node_types is not None else None
+        descend_node_types = set(descend_node_types) if descend_node_types is not None else None
+        return node_types, descend_node_types
+
+    def _walk_descend(self, *, node, depth, max_depth, descend_node_types=None):
+        """
+        Returns True if the children of the node at ``depth`` should be loaded.
+        """
+        if max_depth is not None and depth >= max_depth:
+            return False
+        node_type = node.get("nodeType", None)
+        if descend_node_types is not None and node_type not in descend_node_types:
+            return False
+        return node_type in self._WALK_CONTAINER_NODE_TYPES
+
+    # Fields of the replicated nodes sent to the destination server. Other fields (e.g. 'uniqueId'
+    #   or 'lastModifiedDate') are set by the server.
+    _REPLICATE_NODE_KEYS = ("name", "description", "nodeType")
+
+    def _prepare_tree_replicate(self, *, source, uniqueNodeId, parentNodeId, uid_map, max_concurrency):
+        if not isinstance(source, type(self)):
+            raise self.RequestParameterError(
+                f"Invalid 'source': {type(source).__name__}. Must be an instance of {type(self).__name__}."
+            )
+        if not isinstance(uniqueNodeId, str) or not uniqueNodeId:
+            raise self.RequestParameterError(f"Invalid 'uniqueNodeId': {uniqueNodeId!r}")
+        if not isinstance(max_concurrency, int) or max_concurrency < 1:
+            raise self.RequestParameterError(
+                f"Invalid 'max_concurrency': {max_concurrency!r}. Must be a positive integer."
+            )
+        parentNodeId = parentNodeId or self.ROOT_NODE_UID
+        uid_map = _ImportCheckpoint(uid_map) if uid_map is not None else None
+        result = {"added": [], "updated": [], "unchanged": [], "errors": []}
+        result["uid_map"] = dict(uid_map.items()) if uid_map is not None else {}
+        if uniqueNodeId == source.ROOT_NODE_UID:
+            # The children of the root node are replicated to the parent node
+            result["uid_map"][uniqueNodeId] = parentNodeId
+        return parentNodeId, uid_map, result
+
+    @staticmethod
+    def _tree_replicate_action(*, node, uid_map):
+        """
+        Returns the tuple ``(action, dst_uid)``. The action is ``"add"`` if the node was not
+        replicated, ``"update"`` if the node was modified since it was replicated, ``"skip"``
+        if the node was not modified. Modified folders are skipped, because only the children
+        of folders are replicated.
+        """
+        record = uid_map.get(node["uniqueId"]) if uid_map is not None else None
+        if record is None:
+            return "add", None
+        if node["nodeType"] == "FOLDER" or record.get("lastModifiedDate", None) == node.get(
+            "lastModifiedDate", None
+        ):
+            return "skip", record["uniqueId"]
+        return "update", record["uniqueId"]
+
+    def _tree_replicate_node(self, *, node, dst_uid):
+        """
+        Returns the node metadata sent to the destination server.
+        """
+        node = {k: v for k, v in node.items() if k in self._REPLICATE_NODE_KEYS}
+        if dst_uid is not None:
+            node["uniqueId"] = dst_uid
+        return node
+
+    @staticmethod
+    def _tree_replicate_data(*, node, data, dst_uid, uid_map):
+        """
+        Returns the node data (configuration, snapshot or composite snapshot data) sent to
+        the destination server. ``uid_map`` is the dictionary that maps UIDs of the source
+        nodes to the UIDs of the destination nodes.
+        """
+        node_type = node["nodeType"]
+        if node_type == "CONFIGURATION":
+            data = {"pvList": data["pvList"]}
+        elif node_type == "SNAPSHOT":
+            data = {"snapshotItems": data["snapshotItems"]}
+        else:
+            uids = data.get("referencedSnapshotNodes", None) or []
+            missing = [_ for _ in uids if _ not in uid_map]
+            if missing:
+                raise RuntimeError(f"Referenced snapshots are not replicated: {missing}")
+            data = {"referencedSnapshotNodes": [uid_map[_] for _ in uids]}
+        if dst_uid is not None:
+            data["uniqueId"] = dst_uid
+        return data
+
+    @staticmethod
+    def _tree_replicate_ready(composites, uid_map):
+        """
+        Split the list of composite snapshots ``(node, dst_parent_uid, data)`` into the composite
+        snapshots that reference only the replicated snapshots and the remaining composite snapshots.
+        """
+        ready, waiting = [], []
+        for item in composites:
+            uids = item[2].get("referencedSnapshotNodes", None) or []
+            (ready if all(_ in uid_map for _ in uids) else waiting).append(item)
+        return ready, waiting
+
+    @staticmethod
+    def _tree_replicate_process(*, result, uid_map, node, action, dst_uid, error):
+        """
+        Save the result of replicating the node. The node may be replicated (``dst_uid``
+        is not None) even if the operation failed (e.g. if the list of children was not loaded).
+        """
+        src_uid = node["uniqueId"]
+        if dst_uid is not None:
+            result["uid_map"][src_uid] = dst_uid
+            result[{"add": "added", "update": "updated", "skip": "unchanged"}[action]].append(src_uid)
+            if uid_map is not None and action != "skip":
+                uid_map.record(src_uid, dst_uid, lastModifiedDate=node.get("lastModifiedDate", None))
+        if error is not None:
+            result["errors"].append({"uniqueId": src_uid, "error": error})
+
     # =============================================================================================
     #                         CONFIGURATION-CONTROLLER API METHODS
     # =============================================================================================
@@ -331,6 +989,98 @@ class _SaveRestoreAPI_Base:
         method, url = "GET", "/snapshots"
         return method, url
 
+    # Number of nodes loaded by one search request when the snapshots are selected by tag
+    _EXPORT_SEARCH_PAGE_SIZE = 100
+
+    def _prepare_snapshots_export(self, *, file_name, uniqueIds, folderId, tag, file_format, chunk_size):
+        if sum(_ is not None for _ in (uniqueIds, folderId, tag)) != 1:
+            raise self.RequestParameterError(
+                "Exactly one of the parameters 'uniqueIds', 'folderId' or 'tag' must be specified."
+            )
+        if not isinstance(chunk_size, int) or chunk_size < 1:
+            raise self.RequestParameterError(f"Invalid 'chunk_size': {chunk_size!r}. Must be a positive integer.")
+        # The module imports optional packages (e.g. 'pyarrow'), which are slow to import
+        from ._snapshot_export import _export_format
+
+        try:
+            # Fails if the format is not supported or the required package is not installed
+            _export_format(file_name, file_format)
+        except ValueError as ex:
+            raise self.RequestParameterError(str(ex)) from ex
+        return [uniqueIds] if isinstance(uniqueIds, str) else uniqueIds
+
+    def _snapshots_export_search_params(self, *, tag, start):
+        return {"tags": tag, "type": "SNAPSHOT", "from": start, "size": self._EXPORT_SEARCH_PAGE_SIZE}
+
+    # Fields of the imported snapshot nodes sent to the server. Other fields (e.g. 'uniqueId'
+    #   or 'created' of the snapshots loaded from another server) are set by the server.
+    _IMPORT_SNAPSHOT_NODE_KEYS = ("name", "description")
+
+    def _prepare_snapshots_import_bulk(self, *, checkpoint, max_concurrency):
+        if not isinstance(max_concurrency, int) or max_concurrency < 1:
+            raise self.RequestParameterError(
+                f"Invalid 'max_concurrency': {max_concurrency!r}. Must be a positive integer."
+            )
+        return _ImportCheckpoint(checkpoint) if checkpoint is not None else None
+
+    def _snapshots_import_entry(self, *, snapshot, result, checkpoint):
+        """
+        Returns the tuple ``(key, config_name, snapshot_node, snapshot_data)`` for the snapshot
+        passed to ``snapshots_import_bulk()`` or None if the snapshot is skipped. The path
+        ``config_name`` is normalized (``/folder/config``). Invalid snapshots are reported
+        in ``result["errors"]``, the snapshots found in the checkpoint are reported in
+        ``result["skipped"]``.
+        """
+        try:
+            node = snapshot["snapshotNode"]
+            snapshot_node = {k: v for k, v in node.items() if k in self._IMPORT_SNAPSHOT_NODE_KEYS}
+            snapshot_data = {"snapshotItems": list(snapshot["snapshotData"]["snapshotItems"])}
+            # The PV list is needed if the configuration is created
+            self._snapshots_import_pv_list(snapshot_data)
+            folders, name = self._snapshots_import_path(snapshot["configName"])
+            config_name = "/" + "/".join(folders + [name])
+            key = snapshot.get("key", None) or f"{config_name}/{snapshot_node['name']}"
+        except self.RequestParameterError as ex:
+            result["errors"].append({"key": None, "error": ex})
+            return None
+        except (KeyError, TypeError, AttributeError) as ex:
+            error = self.RequestParameterError(f"Invalid snapshot: {ex!r}")
+            result["errors"].append({"key": None, "error": error})
+            return None
+
+        if checkpoint is not None and key in checkpoint:
+            result["skipped"].append(key)
+            return None
+        return key, config_name, snapshot_node, snapshot_data
+
+    def _snapshots_import_path(self, config_name):
+        """
+        Returns the list of names of the folders and the name of the configuration node.
+        """
+        names = [_ for _ in config_name.split("/") if _]
+        if not names:
+            raise self.RequestParameterError(f"Invalid configuration name: {config_name!r}")
+        return names[:-1], names[-1]
+
+    @staticmethod
+    def _snapshots_import_pv_list(snapshot_data):
+        """
+        Returns the list of PVs of the configuration created for the imported snapshot.
+        """
+        return [dict(_["configPv"]) for _ in snapshot_data["snapshotItems"]]
+
+    @staticmethod
+    def _snapshots_import_process(*, result, checkpoint, key, response, error):
+        """
+        Save the result of importing the snapshot.
+        """
+        if error is not None:
+            result["errors"].append({"key": key, "error": error})
+        else:
+            result["snapshots"].append(response["snapshotNode"])
+            if checkpoint is not None:
+                checkpoint.record(key, response["snapshotNode"]["uniqueId"])
+
     # =============================================================================================
     #                         COMPOSITE-SNAPSHOT-CONTROLLER API METHODS
     # =============================================================================================
@@ -383,6 +1133,149 @@ class _SaveRestoreAPI_Base:
         body_json = snapshotItems
         return method, url, body_json
 
+    def _prepare_restore_items_staged(self, *, snapshotItems, plan, chunk_size, max_concurrency):
+        """
+        Split the snapshot items into the stages of the plan and the stages into chunks. Returns
+        the list of tuples ``(stage_name, chunks)`` and the initial result of the restore operation.
+        """
+        if not isinstance(plan, RestorePlan):
+            raise self.RequestParameterError(f"Invalid 'plan': {plan!r}. Must be an instance of RestorePlan.")
+        if not isinstance(chunk_size, int) or chunk_size < 1:
+            raise self.RequestParameterError(f"Invalid 'chunk_size': {chunk_size!r}. Must be a positive integer.")
+        if not isinstance(max_concurrency, int) or max_concurrency < 1:
+            raise self.RequestParameterError(
+                f"Invalid 'max_concurrency': {max_concurrency!r}. Must be a positive integer."
+            )
+        try:
+            stages, unmatched = plan.split(snapshotItems)
+        except ValueError as ex:
+            raise self.RequestParameterError(str(ex)) from ex
+        stages = [
+            (name, [items[n : n + chunk_size] for n in range(0, len(items), chunk_size)]) for name, items in stages
+        ]
+        result = {"not_restored": [], "stages": [], "skipped": list(unmatched), "errors": []}
+        return stages, result
+
+    def _process_restore_stage(self, *, result, name, chunks, chunk_results, duration):
+        """
+        Add the results of the stage to the result of the restore operation. The list ``chunk_results``
+        contains a tuple ``(response, request_duration)`` for each chunk, where the response is the list
+        of items that were not restored or an exception. The items of the stage are added to the list
+        of skipped items if ``chunk_results`` is None (the stage was not restored).
+        """
+        stage = {
+            "name": name,
+            "status": "completed",
+            "n_items": sum(len(_) for _ in chunks),
+            "n_chunks": len(chunks),
+            "n_not_restored": 0,
+            "duration": duration,
+            "max_request_duration": 0.0,
+        }
+        if chunk_results is None:
+            stage["status"] = "skipped"
+            for chunk in chunks:
+                result["skipped"].extend(chunk)
+        else:
+            for chunk, (response, request_duration) in zip(chunks, chunk_results):
+                stage["max_request_duration"] = max(stage["max_request_duration"], request_duration)
+                if isinstance(response, Exception):
+                    stage["status"] = "failed"
+                    result["errors"].append({"stage": name, "snapshotItems": chunk, "error": response})
+                else:
+                    stage["n_not_restored"] += len(response or [])
+                    result["not_restored"].extend(response or [])
+        result["stages"].append(stage)
+
+    def _prepare_restore_differences(self, *, node):
+        """
+        Returns the method used to load the snapshot items of the snapshot or composite snapshot node.
+        """
+        node_type = node.get("nodeType", None)
+        if node_type == "SNAPSHOT":
+            return "snapshot_get_items_stream"
+        if node_type == "COMPOSITE_SNAPSHOT":
+            return "composite_snapshot_get_items_stream"
+        raise self.RequestParameterError(
+            f"Node {node.get('uniqueId', None)!r} is not a snapshot or composite snapshot: node type {node_type!r}"
+        )
+
+    @staticmethod
+    def _restore_differences_pv_names(compare_results):
+        """
+        Returns the set of names of PVs with live values different from the stored values.
+        """
+        return {_["pvName"] for _ in compare_results if not _.get("equal", False)}
+
+    def _process_restore_differences(self, *, compare_results, pv_names, items, not_restored, dry_run):
+        """
+        Returns the result of ``restore_differences()``.
+        """
+        not_restored_names = {_["configPv"]["pvName"] for _ in not_restored or []}
+        found = {_["configPv"]["pvName"] for _ in items}
+        return {
+            "dry_run": dry_run,
+            "n_compared": len(compare_results),
+            "n_equal": len(compare_results) - len(pv_names),
+            "different": items,
+            "restored": [] if dry_run else [_ for _ in items if _["configPv"]["pvName"] not in not_restored_names],
+            "not_restored": list(not_restored or []),
+            "missing": sorted(pv_names - found),
+        }
+
+    def _prepare_restore_items_retry(self, *, snapshotItems, retry_policy, deadline):
+        """
+        Returns the retry policy, the time (``time.monotonic()``) after which the items are not
+        retried (or None), the list of items and the initial result of the restore operation.
+        """
+        retry_policy = RetryPolicy() if retry_policy is None else retry_policy
+        if not isinstance(retry_policy, RetryPolicy):
+            raise self.RequestParameterError(
+                f"Invalid 'retry_policy': {retry_policy!r}. Must be an instance of RetryPolicy or None."
+            )
+        if deadline is not None and (
+            isinstance(deadline, bool) or not isinstance(deadline, (int, float)) or deadline <= 0
+        ):
+            raise self.RequestParameterError(
+                f"Invalid 'deadline': {deadline!r}. Must be a positive number or None."
+            )
+        items = list(snapshotItems)
+        for item in items:
+            try:
+                item["configPv"]["pvName"]
+            except (KeyError, TypeError):
+                raise self.RequestParameterError(f"Invalid snapshot item: {item!r}. PV name is missing.") from None
+        deadline_time = time.monotonic() + deadline if deadline is not None else None
+        result = {"restored_first_try": [], "restored_on_retry": [], "failed": [], "attempts": 0, "errors": []}
+        return retry_policy, deadline_time, items, result
+
+    def _process_restore_items_retry(self, *, result, pending, response, retry_policy, deadline_time):
+        """
+        Process the response of the restore request (list of items that were NOT restored or an exception)
+        for the list of ``pending`` items. Returns the list of items that are still not restored and
+        the delay before the next attempt (None if the items should not be retried).
+        """
+        result["attempts"] += 1
+        attempt = result["attempts"]
+        if isinstance(response, Exception):
+            result["errors"].append({"attempt": attempt, "error": response})
+        else:
+            not_restored = {_["configPv"]["pvName"] for _ in response or []}
+            restored = [_ for _ in pending if _["configPv"]["pvName"] not in not_restored]
+            result["restored_first_try" if attempt == 1 else "restored_on_retry"].extend(restored)
+            pending = [_ for _ in pending if _["configPv"]["pvName"] in not_restored]
+
+        # The requests rejected by the server (e.g. authentication errors) are not retried
+        delay = None
+        if pending and attempt < retry_policy.max_attempts and not isinstance(response, HTTPClientError):
+            delay = retry_policy.get_delay(attempt=attempt)
+            if deadline_time is not None:
+                remaining = deadline_time - time.monotonic()
+                delay = min(delay, remaining) if remaining > 0 else None
+        if delay is None:
+            result["failed"] = pending
+        return pending, delay
+
     # =============================================================================================
     #                     COMPARISON-CONTROLLER API METHODS
     # =============================================================================================
@@ -400,6 +1293,17 @@ class _SaveRestoreAPI_Base:
             params = None
         return method, url, params
 
+    def _prepare_snapshots_diff(self, *, tolerance, compareMode):
+        if tolerance is not None and (
+            not isinstance(tolerance, (int, float)) or isinstance(tolerance, bool) or not (tolerance >= 0)
+        ):
+            raise self.RequestParameterError(f"Invalid 'tolerance': {tolerance!r}. Must be a non-negative number.")
+        compare_modes = ("ABSOLUTE", "RELATIVE")
+        if compareMode is not None and compareMode not in compare_modes:
+            raise self.RequestParameterError(
+                f"Invalid 'compareMode': {compareMode!r}. Supported modes: {compare_modes}."
+            )
+
     # =============================================================================================
     #                     FILTER-CONTROLLER API METHODS
     # =============================================================================================
@@ -1,9 +1,94 @@
+import contextlib
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
 import httpx
 
 from ._api_base import _SaveRestoreAPI_Base
+from ._snapshot_diff import SnapshotDiff
+from ._snapshot_table import SnapshotTable
 
 
 class SaveRestoreAPI(_SaveRestoreAPI_Base):
+    """
+    API for communication with Save-and-Restore service.
+
+    Parameters
+    ----------
+    base_url : str
+        Base URL of the Save-and-Restore service, e.g. ``http://localhost:8080/save-restore``.
+    timeout : float, optional
+        Default timeout for requests in seconds. Default: 5.0.
+    max_connections : int or None, optional
+        Maximum number of concurrent connections in the connection pool. Requests that
+        are sent when all connections are busy are waiting for a free connection.
+        Set to None to remove the limit. Default: 100.
+    max_keepalive_connections : int or None, optional
+        Maximum number of idle connections kept alive in the pool. Default: 20.
+    keepalive_expiry : float or None, optional
+        Time in seconds after which idle connections are closed. Default: 5.0.
+    http2 : bool, optional
+        Enable HTTP/2 support. Multiple concurrent requests are multiplexed over a single
+        connection if the server supports HTTP/2. HTTP/2 is negotiated only for ``https``
+        connections. Requires ``h2`` package (``pip install httpx[http2]``). Default: False.
+    transport : httpx.HTTPTransport or httpx.AsyncHTTPTransport, optional
+        Transport shared between multiple instances of the API class. The connection pool
+        of the transport is used by all the clients that share the transport. The parameters
+        ``max_connections``, ``max_keepalive_connections``, ``keepalive_expiry`` and ``http2``
+        are ignored. The transport is not closed by ``close()`` and must be closed by the
+        application. Use ``httpx.HTTPTransport`` with ``SaveRestoreAPI`` and
+        ``httpx.AsyncHTTPTransport`` with ``aio.SaveRestoreAPI``.
+    client : httpx.Client or httpx.AsyncClient, optional
+        Preconfigured HTTP client used instead of creating a new client. The client must
+        be configured with ``base_url`` of the service. The client is not closed by ``close()``
+        and must be closed by the application. Use ``httpx.Client`` with ``SaveRestoreAPI``
+        and ``httpx.AsyncClient`` with ``aio.SaveRestoreAPI``.
+    node_cache_size : int, optional
+        Maximum number of entries in the client-side node cache. The cache stores results of
+        ``node_get()``, ``node_get_children()``, ``node_get_parent()`` and ``structure_path_get()``
+        calls. The cache is disabled if the size is 0. See ``node_cache_info()``. Default: 0.
+    node_cache_ttl : float or None, optional
+        Lifetime of the node cache entries in seconds. The entries never expire if None.
+        Default: 60.0.
+    retry_policy : RetryPolicy or None, optional
+        Policy for retrying requests after transient errors (timeouts, connection errors,
+        selected HTTP status codes). By default, only GET requests are retried. See ``RetryPolicy``
+        and ``retry_info()``. Failed requests are not retried if None. Default: None.
+    request_hooks : list of callable or None, optional
+        Request hooks called with ``RequestEvent`` once each API request is completed. The event
+        contains the method, URL template, status code, transferred bytes and the durations of
+        the request phases. See ``request_hook_add()`` and ``RequestStatsCollector``. Default: None.
+    coalesce_requests : bool, optional
+        Coalesce identical concurrent GET requests (same URL, query parameters, body and headers):
+        the calls made while the identical request is in progress wait for the request and
+        receive its result (the same decoded object, which should not be modified by the
+        application) or exception. See ``coalesce_info()``. Default: False.
+    request_limits : RequestLimits, dict or None, optional
+        Limits of the number of concurrent requests and the rate of requests. The limits are applied
+        separately to the group of read (GET) requests and the group of write requests. The value may
+        be ``RequestLimits`` (the same limits for both groups) or a dictionary with the keys ``read``
+        and/or ``write`` and ``RequestLimits`` values. See ``RequestLimits`` and ``request_limits_info()``.
+        The requests are not limited if None. Default: None.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        import httpx
+        from save_and_restore_api import SaveRestoreAPI
+
+        # Larger connection pool for applications sending many concurrent requests
+        with SaveRestoreAPI(base_url="http://localhost:8080/save-restore", max_connections=200) as SR:
+            info = SR.info_get()
+
+        # Two instances sharing the same connection pool
+        transport = httpx.HTTPTransport(limits=httpx.Limits(max_connections=50))
+        SR1 = SaveRestoreAPI(base_url="http://localhost:8080/save-restore", transport=transport)
+        SR2 = SaveRestoreAPI(base_url="http://localhost:8080/save-restore", transport=transport)
+    """
+
     def open(self):
         """
         Open HTTP connection to the server. The function creates the HTTP client
@@ -35,14 +120,19 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
             await SR.close()
         """
         if self._client is None:
-            self._client = httpx.Client(base_url=self._base_url, timeout=self._timeout)
+            if self._shared_client is not None:
+                self._client = self._shared_client
+            else:
+                self._client = httpx.Client(**self._client_kwargs())
 
     def close(self):
         """
         Close HTTP connection to the server. The function closes the HTTP client.
+        Shared client or transport passed to the constructor are not closed.
         """
         if self._client is not None:
-            self._client.close()
+            if self._owns_client:
+                self._client.close()
             self._client = None
 
     def __enter__(self):
@@ -122,26 +212,159 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
         HTTPRequestError, HTTPClientError, HTTPServerError
             Error while processing the request or communicating with the server.
         """
+        key = self._coalesce_key(
+            method=method, url=url, params=params, body_json=body_json, headers=headers, data=data
+        )
+        kwargs = {
+            "body_json": body_json,
+            "params": params,
+            "headers": headers,
+            "data": data,
+            "timeout": timeout,
+            "auth": auth,
+        }
+        if key is None:
+            return self._send_request(method, url, **kwargs)
+
+        with self._coalesce_lock:
+            future = self._coalesce_inflight.get(key, None)
+            is_leader = future is None
+            if is_leader:
+                future = self._coalesce_inflight[key] = Future()
+            self._coalesce_counters["requests" if is_leader else "coalesced"] += 1
+
+        if is_leader:
+            try:
+                future.set_result(self._send_request(method, url, **kwargs))
+            except Exception as ex:
+                future.set_exception(ex)
+            finally:
+                if not future.done():
+                    future.cancel()  # Interrupted (e.g. KeyboardInterrupt): the waiting calls are cancelled
+                with self._coalesce_lock:
+                    del self._coalesce_inflight[key]
+        return future.result()
+
+    def _send_request(
+        self, method, url, *, body_json=None, params=None, headers=None, data=None, timeout=None, auth=None
+    ):
+        """
+        Send HTTP request to the server (see ``send_request()``). The request is not coalesced.
+        """
+        event = self._request_event_create(method=method, url=url)
         try:
-            client_response = None
-            kwargs = self._prepare_request(
-                method=method,
-                body_json=body_json,
-                params=params,
-                headers=headers,
-                data=data,
-                timeout=timeout,
-                auth=auth,
-            )
-            client_response = self._client.request(method, url, **kwargs)
-            response = self._process_response(client_response=client_response)
-        except Exception:
-            response = self._process_comm_exception(
-                method=method, body_json=body_json, client_response=client_response
-            )
-
+            attempt = 0
+            while True:
+                attempt += 1
+                phase, t = "prepare", time.perf_counter()
+                try:
+                    client_response = None
+                    kwargs = self._prepare_request(
+                        method=method,
+                        body_json=body_json,
+                        params=params,
+                        headers=headers,
+                        data=data,
+                        timeout=timeout,
+                        auth=auth,
+                    )
+                    phase, t = "limit_wait", self._request_event_phase(event, phase, t)
+                    with self._request_limit(method=method):
+                        phase, t = "network", self._request_event_phase(event, phase, t)
+                        client_response = self._client.request(method, url, **kwargs)
+                    phase, t = "decode", self._request_event_phase(event, phase, t)
+                    response = self._process_response(client_response=client_response)
+                    self._request_event_phase(event, phase, t)
+                except Exception as ex:
+                    t = self._request_event_phase(event, phase, t)
+                    self._request_event_attempt(event, attempt=attempt, client_response=client_response)
+                    delay = self._retry_delay(method=method, attempt=attempt, exception=ex)
+                    if delay is not None:
+                        time.sleep(delay)
+                        self._request_event_phase(event, "retry_wait", t)
+                        continue
+                    response = self._process_comm_exception(
+                        method=method, body_json=body_json, client_response=client_response
+                    )
+
+                self._request_event_attempt(event, attempt=attempt, client_response=client_response)
+                if attempt > 1:
+                    self._retry_count("recovered")
+                break
+        except Exception as ex:
+            self._request_event_emit(event, exception=ex)
+            raise
+        self._request_event_emit(event)
         return response
 
+    def _send_request_stream(self, method, url, *, key=None, params=None, timeout=None, auth=None):
+        """
+        Send HTTP request and yield elements of the JSON array from the response as they are
+        received. The response body is read and decoded incrementally, so the complete response
+        is never held in memory. The array is the top-level element of the response if ``key``
+        is None, or the ``response[key]`` array otherwise. The request limit (see ``RequestLimits``)
+        is released once the response headers are received, so the application may send other
+        requests while iterating over the items. The exceptions are the same as for ``send_request()``.
+        """
+        event = self._request_event_create(method=method, url=url)
+        try:
+            attempt = 0
+            while True:
+                attempt, n_items = attempt + 1, 0
+                phase, t = "prepare", time.perf_counter()
+                try:
+                    client_response = None
+                    kwargs = self._prepare_request(method=method, params=params, timeout=timeout, auth=auth)
+                    phase, t = "limit_wait", self._request_event_phase(event, phase, t)
+                    with contextlib.ExitStack() as request_limit:
+                        request_limit.enter_context(self._request_limit(method=method))
+                        phase, t = "network", self._request_event_phase(event, phase, t)
+                        with self._client.stream(method, url, **kwargs) as stream_response:
+                            client_response = stream_response
+                            if client_response.is_error:
+                                client_response.read()
+                            client_response.raise_for_status()
+                            # The limit is released before the items are passed to the application
+                            request_limit.close()
+                            parser = self._create_stream_parser(key=key)
+                            for chunk in client_response.iter_text():
+                                phase, t = "decode", self._request_event_phase(event, phase, t)
+                                items = parser.feed(chunk)
+                                phase, t = "network", self._request_event_phase(event, phase, t)
+                                for item in items:
+                                    n_items += 1
+                                    yield item
+                                # The time spent by the application processing the items is not included
+                                t = time.perf_counter()
+                            phase, t = "decode", self._request_event_phase(event, phase, t)
+                            items = parser.close()
+                            self._request_event_phase(event, phase, t)
+                            yield from items
+                except Exception as ex:
+                    t = self._request_event_phase(event, phase, t)
+                    self._request_event_attempt(event, attempt=attempt, client_response=client_response)
+                    # The request can not be retried once the items were passed to the application
+                    delay = None if n_items else self._retry_delay(method=method, attempt=attempt, exception=ex)
+                    if delay is not None:
+                        time.sleep(delay)
+                        self._request_event_phase(event, "retry_wait", t)
+                        continue
+                    self._process_comm_exception(method=method, body_json=None, client_response=client_response)
+
+                self._request_event_attempt(event, attempt=attempt, client_response=client_response)
+                if attempt > 1:
+                    self._retry_count("recovered")
+                break
+        except GeneratorExit:
+            # The application stopped reading the items
+            self._request_event_attempt(event, attempt=attempt, client_response=client_response)
+            self._request_event_emit(event)
+            raise
+        except Exception as ex:
+            self._request_event_emit(event, exception=ex)
+            raise
+        self._request_event_emit(event)
+
     # =============================================================================================
     #                         INFO-CONTROLLER API METHODS
     # =============================================================================================
@@ -292,8 +515,12 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
                 root_folder = await SR.node_get(root_folder_uid)
                 print(f"Root folder metadata: {root_folder}")
         """
-        method, url = self._prepare_node_get(uniqueNodeId=uniqueNodeId)
-        return self.send_request(method, url)
+        hit, response = self._node_cache_get("node", uniqueNodeId)
+        if not hit:
+            method, url = self._prepare_node_get(uniqueNodeId=uniqueNodeId)
+            response = self.send_request(method, url)
+            self._node_cache_put("node", uniqueNodeId, response)
+        return response
 
     def nodes_get(self, uniqueIds):
         """
@@ -315,6 +542,74 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
         method, url, body_json = self._prepare_nodes_get(uniqueIds=uniqueIds)
         return self.send_request(method, url, body_json=body_json)
 
+    def nodes_get_bulk(self, uniqueIds, *, chunk_size=100, max_concurrency=4):
+        """
+        Returns metadata for a large number of nodes specified by a list of UIDs. The list
+        is split into chunks of ``chunk_size`` UIDs and ``nodes_get()`` requests for the chunks
+        are sent concurrently. The requests are executed in a pool of threads (threaded version)
+        or as concurrent tasks (async version). The returned nodes are merged in the order of
+        ``uniqueIds``. Failure of a request for one chunk does not affect other chunks: the UIDs
+        of failed chunks are reported in the ``errors`` list.
+
+        API: GET /nodes (multiple requests)
+
+        Parameters
+        ----------
+        uniqueIds : list of str
+            List of node unique IDs.
+        chunk_size : int, optional
+            Maximum number of UIDs sent in a single request. Default: 100.
+        max_concurrency : int, optional
+            Maximum number of requests executed concurrently. Default: 4.
+
+        Returns
+        -------
+        dict
+            Dictionary with the following keys: ``nodes`` - list of node metadata for
+            successfully loaded chunks in the order of ``uniqueIds``, ``errors`` - list of
+            dictionaries for failed chunks, each containing ``uniqueIds`` (list of UIDs in
+            the chunk) and ``error`` (the exception raised by the request).
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            from save_and_restore_api import SaveRestoreAPI
+
+            with SaveRestoreAPI(base_url="http://localhost:8080/save-restore") as SR:
+                result = SR.nodes_get_bulk(uids, chunk_size=200, max_concurrency=8)
+                nodes = result["nodes"]
+                for err in result["errors"]:
+                    print(f"Failed to load {len(err['uniqueIds'])} nodes: {err['error']}")
+
+        Async version:
+
+        .. code-block:: python
+
+            from save_and_restore_api.aio import SaveRestoreAPI
+
+            async with SaveRestoreAPI(base_url="http://localhost:8080/save-restore") as SR:
+                result = await SR.nodes_get_bulk(uids, chunk_size=200, max_concurrency=8)
+        """
+        uniqueIds, chunks = self._prepare_nodes_get_bulk(
+            uniqueIds=uniqueIds, chunk_size=chunk_size, max_concurrency=max_concurrency
+        )
+
+        def load_chunk(chunk):
+            try:
+                return self.nodes_get(chunk)
+            except self._request_exceptions as ex:
+                return ex
+
+        if len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=min(max_concurrency, len(chunks))) as executor:
+                chunk_results = list(executor.map(load_chunk, chunks))
+        else:
+            chunk_results = [load_chunk(_) for _ in chunks]
+
+        return self._process_nodes_get_bulk(uniqueIds=uniqueIds, chunks=chunks, chunk_results=chunk_results)
+
     def node_add(self, parentNodeId, *, node, auth=None, **kwargs):
         """
         Creates a new node under the specified parent node.
@@ -364,7 +659,12 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
                 print(f"Created folder metadata: {folder}")
         """
         method, url, params, body_json = self._prepare_node_add(parentNodeId=parentNodeId, node=node)
-        return self.send_request(method, url, params=params, body_json=body_json, auth=auth)
+        try:
+            response = self.send_request(method, url, params=params, body_json=body_json, auth=auth)
+        finally:
+            self._node_cache_invalidate([parentNodeId])
+        self._tree_index_add(parentNodeId, response)
+        return response
 
     def node_delete(self, nodeId, *, auth=None):
         """
@@ -385,7 +685,12 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
         None
         """
         method, url = self._prepare_node_delete(nodeId=nodeId)
-        return self.send_request(method, url, auth=auth)
+        try:
+            response = self.send_request(method, url, auth=auth)
+        finally:
+            self._node_cache_invalidate([nodeId], recursive=True, paths=True)
+        self._tree_index_remove([nodeId])
+        return response
 
     def nodes_delete(self, uniqueIds, *, auth=None):
         """
@@ -407,7 +712,12 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
         None
         """
         method, url, body_json = self._prepare_nodes_delete(uniqueIds=uniqueIds)
-        return self.send_request(method, url, body_json=body_json, auth=auth)
+        try:
+            response = self.send_request(method, url, body_json=body_json, auth=auth)
+        finally:
+            self._node_cache_invalidate(uniqueIds, recursive=True, paths=True)
+        self._tree_index_remove(uniqueIds)
+        return response
 
     def node_get_children(self, uniqueNodeId):
         """
@@ -426,8 +736,12 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
             List of child node nodes. The list elements are dictionaries containing
             the node metadata as returned by the server.
         """
-        method, url = self._prepare_node_get_children(uniqueNodeId=uniqueNodeId)
-        return self.send_request(method, url)
+        hit, response = self._node_cache_get("children", uniqueNodeId)
+        if not hit:
+            method, url = self._prepare_node_get_children(uniqueNodeId=uniqueNodeId)
+            response = self.send_request(method, url)
+            self._node_cache_put("children", uniqueNodeId, response)
+        return response
 
     def node_get_parent(self, uniqueNodeId):
         """
@@ -445,8 +759,370 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
         dict
             Parent node metadata as returned by the server.
         """
-        method, url = self._prepare_node_get_parent(uniqueNodeId=uniqueNodeId)
-        return self.send_request(method, url)
+        hit, response = self._node_cache_get("parent", uniqueNodeId)
+        if not hit:
+            method, url = self._prepare_node_get_parent(uniqueNodeId=uniqueNodeId)
+            response = self.send_request(method, url)
+            self._node_cache_put("parent", uniqueNodeId, response)
+        return response
+
+    def walk(self, uniqueNodeId, *, max_depth=None, node_types=None, descend_node_types=None, max_concurrency=8):
+        """
+        Walk the subtree of the node with specified UID and yield all the descendant nodes
+        (the node itself is not included). The subtree is traversed breadth-first. The lists
+        of children are loaded using ``node_get_children()``: up to ``max_concurrency`` requests
+        are executed concurrently (in a pool of threads in the threaded version or as
+        concurrent tasks in the async version). The nodes are yielded as soon as the
+        lists of children are received, so the order of nodes at the same depth is
+        not guaranteed.
+
+        API: GET /node/{uniqueNodeId}/children (multiple requests)
+
+        Parameters
+        ----------
+        uniqueNodeId : str
+            Unique ID of the root node of the subtree.
+        max_depth : int or None, optional
+            Maximum depth of the traversed nodes. Children of the root node are at depth 1.
+            If None, then the whole subtree is traversed. Default: None.
+        node_types : str, list[str] or None, optional
+            Yield only the nodes of the specified types (e.g. ``["FOLDER", "CONFIGURATION"]``).
+            The subtree is still traversed through the nodes of other types. If None, then
+            the nodes of all types are yielded. Default: None.
+        descend_node_types : str, list[str] or None, optional
+            Load the children only of the nodes of the specified types, e.g. ``"FOLDER"`` skips
+            the snapshots of the configurations. If None, then the children of all the folders
+            and configurations are loaded. Default: None.
+        max_concurrency : int, optional
+            Maximum number of concurrently executed requests. Default: 8.
+
+        Yields
+        ------
+        tuple(str, dict)
+            UID of the parent node and the node metadata as returned by the server.
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            from save_and_restore_api import SaveRestoreAPI
+
+            with SaveRestoreAPI(base_url="http://localhost:8080/save-restore") as SR:
+                for parent_uid, node in SR.walk(SR.ROOT_NODE_UID, node_types="CONFIGURATION"):
+                    print(f"Configuration: {node['name']} ({node['uniqueId']})")
+
+        Async version:
+
+        .. code-block:: python
+
+            from save_and_restore_api.aio import SaveRestoreAPI
+
+            async with SaveRestoreAPI(base_url="http://localhost:8080/save-restore") as SR:
+                async for parent_uid, node in SR.walk(SR.ROOT_NODE_UID, node_types="CONFIGURATION"):
+                    print(f"Configuration: {node['name']} ({node['uniqueId']})")
+        """
+        node_types, descend_node_types = self._prepare_walk(
+            max_depth=max_depth,
+            node_types=node_types,
+            max_concurrency=max_concurrency,
+            descend_node_types=descend_node_types,
+        )
+
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            pending = {executor.submit(self.node_get_children, uniqueNodeId): (uniqueNodeId, 1)}
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        parent_uid, depth = pending.pop(future)
+                        for node in future.result():
+                            if self._walk_descend(
+                                node=node, depth=depth, max_depth=max_depth, descend_node_types=descend_node_types
+                            ):
+                                node_uid = node["uniqueId"]
+                                pending[executor.submit(self.node_get_children, node_uid)] = (node_uid, depth + 1)
+                            if node_types is None or node["nodeType"] in node_types:
+                                yield parent_uid, node
+            finally:
+                # The generator may be closed before the subtree is fully traversed
+                for future in pending:
+                    future.cancel()
+
+    def tree_index_load(self, uniqueNodeId=None, *, folders_only=False, max_concurrency=8):
+        """
+        Load the local index of the subtree of nodes (see ``tree_index`` property). The subtree
+        is loaded using ``walk()``. Once the index is loaded, ``structure_path_nodes()`` finds
+        nodes inside the subtree without sending requests to the server. Repeated calls replace
+        the existing index. Use ``tree_index_clear()`` to unload the index.
+
+        Loading snapshots of all configurations may take many requests. If ``folders_only`` is True,
+        then only the children of the folders (folders and configurations) are indexed. The paths
+        of the children of the configurations are not covered by such index and are still looked
+        up on the server.
+
+        API: GET /node/{uniqueNodeId}/children (multiple requests), GET /path/{uniqueNodeId}
+
+        Parameters
+        ----------
+        uniqueNodeId : str or None, optional
+            Unique ID of the root node of the indexed subtree. If None, then the whole tree
+            is indexed (``ROOT_NODE_UID``). Default: None.
+        folders_only : bool, optional
+            Index only the children of the folders, the children of the configurations are
+            not loaded. Default: False.
+        max_concurrency : int, optional
+            Maximum number of concurrently executed requests. Default: 8.
+
+        Returns
+        -------
+        NodeTreeIndex
+            Loaded index.
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            from save_and_restore_api import SaveRestoreAPI
+
+            with SaveRestoreAPI(base_url="http://localhost:8080/save-restore") as SR:
+                SR.tree_index_load()
+                nodes = SR.structure_path_nodes("/detectors/imaging/eiger_config")
+
+        Async version:
+
+        .. code-block:: python
+
+            from save_and_restore_api.aio import SaveRestoreAPI
+
+            async with SaveRestoreAPI(base_url="http://localhost:8080/save-restore") as SR:
+                await SR.tree_index_load()
+                nodes = await SR.structure_path_nodes("/detectors/imaging/eiger_config")
+        """
+        uniqueNodeId, descend_node_types = self._prepare_tree_index_load(
+            uniqueNodeId=uniqueNodeId, folders_only=folders_only, max_concurrency=max_concurrency
+        )
+        root_path = None if uniqueNodeId == self.ROOT_NODE_UID else self.structure_path_get(uniqueNodeId)
+        index = self._tree_index_create(root_uid=uniqueNodeId, root_path=root_path, folders_only=folders_only)
+        for parent_uid, node in self.walk(
+            uniqueNodeId, descend_node_types=descend_node_types, max_concurrency=max_concurrency
+        ):
+            index.add(parent_uid, node)
+        self._tree_index = index
+        return index
+
+    def tree_replicate(
+        self, source, uniqueNodeId, *, parentNodeId=None, uid_map=None, max_concurrency=8, auth=None
+    ):
+        """
+        Replicate the subtree of the node ``uniqueNodeId`` from another server (``source``)
+        to this server. The node and its descendants are created under the node ``parentNodeId``
+        (if ``uniqueNodeId`` is the root node, then only its descendants are replicated). Folders,
+        configurations, snapshots and composite snapshots are copied using ``node_get_children()``,
+        ``config_get()``, ``snapshot_get()``, ``composite_snapshot_get()`` and the respective
+        ``*_add()`` calls. The transfer is pipelined: the children of each node are loaded and
+        copied as soon as the node is created, up to ``max_concurrency`` nodes are copied
+        concurrently. Composite snapshots are copied after all other nodes, since they reference
+        snapshots by UID (the references are replaced with the UIDs of the replicated snapshots).
+        Failure to copy a node does not stop the replication: the failed nodes are reported
+        in the ``errors`` list and the subtrees of the failed nodes are skipped.
+
+        Re-runs are incremental if the UID map file (``uid_map``) is specified. The file maps
+        the UIDs of the source nodes to the UIDs of the replicated nodes and saves the
+        ``lastModifiedDate`` of the source nodes. The nodes found in the map are copied again
+        (using ``*_update()`` calls) only if ``lastModifiedDate`` changed. Nodes deleted or
+        moved on the source server are not deleted or moved on this server, changes of folder
+        metadata are not replicated.
+
+        API: GET /node/{uniqueNodeId}, GET /node/{uniqueNodeId}/children, GET /config/{uniqueNodeId},
+        GET /snapshot/{uniqueId}, GET /composite-snapshot/{uniqueId} (source server),
+        PUT /node, PUT /config, PUT /snapshot, PUT /composite-snapshot, POST /config,
+        POST /snapshot, POST /composite-snapshot (this server, multiple requests)
+
+        Parameters
+        ----------
+        source : SaveRestoreAPI
+            Opened API object for the source server. The object must be of the same type
+            (threaded or async) as this object.
+        uniqueNodeId : str
+            Unique ID of the root node of the replicated subtree on the source server.
+        parentNodeId : str or None, optional
+            Unique ID of the parent node of the replicated subtree on this server. If None,
+            then the subtree is replicated to the root node. Default: None.
+        uid_map : str or None, optional
+            Name of the UID map file. The file is created if it does not exist. Default: None.
+        max_concurrency : int, optional
+            Maximum number of nodes copied concurrently. Default: 8.
+        auth : httpx.BasicAuth, optional
+            Object with authentication data (generated using ``auth_gen`` method). If not
+            specified or None, then the authentication set using ``auth_set`` method is used.
+
+        Returns
+        -------
+        dict
+            Dictionary with the following keys: ``added``, ``updated`` and ``unchanged`` -
+            the lists of UIDs of the source nodes that were added, updated or not modified,
+            ``errors`` - the list of dictionaries for failed nodes, each containing ``uniqueId``
+            (UID of the source node) and ``error`` (the raised exception), ``uid_map`` -
+            the dictionary that maps UIDs of the source nodes to UIDs of the replicated nodes.
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            from save_and_restore_api import SaveRestoreAPI
+
+            with SaveRestoreAPI(base_url=src_url) as SR_src, SaveRestoreAPI(base_url=dst_url) as SR_dst:
+                SR_dst.auth_set(username="user", password="userPass")
+                result = SR_dst.tree_replicate(SR_src, folder_uid, uid_map="replication.jsonl")
+                print(f"Added: {len(result['added'])}, updated: {len(result['updated'])}")
+                for err in result["errors"]:
+                    print(f"Failed to replicate the node {err['uniqueId']!r}: {err['error']}")
+
+        Async version:
+
+        .. code-block:: python
+
+            from save_and_restore_api.aio import SaveRestoreAPI
+
+            async with SaveRestoreAPI(base_url=src_url) as SR_src, SaveRestoreAPI(base_url=dst_url) as SR_dst:
+                result = await SR_dst.tree_replicate(SR_src, folder_uid, uid_map="replication.jsonl")
+        """
+        parentNodeId, uid_map, result = self._prepare_tree_replicate(
+            source=source,
+            uniqueNodeId=uniqueNodeId,
+            parentNodeId=parentNodeId,
+            uid_map=uid_map,
+            max_concurrency=max_concurrency,
+        )
+
+        def replicate_node(node, dst_parent_uid, data=None):
+            action, dst_uid = self._tree_replicate_action(node=node, uid_map=uid_map)
+            try:
+                if action != "skip":
+                    dst_uid = self._tree_replicate_copy(
+                        source,
+                        node,
+                        dst_parent_uid=dst_parent_uid,
+                        dst_uid=dst_uid,
+                        data=data,
+                        uids=result["uid_map"],
+                        auth=auth,
+                    )
+            except (*self._request_exceptions, RuntimeError) as ex:
+                return action, None, ex, []
+            try:
+                children = []
+                if node["nodeType"] in self._WALK_CONTAINER_NODE_TYPES:
+                    children = source.node_get_children(node["uniqueId"])
+                return action, dst_uid, None, children
+            except self._request_exceptions as ex:
+                return action, dst_uid, ex, []
+
+        def load_composite(node, dst_parent_uid):
+            try:
+                return node, dst_parent_uid, source.composite_snapshot_get(node["uniqueId"]), None
+            except self._request_exceptions as ex:
+                return node, dst_parent_uid, None, ex
+
+        try:
+            if uniqueNodeId == source.ROOT_NODE_UID:
+                nodes = [(_, parentNodeId) for _ in source.node_get_children(uniqueNodeId)]
+            else:
+                nodes = [(source.node_get(uniqueNodeId), parentNodeId)]
+
+            with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+                pending, composites = {}, []
+
+                def submit(nodes):
+                    for node, dst_parent_uid in nodes:
+                        action, _ = self._tree_replicate_action(node=node, uid_map=uid_map)
+                        if node["nodeType"] == "COMPOSITE_SNAPSHOT" and action != "skip":
+                            composites.append((node, dst_parent_uid))
+                        else:
+                            pending[executor.submit(replicate_node, node, dst_parent_uid)] = node
+
+                submit(nodes)
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        node = pending.pop(future)
+                        action, dst_uid, error, children = future.result()
+                        self._tree_replicate_process(
+                            result=result, uid_map=uid_map, node=node, action=action, dst_uid=dst_uid, error=error
+                        )
+                        submit([(_, dst_uid) for _ in children])
+
+                # Composite snapshots are copied once all the referenced snapshots are copied
+                waiting = []
+                for node, dst_parent_uid, data, error in executor.map(lambda _: load_composite(*_), composites):
+                    if error is None:
+                        waiting.append((node, dst_parent_uid, data))
+                    else:
+                        self._tree_replicate_process(
+                            result=result, uid_map=uid_map, node=node, action="add", dst_uid=None, error=error
+                        )
+                while waiting:
+                    ready, waiting = self._tree_replicate_ready(waiting, result["uid_map"])
+                    if not ready:
+                        # The remaining composite snapshots fail with the error
+                        ready, waiting = waiting, []
+                    futures = {executor.submit(replicate_node, *_): _[0] for _ in ready}
+                    for future, node in futures.items():
+                        action, dst_uid, error, _ = future.result()
+                        self._tree_replicate_process(
+                            result=result, uid_map=uid_map, node=node, action=action, dst_uid=dst_uid, error=error
+                        )
+        finally:
+            if uid_map is not None:
+                uid_map.close()
+
+        return result
+
+    def _tree_replicate_copy(self, source, node, *, dst_parent_uid, dst_uid, data, uids, auth):
+        """
+        Copy the node from the source server. The node is added if ``dst_uid`` is None, otherwise
+        the node ``dst_uid`` is updated. The data of composite snapshots is passed as ``data``.
+        Returns UID of the node on this server.
+        """
+        node_type, src_uid = node["nodeType"], node["uniqueId"]
+        new_node = self._tree_replicate_node(node=node, dst_uid=dst_uid)
+        if node_type == "FOLDER":
+            return self.node_add(dst_parent_uid, node=new_node, auth=auth)["uniqueId"]
+        elif node_type == "CONFIGURATION":
+            data = self._tree_replicate_data(
+                node=node, data=source.config_get(src_uid), dst_uid=dst_uid, uid_map=uids
+            )
+            if dst_uid is None:
+                response = self.config_add(
+                    dst_parent_uid, configurationNode=new_node, configurationData=data, auth=auth
+                )
+            else:
+                response = self.config_update(configurationNode=new_node, configurationData=data, auth=auth)
+            return response["configurationNode"]["uniqueId"]
+        elif node_type == "SNAPSHOT":
+            data = self._tree_replicate_data(
+                node=node, data=source.snapshot_get(src_uid), dst_uid=dst_uid, uid_map=uids
+            )
+            if dst_uid is None:
+                response = self.snapshot_add(dst_parent_uid, snapshotNode=new_node, snapshotData=data, auth=auth)
+            else:
+                response = self.snapshot_update(snapshotNode=new_node, snapshotData=data, auth=auth)
+            return response["snapshotNode"]["uniqueId"]
+        elif node_type == "COMPOSITE_SNAPSHOT":
+            data = self._tree_replicate_data(node=node, data=data, dst_uid=dst_uid, uid_map=uids)
+            if dst_uid is None:
+                response = self.composite_snapshot_add(
+                    dst_parent_uid, compositeSnapshotNode=new_node, compositeSnapshotData=data, auth=auth
+                )
+            else:
+                response = self.composite_snapshot_update(
+                    compositeSnapshotNode=new_node, compositeSnapshotData=data, auth=auth
+                )
+            return response["compositeSnapshotNode"]["uniqueId"]
+        raise RuntimeError(f"Unsupported node type: {node_type!r}")
 
     # =============================================================================================
     #                         CONFIGURATION-CONTROLLER API METHODS
@@ -511,7 +1187,12 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
         method, url, body_json = self._prepare_config_add(
             parentNodeId=parentNodeId, configurationNode=configurationNode, configurationData=configurationData
         )
-        return self.send_request(method, url, body_json=body_json, auth=auth)
+        try:
+            response = self.send_request(method, url, body_json=body_json, auth=auth)
+        finally:
+            self._node_cache_invalidate([parentNodeId])
+        self._tree_index_add(parentNodeId, response, key="configurationNode")
+        return response
 
     def config_update(self, *, configurationNode, configurationData, auth=None):
         """
@@ -544,7 +1225,12 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
         method, url, body_json = self._prepare_config_update(
             configurationNode=configurationNode, configurationData=configurationData
         )
-        return self.send_request(method, url, body_json=body_json, auth=auth)
+        try:
+            response = self.send_request(method, url, body_json=body_json, auth=auth)
+        finally:
+            self._node_cache_invalidate([configurationNode.get("uniqueId", None)], paths=True)
+        self._tree_index_update(response, key="configurationNode")
+        return response
 
     # =============================================================================================
     #                         TAG-CONTROLLER API METHODS
@@ -588,7 +1274,12 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
             List of node metadata for the nodes to which the tag was added.
         """
         method, url, body_json = self._prepare_tags_add(uniqueNodeIds=uniqueNodeIds, tag=tag)
-        return self.send_request(method, url, body_json=body_json, auth=auth)
+        try:
+            response = self.send_request(method, url, body_json=body_json, auth=auth)
+        finally:
+            self._node_cache_invalidate(uniqueNodeIds)
+        self._tree_index_update(response)
+        return response
 
     def tags_delete(self, *, uniqueNodeIds, tag, auth=None):
         """
@@ -614,7 +1305,12 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
             List of node metadata for the nodes from ``uniqueNodeIds`` list.
         """
         method, url, body_json = self._prepare_tags_delete(uniqueNodeIds=uniqueNodeIds, tag=tag)
-        return self.send_request(method, url, body_json=body_json, auth=auth)
+        try:
+            response = self.send_request(method, url, body_json=body_json, auth=auth)
+        finally:
+            self._node_cache_invalidate(uniqueNodeIds)
+        self._tree_index_update(response)
+        return response
 
     # =============================================================================================
     #                         TAKE-SNAPSHOT-CONTROLLER API METHODS
@@ -673,7 +1369,12 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
         method, url, params = self._prepare_take_snapshot_save(
             uniqueNodeId=uniqueNodeId, name=name, comment=comment
         )
-        return self.send_request(method, url, params=params, auth=auth)
+        try:
+            response = self.send_request(method, url, params=params, auth=auth)
+        finally:
+            self._node_cache_invalidate([uniqueNodeId])
+        self._tree_index_add(uniqueNodeId, response, key="snapshotNode")
+        return response
 
     # =============================================================================================
     #                         SNAPSHOT-CONTROLLER API METHODS
@@ -726,7 +1427,12 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
         method, url, params, body_json = self._prepare_snapshot_add(
             parentNodeId=parentNodeId, snapshotNode=snapshotNode, snapshotData=snapshotData
         )
-        return self.send_request(method, url, body_json=body_json, params=params, auth=auth)
+        try:
+            response = self.send_request(method, url, body_json=body_json, params=params, auth=auth)
+        finally:
+            self._node_cache_invalidate([parentNodeId])
+        self._tree_index_add(parentNodeId, response, key="snapshotNode")
+        return response
 
     def snapshot_update(self, *, snapshotNode, snapshotData, auth=None):
         """
@@ -756,7 +1462,12 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
         method, url, body_json = self._prepare_snapshot_update(
             snapshotNode=snapshotNode, snapshotData=snapshotData
         )
-        return self.send_request(method, url, body_json=body_json, auth=auth)
+        try:
+            response = self.send_request(method, url, body_json=body_json, auth=auth)
+        finally:
+            self._node_cache_invalidate([snapshotNode.get("uniqueId", None)], paths=True)
+        self._tree_index_update(response, key="snapshotNode")
+        return response
 
     def snapshots_get(self):
         """
@@ -773,6 +1484,342 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
         method, url = self._prepare_snapshots_get()
         return self.send_request(method, url)
 
+    def snapshot_get_items_stream(self, uniqueId):
+        """
+        Iterate over the snapshot items (``snapshotData["snapshotItems"]``) of the snapshot
+        specified by ``uniqueId``. This is the streaming version of ``snapshot_get()``: the
+        response is decoded incrementally and the items are yielded as soon as they are
+        received, which reduces memory consumption for large snapshots. The application
+        may stop the iteration at any time, the remaining data is not downloaded. The request
+        limits are not held while the items are iterated, so other API methods may be called
+        inside the loop.
+
+        API: GET /snapshot/{uniqueId}
+
+        Parameters
+        ----------
+        uniqueId : str
+            Unique ID of the snapshot node.
+
+        Yields
+        ------
+        dict
+            Snapshot item (PV data) as returned by the server.
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            from save_and_restore_api import SaveRestoreAPI
+
+            with SaveRestoreAPI(base_url="http://localhost:8080/save-restore") as SR:
+                for item in SR.snapshot_get_items_stream(snapshot_uid):
+                    print(f"{item['configPv']['pvName']}: {item['value']}")
+
+        Async version:
+
+        .. code-block:: python
+
+            from save_and_restore_api.aio import SaveRestoreAPI
+
+            async with SaveRestoreAPI(base_url="http://localhost:8080/save-restore") as SR:
+                async for item in SR.snapshot_get_items_stream(snapshot_uid):
+                    print(f"{item['configPv']['pvName']}: {item['value']}")
+        """
+        method, url = self._prepare_snapshot_get(uniqueId=uniqueId)
+        yield from self._send_request_stream(method, url, key="snapshotItems")
+
+    def snapshots_get_stream(self):
+        """
+        Iterate over all existing snapshots (``snapshotNode`` objects). This is the streaming
+        version of ``snapshots_get()``: the nodes are yielded as soon as they are received.
+        The request limits are not held while the nodes are iterated.
+
+        API: GET /snapshots
+
+        Yields
+        ------
+        dict
+            Snapshot node (``snapshotNode``) as returned by the server.
+        """
+        method, url = self._prepare_snapshots_get()
+        yield from self._send_request_stream(method, url)
+
+    def snapshots_export(
+        self, file_name, *, uniqueIds=None, folderId=None, tag=None, file_format=None, chunk_size=10000
+    ):
+        """
+        Export snapshots to a columnar file (Parquet, Arrow or HDF5) for offline analysis.
+        The snapshots are selected by UIDs (``uniqueIds``), by the folder or configuration
+        node that contains the snapshots (``folderId``, the subtree is traversed using ``walk()``)
+        or by tag (``tag``, the snapshots are found using ``search()``). Exactly one of
+        the parameters must be specified. The snapshot items are downloaded using
+        ``snapshot_get_items_stream()`` and written by ``SnapshotExportWriter`` in chunks,
+        so the memory consumption does not depend on the number and the size of the snapshots.
+        See ``SnapshotExportWriter`` for the description of the columns. Writing Parquet
+        and Arrow files requires ``pyarrow``, writing HDF5 files requires ``h5py``.
+
+        API: GET /nodes, GET /node/{uniqueNodeId}/children or GET /search,
+        GET /snapshot/{uniqueId} (multiple requests)
+
+        Parameters
+        ----------
+        file_name : str
+            Name of the created file. The existing file is overwritten.
+        uniqueIds : str, list[str] or None, optional
+            UID or the list of UIDs of the exported snapshots.
+        folderId : str or None, optional
+            UID of the folder or configuration node. All snapshots in the subtree are exported.
+        tag : str or None, optional
+            Name of the tag. All snapshots with the tag are exported.
+        file_format : str or None, optional
+            File format: ``"parquet"``, ``"arrow"`` or ``"hdf5"``. If None, then the format
+            is selected based on the file extension. Default: None.
+        chunk_size : int, optional
+            Number of rows (snapshot items) written at once. Default: 10000.
+
+        Returns
+        -------
+        dict
+            Dictionary with the following keys: ``snapshots`` - the list of exported snapshot
+            nodes, ``items`` - the total number of exported snapshot items.
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            from save_and_restore_api import SaveRestoreAPI
+
+            with SaveRestoreAPI(base_url="http://localhost:8080/save-restore") as SR:
+                SR.snapshots_export("golden.parquet", tag="golden")
+                SR.snapshots_export("eiger.h5", folderId=config_uid)
+
+        Async version:
+
+        .. code-block:: python
+
+            from save_and_restore_api.aio import SaveRestoreAPI
+
+            async with SaveRestoreAPI(base_url="http://localhost:8080/save-restore") as SR:
+                await SR.snapshots_export("golden.parquet", tag="golden")
+        """
+        from ._snapshot_export import SnapshotExportWriter
+
+        uniqueIds = self._prepare_snapshots_export(
+            file_name=file_name,
+            uniqueIds=uniqueIds,
+            folderId=folderId,
+            tag=tag,
+            file_format=file_format,
+            chunk_size=chunk_size,
+        )
+
+        if uniqueIds is not None:
+            nodes = self.nodes_get(uniqueIds) if uniqueIds else []
+        elif folderId is not None:
+            nodes = [node for _, node in self.walk(folderId, node_types="SNAPSHOT")]
+        else:
+            nodes = []
+            while True:
+                response = self.search(self._snapshots_export_search_params(tag=tag, start=len(nodes)))
+                page = response.get("nodes", None) or []
+                nodes.extend(page)
+                if not page or len(nodes) >= response.get("hitCount", 0):
+                    break
+            nodes = [_ for _ in nodes if _.get("nodeType", None) == "SNAPSHOT"]
+
+        with SnapshotExportWriter(file_name, file_format=file_format, chunk_size=chunk_size) as writer:
+            for node in nodes:
+                snapshot_uid, snapshot_name = node["uniqueId"], node.get("name", None)
+                for item in self.snapshot_get_items_stream(snapshot_uid):
+                    writer.append(item, snapshot_uid=snapshot_uid, snapshot_name=snapshot_name)
+            return {"snapshots": nodes, "items": writer.n_items}
+
+    def snapshots_import_bulk(
+        self, snapshots, *, checkpoint=None, create_nodes=True, max_concurrency=4, auth=None
+    ):
+        """
+        Import a stream of snapshots, e.g. loaded from files or from another server. Each snapshot
+        is added to the configuration node specified by the full path (``configName``). The missing
+        folders and configurations are created once (the configuration is created with the list
+        of PVs of the first snapshot) and their UIDs are reused for all the snapshots. Up to
+        ``max_concurrency`` snapshots are uploaded concurrently. The snapshots are consumed
+        from the stream (iterable or generator) as they are uploaded, so the stream is never
+        loaded into memory. Failure to import one snapshot does not affect other snapshots:
+        the failed snapshots are reported in the ``errors`` list.
+
+        The import can be resumed if ``checkpoint`` is specified: the key of each imported
+        snapshot is appended to the checkpoint file and the snapshots with keys found in
+        the file are skipped if the import is restarted with the same stream.
+
+        API: GET /path, PUT /node, PUT /config, PUT /snapshot (multiple requests)
+
+        Parameters
+        ----------
+        snapshots : iterable of dict
+            Stream of snapshots. Each snapshot is a dictionary with the keys ``configName``
+            (full path of the configuration node, e.g. ``/folder/config``), ``snapshotNode``
+            (only ``name`` and ``description`` are used) and ``snapshotData`` (only
+            ``snapshotItems`` are used). The optional key ``key`` identifies the snapshot
+            in the checkpoint file. Default key: ``<configName>/<snapshot name>``. The async
+            version also accepts async iterables.
+        checkpoint : str or None, optional
+            Name of the checkpoint file. The file is created if it does not exist.
+            Default: None.
+        create_nodes : bool, optional
+            Create the missing folders and configurations if True. Otherwise the snapshots
+            are added only to the existing configurations. Default: True.
+        max_concurrency : int, optional
+            Maximum number of snapshots uploaded concurrently. Default: 4.
+        auth : httpx.BasicAuth, optional
+            Object with authentication data (generated using ``auth_gen`` method). If not
+            specified or None, then the authentication set using ``auth_set`` method is used.
+
+        Returns
+        -------
+        dict
+            Dictionary with the following keys: ``snapshots`` - the list of created snapshot
+            nodes, ``skipped`` - the list of keys of the snapshots found in the checkpoint
+            file, ``errors`` - the list of dictionaries for failed snapshots, each containing
+            ``key`` (None if the snapshot is invalid) and ``error`` (the raised exception).
+
+        Examples
+        --------
+
+        Import snapshots from a file with one snapshot (JSON object) per line:
+
+        .. code-block:: python
+
+            import json
+            from save_and_restore_api import SaveRestoreAPI
+
+            def load_snapshots(file_name):
+                with open(file_name) as f:
+                    for line in f:
+                        yield json.loads(line)
+
+            with SaveRestoreAPI(base_url="http://localhost:8080/save-restore") as SR:
+                SR.auth_set(username="user", password="userPass")
+                result = SR.snapshots_import_bulk(
+                    load_snapshots("snapshots.jsonl"), checkpoint="snapshots.checkpoint"
+                )
+                for err in result["errors"]:
+                    print(f"Failed to import the snapshot {err['key']!r}: {err['error']}")
+
+        Copy snapshots from another server:
+
+        .. code-block:: python
+
+            from save_and_restore_api import SaveRestoreAPI
+
+            def load_snapshots(SR, folder_uid):
+                for _, node in SR.walk(folder_uid, node_types="SNAPSHOT"):
+                    path = SR.structure_path_get(SR.node_get_parent(node["uniqueId"])["uniqueId"])
+                    yield {
+                        "configName": path,
+                        "snapshotNode": node,
+                        "snapshotData": SR.snapshot_get(node["uniqueId"]),
+                    }
+
+            with SaveRestoreAPI(base_url=src_url) as SR_src, SaveRestoreAPI(base_url=dst_url) as SR_dst:
+                SR_dst.auth_set(username="user", password="userPass")
+                SR_dst.snapshots_import_bulk(load_snapshots(SR_src, folder_uid), max_concurrency=8)
+
+        Async version:
+
+        .. code-block:: python
+
+            from save_and_restore_api.aio import SaveRestoreAPI
+
+            async with SaveRestoreAPI(base_url="http://localhost:8080/save-restore") as SR:
+                result = await SR.snapshots_import_bulk(snapshots, checkpoint="snapshots.checkpoint")
+        """
+        checkpoint = self._prepare_snapshots_import_bulk(checkpoint=checkpoint, max_concurrency=max_concurrency)
+        result = {"snapshots": [], "skipped": [], "errors": []}
+        node_uids, lock = {}, threading.Lock()
+
+        def import_snapshot(key, config_name, snapshot_node, snapshot_data):
+            try:
+                config_uid = node_uids.get(("CONFIGURATION", config_name), None)
+                if config_uid is None:
+                    # Folders and configurations are created only once
+                    with lock:
+                        config_uid = self._snapshots_import_config(
+                            config_name,
+                            snapshot_data=snapshot_data,
+                            node_uids=node_uids,
+                            create_nodes=create_nodes,
+                            auth=auth,
+                        )
+                response = self.snapshot_add(
+                    config_uid, snapshotNode=snapshot_node, snapshotData=snapshot_data, auth=auth
+                )
+                return key, response, None
+            except (*self._request_exceptions, self.RequestParameterError, RuntimeError) as ex:
+                return key, None, ex
+
+        def process_completed(futures):
+            for fut in futures:
+                key, response, error = fut.result()
+                self._snapshots_import_process(
+                    result=result, checkpoint=checkpoint, key=key, response=response, error=error
+                )
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+                pending = set()
+                for snapshot in snapshots:
+                    entry = self._snapshots_import_entry(snapshot=snapshot, result=result, checkpoint=checkpoint)
+                    if entry is None:
+                        continue
+                    if len(pending) >= max_concurrency:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        process_completed(done)
+                    pending.add(executor.submit(import_snapshot, *entry))
+                done, pending = wait(pending)
+                process_completed(done)
+        finally:
+            if checkpoint is not None:
+                checkpoint.close()
+
+        return result
+
+    def _snapshots_import_config(self, config_name, *, snapshot_data, node_uids, create_nodes, auth):
+        """
+        Returns UID of the configuration node ``config_name``. Missing folders and configuration
+        are created if ``create_nodes`` is True. The UIDs of the nodes are saved in ``node_uids``.
+        """
+        folders, name = self._snapshots_import_path(config_name)
+        parent_uid, path = self.ROOT_NODE_UID, ""
+        for node_type, node_name in [("FOLDER", _) for _ in folders] + [("CONFIGURATION", name)]:
+            path += f"/{node_name}"
+            key = (node_type, path)
+            if key not in node_uids:
+                try:
+                    nodes = self.structure_path_nodes(path)
+                except self.HTTPClientError:
+                    nodes = []
+                uids = [_["uniqueId"] for _ in nodes if _["nodeType"] == node_type]
+                if uids:
+                    node_uids[key] = uids[0]
+                elif not create_nodes:
+                    raise RuntimeError(f"{node_type.capitalize()} node {path!r} does not exist")
+                elif node_type == "FOLDER":
+                    node = {"name": node_name, "nodeType": "FOLDER"}
+                    node_uids[key] = self.node_add(parent_uid, node=node, auth=auth)["uniqueId"]
+                else:
+                    response = self.config_add(
+                        parent_uid,
+                        configurationNode={"name": node_name},
+                        configurationData={"pvList": self._snapshots_import_pv_list(snapshot_data)},
+                        auth=auth,
+                    )
+                    node_uids[key] = response["configurationNode"]["uniqueId"]
+            parent_uid = node_uids[key]
+        return parent_uid
+
     # =============================================================================================
     #                         COMPOSITE-SNAPSHOT-CONTROLLER API METHODS
     # =============================================================================================
@@ -840,6 +1887,28 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
         method, url = self._prepare_composite_snapshot_get_items(uniqueId=uniqueId)
         return self.send_request(method, url)
 
+    def composite_snapshot_get_items_stream(self, uniqueId):
+        """
+        Iterate over the restorable items (PV data) referenced by the composite snapshot
+        specified by ``uniqueId``. This is the streaming version of ``composite_snapshot_get_items()``:
+        the items are yielded as soon as they are received.
+
+        API: GET /composite-snapshot/{uniqueId}/items
+
+        Parameters
+        ----------
+        uniqueId : str
+            Unique ID of the composite snapshot node.
+
+        Yields
+        ------
+        dict
+            Snapshot item (PV). The format is consistent with the format of
+            ``snapshotData["snapshotItems"]``.
+        """
+        method, url = self._prepare_composite_snapshot_get_items(uniqueId=uniqueId)
+        yield from self._send_request_stream(method, url)
+
     def composite_snapshot_add(self, parentNodeId, *, compositeSnapshotNode, compositeSnapshotData, auth=None):
         """
         Create a new composite snapshot node. The new node is created under the existing configuration node
@@ -872,7 +1941,12 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
             compositeSnapshotNode=compositeSnapshotNode,
             compositeSnapshotData=compositeSnapshotData,
         )
-        return self.send_request(method, url, params=params, body_json=body_json, auth=auth)
+        try:
+            response = self.send_request(method, url, params=params, body_json=body_json, auth=auth)
+        finally:
+            self._node_cache_invalidate([parentNodeId])
+        self._tree_index_add(parentNodeId, response, key="compositeSnapshotNode")
+        return response
 
     def composite_snapshot_update(self, *, compositeSnapshotNode, compositeSnapshotData, auth=None):
         """
@@ -903,7 +1977,12 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
             compositeSnapshotNode=compositeSnapshotNode,
             compositeSnapshotData=compositeSnapshotData,
         )
-        return self.send_request(method, url, body_json=body_json, auth=auth)
+        try:
+            response = self.send_request(method, url, body_json=body_json, auth=auth)
+        finally:
+            self._node_cache_invalidate([compositeSnapshotNode.get("uniqueId", None)], paths=True)
+        self._tree_index_update(response, key="compositeSnapshotNode")
+        return response
 
     def composite_snapshot_consistency_check(self, uniqueNodeIds, *, auth=None):
         """
@@ -988,6 +2067,274 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
         method, url, body_json = self._prepare_restore_items(snapshotItems=snapshotItems)
         return self.send_request(method, url, body_json=body_json, auth=auth)
 
+    def restore_differences(
+        self, nodeId, *, tolerance=None, compareMode=None, skipReadback=None, dry_run=False, auth=None
+    ):
+        """
+        Restore only the PVs with live values that differ from the values stored in the snapshot
+        or composite snapshot. The stored values are compared with the live values using ``compare()``,
+        the snapshot items of the PVs that are not equal are loaded using ``snapshot_get_items_stream()``
+        or ``composite_snapshot_get_items_stream()`` and restored using ``restore_items()``. If most
+        of the PVs are already equal to the stored values, then the restore operation writes much
+        fewer PVs than ``restore_node()``. If ``dry_run`` is True, then the items are not restored:
+        the returned result contains the items that would be restored.
+
+        API: GET /node/{nodeId}, GET /compare/{nodeId}, GET /snapshot/{nodeId} or
+        GET /composite-snapshot/{nodeId}/items, POST /restore/items
+
+        Parameters
+        ----------
+        nodeId : str
+            Unique ID of the snapshot or composite snapshot node.
+        tolerance : float, optional
+            Tolerance for numerical comparisons. See ``compare()``.
+        compareMode : str, optional
+            Comparison mode: ``"ABSOLUTE"`` or ``"RELATIVE"``. See ``compare()``.
+        skipReadback : bool, optional
+            Use ``pvName`` live values for PVs with ``readbackPvName``. See ``compare()``.
+        dry_run : bool, optional
+            Compute the PVs that should be restored, but do not restore them. Default: False.
+        auth : httpx.BasicAuth, optional
+            Object with authentication data (generated using ``auth_gen()`` method).
+
+        Returns
+        -------
+        dict
+            Dictionary with the following keys: ``dry_run`` - the value of ``dry_run`` parameter,
+            ``n_compared`` - number of compared PVs, ``n_equal`` - number of PVs equal to the stored
+            values, ``different`` - list of snapshot items of the PVs that are not equal (restored or
+            to be restored), ``restored`` - list of restored items, ``not_restored`` - list of items
+            that were NOT restored (returned by the server), ``missing`` - list of names of PVs that
+            are not equal, but are not found in the snapshot items (not restored).
+
+        Raises
+        ------
+        RequestParameterError
+            The node is not a snapshot or composite snapshot.
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            from save_and_restore_api import SaveRestoreAPI
+
+            with SaveRestoreAPI(base_url="http://localhost:8080/save-restore") as SR:
+                SR.auth_set(username="user", password="userPass")
+                result = SR.restore_differences(snapshot_uid, tolerance=0.01, dry_run=True)
+                print(f"{len(result['different'])} of {result['n_compared']} PVs will be restored")
+                result = SR.restore_differences(snapshot_uid, tolerance=0.01)
+
+        Async version:
+
+        .. code-block:: python
+
+            from save_and_restore_api.aio import SaveRestoreAPI
+
+            async with SaveRestoreAPI(base_url="http://localhost:8080/save-restore") as SR:
+                result = await SR.restore_differences(snapshot_uid, tolerance=0.01, auth=auth)
+        """
+        items_stream = getattr(self, self._prepare_restore_differences(node=self.node_get(nodeId)))
+        compare_results = self.compare(
+            nodeId, tolerance=tolerance, compareMode=compareMode, skipReadback=skipReadback
+        )
+        pv_names = self._restore_differences_pv_names(compare_results)
+        items = [_ for _ in items_stream(nodeId) if _["configPv"]["pvName"] in pv_names] if pv_names else []
+        not_restored = None
+        if items and not dry_run:
+            not_restored = self.restore_items(snapshotItems=items, auth=auth)
+        return self._process_restore_differences(
+            compare_results=compare_results,
+            pv_names=pv_names,
+            items=items,
+            not_restored=not_restored,
+            dry_run=dry_run,
+        )
+
+    def restore_items_retry(self, snapshotItems, *, retry_policy=None, deadline=None, auth=None):
+        """
+        Restore snapshot items and retry restoring the items that were NOT restored. The items
+        returned by the server as not restored are sent again using ``restore_items()`` (the items
+        that were restored are not sent again) until all the items are restored, the maximum number
+        of attempts is reached or the deadline expires. The delays between the attempts are defined
+        by the retry policy (``max_attempts``, ``backoff_factor``, ``backoff_max`` and ``jitter``
+        parameters of ``RetryPolicy``). The failed requests are also retried, except the requests
+        rejected by the server with 4xx status codes (e.g. authentication errors).
+
+        API: POST /restore/items (for each attempt)
+
+        Parameters
+        ----------
+        snapshotItems : iterable of dict
+            Snapshot items (PVs) to be restored. The format is consistent with the format of
+            ``snapshotData["snapshotItems"]``.
+        retry_policy : RetryPolicy or None, optional
+            Maximum number of attempts and the delays between the attempts. If None, then
+            ``RetryPolicy()`` with the default parameters is used (3 attempts). Default: None.
+        deadline : float or None, optional
+            Time in seconds after which the items are not retried. The number of attempts is
+            limited only by the retry policy if None. Default: None.
+        auth : httpx.BasicAuth, optional
+            Object with authentication data (generated using ``auth_gen()`` method).
+
+        Returns
+        -------
+        dict
+            Dictionary with the following keys: ``restored_first_try`` - list of items restored
+            by the first attempt, ``restored_on_retry`` - list of items restored by the following
+            attempts, ``failed`` - list of items that were not restored, ``attempts`` - number of sent
+            requests, ``errors`` - list of failed requests (dictionaries with the keys ``attempt``
+            and ``error``).
+
+        Raises
+        ------
+        RequestParameterError
+            Invalid parameter value or type.
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            from save_and_restore_api import RetryPolicy, SaveRestoreAPI
+
+            with SaveRestoreAPI(base_url="http://localhost:8080/save-restore") as SR:
+                SR.auth_set(username="user", password="userPass")
+                items = SR.snapshot_get(snapshot_uid)["snapshotItems"]
+                policy = RetryPolicy(max_attempts=5, backoff_factor=1.0)
+                result = SR.restore_items_retry(items, retry_policy=policy, deadline=30)
+                print(f"Failed PVs: {[_['configPv']['pvName'] for _ in result['failed']]}")
+
+        Async version:
+
+        .. code-block:: python
+
+            from save_and_restore_api.aio import SaveRestoreAPI
+
+            async with SaveRestoreAPI(base_url="http://localhost:8080/save-restore") as SR:
+                result = await SR.restore_items_retry(items, retry_policy=policy, deadline=30, auth=auth)
+        """
+        retry_policy, deadline_time, pending, result = self._prepare_restore_items_retry(
+            snapshotItems=snapshotItems, retry_policy=retry_policy, deadline=deadline
+        )
+        while pending:
+            try:
+                response = self.restore_items(snapshotItems=pending, auth=auth)
+            except self._request_exceptions as ex:
+                response = ex
+            pending, delay = self._process_restore_items_retry(
+                result=result,
+                pending=pending,
+                response=response,
+                retry_policy=retry_policy,
+                deadline_time=deadline_time,
+            )
+            if delay is None:
+                break
+            time.sleep(delay)
+        return result
+
+    def restore_items_staged(
+        self, snapshotItems, plan, *, chunk_size=1000, max_concurrency=4, stop_on_error=True, auth=None
+    ):
+        """
+        Restore snapshot items in ordered stages defined by the restore plan (``RestorePlan``),
+        e.g. restore the power supplies before the magnets. The stages are restored one after
+        another. The items of each stage are split into chunks of ``chunk_size`` items, which
+        are restored using up to ``max_concurrency`` concurrent ``restore_items()`` requests.
+        The next stage is started once all the requests of the stage are completed. If a request
+        fails, then the remaining stages are not restored unless ``stop_on_error`` is False.
+
+        API: POST /restore/items (for each chunk)
+
+        Parameters
+        ----------
+        snapshotItems : iterable of dict
+            Snapshot items (PVs) to be restored. The format is consistent with the format of
+            ``snapshotData["snapshotItems"]``.
+        plan : RestorePlan
+            Restore plan, which assigns the items to the stages.
+        chunk_size : int, optional
+            Maximum number of items restored by a single request. Default: 1000.
+        max_concurrency : int, optional
+            Maximum number of concurrent requests. Default: 4.
+        stop_on_error : bool, optional
+            Skip the remaining stages if a request of the stage fails. Default: True.
+        auth : httpx.BasicAuth, optional
+            Object with authentication data (generated using ``auth_gen()`` method).
+
+        Returns
+        -------
+        dict
+            Dictionary with the following keys: ``not_restored`` - merged lists of the items that
+            were NOT restored (returned by the server), ``stages`` - list of results of the stages
+            in the order of restoring, ``skipped`` - list of items that were not sent to the server
+            (the items of the skipped stages and the items that match none of the stages),
+            ``errors`` - list of failed requests. The result of each stage is a dictionary with
+            the keys ``name``, ``status`` (``completed``, ``failed`` or ``skipped``), ``n_items``,
+            ``n_chunks``, ``n_not_restored``, ``duration`` (duration of the stage in seconds) and
+            ``max_request_duration`` (maximum duration of the requests of the stage in seconds).
+            Each error is a dictionary with the keys ``stage``, ``snapshotItems`` (the items sent
+            with the failed request) and ``error`` (exception).
+
+        Raises
+        ------
+        RequestParameterError
+            Invalid parameter value or type.
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            from save_and_restore_api import RestorePlan, SaveRestoreAPI
+
+            plan = RestorePlan({"power-supplies": "*:PS:*", "magnets": ["QUAD:*", "BEND:*"]})
+            with SaveRestoreAPI(base_url="http://localhost:8080/save-restore") as SR:
+                SR.auth_set(username="user", password="userPass")
+                items = SR.snapshot_get(snapshot_uid)["snapshotItems"]
+                result = SR.restore_items_staged(items, plan, max_concurrency=8)
+                print(f"Not restored: {[_['configPv']['pvName'] for _ in result['not_restored']]}")
+
+        Async version:
+
+        .. code-block:: python
+
+            from save_and_restore_api.aio import SaveRestoreAPI
+
+            async with SaveRestoreAPI(base_url="http://localhost:8080/save-restore") as SR:
+                result = await SR.restore_items_staged(items, plan, max_concurrency=8, auth=auth)
+        """
+        stages, result = self._prepare_restore_items_staged(
+            snapshotItems=snapshotItems, plan=plan, chunk_size=chunk_size, max_concurrency=max_concurrency
+        )
+
+        def restore_chunk(chunk):
+            t = time.perf_counter()
+            try:
+                response = self.restore_items(snapshotItems=chunk, auth=auth)
+            except self._request_exceptions as ex:
+                response = ex
+            return response, time.perf_counter() - t
+
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            for name, chunks in stages:
+                if stop_on_error and result["errors"]:
+                    self._process_restore_stage(
+                        result=result, name=name, chunks=chunks, chunk_results=None, duration=0.0
+                    )
+                    continue
+                t = time.perf_counter()
+                chunk_results = list(executor.map(restore_chunk, chunks))
+                self._process_restore_stage(
+                    result=result,
+                    name=name,
+                    chunks=chunks,
+                    chunk_results=chunk_results,
+                    duration=time.perf_counter() - t,
+                )
+        return result
+
     # =============================================================================================
     #                     COMPARISON-CONTROLLER API METHODS
     # =============================================================================================
@@ -1024,6 +2371,51 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
         )
         return self.send_request(method, url, params=params)
 
+    def snapshots_diff(self, snapshot1, snapshot2, *, tolerance=None, compareMode=None):
+        """
+        Compare two snapshots on the client side. The snapshots may be specified by UIDs of
+        snapshot nodes or passed as loaded data (``SnapshotTable``, ``snapshotData`` or the list
+        of snapshot items). The snapshots specified by UIDs are loaded using
+        ``snapshot_get_items_stream()``. The items are aligned by PV names and the values are
+        compared using the same rules as ``compare()``. See ``SnapshotDiff`` for details.
+
+        API: GET /snapshot/{uniqueId} (for each snapshot specified by UID)
+
+        Parameters
+        ----------
+        snapshot1, snapshot2 : str, SnapshotTable, dict or list[dict]
+            UIDs of the snapshot nodes or loaded snapshots. The first snapshot is used as
+            a reference for the relative comparisons.
+        tolerance : float, optional
+            Tolerance for numerical comparisons. If not specified or None, the default is 0.
+        compareMode : str, optional
+            Comparison mode. Supported values: ``"ABSOLUTE"``, ``"RELATIVE"``. If not specified
+            or None, the default is ``"ABSOLUTE"``.
+
+        Returns
+        -------
+        SnapshotDiff
+            Results of the comparison.
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            from save_and_restore_api import SaveRestoreAPI
+
+            with SaveRestoreAPI(base_url="http://localhost:8080/save-restore") as SR:
+                diff = SR.snapshots_diff(snapshot_uid_1, snapshot_uid_2, tolerance=0.01, compareMode="RELATIVE")
+                for result in diff.to_list(only_different=True):
+                    print(f"{result['pvName']}: {result['value1']} != {result['value2']}")
+        """
+        self._prepare_snapshots_diff(tolerance=tolerance, compareMode=compareMode)
+        snapshots = [
+            SnapshotTable.from_items(self.snapshot_get_items_stream(_)) if isinstance(_, str) else _
+            for _ in (snapshot1, snapshot2)
+        ]
+        return SnapshotDiff(*snapshots, tolerance=tolerance, compareMode=compareMode)
+
     # =============================================================================================
     #                     FILTER-CONTROLLER API METHODS
     # =============================================================================================
@@ -1111,7 +2503,12 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
         method, url, body_json, params = self._prepare_structure_move(
             nodeIds=nodeIds, newParentNodeId=newParentNodeId
         )
-        return self.send_request(method, url, body_json=body_json, params=params, auth=auth)
+        try:
+            response = self.send_request(method, url, body_json=body_json, params=params, auth=auth)
+        finally:
+            self._node_cache_invalidate([*nodeIds, newParentNodeId], paths=True)
+        self._tree_index_move(nodeIds, newParentNodeId)
+        return response
 
     def structure_copy(self, nodeIds, *, newParentNodeId, auth=None):
         """
@@ -1137,7 +2534,12 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
         method, url, body_json, params = self._prepare_structure_copy(
             nodeIds=nodeIds, newParentNodeId=newParentNodeId
         )
-        return self.send_request(method, url, body_json=body_json, params=params, auth=auth)
+        try:
+            response = self.send_request(method, url, body_json=body_json, params=params, auth=auth)
+        finally:
+            self._node_cache_invalidate([newParentNodeId])
+        self.tree_index_clear()
+        return response
 
     def structure_path_get(self, uniqueNodeId):
         """
@@ -1156,8 +2558,12 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
         str
             Path of the node with names of nodes separated by '/' character.
         """
-        method, url = self._prepare_structure_path_get(uniqueNodeId=uniqueNodeId)
-        return self.send_request(method, url)
+        hit, response = self._node_cache_get("path", uniqueNodeId)
+        if not hit:
+            method, url = self._prepare_structure_path_get(uniqueNodeId=uniqueNodeId)
+            response = self.send_request(method, url)
+            self._node_cache_put("path", uniqueNodeId, response)
+        return response
 
     def structure_path_nodes(self, path):
         """
@@ -1178,5 +2584,8 @@ class SaveRestoreAPI(_SaveRestoreAPI_Base):
             List of nodes that match the specified path. Each node is represented as a dictionary
             with node metadata as returned by the server.
         """
-        method, url, params = self._prepare_structure_path_nodes(path=path)
-        return self.send_request(method, url, params=params)
+        response = self._tree_index_path_nodes(path)
+        if response is None:
+            method, url, params = self._prepare_structure_path_nodes(path=path)
+            response = self.send_request(method, url, params=params)
+        return response
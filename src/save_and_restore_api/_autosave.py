@@ -0,0 +1,293 @@
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+# Elements of arrays saved by autosave: quoted strings with backslash escapes, e.g. "1.5" or "a \"b\""
+_ARRAY_ELEMENT = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+_ARRAY_PATTERN = re.compile(r"\s*\{\s*((?:" + _ARRAY_ELEMENT + r"\s*)*)\}\s*$")
+_ARRAY_ELEMENTS_PATTERN = re.compile(r'"([^"\\]*(?:\\.[^"\\]*)*)"')
+_ESCAPE_PATTERN = re.compile(r"\\(.)")
+
+_ARRAY_MARKER = "@array@"
+_END_MARKER = "<END>"
+
+# PV names are the first fields of the lines. The lines starting with '#', '!' and '<' are comments
+#   and markers. The lines starting with '"' or '}' are continuations of multi-line arrays.
+#   The names are searched after the newline character: the patterns that start with
+#   a literal character are searched much faster than the patterns that start with '^'.
+_PV_NAME_FIELD = rb'[ \t]*([^\s#!<"}][^ \t\r\n]*)'
+_PV_NAME_PATTERN = re.compile(_PV_NAME_FIELD)
+_PV_NAMES_PATTERN = re.compile(b"\n" + _PV_NAME_FIELD)
+
+# The file is scanned in windows (parts) of this size, so that only the names found in one
+#   window are held in memory as bytes.
+_SCAN_WINDOW_SIZE = 16 * 2**20
+
+# Minimum size of the part of the file scanned by a separate process. Files smaller than
+#   two parts are scanned in the current process.
+_PARALLEL_SCAN_CHUNK_SIZE = 32 * 2**20
+
+
+class AutosaveFormatError(ValueError):
+    """
+    Raised if the autosave file can not be parsed or the file is incomplete
+    (the ``<END>`` marker is missing).
+    """
+
+    def __init__(self, msg, *, source=None, line_number=None):
+        location = [str(_) for _ in (source, f"line {line_number}" if line_number else None) if _]
+        super().__init__(f"{msg} ({', '.join(location)})" if location else msg)
+        self.source = source
+        self.line_number = line_number
+
+
+def _unquote(text):
+    """
+    Remove the quotes and process backslash escapes in the quoted string.
+    """
+    text = text[1:-1]
+    return _ESCAPE_PATTERN.sub(r"\1", text) if "\\" in text else text
+
+
+def _array_elements(text):
+    """
+    Returns the list of unquoted elements of the array (``text`` is the contents of ``{ ... }``).
+    """
+    elements = _ARRAY_ELEMENTS_PATTERN.findall(text)
+    if "\\" in text:
+        elements = [_ESCAPE_PATTERN.sub(r"\1", _) for _ in elements]
+    return elements
+
+
+def autosave_parse_lines(lines, *, check_end=True, source=None):
+    """
+    Parse the contents of an autosave (``.sav``) file passed as an iterable of lines and
+    yield ``(pvName, value)`` tuples. The lines are processed one by one, so the iterable may
+    be a file object or any other source that produces the lines on demand. See
+    ``autosave_read_file()`` for the description of the format and the returned values.
+
+    Parameters
+    ----------
+    lines : iterable of str
+        Lines of the autosave file.
+    check_end : bool, optional
+        Raise ``AutosaveFormatError`` if the ``<END>`` marker is not the last entry. Default: True.
+    source : str or None, optional
+        Name of the source (e.g. file name) included in the error messages.
+
+    Yields
+    ------
+    tuple(str, str or list(str))
+        PV name and the saved value.
+
+    Raises
+    ------
+    AutosaveFormatError
+        Invalid format of the array or the file is incomplete.
+    """
+    ended, array_start, array_name, array_text = False, None, None, None
+    for line_number, line in enumerate(lines, 1):
+        if array_text is not None:
+            # Continuation of the array value that spans multiple lines
+            array_text += line
+            match = _ARRAY_PATTERN.match(array_text) if "}" in line else None
+            if match:
+                yield array_name, _array_elements(match.group(1))
+                array_text = None
+            continue
+
+        line = line.strip()
+        if not line or line[0] in "#!":
+            # Comments, commented (disconnected) PVs and the lines with the number of errors
+            continue
+        if line[0] == "<":
+            if line == _END_MARKER:
+                ended = True
+            continue
+
+        ended = False
+        pv_name, _, value = line.partition(" ")
+        if not _:
+            pv_name, _, value = line.partition("\t")
+        value = value.strip()
+
+        if value.startswith(_ARRAY_MARKER):
+            array_text = value[len(_ARRAY_MARKER) :]
+            match = _ARRAY_PATTERN.match(array_text)
+            if match:
+                yield pv_name, _array_elements(match.group(1))
+                array_text = None
+            else:
+                array_start, array_name = line_number, pv_name
+        elif len(value) > 1 and value[0] == '"' and value[-1] == '"':
+            yield pv_name, _unquote(value)
+        else:
+            yield pv_name, value
+
+    if array_text is not None:
+        raise AutosaveFormatError(
+            f"Invalid or incomplete array value of PV {array_name!r}", source=source, line_number=array_start
+        )
+    if check_end and not ended:
+        raise AutosaveFormatError(f"The file is incomplete: {_END_MARKER} marker is missing", source=source)
+
+
+def autosave_read_file(file_name, *, check_end=True):
+    """
+    Read the autosave (``.sav``) file and yield ``(pvName, value)`` tuples. The file is read
+    line by line, so large files are never fully loaded into memory. The values of scalar PVs
+    are returned as strings (e.g. ``"1.5"``). Surrounding quotes are removed from quoted values.
+    The values of array PVs (``PV:name @array@ { "1" "2" "3" }``) are returned as lists
+    of strings. The arrays may span multiple lines. Comments (``#``), commented PVs and
+    the lines with error counts (``!``) are skipped. The ``<END>`` marker is written by
+    autosave once the file is completely saved. The marker is expected to be the last
+    entry of the file, otherwise the file is considered incomplete.
+
+    Parameters
+    ----------
+    file_name : str
+        Name of the autosave file.
+    check_end : bool, optional
+        Raise ``AutosaveFormatError`` if the ``<END>`` marker is not the last entry. Default: True.
+
+    Yields
+    ------
+    tuple(str, str or list(str))
+        PV name and the saved value.
+
+    Raises
+    ------
+    AutosaveFormatError
+        Invalid format of the array or the file is incomplete.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        from save_and_restore_api import autosave_read_file
+
+        for pv_name, value in autosave_read_file("auto_settings.sav"):
+            print(f"{pv_name} = {value!r}")
+    """
+    with open(file_name, encoding="utf-8", errors="replace") as f:
+        yield from autosave_parse_lines(f, check_end=check_end, source=file_name)
+
+
+def _scan_pv_names(buffer, start, end):
+    """
+    Returns the list of PV names (bytes) found in the range ``[start, end)`` of the buffer.
+    The range must start at the beginning of a line.
+    """
+    names = []
+    if start == 0:
+        match = _PV_NAME_PATTERN.match(buffer, 0, end)
+        if match:
+            names.append(match.group(1))
+    names.extend(_PV_NAMES_PATTERN.findall(buffer, max(start - 1, 0), end))
+    return names
+
+
+def _scan_pv_names_file(file_name, start, end):
+    """
+    Scan the range of bytes ``[start, end)`` of the memory-mapped file. The function is executed
+    in a separate process. Returns the PV names joined with newlines.
+    """
+    with open(file_name, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        return b"\n".join(_scan_pv_names(buffer, start, end))
+
+
+def _split_at_lines(buffer, n_chunks):
+    """
+    Split the buffer into ``n_chunks`` ranges of approximately equal size at newline boundaries.
+    """
+    size, bounds = len(buffer), [0]
+    for n in range(1, n_chunks):
+        pos = buffer.find(b"\n", max(size * n // n_chunks, bounds[-1]))
+        if pos < 0:
+            break
+        bounds.append(pos + 1)
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds[:-1], bounds[1:]) if end > start]
+
+
+def _has_end_marker(buffer):
+    """
+    Check if ``<END>`` is the last non-empty line of the buffer.
+    """
+    end = len(buffer)
+    while end and buffer[end - 1] in b" \t\r\n":
+        end -= 1
+    start = buffer.rfind(b"\n", 0, end) + 1
+    return buffer[start:end].strip() == _END_MARKER.encode()
+
+
+def autosave_read_pv_names(file_name, *, check_end=True, max_workers=None):
+    """
+    Read PV names from the autosave (``.sav``) file. The function is optimized for very large
+    files (e.g. combined autosave dumps): the file is memory-mapped and scanned as bytes,
+    and only PV names are decoded. The values are not parsed, use ``autosave_read_file()``
+    to read the values. Files larger than 64 MB are split at line boundaries and scanned
+    in parallel by multiple processes.
+
+    Parameters
+    ----------
+    file_name : str
+        Name of the autosave file.
+    check_end : bool, optional
+        Raise ``AutosaveFormatError`` if the ``<END>`` marker is not the last entry. Default: True.
+    max_workers : int or None, optional
+        Maximum number of processes used to scan large files. The number of CPUs is used if None.
+        The file is scanned in the current process if ``max_workers`` is 1. Default: None.
+
+    Returns
+    -------
+    list(str)
+        List of PV names in the order of the file.
+
+    Raises
+    ------
+    AutosaveFormatError
+        The file is incomplete.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        from save_and_restore_api import autosave_read_pv_names
+
+        pv_names = autosave_read_pv_names("combined_dump.sav")
+    """
+    if max_workers is not None and (not isinstance(max_workers, int) or max_workers < 1):
+        raise ValueError(f"Invalid 'max_workers': {max_workers!r}. Must be a positive integer.")
+    max_workers = max_workers or os.cpu_count() or 1
+
+    with open(file_name, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        # Empty files can not be memory-mapped
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        try:
+            if check_end and not _has_end_marker(buffer):
+                raise AutosaveFormatError(
+                    f"The file is incomplete: {_END_MARKER} marker is missing", source=file_name
+                )
+            n_chunks = min(max_workers, size // _PARALLEL_SCAN_CHUNK_SIZE)
+            pv_names = []
+            if n_chunks < 2:
+                for start, end in _split_at_lines(buffer, size // _SCAN_WINDOW_SIZE + 1):
+                    pv_names += [_.decode("utf-8", "replace") for _ in _scan_pv_names(buffer, start, end)]
+            else:
+                chunks = _split_at_lines(buffer, n_chunks)
+                with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+                    futures = [executor.submit(_scan_pv_names_file, file_name, *_) for _ in chunks]
+                    for future in futures:
+                        names = future.result()
+                        if names:
+                            pv_names += names.decode("utf-8", "replace").split("\n")
+        finally:
+            if size:
+                buffer.close()
+
+    return pv_names
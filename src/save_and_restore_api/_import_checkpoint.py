@@ -0,0 +1,68 @@
+import json
+import os
+
+
+class _ImportCheckpoint:
+    """
+    Checkpoint file of the bulk import and the UID map of the tree replication. The file
+    contains one JSON object per line with the key and the UID of each imported snapshot
+    or replicated node (``{"key": ..., "uniqueId": ..., ...}``) and optional additional
+    fields. The lines are appended and flushed as soon as the nodes are created, so the file
+    is consistent if the process is terminated. If the key is recorded multiple times, then
+    the last record is used. The incomplete last line (e.g. if the process crashed while
+    writing the line) is ignored when the file is loaded.
+
+    Parameters
+    ----------
+    file_name : str
+        Name of the checkpoint file. The file is created if it does not exist.
+    """
+
+    def __init__(self, file_name):
+        self._file_name = file_name
+        self._records, text = {}, ""
+        if os.path.isfile(file_name):
+            with open(file_name, encoding="utf-8") as f:
+                text = f.read()
+            for line in text.splitlines():
+                try:
+                    record = json.loads(line)
+                    if record["uniqueId"] is not None:
+                        self._records[record["key"]] = record
+                except (ValueError, KeyError, TypeError):
+                    continue
+        self._file = open(file_name, "a", encoding="utf-8")  # noqa: SIM115
+        if text and not text.endswith("\n"):
+            # Terminate the incomplete line, so that it does not corrupt the next record
+            self._file.write("\n")
+
+    def __contains__(self, key):
+        return key in self._records
+
+    def __len__(self):
+        return len(self._records)
+
+    def get(self, key, default=None):
+        """
+        Returns the last record (dictionary) saved for the key.
+        """
+        return self._records.get(key, default)
+
+    def items(self):
+        """
+        Returns the iterator over the keys and the UIDs of the recorded nodes.
+        """
+        return ((k, v["uniqueId"]) for k, v in self._records.items())
+
+    def record(self, key, uniqueId, **kwargs):
+        """
+        Save the key and the UID of the imported snapshot or the replicated node. The additional
+        fields (e.g. ``lastModifiedDate``) are passed as keyword arguments.
+        """
+        record = {"key": key, "uniqueId": uniqueId, **kwargs}
+        self._records[key] = record
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
@@ -0,0 +1,284 @@
+import logging
+import math
+import re
+import threading
+from urllib.parse import unquote, urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Templates of the URLs that contain parameters. The URLs that do not match the templates
+#   (e.g. '/nodes' or '/snapshot') are used as is.
+_URL_TEMPLATES = [
+    (re.compile(pattern), template)
+    for pattern, template in (
+        (r"^/help/[^/]+$", "/help/{what}"),
+        (r"^/node/[^/]+/children$", "/node/{uniqueNodeId}/children"),
+        (r"^/node/[^/]+/parent$", "/node/{uniqueNodeId}/parent"),
+        (r"^/node/[^/]+$", "/node/{uniqueNodeId}"),
+        (r"^/config/[^/]+$", "/config/{uniqueNodeId}"),
+        (r"^/take-snapshot/[^/]+$", "/take-snapshot/{uniqueNodeId}"),
+        (r"^/snapshot/[^/]+$", "/snapshot/{uniqueId}"),
+        (r"^/composite-snapshot/[^/]+/nodes$", "/composite-snapshot/{uniqueId}/nodes"),
+        (r"^/composite-snapshot/[^/]+/items$", "/composite-snapshot/{uniqueId}/items"),
+        (r"^/composite-snapshot/[^/]+$", "/composite-snapshot/{uniqueId}"),
+        (r"^/compare/[^/]+$", "/compare/{nodeId}"),
+        (r"^/filter/.+$", "/filter/{name}"),
+        (r"^/path/[^/]+$", "/path/{uniqueNodeId}"),
+    )
+]
+
+
+def _url_template(url):
+    """
+    Returns the template of the URL (path relative to ``base_url``) with the parameters replaced
+    by their names, e.g. ``/node/{uniqueNodeId}/children``. The query string is removed.
+    """
+    path = unquote(urlsplit(url).path) or "/"
+    for pattern, template in _URL_TEMPLATES:
+        if pattern.match(path):
+            return template
+    return path
+
+
+class RequestEvent:
+    """
+    Information about the request sent to the server. The event is passed to the request hooks
+    (``request_hooks`` parameter of the ``SaveRestoreAPI`` constructor or ``request_hook_add()``)
+    once the request is completed (successfully or with an error). The event is created for each
+    API call: if the request is retried, then the durations include all attempts. The durations
+    of streaming requests (e.g. ``snapshot_get_items_stream()``) do not include the time spent
+    by the application processing the received items.
+
+    Attributes
+    ----------
+    method : str
+        HTTP method.
+    url : str
+        URL of the request (relative to ``base_url``).
+    url_template : str
+        URL template with the parameters replaced by their names (e.g. ``/node/{uniqueNodeId}``).
+        The template may be used to group the requests sent to the same endpoint.
+    status_code : int or None
+        HTTP status code of the response or None if no response was received.
+    error : str or None
+        Name of the exception raised by the API call or None if the request succeeded.
+    attempts : int
+        Number of attempts (more than one if the request was retried).
+    bytes_sent : int
+        Size of the request body in bytes.
+    bytes_received : int
+        Number of bytes of the response body downloaded from the server.
+    durations : dict
+        Durations of the request phases in seconds: ``prepare`` - preparation of the request,
+        ``limit_wait`` - waiting in the queue of requests limited by ``request_limits``, ``network`` -
+        sending the request and receiving the response, ``decode`` - decoding of the response,
+        ``retry_wait`` - waiting before retrying the request.
+    """
+
+    def __init__(self, *, method, url):
+        self.method = method.upper()
+        self.url = url
+        self.url_template = _url_template(url)
+        self.status_code = None
+        self.error = None
+        self.attempts = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.durations = {"prepare": 0.0, "limit_wait": 0.0, "network": 0.0, "decode": 0.0, "retry_wait": 0.0}
+
+    @property
+    def duration(self):
+        """
+        Total duration of the request in seconds.
+        """
+        return sum(self.durations.values())
+
+    def _update_from_response(self, client_response):
+        if client_response is None:
+            return
+        self.status_code = client_response.status_code
+        try:
+            self.bytes_sent += len(client_response.request.content)
+        except Exception:
+            # Streaming request body was not read
+            pass
+        bytes_received = client_response.num_bytes_downloaded
+        if not bytes_received:
+            # The body of the response was not downloaded by the client (e.g. mock transport)
+            try:
+                bytes_received = len(client_response.content)
+            except Exception:
+                pass
+        self.bytes_received += bytes_received
+
+    def to_dict(self):
+        """
+        Returns the event data as a dictionary.
+        """
+        return {
+            "method": self.method,
+            "url": self.url,
+            "url_template": self.url_template,
+            "status_code": self.status_code,
+            "error": self.error,
+            "attempts": self.attempts,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "duration": self.duration,
+            "durations": dict(self.durations),
+        }
+
+    def __repr__(self):
+        return (
+            f"RequestEvent({self.method} {self.url_template}, status_code={self.status_code}, "
+            f"error={self.error}, duration={self.duration:.6f})"
+        )
+
+
+class RequestStatsCollector:
+    """
+    In-process collector of request statistics. The collector is a request hook: pass it to
+    the ``request_hooks`` parameter of the ``SaveRestoreAPI`` constructor or register it using
+    ``request_hook_add()``. The statistics are accumulated for each endpoint (HTTP method and
+    URL template): the number of requests and errors, transferred bytes, durations of the request
+    phases and the histogram of the request durations. The percentiles are estimated based on
+    the histogram, so the precision is limited by the bucket boundaries. The collector
+    is thread-safe and may be shared by multiple API objects.
+
+    Parameters
+    ----------
+    buckets : iterable of float, optional
+        Upper boundaries of the histogram buckets in seconds. The last bucket is always
+        unbounded. The default buckets cover the range from 1 ms to 60 s.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        from save_and_restore_api import RequestStatsCollector, SaveRestoreAPI
+
+        stats = RequestStatsCollector()
+        with SaveRestoreAPI(base_url="http://localhost:8080/save-restore", request_hooks=[stats]) as SR:
+            # < Send requests >
+            print(stats.report())
+    """
+
+    DEFAULT_BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10, 30, 60)
+
+    def __init__(self, *, buckets=None):
+        buckets = sorted(self.DEFAULT_BUCKETS if buckets is None else buckets)
+        self._buckets = tuple(buckets) + (math.inf,)
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        key = (event.method, event.url_template)
+        duration = event.duration
+        with self._lock:
+            stats = self._stats.get(key, None)
+            if stats is None:
+                stats = self._stats[key] = {
+                    "count": 0,
+                    "errors": 0,
+                    "attempts": 0,
+                    "bytes_sent": 0,
+                    "bytes_received": 0,
+                    "total": 0.0,
+                    "min": math.inf,
+                    "max": 0.0,
+                    "durations": dict.fromkeys(event.durations, 0.0),
+                    "histogram": [0] * len(self._buckets),
+                }
+            stats["count"] += 1
+            stats["errors"] += 1 if event.error else 0
+            stats["attempts"] += event.attempts
+            stats["bytes_sent"] += event.bytes_sent
+            stats["bytes_received"] += event.bytes_received
+            stats["total"] += duration
+            stats["min"] = min(stats["min"], duration)
+            stats["max"] = max(stats["max"], duration)
+            for phase, value in event.durations.items():
+                stats["durations"][phase] = stats["durations"].get(phase, 0.0) + value
+            for n, boundary in enumerate(self._buckets):
+                if duration <= boundary:
+                    stats["histogram"][n] += 1
+                    break
+
+    @property
+    def buckets(self):
+        """
+        Upper boundaries of the histogram buckets in seconds (the last boundary is ``inf``).
+        """
+        return self._buckets
+
+    def _percentile(self, stats, q):
+        threshold, cumulative = q * stats["count"], 0
+        for boundary, count in zip(self._buckets, stats["histogram"]):
+            cumulative += count
+            if count and cumulative >= threshold:
+                return min(boundary, stats["max"])
+        return stats["max"]
+
+    def summary(self):
+        """
+        Returns the statistics for each endpoint. The list is sorted by the total duration
+        of the requests, so the endpoints that take most of the time are at the top.
+
+        Returns
+        -------
+        list[dict]
+            List of dictionaries with the following keys: ``method``, ``url_template``, ``count``,
+            ``errors``, ``attempts``, ``bytes_sent``, ``bytes_received``, ``total``, ``mean``,
+            ``min``, ``max``, ``p50``, ``p90``, ``p99`` (durations in seconds), ``durations``
+            (total durations of the request phases) and ``histogram`` (the number of requests
+            in each bucket, see ``buckets``).
+        """
+        results = []
+        with self._lock:
+            for (method, url_template), stats in self._stats.items():
+                results.append(
+                    {
+                        "method": method,
+                        "url_template": url_template,
+                        "count": stats["count"],
+                        "errors": stats["errors"],
+                        "attempts": stats["attempts"],
+                        "bytes_sent": stats["bytes_sent"],
+                        "bytes_received": stats["bytes_received"],
+                        "total": stats["total"],
+                        "mean": stats["total"] / stats["count"],
+                        "min": stats["min"],
+                        "max": stats["max"],
+                        "p50": self._percentile(stats, 0.5),
+                        "p90": self._percentile(stats, 0.9),
+                        "p99": self._percentile(stats, 0.99),
+                        "durations": dict(stats["durations"]),
+                        "histogram": list(stats["histogram"]),
+                    }
+                )
+        return sorted(results, key=lambda _: _["total"], reverse=True)
+
+    def report(self):
+        """
+        Returns the statistics formatted as a text table (durations in milliseconds).
+        """
+        lines = [
+            f"{'METHOD':<7} {'ENDPOINT':<40} {'COUNT':>7} {'ERRORS':>6} {'TOTAL':>10} "
+            f"{'MEAN':>8} {'P50':>8} {'P90':>8} {'P99':>8} {'MAX':>8}"
+        ]
+        for s in self.summary():
+            ms = {k: s[k] * 1000 for k in ("total", "mean", "p50", "p90", "p99", "max")}
+            lines.append(
+                f"{s['method']:<7} {s['url_template']:<40} {s['count']:>7} {s['errors']:>6} "
+                f"{ms['total']:>10.1f} {ms['mean']:>8.1f} {ms['p50']:>8.1f} {ms['p90']:>8.1f} "
+                f"{ms['p99']:>8.1f} {ms['max']:>8.1f}"
+            )
+        return "\n".join(lines)
+
+    def reset(self):
+        """
+        Clear the collected statistics.
+        """
+        with self._lock:
+            self._stats.clear()
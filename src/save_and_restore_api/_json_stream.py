@@ -0,0 +1,257 @@
+import json
+import re
+
+
+class _JSONArrayStreamParser:
+    """
+    Incremental parser for JSON documents that contain a (potentially very large) array.
+    The document is passed to the parser in chunks of text using ``feed()``. The parser
+    returns the elements of the array as soon as they are fully received, so only the
+    elements that are not yet parsed are held in memory. If ``key`` is None, then the
+    document is expected to be an array (e.g. ``[{...}, {...}]``). Otherwise the document
+    is expected to be an object and the elements of the array ``document[key]`` are returned
+    (e.g. ``{"uniqueId": "...", "snapshotItems": [{...}, {...}]}``). Other members of the
+    object are skipped.
+
+    Each chunk is scanned once: the parser tracks the nesting depth and the state of strings
+    and escape sequences of the current value, and the chunks of the value are collected until
+    the end of the value is found. Then the value is decoded with the standard ``json`` decoder.
+    The time of parsing is proportional to the size of the document regardless of the size
+    of the chunks and the elements.
+
+    Parameters
+    ----------
+    key : str or None
+        The key of the array in the top-level object or None if the document is an array.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        parser = _JSONArrayStreamParser(key="snapshotItems")
+        for chunk in chunks:
+            for item in parser.feed(chunk):
+                process(item)
+        for item in parser.close():
+            process(item)
+    """
+
+    _WHITESPACE = " \t\n\r"
+    _SCALAR_START = "-0123456789tfnNI"
+    _STRING_SPECIAL = re.compile(r'["\\]')
+    _NESTED_SPECIAL = re.compile(r'["\[\]{}]')
+    _SCALAR_END = re.compile(r"[ \t\n\r,:\]}]")
+
+    def __init__(self, *, key=None):
+        self._key = key
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        # States: "start", "object" (expecting ',', or '}' if the key is not found), "key", "colon",
+        #   "member" (the value of the object member), "array" (expecting ',' or ']'), "element",
+        #   "done" (the array is fully parsed, the rest of the document is ignored).
+        self._state = "start"
+        self._array_found = False
+        self._first_member = True
+        self._first_element = True
+        self._member_key = None
+        # The value that is currently received: the start of the value in the buffer (None if
+        #   no value is received), the chunks received with the previous calls to 'feed()',
+        #   the scan position in the buffer and the scan state.
+        self._value_start = None
+        self._value_parts = []
+        self._scan_pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._scalar = False
+
+    def feed(self, text):
+        """
+        Add the next chunk of the document. Returns the list of array elements that
+        were completely received.
+        """
+        if self._state == "done":
+            return []
+        # The buffer is fully processed unless a value is partially received.
+        if self._value_start is not None:
+            self._value_parts.append(self._buffer[self._value_start :])
+            self._value_start = self._scan_pos = 0
+        self._buffer, self._pos = text, 0
+        return self._parse(final=False)
+
+    def close(self):
+        """
+        Finish parsing. Returns the list of remaining elements. Raises ``json.JSONDecodeError``
+        if the document is incomplete or does not contain the array.
+        """
+        items = self._parse(final=True)
+        if self._state != "done":
+            if self._key is not None and self._state == "object" and not self._array_found:
+                raise json.JSONDecodeError(f"Key {self._key!r} is not found", self._buffer, self._pos)
+            raise json.JSONDecodeError("Incomplete JSON document", self._buffer, self._pos)
+        return items
+
+    def _skip_whitespace(self):
+        buffer, pos = self._buffer, self._pos
+        while pos < len(buffer) and buffer[pos] in self._WHITESPACE:
+            pos += 1
+        self._pos = pos
+        return pos < len(buffer)
+
+    def _expect(self, char):
+        if self._buffer[self._pos] != char:
+            raise json.JSONDecodeError(f"Expecting {char!r}", self._buffer, self._pos)
+        self._pos += 1
+
+    def _start_value(self):
+        """
+        Start receiving the value at the current position in the buffer.
+        """
+        char = self._buffer[self._pos]
+        self._value_start = self._scan_pos = self._pos
+        self._depth, self._in_string, self._escape, self._scalar = 0, False, False, False
+        if char == '"':
+            self._in_string = True
+            self._scan_pos += 1
+        elif char in "[{":
+            self._depth = 1
+            self._scan_pos += 1
+        elif char in self._SCALAR_START:
+            self._scalar = True
+        else:
+            raise json.JSONDecodeError("Expecting value", self._buffer, self._pos)
+
+    def _scan(self):
+        """
+        Scan the buffer starting from the scan position. Returns the position of the end
+        of the value in the buffer or None if the end of the value was not received.
+        """
+        buffer, pos, n = self._buffer, self._scan_pos, len(self._buffer)
+        while pos < n:
+            if self._scalar:
+                # Numbers and literals are complete only if followed by a delimiter
+                m = self._SCALAR_END.search(buffer, pos)
+                if m is None:
+                    pos = n
+                    break
+                return m.start()
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    pos += 1
+                    continue
+                m = self._STRING_SPECIAL.search(buffer, pos)
+                if m is None:
+                    pos = n
+                    break
+                pos = m.end()
+                if m.group() == "\\":
+                    self._escape = True
+                else:
+                    self._in_string = False
+                    if self._depth == 0:
+                        return pos
+                continue
+            m = self._NESTED_SPECIAL.search(buffer, pos)
+            if m is None:
+                pos = n
+                break
+            pos, char = m.end(), m.group()
+            if char == '"':
+                self._in_string = True
+            elif char in "[{":
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    return pos
+        self._scan_pos = pos
+        return None
+
+    def _read_value(self, *, final):
+        """
+        Read the next value. Returns ``(True, value)`` or ``(False, None)`` if more data is needed.
+        The value is decoded only once, after it is completely received.
+        """
+        if self._value_start is None:
+            self._start_value()
+        end = self._scan()
+        if end is None:
+            if not (final and self._scalar):
+                return False, None
+            end = len(self._buffer)
+
+        text = self._buffer[self._value_start : end]
+        if self._value_parts:
+            self._value_parts.append(text)
+            text = "".join(self._value_parts)
+            self._value_parts = []
+        value, n = self._decoder.raw_decode(text)
+        if n != len(text):
+            raise json.JSONDecodeError("Extra data", text, n)
+        self._value_start, self._pos = None, end
+        return True, value
+
+    def _parse(self, *, final):
+        items = []
+        while self._state != "done":
+            if self._value_start is None and not self._skip_whitespace():
+                break
+            state = self._state
+
+            if state == "start":
+                if self._key is None:
+                    self._expect("[")
+                    self._state = "array"
+                else:
+                    self._expect("{")
+                    self._state = "object"
+
+            elif state == "object":
+                if self._buffer[self._pos] == "}":
+                    raise json.JSONDecodeError(f"Key {self._key!r} is not found", self._buffer, self._pos)
+                if not self._first_member:
+                    self._expect(",")
+                self._state = "key"
+
+            elif state == "colon":
+                self._expect(":")
+                self._state = "member"
+
+            elif state == "member" and self._member_key == self._key:
+                self._expect("[")
+                self._array_found = True
+                self._state = "array"
+
+            elif state == "array":
+                if self._buffer[self._pos] == "]":
+                    self._pos += 1
+                    self._state = "done"
+                    break
+                if not self._first_element:
+                    self._expect(",")
+                self._state = "element"
+
+            else:
+                # The key or the value of the object member or the element of the array
+                if state == "key" and self._value_start is None and self._buffer[self._pos] != '"':
+                    raise json.JSONDecodeError(
+                        "Expecting property name enclosed in double quotes", self._buffer, self._pos
+                    )
+                success, value = self._read_value(final=final)
+                if not success:
+                    break
+                if state == "key":
+                    self._member_key = value
+                    self._state = "colon"
+                elif state == "member":
+                    self._first_member = False
+                    self._state = "object"
+                else:
+                    items.append(value)
+                    self._first_element = False
+                    self._state = "array"
+
+        return items
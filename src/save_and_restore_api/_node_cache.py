@@ -0,0 +1,103 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+
+class _NodeCache:
+    """
+    Thread-safe in-memory LRU cache with limited entry lifetime (TTL). The cache stores
+    responses of read-only API calls related to nodes. The entries are keyed by the type
+    of the call (``"node"``, ``"children"``, ``"parent"`` or ``"path"``) and node UID.
+    Cached data is copied when it is stored and when it is returned, so that the application
+    may safely modify the returned objects.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of entries in the cache. The least recently used entries are
+        removed once the cache is full.
+    ttl : float or None
+        Lifetime of the cache entries in seconds. The entries never expire if None.
+    """
+
+    def __init__(self, *, maxsize, ttl):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, kind, uid):
+        """
+        Returns a tuple ``(hit, value)``. The value is None if the entry is not found.
+        """
+        with self._lock:
+            key = (kind, uid)
+            entry = self._entries.get(key, None)
+            if entry is not None and self._ttl is not None and (time.monotonic() - entry[0]) > self._ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            value = entry[1]
+        return True, copy.deepcopy(value)
+
+    def put(self, kind, uid, value):
+        value = copy.deepcopy(value)
+        with self._lock:
+            key = (kind, uid)
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, uids, *, recursive=False, paths=False):
+        """
+        Remove entries related to nodes with the UIDs from ``uids``. The entries for the nodes,
+        lists of children that contain the nodes and parent nodes of the nodes are removed.
+        If ``recursive`` is True, then the entries for the cached descendants of the nodes
+        are also removed (e.g. the nodes are deleted). If ``paths`` is True, then all cached
+        paths are removed (e.g. the nodes are moved or renamed).
+        """
+        uids = {_ for _ in uids if _ is not None}
+        with self._lock:
+            if recursive:
+                pending = list(uids)
+                while pending:
+                    entry = self._entries.get(("children", pending.pop()), None)
+                    if entry is not None:
+                        child_uids = {_["uniqueId"] for _ in entry[1]} - uids
+                        uids.update(child_uids)
+                        pending.extend(child_uids)
+
+            def is_affected(key, value):
+                kind, uid = key
+                if uid in uids or (paths and kind == "path"):
+                    return True
+                if kind == "children":
+                    return any(_.get("uniqueId", None) in uids for _ in value)
+                if kind == "parent":
+                    return value.get("uniqueId", None) in uids
+                return False
+
+            for key in [k for k, v in self._entries.items() if is_affected(k, v[1])]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def info(self):
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "maxsize": self._maxsize,
+                "currsize": len(self._entries),
+                "ttl": self._ttl,
+            }
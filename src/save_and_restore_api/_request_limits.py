@@ -0,0 +1,301 @@
+import asyncio
+import threading
+import time
+
+# Requests are limited separately for the groups of endpoints: 'read' - GET requests,
+#   'write' - requests that create or modify nodes (PUT, POST, DELETE).
+_REQUEST_LIMITS_GROUPS = ("read", "write")
+
+
+class RequestLimits:
+    """
+    Limits of the number of concurrent requests and the rate of requests sent to the server.
+    The limits protect the server from overloading when the application sends many requests
+    at once, e.g. when thousands of ``node_get()`` calls are started using ``asyncio.gather()``.
+    The requests that exceed the limits wait in the queue until they can be sent. The rate
+    is limited using the token bucket algorithm: up to ``burst`` requests may be sent at once,
+    then the requests are sent at the average ``rate``.
+
+    The limits are passed to the ``SaveRestoreAPI`` constructor (``request_limits`` parameter)
+    and are applied separately to the group of read (GET) requests and the group of write
+    (PUT, POST, DELETE) requests. See ``request_limits_info()`` for the queue depth and
+    the waiting time statistics. The streaming requests (e.g. ``snapshot_get_items_stream()``)
+    are counted as in progress until the response headers are received. The response body
+    is read while the application iterates over the items and is not limited, so calling
+    other API methods inside the loop does not block the iteration.
+
+    Parameters
+    ----------
+    max_concurrency : int or None, optional
+        Maximum number of requests in progress. The number is not limited if None. Default: None.
+    rate : float or None, optional
+        Maximum average number of requests per second. The rate is not limited if None. Default: None.
+    burst : int, optional
+        Maximum number of requests that may be sent at once without waiting (capacity of the
+        token bucket). Used only if ``rate`` is set. Default: 1.
+
+    Raises
+    ------
+    ValueError
+        Invalid parameter value.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        from save_and_restore_api import RequestLimits
+        from save_and_restore_api.aio import SaveRestoreAPI
+
+        # Up to 20 concurrent GET requests, up to 2 concurrent write requests at 10 requests/s
+        request_limits = {
+            "read": RequestLimits(max_concurrency=20),
+            "write": RequestLimits(max_concurrency=2, rate=10),
+        }
+        base_url = "http://localhost:8080/save-restore"
+        async with SaveRestoreAPI(base_url=base_url, request_limits=request_limits) as SR:
+            nodes = await asyncio.gather(*[SR.node_get(uid) for uid in uids])
+            print(SR.request_limits_info())
+    """
+
+    def __init__(self, *, max_concurrency=None, rate=None, burst=1):
+        if max_concurrency is not None and (not isinstance(max_concurrency, int) or max_concurrency < 1):
+            raise ValueError(
+                f"Invalid 'max_concurrency': {max_concurrency!r}. Must be a positive integer or None."
+            )
+        if rate is not None and not rate > 0:
+            raise ValueError(f"Invalid 'rate': {rate!r}. Must be a positive number or None.")
+        if not isinstance(burst, int) or burst < 1:
+            raise ValueError(f"Invalid 'burst': {burst!r}. Must be a positive integer.")
+
+        self._max_concurrency = max_concurrency
+        self._rate = rate
+        self._burst = burst
+
+    @property
+    def max_concurrency(self):
+        """
+        Maximum number of requests in progress or None.
+        """
+        return self._max_concurrency
+
+    @property
+    def rate(self):
+        """
+        Maximum average number of requests per second or None.
+        """
+        return self._rate
+
+    @property
+    def burst(self):
+        """
+        Maximum number of requests that may be sent at once without waiting.
+        """
+        return self._burst
+
+    @staticmethod
+    def _groups(request_limits):
+        """
+        Returns the dictionary of limits for the groups of requests based on the value of
+        ``request_limits`` parameter: ``RequestLimits`` (applied to each group), dictionary
+        ``{"read": RequestLimits, "write": RequestLimits}`` (the groups that are not included
+        are not limited) or None (no limits).
+        """
+        if request_limits is None:
+            return {}
+        if isinstance(request_limits, RequestLimits):
+            return dict.fromkeys(_REQUEST_LIMITS_GROUPS, request_limits)
+        if isinstance(request_limits, dict):
+            for group, limits in request_limits.items():
+                if group not in _REQUEST_LIMITS_GROUPS:
+                    raise ValueError(
+                        f"Invalid group of requests in 'request_limits': {group!r}. "
+                        f"Supported groups: {_REQUEST_LIMITS_GROUPS}."
+                    )
+                if limits is not None and not isinstance(limits, RequestLimits):
+                    raise ValueError(f"Invalid limits of the group {group!r}: {limits!r}. Must be RequestLimits.")
+            return {_: v for _, v in request_limits.items() if v is not None}
+        raise ValueError(f"Invalid 'request_limits': {request_limits!r}. Must be RequestLimits, dict or None.")
+
+
+class _RequestLimiter:
+    """
+    Applies the limits to the group of requests. The limiter is used as a context manager
+    (threaded client) or an asynchronous context manager (async client) around the requests.
+    The semaphore of the asynchronous limiter is created on first use, so that it is bound
+    to the running event loop.
+    """
+
+    def __init__(self, limits):
+        self._limits = limits
+        self._lock = threading.Lock()
+        self._semaphore = None
+        if limits.max_concurrency is not None:
+            self._thread_semaphore = threading.Semaphore(limits.max_concurrency)
+        else:
+            self._thread_semaphore = None
+
+        # Token bucket: the number of available tokens may be negative (the tokens are reserved
+        #   by the waiting requests)
+        self._tokens = float(limits.burst)
+        self._tokens_time = time.monotonic()
+
+        self._in_progress = 0
+        self._queued = 0
+        self._max_queued = 0
+        self._requests = 0
+        self._delayed = 0
+        self._wait_time = 0.0
+        self._max_wait_time = 0.0
+
+    def _rate_delay(self):
+        """
+        Reserve the token and return the time to wait until the reserved token is available.
+        """
+        rate = self._limits.rate
+        if rate is None:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._tokens + (now - self._tokens_time) * rate, self._limits.burst)
+            self._tokens_time = now
+            self._tokens -= 1
+            return max(-self._tokens / rate, 0.0)
+
+    def _rate_refund(self):
+        """
+        Return the token reserved by ``_rate_delay()`` if the request was cancelled or interrupted
+        while waiting for the token, so that the following requests are not delayed.
+        """
+        with self._lock:
+            self._tokens = min(self._tokens + 1, self._limits.burst)
+
+    def _enqueue(self):
+        with self._lock:
+            self._queued += 1
+            self._max_queued = max(self._max_queued, self._queued)
+        return time.perf_counter()
+
+    def _dequeue(self, start, *, acquired, delayed):
+        wait_time = time.perf_counter() - start
+        with self._lock:
+            self._queued -= 1
+            if acquired:
+                self._in_progress += 1
+                self._requests += 1
+                self._delayed += 1 if delayed else 0
+                self._wait_time += wait_time
+                self._max_wait_time = max(self._max_wait_time, wait_time)
+
+    def _complete(self):
+        with self._lock:
+            self._in_progress -= 1
+
+    def __enter__(self):
+        start, acquired, delayed = self._enqueue(), False, False
+        try:
+            if self._thread_semaphore is not None and not self._thread_semaphore.acquire(blocking=False):
+                delayed = True
+                self._thread_semaphore.acquire()
+            try:
+                delay = self._rate_delay()
+                if delay:
+                    delayed = True
+                    try:
+                        time.sleep(delay)
+                    except BaseException:
+                        self._rate_refund()
+                        raise
+            except BaseException:
+                if self._thread_semaphore is not None:
+                    self._thread_semaphore.release()
+                raise
+            acquired = True
+        finally:
+            self._dequeue(start, acquired=acquired, delayed=delayed)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._complete()
+        if self._thread_semaphore is not None:
+            self._thread_semaphore.release()
+
+    async def __aenter__(self):
+        max_concurrency = self._limits.max_concurrency
+        if max_concurrency is not None and self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(max_concurrency)
+        start, acquired, delayed = self._enqueue(), False, False
+        try:
+            if self._semaphore is not None:
+                delayed = self._semaphore.locked()
+                await self._semaphore.acquire()
+            try:
+                delay = self._rate_delay()
+                if delay:
+                    delayed = True
+                    try:
+                        await asyncio.sleep(delay)
+                    except BaseException:
+                        self._rate_refund()
+                        raise
+            except BaseException:
+                if self._semaphore is not None:
+                    self._semaphore.release()
+                raise
+            acquired = True
+        finally:
+            self._dequeue(start, acquired=acquired, delayed=delayed)
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self._complete()
+        if self._semaphore is not None:
+            self._semaphore.release()
+
+    def info(self):
+        """
+        Returns the limits and the statistics of the group of requests.
+        """
+        with self._lock:
+            return {
+                "max_concurrency": self._limits.max_concurrency,
+                "rate": self._limits.rate,
+                "burst": self._limits.burst,
+                "in_progress": self._in_progress,
+                "queued": self._queued,
+                "max_queued": self._max_queued,
+                "requests": self._requests,
+                "delayed": self._delayed,
+                "wait_time": self._wait_time,
+                "max_wait_time": self._max_wait_time,
+            }
+
+    def info_reset(self):
+        """
+        Reset the statistics. The current number of requests in progress and in the queue is not reset.
+        """
+        with self._lock:
+            self._max_queued = self._queued
+            self._requests = self._delayed = 0
+            self._wait_time = self._max_wait_time = 0.0
+
+
+class _NoRequestLimit:
+    """
+    Context manager used for the requests that are not limited.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+_NO_REQUEST_LIMIT = _NoRequestLimit()
@@ -0,0 +1,146 @@
+import fnmatch
+import re
+
+
+class RestorePlan:
+    """
+    Plan for restoring snapshot items in ordered stages. The items are assigned to the stages
+    based on PV names or using a callback, e.g. the power supplies may be restored before
+    the magnets. The stages are restored one after another by ``restore_items_staged()``, the items
+    of each stage are restored using concurrent ``restore_items()`` requests.
+
+    Each item is assigned to the first stage with matching selector. The selector of the stage
+    may be a glob pattern of PV names (e.g. ``"*:PS:*"``), a compiled regular expression (matched
+    using ``pattern.search(pv_name)``), a list of patterns (the item matches if any of the patterns
+    matches) or a callable, which accepts the snapshot item and returns True if the item belongs to
+    the stage. Callables may be used to select the items by other criteria, e.g. by tags or device
+    types maintained by the application. The items that match none of the stages are restored
+    in the last stage (``default_stage``) or not restored if ``default_stage`` is None.
+
+    Parameters
+    ----------
+    stages : dict or list of tuple
+        Ordered stages: dictionary ``{stage_name: selector}`` or list of tuples
+        ``(stage_name, selector)``.
+    default_stage : str or None, optional
+        Name of the last stage, which contains the items that match none of the stages. The items
+        are not restored if None. Default: ``"default"``.
+
+    Raises
+    ------
+    ValueError
+        Invalid stages or selectors.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        import re
+        from save_and_restore_api import RestorePlan, SaveRestoreAPI
+
+        vacuum_pvs = {"VAC:GV1:Pos", "VAC:GV2:Pos"}
+        plan = RestorePlan(
+            {
+                "power-supplies": ["*:PS:*", "*:PS?:*"],
+                "magnets": re.compile(r"^(QUAD|BEND):"),
+                "vacuum": lambda item: item["configPv"]["pvName"] in vacuum_pvs,
+            }
+        )
+        with SaveRestoreAPI(base_url="http://localhost:8080/save-restore") as SR:
+            SR.auth_set(username="user", password="userPass")
+            items = SR.snapshot_get(snapshot_uid)["snapshotItems"]
+            result = SR.restore_items_staged(items, plan, chunk_size=500, max_concurrency=8)
+            for stage in result["stages"]:
+                print(f"{stage['name']}: {stage['n_items']} items, {stage['duration']:.3f} s")
+    """
+
+    def __init__(self, stages, *, default_stage="default"):
+        stages = list(stages.items()) if isinstance(stages, dict) else list(stages)
+        names = set()
+        self._stages = []
+        for stage in stages:
+            if not isinstance(stage, (tuple, list)) or len(stage) != 2:
+                raise ValueError(f"Invalid stage: {stage!r}. Must be a tuple (stage_name, selector).")
+            name, selector = stage
+            if not isinstance(name, str) or not name or name in names:
+                raise ValueError(f"Invalid stage name: {name!r}. Must be a non-empty unique string.")
+            names.add(name)
+            self._stages.append((name, self._create_matcher(name, selector)))
+
+        if default_stage is not None and (not isinstance(default_stage, str) or default_stage in names):
+            raise ValueError(f"Invalid 'default_stage': {default_stage!r}. Must be a unique stage name or None.")
+        self._default_stage = default_stage
+
+    @staticmethod
+    def _create_matcher(name, selector):
+        """
+        Returns the function that accepts the snapshot item and returns True if the item
+        belongs to the stage.
+        """
+        if callable(selector):
+            return selector
+        selectors = [selector] if isinstance(selector, (str, re.Pattern)) else selector
+        try:
+            selectors = list(selectors)
+        except TypeError:
+            selectors = None
+        if not selectors or not all(isinstance(_, (str, re.Pattern)) for _ in selectors):
+            raise ValueError(
+                f"Invalid selector of the stage {name!r}: {selector!r}. Must be a glob pattern, "
+                "a compiled regular expression, a list of patterns or a callable."
+            )
+        patterns = [re.compile(fnmatch.translate(_)) if isinstance(_, str) else _ for _ in selectors]
+        translated = [isinstance(_, str) for _ in selectors]
+
+        def matcher(item):
+            pv_name = item["configPv"]["pvName"]
+            for pattern, is_glob in zip(patterns, translated):
+                if (pattern.match(pv_name) if is_glob else pattern.search(pv_name)) is not None:
+                    return True
+            return False
+
+        return matcher
+
+    @property
+    def stage_names(self):
+        """
+        Names of the stages in the order of restoring, including the default stage.
+        """
+        names = [_[0] for _ in self._stages]
+        return names + [self._default_stage] if self._default_stage is not None else names
+
+    def split(self, snapshotItems):
+        """
+        Split the snapshot items into stages. The order of the items in each stage is preserved.
+
+        Parameters
+        ----------
+        snapshotItems : iterable of dict
+            Snapshot items. The format is consistent with the format of ``snapshotData["snapshotItems"]``.
+
+        Returns
+        -------
+        stages : list of tuple
+            List of tuples ``(stage_name, items)`` in the order of restoring. The list contains all
+            the stages, including the stages with no items.
+        unmatched : list of dict
+            Items that match none of the stages if ``default_stage`` is None, otherwise empty list.
+
+        Raises
+        ------
+        ValueError
+            The item does not contain the PV name.
+        """
+        stages = {name: [] for name in self.stage_names}
+        unmatched = []
+        for item in snapshotItems:
+            try:
+                name = next((name for name, matcher in self._stages if matcher(item)), self._default_stage)
+            except (KeyError, TypeError) as ex:
+                raise ValueError(f"Invalid snapshot item: {item!r}: {ex}") from ex
+            if name is None:
+                unmatched.append(item)
+            else:
+                stages[name].append(item)
+        return list(stages.items()), unmatched
@@ -0,0 +1,163 @@
+import email.utils
+import random
+import time
+
+import httpx
+
+
+class RetryPolicy:
+    """
+    Policy for retrying failed requests. Requests are retried after transient errors:
+    timeouts, connection errors and responses with selected status codes (e.g. ``503`` while
+    the server is restarting). Only requests with the selected HTTP methods are retried.
+    By default, only GET requests are retried: most PUT and POST requests of the
+    Save-and-Restore API create or modify nodes and are not idempotent, so they should be
+    added to ``methods`` only if repeating the request is known to be safe.
+
+    The delay before the n-th retry is ``backoff_factor * 2 ** (n - 1)`` seconds, limited by
+    ``backoff_max``. The delay is randomly reduced by up to ``jitter`` fraction of its value to
+    avoid retrying requests from multiple clients simultaneously. If the server response contains
+    ``Retry-After`` header, then the delay is set based on the header (limited by ``backoff_max``).
+
+    Parameters
+    ----------
+    max_attempts : int, optional
+        Maximum number of attempts including the first attempt. The requests are not retried
+        if ``max_attempts`` is 1. Default: 3.
+    backoff_factor : float, optional
+        Delay before the first retry in seconds. Default: 0.5.
+    backoff_max : float, optional
+        Maximum delay between attempts in seconds. Default: 10.0.
+    jitter : float, optional
+        Maximum fraction (0..1) by which the delay is randomly reduced. Default: 0.5.
+    status_codes : iterable of int, optional
+        HTTP status codes of the responses that are retried. Default: ``(502, 503, 504)``.
+    methods : iterable of str, optional
+        HTTP methods of the requests that may be retried. Default: ``("GET",)``.
+    retry_on_timeout : bool, optional
+        Retry requests after timeouts. Default: True.
+    retry_on_connection_error : bool, optional
+        Retry requests after connection and other transport errors. Default: True.
+
+    Raises
+    ------
+    ValueError
+        Invalid parameter value.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        from save_and_restore_api import RetryPolicy, SaveRestoreAPI
+
+        retry_policy = RetryPolicy(max_attempts=5, backoff_factor=1.0)
+        with SaveRestoreAPI(base_url="http://localhost:8080/save-restore", retry_policy=retry_policy) as SR:
+            info = SR.info_get()
+            print(SR.retry_info())
+    """
+
+    def __init__(
+        self,
+        *,
+        max_attempts=3,
+        backoff_factor=0.5,
+        backoff_max=10.0,
+        jitter=0.5,
+        status_codes=(502, 503, 504),
+        methods=("GET",),
+        retry_on_timeout=True,
+        retry_on_connection_error=True,
+    ):
+        if not isinstance(max_attempts, int) or max_attempts < 1:
+            raise ValueError(f"Invalid 'max_attempts': {max_attempts!r}. Must be a positive integer.")
+        if backoff_factor < 0 or backoff_max < 0:
+            raise ValueError(
+                f"Invalid 'backoff_factor' ({backoff_factor!r}) or 'backoff_max' ({backoff_max!r}): "
+                "must be non-negative."
+            )
+        if not (0 <= jitter <= 1):
+            raise ValueError(f"Invalid 'jitter': {jitter!r}. Must be in the range 0..1.")
+
+        self._max_attempts = max_attempts
+        self._backoff_factor = backoff_factor
+        self._backoff_max = backoff_max
+        self._jitter = jitter
+        self._status_codes = frozenset(status_codes)
+        self._methods = frozenset(_.upper() for _ in methods)
+        self._retry_on_timeout = retry_on_timeout
+        self._retry_on_connection_error = retry_on_connection_error
+
+    @property
+    def max_attempts(self):
+        """
+        Maximum number of attempts including the first attempt.
+        """
+        return self._max_attempts
+
+    def is_retryable(self, *, method, exception):
+        """
+        Returns True if the request that failed with ``exception`` may be retried.
+
+        Parameters
+        ----------
+        method : str
+            HTTP method of the request.
+        exception : Exception
+            Exception raised by ``httpx`` while sending the request or processing the response.
+
+        Returns
+        -------
+        bool
+            True if the request may be retried.
+        """
+        if method.upper() not in self._methods:
+            return False
+        if isinstance(exception, httpx.TimeoutException):
+            return self._retry_on_timeout
+        if isinstance(exception, httpx.TransportError):
+            return self._retry_on_connection_error
+        if isinstance(exception, httpx.HTTPStatusError):
+            return exception.response.status_code in self._status_codes
+        return False
+
+    def get_delay(self, *, attempt, exception=None):
+        """
+        Returns the delay in seconds before the next attempt.
+
+        Parameters
+        ----------
+        attempt : int
+            The number of the failed attempt (1 - the first attempt).
+        exception : Exception, optional
+            Exception raised by the failed attempt. Used to read ``Retry-After`` header.
+
+        Returns
+        -------
+        float
+            Delay in seconds.
+        """
+        retry_after = self._retry_after(exception)
+        if retry_after is not None:
+            return min(retry_after, self._backoff_max)
+        delay = min(self._backoff_factor * 2 ** (attempt - 1), self._backoff_max)
+        return delay * (1 - self._jitter * random.random())
+
+    @staticmethod
+    def _retry_after(exception):
+        """
+        Returns the delay from ``Retry-After`` header (seconds or HTTP date) or None.
+        """
+        if not isinstance(exception, httpx.HTTPStatusError):
+            return None
+        value = exception.response.headers.get("Retry-After", None)
+        if value is None:
+            return None
+        try:
+            return max(float(value), 0)
+        except ValueError:
+            pass
+        try:
+            return max(email.utils.parsedate_to_datetime(value).timestamp() - time.time(), 0)
+        except (TypeError, ValueError):
+            return None
@@ -0,0 +1,277 @@
+import math
+from array import array
+
+from ._snapshot_table import (
+    _KIND_FLOAT,
+    _KIND_FLOAT_ARRAY,
+    _KIND_INT,
+    _KIND_INT_ARRAY,
+    SnapshotTable,
+    np,
+)
+
+_SCALAR_KINDS = (_KIND_FLOAT, _KIND_INT)
+_ARRAY_KINDS = (_KIND_FLOAT_ARRAY, _KIND_INT_ARRAY)
+_COMPARE_MODES = ("ABSOLUTE", "RELATIVE")
+
+
+def _numbers_equal(v1, v2, *, tolerance, relative):
+    """
+    Compare two numbers. ``v1`` is the reference value for relative comparisons.
+    """
+    if v1 == v2 or (math.isnan(v1) and math.isnan(v2)):
+        return True
+    limit = tolerance * abs(v1) if relative else tolerance
+    return abs(v1 - v2) <= limit
+
+
+class SnapshotDiff:
+    """
+    Client-side comparison of two snapshots. The snapshots may be represented as ``SnapshotTable``
+    objects, snapshot data (``snapshotData``) or lists of snapshot items. The items of the snapshots
+    are aligned by PV names and the values are compared using the same rules as the server uses
+    for ``compare()``: the numeric values (scalars and arrays) are equal if the difference does not
+    exceed ``tolerance`` (``"ABSOLUTE"`` mode) or ``tolerance`` multiplied by the absolute value from
+    the first snapshot (``"RELATIVE"`` mode). The values of other types (e.g. strings) must be
+    identical. The numeric values are compared using NumPy if it is installed.
+
+    Parameters
+    ----------
+    snapshot1, snapshot2 : SnapshotTable, dict or list[dict]
+        The snapshots to compare. The first snapshot is used as a reference for the relative
+        comparisons.
+    tolerance : float, optional
+        Tolerance for numerical comparisons. If not specified or None, the default is 0.
+    compareMode : str, optional
+        Comparison mode. Supported values: ``"ABSOLUTE"``, ``"RELATIVE"``. If not specified or None,
+        the default is ``"ABSOLUTE"``.
+
+    Raises
+    ------
+    ValueError
+        Invalid tolerance or comparison mode.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        from save_and_restore_api import SaveRestoreAPI, SnapshotDiff
+
+        with SaveRestoreAPI(base_url="http://localhost:8080/save-restore") as SR:
+            diff = SR.snapshots_diff(snapshot_uid_1, snapshot_uid_2, tolerance=0.01)
+            # The same using the loaded data
+            diff = SnapshotDiff(SR.snapshot_get(snapshot_uid_1), SR.snapshot_get(snapshot_uid_2), tolerance=0.01)
+
+            print(f"Different PVs: {diff.different}")
+            print(f"Missing PVs: {diff.only_in_first} {diff.only_in_second}")
+    """
+
+    def __init__(self, snapshot1, snapshot2, *, tolerance=None, compareMode=None):
+        tolerance = 0 if tolerance is None else tolerance
+        compareMode = "ABSOLUTE" if compareMode is None else compareMode
+        if not isinstance(tolerance, (int, float)) or isinstance(tolerance, bool) or not (tolerance >= 0):
+            raise ValueError(f"Invalid 'tolerance': {tolerance!r}. Must be a non-negative number.")
+        if compareMode not in _COMPARE_MODES:
+            raise ValueError(f"Invalid 'compareMode': {compareMode!r}. Supported modes: {_COMPARE_MODES}.")
+
+        self._table1, self._table2 = self._as_table(snapshot1), self._as_table(snapshot2)
+        self._tolerance, self._relative = tolerance, compareMode == "RELATIVE"
+
+        self._align()
+        if np is not None:
+            self._equal = self._compare_numpy()
+        else:
+            self._equal = self._compare_python()
+
+    @staticmethod
+    def _as_table(snapshot):
+        if isinstance(snapshot, SnapshotTable):
+            return snapshot
+        if isinstance(snapshot, dict):
+            return SnapshotTable.from_snapshot_data(snapshot)
+        return SnapshotTable.from_items(snapshot)
+
+    def _align(self):
+        """
+        Find the indices of the items with the same PV names. If the snapshot contains
+        multiple items with the same PV name, then the first item is used.
+        """
+        names1, names2 = self._table1._pv_names, self._table2._pv_names
+        # The dictionary is filled in reversed order, so the first items are kept
+        first2 = {names2[n]: n for n in range(len(names2) - 1, -1, -1)}
+        unique1 = set(names1)
+
+        if len(unique1) == len(names1):
+            rows1 = range(len(names1))
+        else:
+            processed = set()
+            rows1 = [n for n, name in enumerate(names1) if not (name in processed or processed.add(name))]
+        rows2 = [first2.get(names1[n], -1) for n in rows1]
+
+        self._index1 = array("q", [n for n, m in zip(rows1, rows2) if m >= 0])
+        self._index2 = array("q", [m for m in rows2 if m >= 0])
+        self._pv_names = [names1[n] for n in self._index1]
+        self._only_in_first = [names1[n] for n, m in zip(rows1, rows2) if m < 0]
+        self._only_in_second = []
+        if len(self._index2) < len(first2):
+            self._only_in_second = [names2[n] for n in sorted(first2.values()) if names2[n] not in unique1]
+
+    def _raw_value(self, table, index):
+        value = table.item(index).get("value", None)
+        return value.get("value", None) if isinstance(value, dict) else value
+
+    def _compare_other(self, n1, n2):
+        """
+        Compare the items that are not scalar numbers.
+        """
+        t1, t2 = self._table1, self._table2
+        k1, k2 = t1._kinds[n1], t2._kinds[n2]
+        if k1 in _ARRAY_KINDS and k2 in _ARRAY_KINDS:
+            a1, a2 = t1.array_value(n1), t2.array_value(n2)
+            if len(a1) != len(a2):
+                return False
+            if np is not None:
+                return bool(self._numbers_equal_numpy(a1, a2).all())
+            return all(
+                _numbers_equal(v1, v2, tolerance=self._tolerance, relative=self._relative)
+                for v1, v2 in zip(a1, a2)
+            )
+        if k1 in _ARRAY_KINDS or k2 in _ARRAY_KINDS or k1 in _SCALAR_KINDS or k2 in _SCALAR_KINDS:
+            return False
+        return self._raw_value(t1, n1) == self._raw_value(t2, n2)
+
+    def _numbers_equal_numpy(self, v1, v2):
+        with np.errstate(invalid="ignore", over="ignore"):
+            limit = self._tolerance * np.abs(v1) if self._relative else self._tolerance
+            return (np.abs(v1 - v2) <= limit) | (v1 == v2) | (np.isnan(v1) & np.isnan(v2))
+
+    def _compare_numpy(self):
+        t1, t2 = self._table1, self._table2
+        index1 = np.frombuffer(self._index1, dtype=np.int64)
+        index2 = np.frombuffer(self._index2, dtype=np.int64)
+        kinds1 = np.frombuffer(t1._kinds, dtype=np.int8)[index1]
+        kinds2 = np.frombuffer(t2._kinds, dtype=np.int8)[index2]
+        values1 = np.frombuffer(t1._values, dtype=np.float64)[index1]
+        values2 = np.frombuffer(t2._values, dtype=np.float64)[index2]
+
+        scalar = np.isin(kinds1, _SCALAR_KINDS) & np.isin(kinds2, _SCALAR_KINDS)
+        equal = self._numbers_equal_numpy(values1, values2) & scalar
+        for n in np.flatnonzero(~scalar):
+            equal[n] = self._compare_other(int(index1[n]), int(index2[n]))
+        return equal
+
+    def _compare_python(self):
+        t1, t2 = self._table1, self._table2
+        equal = []
+        for n1, n2 in zip(self._index1, self._index2):
+            if t1._kinds[n1] in _SCALAR_KINDS and t2._kinds[n2] in _SCALAR_KINDS:
+                v1, v2 = t1._values[n1], t2._values[n2]
+                equal.append(_numbers_equal(v1, v2, tolerance=self._tolerance, relative=self._relative))
+            else:
+                equal.append(self._compare_other(n1, n2))
+        return equal
+
+    def __len__(self):
+        return len(self._pv_names)
+
+    @property
+    def table1(self):
+        """
+        The first snapshot (``SnapshotTable``).
+        """
+        return self._table1
+
+    @property
+    def table2(self):
+        """
+        The second snapshot (``SnapshotTable``).
+        """
+        return self._table2
+
+    @property
+    def pv_names(self):
+        """
+        Names of the PVs contained in both snapshots (tuple of str).
+        """
+        return tuple(self._pv_names)
+
+    @property
+    def equal(self):
+        """
+        Boolean mask (list of bool if NumPy is not installed) of the equal values.
+        The mask is aligned with ``pv_names``.
+        """
+        return self._equal.copy()
+
+    @property
+    def index1(self):
+        """
+        Indices of the items in the first snapshot. The indices are aligned with ``pv_names``.
+        """
+        return SnapshotTable._column(self._index1)
+
+    @property
+    def index2(self):
+        """
+        Indices of the items in the second snapshot. The indices are aligned with ``pv_names``.
+        """
+        return SnapshotTable._column(self._index2)
+
+    @property
+    def different(self):
+        """
+        Names of the PVs contained in both snapshots that have different values (list of str).
+        """
+        return [name for name, eq in zip(self._pv_names, self._equal) if not eq]
+
+    @property
+    def only_in_first(self):
+        """
+        Names of the PVs contained only in the first snapshot (list of str).
+        """
+        return list(self._only_in_first)
+
+    @property
+    def only_in_second(self):
+        """
+        Names of the PVs contained only in the second snapshot (list of str).
+        """
+        return list(self._only_in_second)
+
+    @property
+    def is_equal(self):
+        """
+        True if the snapshots contain the same PVs and all values are equal.
+        """
+        return not self._only_in_first and not self._only_in_second and all(self._equal)
+
+    def to_list(self, *, only_different=False):
+        """
+        Returns the results of the comparison as a list of dictionaries with keys ``pvName``,
+        ``equal``, ``value1`` and ``value2``. The values (``item["value"]``) are taken from
+        the first and the second snapshots respectively.
+
+        Parameters
+        ----------
+        only_different : bool, optional
+            Include only the PVs with different values. Default: False.
+
+        Returns
+        -------
+        list[dict]
+            Results of the comparison.
+        """
+        results = []
+        for name, eq, n1, n2 in zip(self._pv_names, self._equal, self._index1, self._index2):
+            if only_different and eq:
+                continue
+            results.append(
+                {
+                    "pvName": name,
+                    "equal": bool(eq),
+                    "value1": self._table1.item(n1).get("value", None),
+                    "value2": self._table2.item(n2).get("value", None),
+                }
+            )
+        return results
@@ -0,0 +1,300 @@
+import json
+import math
+import os
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa, pq = None, None
+
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+# Columns of the exported table: (name, type, fill value used in HDF5 files for missing data).
+#   Types: "str" - string, "f8" - float64, "f8[]" - variable length array of float64,
+#   "i8" - int64, "i4" - int32.
+_COLUMNS = (
+    ("snapshot_uid", "str", ""),
+    ("snapshot_name", "str", ""),
+    ("pv_name", "str", ""),
+    ("value_type", "str", ""),
+    ("value", "f8", math.nan),
+    ("value_array", "f8[]", None),
+    ("value_text", "str", ""),
+    ("severity", "str", ""),
+    ("status", "str", ""),
+    ("alarm_name", "str", ""),
+    ("unix_sec", "i8", 0),
+    ("nano_sec", "i4", -1),
+)
+
+_FILE_FORMATS = ("parquet", "arrow", "hdf5")
+_FILE_EXTENSIONS = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".h5": "hdf5",
+    ".hdf5": "hdf5",
+}
+
+
+def _is_number(v):
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+
+def _export_format(file_name, file_format):
+    """
+    Returns the file format. The format is selected based on the file extension if ``file_format``
+    is None. Raises ``ImportError`` if the package required for the format is not installed.
+    """
+    if file_format is None:
+        extension = os.path.splitext(str(file_name))[1].lower()
+        if extension not in _FILE_EXTENSIONS:
+            raise ValueError(
+                f"Failed to select the file format based on the extension of {str(file_name)!r}. "
+                f"Specify the format explicitly: {_FILE_FORMATS}."
+            )
+        file_format = _FILE_EXTENSIONS[extension]
+    if file_format not in _FILE_FORMATS:
+        raise ValueError(f"Unsupported file format: {file_format!r}. Supported formats: {_FILE_FORMATS}.")
+
+    if file_format in ("parquet", "arrow") and pa is None:
+        raise ImportError(f"Package 'pyarrow' is required to export {file_format!r} files: pip install pyarrow")
+    if file_format == "hdf5" and h5py is None:
+        raise ImportError("Package 'h5py' is required to export 'hdf5' files: pip install h5py")
+    return file_format
+
+
+def _export_row(item):
+    """
+    Returns the tuple of values of the columns (except ``snapshot_uid`` and ``snapshot_name``)
+    for the snapshot item. The missing values are None.
+    """
+    try:
+        pv_name = item["configPv"]["pvName"]
+    except (KeyError, TypeError) as ex:
+        raise ValueError(f"Snapshot item does not contain the PV name: {item!r}") from ex
+
+    value_type, scalar, array_value, text = None, math.nan, None, None
+    severity, status, alarm_name, unix_sec, nano_sec = None, None, None, None, None
+
+    value = item.get("value", None)
+    if isinstance(value, dict):
+        vtype = value.get("type", None)
+        value_type = vtype.get("name", None) if isinstance(vtype, dict) else None
+
+        v = value.get("value", None)
+        if _is_number(v):
+            scalar = float(v)
+        elif isinstance(v, list) and all(_is_number(_) for _ in v):
+            array_value = [float(_) for _ in v]
+        elif isinstance(v, str):
+            text = v
+        elif v is not None:
+            text = json.dumps(v)
+
+        alarm = value.get("alarm", None)
+        if isinstance(alarm, dict):
+            severity, status, alarm_name = (alarm.get(_, None) for _ in ("severity", "status", "name"))
+
+        time = value.get("time", None)
+        if (
+            isinstance(time, dict)
+            and isinstance(time.get("unixSec"), int)
+            and isinstance(time.get("nanoSec"), int)
+        ):
+            unix_sec, nano_sec = time["unixSec"], time["nanoSec"]
+
+    return pv_name, value_type, scalar, array_value, text, severity, status, alarm_name, unix_sec, nano_sec
+
+
+def _arrow_schema():
+    types = {
+        "str": pa.string(),
+        "f8": pa.float64(),
+        "f8[]": pa.list_(pa.float64()),
+        "i8": pa.int64(),
+        "i4": pa.int32(),
+    }
+    return pa.schema([(name, types[ctype]) for name, ctype, _ in _COLUMNS])
+
+
+def _hdf5_dtype(ctype):
+    types = {"str": h5py.string_dtype(), "f8[]": h5py.vlen_dtype(np.dtype("f8"))}
+    return types[ctype] if ctype in types else np.dtype(ctype)
+
+
+def _hdf5_column(values, ctype, fill):
+    if ctype == "f8[]":
+        # The elements are assigned one by one: NumPy creates 2D array from the arrays of equal size
+        column = np.empty(len(values), dtype=object)
+        for n, v in enumerate(values):
+            column[n] = np.asarray(v if v is not None else (), dtype="f8")
+        return column
+    values = [fill if _ is None else _ for _ in values]
+    return np.array(values, dtype=object if ctype == "str" else ctype)
+
+
+class SnapshotExportWriter:
+    """
+    Writer of snapshot items to a columnar file for offline analysis. Each snapshot item is
+    written as a row of the table with typed columns:
+
+    - ``snapshot_uid``, ``snapshot_name`` (string): the snapshot that contains the item;
+    - ``pv_name``, ``value_type`` (string): PV name and the value type (e.g. ``"VDouble"``);
+    - ``value`` (float64): scalar numeric value, NaN if the value is not a number;
+    - ``value_array`` (list of float64): numeric array value;
+    - ``value_text`` (string): string value or JSON representation of other values (e.g. enums);
+    - ``severity``, ``status``, ``alarm_name`` (string): alarm fields;
+    - ``unix_sec`` (int64), ``nano_sec`` (int32): timestamp of the value.
+
+    Missing values are stored as nulls in Parquet and Arrow files. HDF5 files do not support
+    nulls: missing strings are stored as empty strings, missing arrays as empty arrays and
+    missing timestamps as ``unix_sec=0``, ``nano_sec=-1``. HDF5 files contain one dataset
+    per column.
+
+    The items are buffered and written in chunks of ``chunk_size`` rows (row groups of Parquet
+    files, record batches of Arrow files or chunks of HDF5 datasets), so the memory used by
+    the writer does not depend on the number of exported items. Writing Parquet and Arrow files
+    requires ``pyarrow``, writing HDF5 files requires ``h5py``.
+
+    Parameters
+    ----------
+    file_name : str
+        Name of the created file. The existing file is overwritten.
+    file_format : str or None, optional
+        File format: ``"parquet"``, ``"arrow"`` (Arrow IPC file format, also known as Feather V2)
+        or ``"hdf5"``. If None, then the format is selected based on the file extension
+        (``.parquet``, ``.pq``, ``.arrow``, ``.feather``, ``.h5``, ``.hdf5``). Default: None.
+    chunk_size : int, optional
+        Number of rows written at once. Default: 10000.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        from save_and_restore_api import SaveRestoreAPI, SnapshotExportWriter
+
+        with SaveRestoreAPI(base_url="http://localhost:8080/save-restore") as SR:
+            with SnapshotExportWriter("snapshots.parquet") as writer:
+                for item in SR.snapshot_get_items_stream(snapshot_uid):
+                    writer.append(item, snapshot_uid=snapshot_uid, snapshot_name="Daily snapshot")
+
+        import pyarrow.parquet as pq
+        df = pq.read_table("snapshots.parquet").to_pandas()
+    """
+
+    def __init__(self, file_name, *, file_format=None, chunk_size=10000):
+        if not isinstance(chunk_size, int) or chunk_size < 1:
+            raise ValueError(f"Invalid 'chunk_size': {chunk_size!r}. Must be a positive integer.")
+        self._file_format = _export_format(file_name, file_format)
+        self._file_name = file_name
+        self._chunk_size = chunk_size
+        self._rows = []
+        self._n_items = 0
+
+        if self._file_format in ("parquet", "arrow"):
+            self._schema = _arrow_schema()
+            if self._file_format == "parquet":
+                self._writer = pq.ParquetWriter(file_name, self._schema)
+            else:
+                self._writer = pa.ipc.new_file(file_name, self._schema)
+        else:
+            self._writer = h5py.File(file_name, "w")
+            for name, ctype, _ in _COLUMNS:
+                self._writer.create_dataset(
+                    name,
+                    shape=(0,),
+                    maxshape=(None,),
+                    chunks=(chunk_size,),
+                    dtype=_hdf5_dtype(ctype),
+                    compression="gzip",
+                )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def file_format(self):
+        """
+        Format of the file (``"parquet"``, ``"arrow"`` or ``"hdf5"``).
+        """
+        return self._file_format
+
+    @property
+    def n_items(self):
+        """
+        Number of items appended to the file (including the buffered items).
+        """
+        return self._n_items
+
+    def append(self, item, *, snapshot_uid, snapshot_name=None):
+        """
+        Append the snapshot item to the file. The items are written once ``chunk_size``
+        items are buffered.
+
+        Parameters
+        ----------
+        item : dict
+            Snapshot item as returned by the server (e.g. by ``snapshot_get_items_stream()``).
+        snapshot_uid : str
+            Unique ID of the snapshot.
+        snapshot_name : str or None, optional
+            Name of the snapshot.
+
+        Returns
+        -------
+        None
+        """
+        if self._writer is None:
+            raise RuntimeError("The writer is closed.")
+        self._rows.append((snapshot_uid, snapshot_name) + _export_row(item))
+        self._n_items += 1
+        if len(self._rows) >= self._chunk_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Write the buffered items to the file.
+        """
+        if not self._rows or self._writer is None:
+            return
+        columns = list(zip(*self._rows))
+        n_rows = len(self._rows)
+        self._rows = []
+
+        if self._file_format in ("parquet", "arrow"):
+            data = {name: list(values) for (name, _, _), values in zip(_COLUMNS, columns)}
+            self._writer.write_table(pa.Table.from_pydict(data, schema=self._schema))
+        else:
+            for (name, ctype, fill), values in zip(_COLUMNS, columns):
+                dataset = self._writer[name]
+                n_start = dataset.shape[0]
+                dataset.resize((n_start + n_rows,))
+                # Slice assignment fails for the arrays of empty arrays ('value_array' column)
+                dataset.write_direct(_hdf5_column(values, ctype, fill), dest_sel=np.s_[n_start:])
+
+    def close(self):
+        """
+        Write the buffered items and close the file. The method may be called multiple times.
+        """
+        if self._writer is None:
+            return
+        try:
+            self.flush()
+        finally:
+            self._writer.close()
+            self._writer = None
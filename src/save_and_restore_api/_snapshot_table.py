@@ -0,0 +1,319 @@
+import json
+import math
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Value kinds
+_KIND_OTHER, _KIND_FLOAT, _KIND_INT, _KIND_FLOAT_ARRAY, _KIND_INT_ARRAY = range(5)
+
+# Largest integer that is exactly represented by float64
+_MAX_EXACT_INT = 2**53
+
+_residual_encoder = json.JSONEncoder(sort_keys=True, separators=(",", ":"))
+
+
+def _is_number(v):
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+
+class SnapshotTable:
+    """
+    Compact columnar representation of snapshot items (``snapshotData["snapshotItems"]``).
+    The snapshot items returned by the server are lists of nested dictionaries, which require
+    a lot of memory for large snapshots. The table stores the commonly used fields in
+    columns: PV names, scalar numeric values, alarm severities and timestamps. The values of
+    array PVs (e.g. ``VDoubleArray``) are stored in a single buffer indexed by the offsets of
+    the arrays. The rest of the item data (value type, alarm status, display metadata, etc.)
+    is stored as a table of unique JSON strings shared by the items with identical metadata.
+    The table is converted back to the list of items (``to_items()``), which may be passed
+    to ``snapshot_add()``, ``snapshot_update()`` or ``restore_items()``.
+
+    The columns are returned as read-only NumPy arrays if NumPy is installed, otherwise as
+    ``array.array`` objects. The values of items that are not scalar numbers and the
+    timestamps of items that do not have timestamps are represented as NaN.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        from save_and_restore_api import SaveRestoreAPI, SnapshotTable
+
+        with SaveRestoreAPI(base_url="http://localhost:8080/save-restore") as SR:
+            table = SnapshotTable.from_snapshot_data(SR.snapshot_get(snapshot_uid))
+            # Streaming version: the list of items is never created
+            table = SnapshotTable.from_items(SR.snapshot_get_items_stream(snapshot_uid))
+
+            n = table.index("XF:31ID-ES{Det:1}Val")
+            print(table.pv_names[n], table.values[n], table.severities[n])
+
+            SR.restore_items(snapshotItems=table.to_items())
+    """
+
+    def __init__(self):
+        self._pv_names = []
+        self._kinds = array("b")
+        self._values = array("d")
+        self._array_offsets = array("q", [0])
+        self._array_data = array("d")
+        self._severity_codes = array("h")
+        self._unix_sec = array("q")
+        self._nano_sec = array("l")
+        self._residual_codes = array("l")
+
+        # Interned strings: severities and JSON representations of the remaining item data
+        self._severity_labels, self._severity_lookup = [], {}
+        self._residuals, self._residual_lookup = [], {}
+
+        self._pv_index = None
+
+    @classmethod
+    def from_items(cls, items):
+        """
+        Create the table from the list (or any iterable, e.g. ``snapshot_get_items_stream()``)
+        of snapshot items.
+
+        Parameters
+        ----------
+        items : iterable of dict
+            Snapshot items. Each item must contain the PV name (``item["configPv"]["pvName"]``).
+
+        Returns
+        -------
+        SnapshotTable
+            The new table.
+        """
+        table = cls()
+        for item in items:
+            table.append(item)
+        return table
+
+    @classmethod
+    def from_snapshot_data(cls, snapshotData):
+        """
+        Create the table from snapshot data (``snapshotData``) returned by ``snapshot_get()``.
+
+        Parameters
+        ----------
+        snapshotData : dict
+            Snapshot data. The required field is ``"snapshotItems"``.
+
+        Returns
+        -------
+        SnapshotTable
+            The new table.
+        """
+        return cls.from_items(snapshotData["snapshotItems"])
+
+    @staticmethod
+    def _intern(value, labels, lookup):
+        code = lookup.get(value, None)
+        if code is None:
+            code = lookup[value] = len(labels)
+            labels.append(value)
+        return code
+
+    def append(self, item):
+        """
+        Append the snapshot item to the table. The table may be filled incrementally, e.g.
+        from the items yielded by ``snapshot_get_items_stream()`` of the async client.
+
+        Parameters
+        ----------
+        item : dict
+            Snapshot item. The item must contain the PV name (``item["configPv"]["pvName"]``).
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        ValueError
+            The item does not contain the PV name.
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            from save_and_restore_api import SnapshotTable
+            from save_and_restore_api.aio import SaveRestoreAPI
+
+            async with SaveRestoreAPI(base_url="http://localhost:8080/save-restore") as SR:
+                table = SnapshotTable()
+                async for item in SR.snapshot_get_items_stream(snapshot_uid):
+                    table.append(item)
+        """
+        try:
+            pv_name = item["configPv"]["pvName"]
+        except (KeyError, TypeError) as ex:
+            raise ValueError(f"Snapshot item does not contain the PV name: {item!r}") from ex
+
+        # 'residual' is the item without the data stored in columns
+        residual = dict(item)
+        residual["configPv"] = {k: v for k, v in item["configPv"].items() if k != "pvName"}
+
+        kind, scalar, array_values = _KIND_OTHER, math.nan, ()
+        severity_code, unix_sec, nano_sec = -1, 0, -1
+
+        value = item.get("value", None)
+        if isinstance(value, dict):
+            value = residual["value"] = dict(value)
+            v = value.get("value", None)
+            if _is_number(v) and not (isinstance(v, int) and abs(v) > _MAX_EXACT_INT):
+                kind, scalar = (_KIND_INT if isinstance(v, int) else _KIND_FLOAT), v
+                del value["value"]
+            elif isinstance(v, list) and all(_is_number(_) for _ in v):
+                if all(isinstance(_, int) for _ in v):
+                    if all(abs(_) <= _MAX_EXACT_INT for _ in v):
+                        kind, array_values = _KIND_INT_ARRAY, v
+                else:
+                    kind, array_values = _KIND_FLOAT_ARRAY, v
+                if kind != _KIND_OTHER:
+                    del value["value"]
+
+            alarm = value.get("alarm", None)
+            if isinstance(alarm, dict) and isinstance(alarm.get("severity", None), str):
+                severity_code = self._intern(alarm["severity"], self._severity_labels, self._severity_lookup)
+                value["alarm"] = {k: v for k, v in alarm.items() if k != "severity"}
+
+            time = value.get("time", None)
+            if (
+                isinstance(time, dict)
+                and isinstance(time.get("unixSec"), int)
+                and isinstance(time.get("nanoSec"), int)
+            ):
+                unix_sec, nano_sec = time["unixSec"], time["nanoSec"]
+                value["time"] = {k: v for k, v in time.items() if k not in ("unixSec", "nanoSec")}
+
+        residual_code = self._intern(_residual_encoder.encode(residual), self._residuals, self._residual_lookup)
+
+        self._pv_names.append(pv_name)
+        self._kinds.append(kind)
+        self._values.append(scalar)
+        self._array_data.extend(array_values)
+        self._array_offsets.append(len(self._array_data))
+        self._severity_codes.append(severity_code)
+        self._unix_sec.append(unix_sec)
+        self._nano_sec.append(nano_sec)
+        self._residual_codes.append(residual_code)
+        self._pv_index = None
+
+    def __len__(self):
+        return len(self._pv_names)
+
+    def __iter__(self):
+        for n in range(len(self)):
+            yield self.item(n)
+
+    def __getitem__(self, index):
+        return self.item(index)
+
+    @staticmethod
+    def _column(data):
+        if np is not None:
+            column = np.frombuffer(data, dtype=np.dtype(data.typecode))
+            column.flags.writeable = False
+            return column
+        return array(data.typecode, data)
+
+    @property
+    def pv_names(self):
+        """
+        PV names (tuple of str).
+        """
+        return tuple(self._pv_names)
+
+    @property
+    def values(self):
+        """
+        Scalar numeric values (float64). NaN for array PVs and the PVs with non-numeric values.
+        """
+        return self._column(self._values)
+
+    @property
+    def is_array(self):
+        """
+        Boolean mask (list of bool if NumPy is not installed) of the items with array values.
+        """
+        mask = [_ in (_KIND_FLOAT_ARRAY, _KIND_INT_ARRAY) for _ in self._kinds]
+        return np.array(mask, dtype=bool) if np is not None else mask
+
+    @property
+    def severities(self):
+        """
+        Alarm severities (list of str). None if the item has no alarm data.
+        """
+        labels = self._severity_labels
+        return [labels[_] if _ >= 0 else None for _ in self._severity_codes]
+
+    @property
+    def timestamps(self):
+        """
+        Timestamps of the values in seconds since epoch (float64). NaN if the item has no timestamp.
+        """
+        ts = array("d", (s + ns * 1e-9 if ns >= 0 else math.nan for s, ns in zip(self._unix_sec, self._nano_sec)))
+        return self._column(ts)
+
+    def index(self, pv_name):
+        """
+        Returns the index of the item with the PV name. Raises ``KeyError`` if the PV is not found.
+        If multiple items have the same PV name, then the index of the first item is returned.
+        """
+        if self._pv_index is None:
+            self._pv_index = {}
+            for n, name in enumerate(self._pv_names):
+                self._pv_index.setdefault(name, n)
+        return self._pv_index[pv_name]
+
+    def array_value(self, index):
+        """
+        Returns the value of the array PV (NumPy array or ``array.array``) or None if
+        the value is not a numeric array.
+        """
+        kind = self._kinds[index]
+        if kind not in (_KIND_FLOAT_ARRAY, _KIND_INT_ARRAY):
+            return None
+        start, stop = self._array_offsets[index], self._array_offsets[index + 1]
+        return self._column(self._array_data[start:stop])
+
+    def item(self, index):
+        """
+        Returns the snapshot item (dict) in the format used by the server.
+        """
+        index = range(len(self))[index]
+        item = json.loads(self._residuals[self._residual_codes[index]])
+        item["configPv"]["pvName"] = self._pv_names[index]
+
+        kind = self._kinds[index]
+        if kind == _KIND_FLOAT:
+            item["value"]["value"] = self._values[index]
+        elif kind == _KIND_INT:
+            item["value"]["value"] = int(self._values[index])
+        elif kind in (_KIND_FLOAT_ARRAY, _KIND_INT_ARRAY):
+            data = self._array_data[self._array_offsets[index] : self._array_offsets[index + 1]]
+            item["value"]["value"] = data.tolist() if kind == _KIND_FLOAT_ARRAY else [int(_) for _ in data]
+
+        if self._severity_codes[index] >= 0:
+            item["value"]["alarm"]["severity"] = self._severity_labels[self._severity_codes[index]]
+        if self._nano_sec[index] >= 0:
+            item["value"]["time"].update({"unixSec": self._unix_sec[index], "nanoSec": self._nano_sec[index]})
+        return item
+
+    def to_items(self):
+        """
+        Returns the list of snapshot items. The list may be used as ``snapshotData["snapshotItems"]``
+        (e.g. in ``snapshot_add()``) or passed to ``restore_items()``.
+        """
+        return list(self)
+
+    def to_snapshot_data(self):
+        """
+        Returns snapshot data (``{"snapshotItems": [...]}``) that may be passed to ``snapshot_add()``.
+        """
+        return {"snapshotItems": self.to_items()}
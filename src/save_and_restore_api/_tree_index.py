@@ -0,0 +1,226 @@
+import copy
+import threading
+
+
+class NodeTreeIndex:
+    """
+    Local index of the tree of nodes. The index is created by ``tree_index_load()`` API
+    and contains the nodes of a subtree: the node metadata, UIDs of parent nodes and paths
+    of the nodes. The index allows to find nodes by path and parents of nodes without
+    sending requests to the server. The index is updated when the nodes are added, updated,
+    moved or deleted using the API object that owns the index. Changes made by other clients
+    are not tracked, so the index should be reloaded if such changes are expected.
+
+    The paths are represented as strings that contain names of the nodes separated by ``/``,
+    e.g. ``/detectors/imaging/eiger_config``. The root node (``ROOT_NODE_UID``) has path ``/``.
+
+    If ``folders_only`` is True, then the index contains only the children of the folders
+    (folders and configurations). The children of the configurations (snapshots) are not
+    indexed and their paths are not covered by the index.
+    """
+
+    def __init__(self, *, root_uid, root_path, folders_only=False):
+        self._root_uid = root_uid
+        self._root_path = self._normalize_path(root_path)
+        self._folders_only = folders_only
+        self._nodes = {}
+        self._parents = {}
+        self._children = {root_uid: []}
+        self._uid_paths = {root_uid: self._root_path}
+        self._path_uids = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _normalize_path(path):
+        """
+        Normalize the path: remove extra spaces and the trailing '/'. The path of the root
+        node is represented as an empty string.
+        """
+        path = path.strip().rstrip("/")
+        if path and not path.startswith("/"):
+            path = "/" + path
+        return path
+
+    @property
+    def root_uid(self):
+        """
+        UID of the root node of the indexed subtree.
+        """
+        return self._root_uid
+
+    @property
+    def root_path(self):
+        """
+        Path of the root node of the indexed subtree.
+        """
+        return self._root_path or "/"
+
+    @property
+    def folders_only(self):
+        """
+        True if only the children of the folders are indexed.
+        """
+        return self._folders_only
+
+    def __len__(self):
+        with self._lock:
+            return len(self._nodes)
+
+    def __contains__(self, uid):
+        with self._lock:
+            return uid in self._nodes
+
+    def covers(self, path):
+        """
+        Returns True if the path points inside the indexed subtree. All the nodes
+        inside the subtree are in the index, therefore any node that is not found
+        in the index does not exist (assuming that the tree was not modified by
+        other clients). The paths of the children of the configurations are not covered
+        if only the children of the folders are indexed.
+        """
+        path = self._normalize_path(path)
+        if path == self._root_path or (self._root_path and not path.startswith(self._root_path + "/")):
+            return False
+        if self._folders_only:
+            # The children of the nodes other than folders are not indexed
+            with self._lock:
+                parent_path = path.rsplit("/", 1)[0]
+                while parent_path != self._root_path:
+                    if not all(self._children_indexed(_) for _ in self._path_uids.get(parent_path, [])):
+                        return False
+                    parent_path = parent_path.rsplit("/", 1)[0]
+        return True
+
+    def _children_indexed(self, uid):
+        """
+        Returns True if the children of the node are indexed.
+        """
+        return not self._folders_only or uid == self._root_uid or self._nodes[uid]["nodeType"] == "FOLDER"
+
+    def path_nodes(self, path):
+        """
+        Returns the list of nodes with the specified path. The list may contain
+        multiple nodes of different types. The list is empty if no nodes are found.
+        """
+        path = self._normalize_path(path)
+        with self._lock:
+            return [copy.deepcopy(self._nodes[_]) for _ in self._path_uids.get(path, [])]
+
+    def uid_get(self, path, *, node_type=None):
+        """
+        Returns UID of the node with the specified path or None if the node is not found.
+        The node type may be specified if the path points to multiple nodes.
+        """
+        path = self._normalize_path(path)
+        with self._lock:
+            for uid in self._path_uids.get(path, []):
+                if node_type is None or self._nodes[uid]["nodeType"] == node_type:
+                    return uid
+        return None
+
+    def node_get(self, uid):
+        """
+        Returns metadata of the node or None if the node is not in the index.
+        """
+        with self._lock:
+            node = self._nodes.get(uid, None)
+            return copy.deepcopy(node) if node is not None else None
+
+    def parent_get(self, uid):
+        """
+        Returns UID of the parent node or None if the node is not in the index.
+        """
+        with self._lock:
+            return self._parents.get(uid, None)
+
+    def path_get(self, uid):
+        """
+        Returns path of the node or None if the node is not in the index.
+        """
+        with self._lock:
+            path = self._uid_paths.get(uid, None)
+            return (path or "/") if path is not None else None
+
+    def add(self, parent_uid, node):
+        """
+        Add the node to the index. The node is ignored if the parent is not in the index
+        or the children of the parent are not indexed.
+        If the node already exists in the index, then its metadata is updated.
+        """
+        with self._lock:
+            if parent_uid not in self._uid_paths or not self._children_indexed(parent_uid):
+                return
+            uid = node["uniqueId"]
+            if uid in self._nodes:
+                self.remove([uid])
+            self._nodes[uid] = copy.deepcopy(node)
+            self._parents[uid] = parent_uid
+            self._children[parent_uid].append(uid)
+            self._children[uid] = []
+            self._set_path(uid, f"{self._uid_paths[parent_uid]}/{node['name']}")
+
+    def update(self, node):
+        """
+        Update metadata of an existing node, e.g. after the node was renamed or tagged.
+        """
+        with self._lock:
+            uid = node.get("uniqueId", None)
+            if uid not in self._nodes:
+                return
+            self._nodes[uid] = copy.deepcopy(node)
+            self._update_subtree_paths(uid)
+
+    def remove(self, uids):
+        """
+        Remove the nodes and their descendants from the index.
+        """
+        with self._lock:
+            for uid in uids:
+                if uid not in self._nodes:
+                    continue
+                parent_uid = self._parents[uid]
+                self._children[parent_uid].remove(uid)
+                pending = [uid]
+                while pending:
+                    _uid = pending.pop()
+                    pending.extend(self._children.pop(_uid, []))
+                    self._remove_path(_uid)
+                    del self._nodes[_uid]
+                    del self._parents[_uid]
+
+    def move(self, uids, new_parent_uid):
+        """
+        Move the nodes to a new parent. The nodes are removed from the index if the new
+        parent is not in the index or the children of the new parent are not indexed.
+        """
+        with self._lock:
+            if new_parent_uid not in self._uid_paths or not self._children_indexed(new_parent_uid):
+                self.remove(uids)
+                return
+            for uid in uids:
+                if uid not in self._nodes:
+                    continue
+                self._children[self._parents[uid]].remove(uid)
+                self._children[new_parent_uid].append(uid)
+                self._parents[uid] = new_parent_uid
+                self._update_subtree_paths(uid)
+
+    def _set_path(self, uid, path):
+        self._remove_path(uid)
+        self._uid_paths[uid] = path
+        self._path_uids.setdefault(path, []).append(uid)
+
+    def _remove_path(self, uid):
+        path = self._uid_paths.pop(uid, None)
+        if path is not None and path in self._path_uids:
+            self._path_uids[path].remove(uid)
+            if not self._path_uids[path]:
+                del self._path_uids[path]
+
+    def _update_subtree_paths(self, uid):
+        pending = [uid]
+        while pending:
+            _uid = pending.pop()
+            parent_path = self._uid_paths[self._parents[_uid]]
+            self._set_path(_uid, f"{parent_path}/{self._nodes[_uid]['name']}")
+            pending.extend(self._children[_uid])
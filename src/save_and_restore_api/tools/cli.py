@@ -1,14 +1,16 @@
 import argparse
-import getpass
+import functools
 import logging
 import os
-import pprint
 import sys
 import time
 from dataclasses import dataclass
 
 import save_and_restore_api
-from save_and_restore_api import SaveRestoreAPI
+
+# The modules that are slow to import (the API based on 'httpx', 'asyncio', 'pprint' etc.) are
+#   imported by the functions that use them, so that '--help' and invalid parameters are
+#   processed without loading the modules needed only to communicate with the server.
 
 version = save_and_restore_api.__version__
 
@@ -34,6 +36,13 @@ class Settings:
     config_name: str = None
     file_name: str = None
     file_format: str = None
+    manifest: str = None
+    directory: str = None
+    node_name: str = None
+    dest_url: str = None
+    dest_folder: str = None
+    uid_map: str = None
+    max_concurrency: int = 8
     timeout: float = 5
 
 
@@ -94,6 +103,13 @@ def parse_args(settings):
         "        on the list of PVs loaded from file. The file name and format are specified\n"
         "        using the '--file-name' ('-f') and '--file-format' parameters.\n"
         "    CONFIG UPDATE: update an existing config node.\n"
+        "    CONFIG ADD-OR-UPDATE: create a new or update an existing config node.\n"
+        "    CONFIG SYNC: create or update multiple config nodes. The list of configs and files\n"
+        "        is loaded from the manifest file ('--manifest') or the files are found in\n"
+        "        the directory tree ('--dir'). The configs are processed concurrently.\n"
+        "    REPLICATE: copy a subtree of nodes from the host ('--base-url') to another host\n"
+        "        ('--dest-url'). Re-runs with the same UID map file ('--uid-map') copy only\n"
+        "        the nodes modified since the previous run.\n"
         "\n"
         "Host URL specified as the '--base-url' parameter. User authenticates by the user name\n"
         "(--user-name) and the password. The user name and the password can be passed using\n"
@@ -143,7 +159,29 @@ def parse_args(settings):
         "\n"
         "  save-and-restore --base-url http://localhost:8080/save-restore --user-name=user \\\n"
         "    CONFIG ADD-OR-UPDATE --config-name /detectors/imaging/eiger_config \\\n"
-        "    --file-name eiger_pvs.sav --file-format autosave\n",
+        "    --file-name eiger_pvs.sav --file-format autosave\n"
+        "\n"
+        "  Add or update the configuration nodes listed in the manifest file ``configs.csv``.\n"
+        "  Each line of the manifest contains the config name and the file name, e.g.\n"
+        "  '/detectors/imaging/eiger_config,eiger_pvs.sav':\n"
+        "\n"
+        "  save-and-restore --base-url http://localhost:8080/save-restore --user-name=user \\\n"
+        "    --create-folders=ON CONFIG SYNC --manifest configs.csv\n"
+        "\n"
+        "  Add or update the configuration nodes for all '.sav' files in the directory tree\n"
+        "  ``autosave``. The file ``autosave/imaging/eiger.sav`` is loaded into the config\n"
+        "  node ``/detectors/imaging/eiger``:\n"
+        "\n"
+        "  save-and-restore --base-url http://localhost:8080/save-restore --user-name=user \\\n"
+        "    --create-folders=ON CONFIG SYNC --dir autosave --config-name /detectors\n"
+        "\n"
+        "  Replicate the folder '/detectors' to the folder '/commissioning' on another host.\n"
+        "  The user name and the password are used to authenticate with the destination host:\n"
+        "\n"
+        "  save-and-restore --base-url http://ops-host:8080/save-restore --user-name=user \\\n"
+        "    --create-folders=ON REPLICATE --node-name /detectors \\\n"
+        "    --dest-url http://comm-host:8080/save-restore --dest-folder /commissioning \\\n"
+        "    --uid-map detectors.jsonl\n",
         formatter_class=formatter,
     )
 
@@ -348,6 +386,110 @@ def parse_args(settings):
         "Default: '%(default)s'.",
     )
 
+    parser_config_sync = subparser_config_operation.add_parser(
+        "SYNC",
+        help="Add new or update the existing configuration nodes listed in the manifest "
+        "or found in the directory.",
+        formatter_class=formatter,
+    )
+
+    parser_config_sync.add_argument(
+        "--manifest",
+        dest="manifest",
+        type=str,
+        default=None,
+        help="Name of the manifest file (CSV). Each line of the file contains the configuration name "
+        "including folders and the name of the file used as a source of PV names, e.g. "
+        "'/detectors/imaging/eiger_config,eiger_pvs.sav'. Relative file names are relative to "
+        "the directory of the manifest. Lines starting with '#' are ignored.",
+    )
+
+    parser_config_sync.add_argument(
+        "--dir",
+        dest="directory",
+        type=str,
+        default=None,
+        help="Directory with the files used as a source of PV names. The files are searched in "
+        "the directory tree. The configuration name is the path of the file relative to the directory "
+        "without the extension, appended to the folder specified by '--config-name'.",
+    )
+
+    parser_config_sync.add_argument(
+        "--config-name",
+        dest="config_name",
+        type=str,
+        default="/",
+        help="Folder for the configurations created from the files found in '--dir', "
+        "e.g. /detectors. Default: '%(default)s'.",
+    )
+
+    parser_config_sync.add_argument(
+        "--file-format",
+        dest="file_format",
+        type=str,
+        choices=["autosave"],
+        default="autosave",
+        help="Format of the files. Default: '%(default)s'",
+    )
+
+    parser_config_sync.add_argument(
+        "--max-concurrency",
+        dest="max_concurrency",
+        type=int,
+        default=8,
+        help="Maximum number of configurations processed concurrently. Default: %(default)s.",
+    )
+
+    parser_replicate = subparser_command.add_parser(
+        "REPLICATE",
+        help="Copy a subtree of nodes to another host.",
+        formatter_class=formatter,
+    )
+
+    parser_replicate.add_argument(
+        "--node-name",
+        dest="node_name",
+        type=str,
+        default="/",
+        help="Full name of the folder or configuration node (root of the copied subtree), "
+        "e.g. /detectors. If the name is '/', then all the nodes are copied. Default: '%(default)s'.",
+    )
+
+    parser_replicate.add_argument(
+        "--dest-url",
+        dest="dest_url",
+        type=str,
+        default=None,
+        help="Base URL of the destination host, e.g. http://localhost:8080/save-restore.",
+    )
+
+    parser_replicate.add_argument(
+        "--dest-folder",
+        dest="dest_folder",
+        type=str,
+        default="/",
+        help="Full name of the folder on the destination host where the subtree is copied. "
+        "Default: '%(default)s'.",
+    )
+
+    parser_replicate.add_argument(
+        "--uid-map",
+        dest="uid_map",
+        type=str,
+        default=None,
+        help="Name of the file that maps UIDs of the source nodes to UIDs of the copied nodes. "
+        "The file is created if it does not exist. If the file is specified, then repeated runs "
+        "copy only the new nodes and the nodes modified since the previous run.",
+    )
+
+    parser_replicate.add_argument(
+        "--max-concurrency",
+        dest="max_concurrency",
+        type=int,
+        default=8,
+        help="Maximum number of nodes copied concurrently. Default: %(default)s.",
+    )
+
     class ExitOnError(Exception):
         pass
 
@@ -396,6 +538,25 @@ def parse_args(settings):
                 if not success:
                     parser_config_add.print_help()
                     raise ExitOnError()
+
+            elif args.operation == "SYNC":
+                settings.operation = args.operation
+                settings.manifest = args.manifest
+                settings.directory = args.directory
+                settings.config_name = args.config_name
+                settings.file_format = args.file_format
+                settings.max_concurrency = args.max_concurrency
+                settings.show_data = False
+                success = True
+                if bool(settings.manifest) == bool(settings.directory):
+                    logger.error("Exactly one of '--manifest' or '--dir' parameters must be specified")
+                    success = False
+                if settings.max_concurrency < 1:
+                    logger.error("The value of '--max-concurrency' parameter must be a positive integer")
+                    success = False
+                if not success:
+                    parser_config_sync.print_help()
+                    raise ExitOnError()
             if not success:
                 parser_config.print_help()
                 raise ExitOnError()
@@ -403,12 +564,36 @@ def parse_args(settings):
         elif args.command == "LOGIN":
             settings.command = args.command
 
+        elif args.command == "REPLICATE":
+            settings.command = args.command
+            settings.node_name = args.node_name
+            settings.dest_url = args.dest_url
+            settings.dest_folder = args.dest_folder
+            settings.uid_map = args.uid_map
+            settings.max_concurrency = args.max_concurrency
+            success = True
+            if not settings.dest_url:
+                logger.error("Required '--dest-url' parameter is not specified")
+                success = False
+            if settings.max_concurrency < 1:
+                logger.error("The value of '--max-concurrency' parameter must be a positive integer")
+                success = False
+            if not success:
+                parser_replicate.print_help()
+                raise ExitOnError()
+
         else:
             parser.print_help()
             raise ExitOnError()
 
         if settings.file_name:
             settings.file_name = os.path.abspath(os.path.expanduser(settings.file_name))
+        if settings.manifest:
+            settings.manifest = os.path.abspath(os.path.expanduser(settings.manifest))
+        if settings.directory:
+            settings.directory = os.path.abspath(os.path.expanduser(settings.directory))
+        if settings.uid_map:
+            settings.uid_map = os.path.abspath(os.path.expanduser(settings.uid_map))
 
     except ExitOnError:
         exit(EXIT_CODE_CLI_PARAMETER_ERROR)
@@ -436,10 +621,26 @@ def print_settings(settings):
     print(f"User name: {settings.user_name}")
     print(f"User password: {'*********' if settings.user_password else None}")
     print(f"Verbose output: {settings.verbose_output}")
-    if settings.command == "CONFIG":
+    if settings.command == "CONFIG" and settings.operation == "SYNC":
+        print(f"Create folders: {settings.create_folders}")
+        if settings.manifest:
+            print(f"Manifest: {settings.manifest}")
+        else:
+            print(f"Directory: {settings.directory}")
+            print(f"Config folder: {settings.config_name}")
+        print(f"File format: {settings.file_format}")
+        print(f"Max concurrency: {settings.max_concurrency}")
+    elif settings.command == "REPLICATE":
+        print(f"Node name: {settings.node_name}")
+        print(f"Destination URL: {settings.dest_url}")
+        print(f"Destination folder: {settings.dest_folder}")
+        print(f"Create folders: {settings.create_folders}")
+        print(f"UID map: {settings.uid_map}")
+        print(f"Max concurrency: {settings.max_concurrency}")
+    elif settings.command == "CONFIG":
         print(f"Config name: {settings.config_name}")
         print(f"Show data: {settings.show_data}")
-        if settings.operation in ("ADD", "UPDATE"):
+        if settings.operation in ("ADD", "UPDATE", "ADD-OR-UPDATE"):
             print(f"Create folders: {settings.create_folders}")
             print(f"File name: {settings.file_name}")
             print(f"File format: {settings.file_format}")
@@ -471,23 +672,27 @@ def set_username_password(settings):
     if not isinstance(password, str):
         if not user_name_interactive:
             print(f"Username: {user_name}")
+        import getpass
+
         password = getpass.getpass()
     settings.user_name = user_name
     settings.user_password = password
     print("")
 
 
-def check_connection(SR):
+async def check_connection(SR):
+    import pprint
+
     logger.debug("Connecting to the Save-and-Restore service ...")
     try:
-        info = SR.info_get()
+        info = await SR.info_get()
     except (SR.HTTPClientError, SR.HTTPRequestError) as ex:
         logger.debug("Failed to connect to Save-and-Restore service.")
         raise RuntimeError(f"Failed to connect to the Save-and-Restore service: {ex}") from ex
     logger.debug(f"Save-and-Restore info:\n{pprint.pformat(info)}")
 
 
-def process_login_command(settings):
+async def process_login_command(settings):
     """
     Process the LOGIN command, which checks of user name and password are valid.
     Raises an exception if the operation fails.
@@ -501,15 +706,17 @@ def process_login_command(settings):
     -------
     None
     """
+    from save_and_restore_api.aio import SaveRestoreAPI
+
     # Interactively ask for user name and password if necessary
     set_username_password(settings)
 
-    with SaveRestoreAPI(base_url=settings.base_url, timeout=settings.timeout) as SR:
+    async with SaveRestoreAPI(base_url=settings.base_url, timeout=settings.timeout) as SR:
         try:
-            check_connection(SR=SR)
+            await check_connection(SR=SR)
 
             logger.debug("Sending 'login' request ...")
-            response = SR.login(username=settings.user_name, password=settings.user_password)
+            response = await SR.login(username=settings.user_name, password=settings.user_password)
             logger.debug(f"Response received: {response}")
 
             print("Login successful.")
@@ -517,7 +724,7 @@ def process_login_command(settings):
             raise RuntimeError(f"Login failed: {ex}") from ex
 
 
-def check_node_exists(SR, config_name, *, node_type="CONFIGURATION"):
+async def check_node_exists(SR, config_name, *, node_type="CONFIGURATION"):
     """
     Returns uniqueId of the node if 'config_name' points to an existing configuration node.
     Otherwise returns None.
@@ -539,9 +746,11 @@ def check_node_exists(SR, config_name, *, node_type="CONFIGURATION"):
     if node_type not in ("CONFIGURATION", "FOLDER"):
         raise ValueError(f"Unsupported node type: {node_type}")
 
+    # The nodes inside the subtree loaded in the tree index (see 'load_tree_index()') are found
+    #   without sending requests to the server
     try:
         logger.debug(f"Sending 'structure_path_nodes' request for '{config_name}' ...")
-        nodes = SR.structure_path_nodes(config_name)
+        nodes = await SR.structure_path_nodes(config_name)
         logger.debug(f"Response received: {nodes}")
 
     except SR.HTTPClientError:
@@ -582,11 +791,51 @@ def split_node_path(node_path):
     return folders, name
 
 
-def create_missing_folders(SR, folder_name, *, create_folders=False):
+async def load_tree_index(SR, folder_name):
+    """
+    Load the tree index (see ``SaveRestoreAPI.tree_index_load()``) of the deepest existing folder
+    on the path ``folder_name``. Once the index is loaded, ``check_node_exists()`` and
+    ``create_missing_folders()`` find the folders and configurations inside the folder without
+    sending requests to the server. Only the folders are traversed (the snapshots are not
+    loaded), so the number of requests depends on the number of folders in the subtree.
+    The index is not loaded if none of the folders on the path exist, since loading the index
+    of the whole tree may take long.
+
+    Parameters
+    ----------
+    SR : SaveRestoreAPI
+        Current configured instance of SaveRestoreAPI.
+    folder_name: str
+        Full name of the folder node including the path.
+
+    Returns
+    -------
+    NodeTreeIndex or None
+        Loaded index or None if the index was not loaded.
+    """
+    folders = [_ for _ in folder_name.strip().split("/") if _]
+    for n in range(len(folders), 0, -1):
+        path = "/" + "/".join(folders[:n])
+        node_uid = await check_node_exists(SR, path, node_type="FOLDER")
+        if node_uid:
+            logger.debug(f"Loading the tree index of the folder {path!r} ...")
+            index = await SR.tree_index_load(node_uid, folders_only=True)
+            logger.debug(f"The tree index of the folder {path!r} is loaded: {len(index)} nodes.")
+            return index
+    return None
+
+
+async def create_missing_folders(SR, folder_name, *, create_folders=False, folder_uids=None, load_index=False):
     """
     Check if the folder ``folder_name`` exists. Create the folder if it it does not exist.
     Folders are created only if 'create_folders' is True. Returns ``node_uid`` for the existing
-    or created folder node, or *None* if the operation fails.
+    or created folder node, or *None* if the operation fails. The UIDs of the existing and
+    created folders are saved in ``folder_uids`` if the dictionary is passed, so the folders
+    are looked up only once when multiple configurations are created. The folders inside
+    the subtree of the tree index (see ``load_tree_index()``) are looked up locally, and
+    the folders inside a missing folder are not looked up. If ``load_index`` is True and
+    the folder is missing, then the tree index of the deepest existing folder on the path
+    is loaded before the missing folders are created.
 
     Parameters
     ----------
@@ -597,31 +846,54 @@ def create_missing_folders(SR, folder_name, *, create_folders=False):
     create_folders: bool
         If True, create missing folders if required. If False, the function only checks
         if the folder exists.
+    folder_uids: dict or None
+        Cache of UIDs of the folders (full folder name -> UID) shared between the calls.
+        Concurrent calls that share the cache must be serialized (e.g. using ``asyncio.Lock``).
+    load_index: bool
+        If True, load the tree index if the folder is missing and the path is not covered
+        by the loaded index.
 
     Returns
     -------
     str or None
         Unique ID of the existing or created folder node, or None if the operation fails.
     """
+    folder_uids = {} if folder_uids is None else folder_uids
     folders = folder_name.strip("/").split("/")
 
-    node_uid = check_node_exists(SR, folder_name, node_type="FOLDER")
+    node_uid = folder_uids.get(folder_name, None) or await check_node_exists(SR, folder_name, node_type="FOLDER")
     if create_folders and not node_uid:
-        path, parent_uid = "", SR.ROOT_NODE_UID
+        if load_index and (SR.tree_index is None or not SR.tree_index.covers(folder_name)):
+            # The folder 'folder_name' does not exist, start from its parent
+            await load_tree_index(SR, folder_name.rstrip("/").rsplit("/", 1)[0])
+        index = SR.tree_index
+        path, parent_uid, exists = "", SR.ROOT_NODE_UID, True
+        if index is not None and index.covers(folder_name) and index.root_path != "/":
+            # The folders on the path of the root of the index exist
+            path, parent_uid = index.root_path, index.root_uid
+            folders = folders[len(path.strip("/").split("/")) :]
         for f in folders:
             path += f"/{f}"
-            node_uid = check_node_exists(SR, path, node_type="FOLDER")
+            node_uid = folder_uids.get(path, None)
+            if not node_uid and exists:
+                node_uid = await check_node_exists(SR, path, node_type="FOLDER")
+                exists = bool(node_uid)
             if not node_uid:
-                response = SR.node_add(parent_uid, node={"name": f, "nodeType": "FOLDER"})
+                response = await SR.node_add(parent_uid, node={"name": f, "nodeType": "FOLDER"})
                 node_uid = response["uniqueId"]
+            folder_uids[path] = node_uid
             parent_uid = node_uid
 
+    if node_uid:
+        folder_uids[folder_name] = node_uid
     return node_uid
 
 
 def load_pvs_from_file(file_name, *, file_format):
     """
-    Load PV names from file.
+    Load PV names from file. The autosave files are memory-mapped and only PV names are
+    decoded (``autosave_read_pv_names()``), so large files are loaded quickly. The loading fails
+    if the file is incomplete (does not contain the ``<END>`` marker).
 
     Parameters
     ----------
@@ -632,29 +904,105 @@ def load_pvs_from_file(file_name, *, file_format):
 
     Returns
     -------
-    list(str)
-        List of PV names loaded from file.
+    list(dict)
+        List of PVs loaded from file in the format accepted by the API, e.g. ``[{"pvName": "PV:name"}]``.
     """
-    pv_names = []
+    from save_and_restore_api import autosave_read_pv_names
+
     if file_format == "autosave":
-        with open(file_name) as f:
-            for line in f:
-                ll = line.strip()
-                if ll.startswith("#") or ll.startswith("<"):
-                    continue
-                pv_name = ll.split(" ")[0]
-                if pv_name:
-                    pv_names.append(pv_name)
         # Convert PV list to the format accepted by the API
-        pv_names = [{"pvName": _} for _ in pv_names]
+        pv_names = [{"pvName": _} for _ in autosave_read_pv_names(file_name)]
     else:
         raise ValueError(f"Unsupported file format: {file_format}.")
     return pv_names
 
 
-def process_config_command(settings):
+async def load_pvs_from_file_async(file_name, *, file_format):
     """
-    Process the CONFIG command.
+    Load PV names from file (see ``load_pvs_from_file()``) in the default executor of the event
+    loop. The file is loaded while the requests to the server are in progress.
+
+    Parameters
+    ----------
+    file_name: str
+        Name of the file containing PV names.
+    file_format: str
+        Format of the file. Supported formats: "autosave".
+
+    Returns
+    -------
+    list(dict)
+        List of PVs loaded from file in the format accepted by the API.
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    func = functools.partial(load_pvs_from_file, file_name, file_format=file_format)
+    return await loop.run_in_executor(None, func)
+
+
+# Parameters of PVs compared by 'compare_pv_lists()'
+_PV_COMPARED_KEYS = ("readbackPvName", "comparison")
+
+
+def compare_pv_lists(pv_list_old, pv_list_new):
+    """
+    Compare two lists of PVs (``pvList`` of configuration data). PVs are matched by ``pvName``.
+    Matching PVs are modified if the read-back PV names (``readbackPvName``) or the comparison
+    parameters (``comparison``) are different. The order of PVs is ignored.
+
+    Parameters
+    ----------
+    pv_list_old: list(dict)
+        Existing list of PVs.
+    pv_list_new: list(dict)
+        New list of PVs.
+
+    Returns
+    -------
+    dict
+        Dictionary with the following keys: ``added``, ``removed``, ``modified``. The values are
+        sorted lists of PV names.
+    """
+
+    def index(pv_list):
+        return {_["pvName"]: tuple(_.get(k, None) for k in _PV_COMPARED_KEYS) for _ in pv_list}
+
+    pvs_old, pvs_new = index(pv_list_old), index(pv_list_new)
+    return {
+        "added": sorted(pvs_new.keys() - pvs_old.keys()),
+        "removed": sorted(pvs_old.keys() - pvs_new.keys()),
+        "modified": sorted(_ for _ in pvs_new.keys() & pvs_old.keys() if pvs_new[_] != pvs_old[_]),
+    }
+
+
+def print_pv_list_changes(changes):
+    """
+    Print the number of added, removed and modified PVs. The PV names are printed in debug mode.
+
+    Parameters
+    ----------
+    changes: dict
+        Changes returned by ``compare_pv_lists()``.
+
+    Returns
+    -------
+    None
+    """
+    print(
+        f"PVs added: {len(changes['added'])}, removed: {len(changes['removed'])}, "
+        f"modified: {len(changes['modified'])}"
+    )
+    for key in ("added", "removed", "modified"):
+        if changes[key]:
+            logger.debug(f"PVs {key}: {changes[key]}")
+
+
+async def process_config_command(settings):
+    """
+    Process the CONFIG command. Independent requests are sent concurrently: the connection is
+    checked while the config node is looked up and the file with PV names is loaded, then
+    the node and the configuration data are loaded simultaneously.
 
     Parameters
     ----------
@@ -665,6 +1013,11 @@ def process_config_command(settings):
     -------
     None
     """
+    import asyncio
+    import pprint
+
+    from save_and_restore_api.aio import SaveRestoreAPI
+
     if settings.file_name and not os.path.isfile(settings.file_name):
         raise ValueError(f"Input file {settings.file_name!r} does not exist.")
 
@@ -672,22 +1025,35 @@ def process_config_command(settings):
     if settings.operation != "GET":
         set_username_password(settings)
 
-    with SaveRestoreAPI(base_url=settings.base_url, timeout=settings.timeout) as SR:
+    async with SaveRestoreAPI(base_url=settings.base_url, timeout=settings.timeout) as SR:
         if settings.operation != "GET":
             logger.debug("Configuring authentication parameters ...")
             SR.auth_set(username=settings.user_name, password=settings.user_password)
 
-        check_connection(SR=SR)
-
         logger.debug(f"Checking if config node {settings.config_name!r} exists ...")
-        node_uid = check_node_exists(SR, settings.config_name, node_type="CONFIGURATION")
+        tasks = [check_connection(SR=SR), check_node_exists(SR, settings.config_name, node_type="CONFIGURATION")]
+        if settings.operation != "GET":
+            logger.debug(f"Loading PV names from file {settings.file_name!r} ...")
+            tasks.append(load_pvs_from_file_async(settings.file_name, file_format=settings.file_format))
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Connection errors are reported first. Errors of loading the file are reported
+        #   only if the PV list is needed for the operation.
+        for result in results[:2]:
+            if isinstance(result, Exception):
+                raise result
+        node_uid = results[1]
         logger.debug(f"Config node UID: {node_uid}")
 
-        logger.debug(f"Loading information for the node: {node_uid} ...")
-        config_node = SR.node_get(node_uid) if node_uid else None
+        def get_pv_list():
+            if isinstance(results[2], Exception):
+                raise results[2]
+            return results[2]
 
-        logger.debug(f"Loading data for the node: {node_uid} ...")
-        config_data = SR.config_get(node_uid) if node_uid else None
+        config_node, config_data = None, None
+        if node_uid:
+            logger.debug(f"Loading information and data for the node: {node_uid} ...")
+            config_node, config_data = await asyncio.gather(SR.node_get(node_uid), SR.config_get(node_uid))
 
         if settings.operation == "GET":
             logger.debug("Executing 'CONFIG GET' operation ...")
@@ -704,9 +1070,7 @@ def process_config_command(settings):
                 raise RuntimeError(f"Config node {settings.config_name!r} already exists.")
 
             else:
-                logger.debug(f"Loading PV names from file {settings.file_name!r} ...")
-                pv_list = load_pvs_from_file(settings.file_name, file_format=settings.file_format)
-
+                pv_list = get_pv_list()
                 print(f"Number of PVs loaded from file: {len(pv_list)}")
 
                 _folders, _config_name = split_node_path(settings.config_name)
@@ -716,12 +1080,14 @@ def process_config_command(settings):
                     raise ValueError(f"Config name is an empty string: {settings.config_name!r}")
 
                 logger.debug(f"Creating the folder {_folder_name!r} ...")
-                parent_uid = create_missing_folders(SR, _folder_name, create_folders=settings.create_folders)
+                parent_uid = await create_missing_folders(
+                    SR, _folder_name, create_folders=settings.create_folders, load_index=True
+                )
                 if parent_uid is None:
                     raise RuntimeError(f"The folder {_folder_name!r} does not exist.")
                 else:
                     logger.debug(f"Adding config node: parent UID: {parent_uid}, name: {_config_name!r}...")
-                    response = SR.config_add(
+                    response = await SR.config_add(
                         parent_uid,
                         configurationNode={"name": _config_name},
                         configurationData={"pvList": pv_list},
@@ -737,16 +1103,24 @@ def process_config_command(settings):
                 raise RuntimeError(f"Config node {settings.config_name!r} does not exist.")
 
             else:
-                logger.debug(f"Loading PV names from file {settings.file_name!r} ...")
-                pv_list = load_pvs_from_file(settings.file_name, file_format=settings.file_format)
-
+                pv_list = get_pv_list()
                 print(f"Number of PVs loaded from file: {len(pv_list)}")
 
+                changes = compare_pv_lists(config_data.get("pvList", None) or [], pv_list)
+                print_pv_list_changes(changes)
+
+                if not any(changes.values()):
+                    # Updating the config node without changes is unnecessary
+                    print(f"Config node is up to date:\n{pprint.pformat(config_node)}")
+                    if settings.show_data:
+                        print(f"Config data:\n{pprint.pformat(config_data)}")
+                    return
+
                 logger.debug(
                     f"Updating config node: node UID: {config_node['uniqueId']}, name: {config_node['name']!r} ..."
                 )
                 config_data["pvList"] = pv_list
-                response = SR.config_update(
+                response = await SR.config_update(
                     configurationNode=config_node,
                     configurationData=config_data,
                 )
@@ -756,6 +1130,327 @@ def process_config_command(settings):
                     print(f"Updated config data:\n{pprint.pformat(response['configurationData'])}")
 
 
+# Extensions of the files found by 'CONFIG SYNC' in the directory tree
+_FILE_EXTENSIONS = {"autosave": ".sav"}
+
+
+def load_sync_manifest(file_name):
+    """
+    Load the list of configurations from the manifest file. The manifest is a CSV file. Each line
+    contains the full configuration name and the name of the file used as a source of PV names.
+    Relative file names are relative to the directory of the manifest. Empty lines and lines
+    starting with ``#`` are ignored.
+
+    Parameters
+    ----------
+    file_name: str
+        Name of the manifest file.
+
+    Returns
+    -------
+    list(tuple(str, str))
+        List of tuples (config name, file name).
+    """
+    import csv
+
+    manifest_dir = os.path.dirname(file_name)
+    items = []
+    with open(file_name, newline="") as f:
+        for n, row in enumerate(csv.reader(f), 1):
+            row = [_.strip() for _ in row]
+            if not any(row) or row[0].startswith("#"):
+                continue
+            if len(row) != 2 or not all(row):
+                raise ValueError(f"Invalid line {n} in the manifest {file_name!r}: {','.join(row)!r}")
+            config_name, pv_file_name = row
+            pv_file_name = os.path.join(manifest_dir, os.path.expanduser(pv_file_name))
+            items.append((config_name, os.path.abspath(pv_file_name)))
+    return items
+
+
+def find_sync_files(directory, *, config_folder, file_format):
+    """
+    Find files with the extension matching the file format in the directory tree. The config name
+    is the path of the file relative to ``directory`` without the extension, appended to
+    ``config_folder``, e.g. the file ``<directory>/imaging/eiger.sav`` is mapped to the config
+    ``<config_folder>/imaging/eiger``.
+
+    Parameters
+    ----------
+    directory: str
+        Root directory of the directory tree.
+    config_folder: str
+        Folder for the configurations.
+    file_format: str
+        Format of the files. Supported formats: "autosave".
+
+    Returns
+    -------
+    list(tuple(str, str))
+        List of tuples (config name, file name) sorted by the config name.
+    """
+    if file_format not in _FILE_EXTENSIONS:
+        raise ValueError(f"Unsupported file format: {file_format}.")
+    if not os.path.isdir(directory):
+        raise ValueError(f"Directory {directory!r} does not exist.")
+    extension, config_folder = _FILE_EXTENSIONS[file_format], config_folder.strip().rstrip("/")
+    items = []
+    for dir_path, _, file_names in os.walk(directory):
+        for file_name in file_names:
+            if file_name.endswith(extension):
+                file_path = os.path.join(dir_path, file_name)
+                rel_path = os.path.relpath(file_path, directory)[: -len(extension)]
+                config_name = config_folder + "/" + "/".join(rel_path.split(os.sep))
+                items.append((config_name, file_path))
+    return sorted(items)
+
+
+async def sync_config(SR, config_name, file_name, *, file_format, create_folders, folder_uids, folder_lock):
+    """
+    Add new or update the existing configuration node based on the list of PVs loaded from file.
+    Missing folders are created if ``create_folders`` is True. The file is loaded while the config
+    node is looked up. Multiple configurations may be synced concurrently. The folder cache
+    ``folder_uids`` is shared between the tasks, and the folders are created while holding
+    the ``folder_lock``.
+
+    Parameters
+    ----------
+    SR : SaveRestoreAPI
+        Current configured instance of SaveRestoreAPI.
+    config_name: str
+        Full config name including the path.
+    file_name: str
+        Name of the file containing PV names.
+    file_format: str
+        Format of the file. Supported formats: "autosave".
+    create_folders: bool
+        Create missing folders if True.
+    folder_uids: dict
+        Cache of UIDs of the folders shared between the calls.
+    folder_lock: asyncio.Lock
+        Lock that protects ``folder_uids`` and folder creation.
+
+    Returns
+    -------
+    str
+        Operation: "ADDED", "UPDATED" or "UNCHANGED" (the existing config contains the same PVs).
+    int
+        Number of PVs loaded from file.
+    """
+    import asyncio
+
+    if not os.path.isfile(file_name):
+        raise ValueError(f"Input file {file_name!r} does not exist.")
+    pv_list, node_uid = await asyncio.gather(
+        load_pvs_from_file_async(file_name, file_format=file_format),
+        check_node_exists(SR, config_name, node_type="CONFIGURATION"),
+    )
+    if node_uid:
+        logger.debug(f"Updating config node {config_name!r}: node UID: {node_uid} ...")
+        config_data = await SR.config_get(node_uid)
+        changes = compare_pv_lists(config_data.get("pvList", None) or [], pv_list)
+        if not any(changes.values()):
+            return "UNCHANGED", len(pv_list)
+        logger.debug(
+            f"Config {config_name!r}: {len(changes['added'])} PVs added, {len(changes['removed'])} removed, "
+            f"{len(changes['modified'])} modified"
+        )
+        config_node = await SR.node_get(node_uid)
+        config_data["pvList"] = pv_list
+        await SR.config_update(configurationNode=config_node, configurationData=config_data)
+        return "UPDATED", len(pv_list)
+
+    _folders, _config_name = split_node_path(config_name)
+    _folder_name = "/" + "/".join(_folders)
+    if not _config_name:
+        raise ValueError(f"Config name is an empty string: {config_name!r}")
+
+    async with folder_lock:
+        parent_uid = await create_missing_folders(
+            SR, _folder_name, create_folders=create_folders, folder_uids=folder_uids
+        )
+    if parent_uid is None:
+        raise RuntimeError(f"The folder {_folder_name!r} does not exist.")
+
+    logger.debug(f"Adding config node: parent UID: {parent_uid}, name: {_config_name!r}...")
+    await SR.config_add(
+        parent_uid, configurationNode={"name": _config_name}, configurationData={"pvList": pv_list}
+    )
+    return "ADDED", len(pv_list)
+
+
+async def process_config_sync_command(settings):
+    """
+    Process the CONFIG SYNC command. The configurations are processed concurrently using
+    a single HTTP client. The number of configurations processed simultaneously is limited
+    by ``max_concurrency``. The summary of the operation is printed for each file.
+    Raises an exception if any of the configurations failed to sync.
+
+    Parameters
+    ----------
+    settings: Settings
+        Settings object with command line parameters.
+
+    Returns
+    -------
+    None
+    """
+    import asyncio
+
+    from save_and_restore_api.aio import SaveRestoreAPI
+
+    if settings.manifest:
+        if not os.path.isfile(settings.manifest):
+            raise ValueError(f"Manifest file {settings.manifest!r} does not exist.")
+        items = load_sync_manifest(settings.manifest)
+    else:
+        items = find_sync_files(
+            settings.directory, config_folder=settings.config_name, file_format=settings.file_format
+        )
+
+    if not items:
+        raise RuntimeError("No configurations to sync.")
+    print(f"Number of configurations to sync: {len(items)}")
+
+    # Interactively ask for user name and password if necessary
+    set_username_password(settings)
+
+    folder_uids, folder_lock = {}, asyncio.Lock()
+    semaphore = asyncio.Semaphore(settings.max_concurrency)
+
+    async with SaveRestoreAPI(
+        base_url=settings.base_url,
+        timeout=settings.timeout,
+        max_keepalive_connections=settings.max_concurrency,
+    ) as SR:
+        logger.debug("Configuring authentication parameters ...")
+        SR.auth_set(username=settings.user_name, password=settings.user_password)
+
+        await check_connection(SR=SR)
+
+        # The configurations are found and the missing folders are created using the tree index
+        #   of the common folder of the configurations
+        common_folders = os.path.commonprefix([split_node_path(_[0])[0] for _ in items])
+        await load_tree_index(SR, "/" + "/".join(common_folders))
+
+        async def process_item(item):
+            config_name, file_name = item
+            async with semaphore:
+                time_start = time.time()
+                try:
+                    operation, n_pvs = await sync_config(
+                        SR,
+                        config_name,
+                        file_name,
+                        file_format=settings.file_format,
+                        create_folders=settings.create_folders,
+                        folder_uids=folder_uids,
+                        folder_lock=folder_lock,
+                    )
+                    error = None
+                except Exception as ex:
+                    logger.debug(f"Failed to sync config {config_name!r}: {ex}")
+                    operation, n_pvs, error = "FAILED", None, ex
+                return operation, n_pvs, time.time() - time_start, error
+
+        time_start = time.time()
+        results = await asyncio.gather(*[process_item(_) for _ in items])
+        total_time = time.time() - time_start
+
+    print(f"\n{'STATUS':<9} {'PVS':>7} {'TIME, s':>8}  CONFIG <- FILE")
+    for (config_name, file_name), (operation, n_pvs, duration, error) in zip(items, results):
+        n_pvs = "-" if n_pvs is None else n_pvs
+        print(f"{operation:<9} {n_pvs:>7} {duration:>8.3f}  {config_name} <- {file_name}")
+        if error is not None:
+            print(f"{'':<9} {'':>7} {'':>8}  Error: {error}")
+
+    n_failed = sum(_[0] == "FAILED" for _ in results)
+    n_added = sum(_[0] == "ADDED" for _ in results)
+    n_updated = sum(_[0] == "UPDATED" for _ in results)
+    n_unchanged = sum(_[0] == "UNCHANGED" for _ in results)
+    print(
+        f"\nTotal: {len(items)} configurations ({n_added} added, {n_updated} updated, "
+        f"{n_unchanged} unchanged, {n_failed} failed) in {total_time:.3f} s"
+    )
+    if n_failed:
+        raise RuntimeError(f"Failed to sync {n_failed} of {len(items)} configurations.")
+
+
+async def process_replicate_command(settings):
+    """
+    Process the REPLICATE command. The subtree is copied from the host ``base_url`` to the host
+    ``dest_url``. The user is authenticated with the destination host. The number of added,
+    updated and unchanged nodes and the list of errors are printed. Raises an exception if
+    any of the nodes failed to replicate.
+
+    Parameters
+    ----------
+    settings: Settings
+        Settings object with command line parameters.
+
+    Returns
+    -------
+    None
+    """
+    import asyncio
+
+    from save_and_restore_api.aio import SaveRestoreAPI
+
+    # Interactively ask for user name and password if necessary
+    set_username_password(settings)
+
+    kwargs = {"timeout": settings.timeout, "max_keepalive_connections": settings.max_concurrency}
+    SR_src = SaveRestoreAPI(base_url=settings.base_url, **kwargs)
+    SR_dst = SaveRestoreAPI(base_url=settings.dest_url, **kwargs)
+    async with SR_src, SR_dst:
+        logger.debug("Configuring authentication parameters ...")
+        SR_dst.auth_set(username=settings.user_name, password=settings.user_password)
+
+        await asyncio.gather(check_connection(SR=SR_src), check_connection(SR=SR_dst))
+
+        node_uid = SR_src.ROOT_NODE_UID
+        if settings.node_name.strip("/"):
+            folder_uid, config_uid = await asyncio.gather(
+                check_node_exists(SR_src, settings.node_name, node_type="FOLDER"),
+                check_node_exists(SR_src, settings.node_name, node_type="CONFIGURATION"),
+            )
+            node_uid = folder_uid or config_uid
+            if not node_uid:
+                raise RuntimeError(f"Node {settings.node_name!r} does not exist.")
+
+        dest_uid = SR_dst.ROOT_NODE_UID
+        if settings.dest_folder.strip("/"):
+            dest_uid = await create_missing_folders(
+                SR_dst, settings.dest_folder, create_folders=settings.create_folders, load_index=True
+            )
+            if not dest_uid:
+                raise RuntimeError(
+                    f"Folder {settings.dest_folder!r} does not exist. Use '--create-folders=ON' "
+                    "to create missing folders."
+                )
+
+        time_start = time.time()
+        result = await SR_dst.tree_replicate(
+            SR_src,
+            node_uid,
+            parentNodeId=dest_uid,
+            uid_map=settings.uid_map,
+            max_concurrency=settings.max_concurrency,
+        )
+        total_time = time.time() - time_start
+
+    for err in result["errors"]:
+        print(f"FAILED  {err['uniqueId']}  Error: {err['error']}")
+
+    n_failed = len(result["errors"])
+    print(
+        f"\nTotal: {len(result['added'])} nodes added, {len(result['updated'])} updated, "
+        f"{len(result['unchanged'])} unchanged, {n_failed} failed in {total_time:.3f} s"
+    )
+    if n_failed:
+        raise RuntimeError(f"Failed to replicate {n_failed} nodes.")
+
+
 def main():
     logging.basicConfig(level=logging.WARNING)
     logging.getLogger("save-and-restore-api").setLevel("INFO")
@@ -769,13 +1464,19 @@ def main():
         name="save-and-restore-api",
     )
 
+    import asyncio
+
     logger.debug("Execution started.")
     time_start = time.time()
     try:
         if settings.command == "LOGIN":
-            process_login_command(settings)
+            asyncio.run(process_login_command(settings))
+        elif settings.command == "CONFIG" and settings.operation == "SYNC":
+            asyncio.run(process_config_sync_command(settings))
         elif settings.command == "CONFIG":
-            process_config_command(settings)
+            asyncio.run(process_config_command(settings))
+        elif settings.command == "REPLICATE":
+            asyncio.run(process_replicate_command(settings))
         else:
             raise ValueError(f"Unsupported command: {settings.command}")
 
@@ -0,0 +1,670 @@
+"""
+In-process mock of the Save-and-Restore service used by the tests that do not require the Java
+service and the simulated IOC, and by the benchmarks. The server keeps the tree of nodes
+in memory and implements the endpoints used by the API (see the ``_prepare_*`` methods of
+``_SaveRestoreAPI_Base``). Requests are passed to the server by ``httpx.MockTransport``, so
+no sockets are opened. The module does not depend on the simulated IOC (see ``common.py``).
+
+The tests simulate failures by subclassing ``MockServer``: overriding ``node_rejected()``
+(the nodes rejected by the server), ``restore_pv()`` (the PVs that can not be restored),
+the request handlers (e.g. ``_compare()``) or ``handle()``. The handlers may raise
+``ResponseError`` to return the error response.
+
+Usage::
+
+    from tests.mock_server import MockServer
+    from save_and_restore_api import SaveRestoreAPI
+
+    server = MockServer(latency=0.001)
+    with SaveRestoreAPI(base_url=server.base_url, transport=server.transport()) as SR:
+        config = server.create_config("/detectors/eiger", n_pvs=1000)
+        snapshot = server.create_snapshot(config["uniqueId"], name="snapshot")
+        data = SR.snapshot_get(snapshot["uniqueId"])
+"""
+
+import asyncio
+import contextlib
+import itertools
+import json
+import re
+import threading
+import time
+from urllib.parse import unquote
+
+import httpx
+
+from save_and_restore_api import SaveRestoreAPI as SaveRestoreAPI_Threads
+from save_and_restore_api.aio import SaveRestoreAPI as SaveRestoreAPI_Async
+
+ROOT_NODE_UID = SaveRestoreAPI_Threads.ROOT_NODE_UID
+
+base_url = "http://localhost:8080/save-restore"
+
+
+class ResponseError(Exception):
+    """
+    Raised by the request handlers to return the error response.
+    """
+
+    def __init__(self, status_code, message):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class _NotFound(ResponseError):
+    def __init__(self, message):
+        super().__init__(404, f"Not found: {message}")
+
+
+class MockServer:
+    """
+    In-memory mock of the Save-and-Restore service.
+
+    The server records the requests as tuples ``(method, path, params)`` (the path does not
+    include the path of the base URL) and the lists of names of the PVs restored by
+    ``/restore/items`` requests.
+
+    Parameters
+    ----------
+    base_url : str, optional
+        Base URL of the service. The path of the URL is removed from the request paths.
+    latency : float, optional
+        Simulated processing time of each request in seconds. The threaded transport
+        blocks the calling thread, the async transport awaits ``asyncio.sleep()``. Default: 0.
+    uid_prefix : str, optional
+        Prefix of the UIDs of the created nodes, so that the nodes of different servers have
+        different UIDs. Default: ``"mock"``.
+    """
+
+    def __init__(self, *, base_url=base_url, latency=0, uid_prefix="mock"):
+        self.base_url = base_url
+        self.latency = latency
+        self.requests = []
+        self.restored = []
+        self._prefix = httpx.URL(base_url).path.rstrip("/")
+        self._lock = threading.Lock()
+        self._uids = (f"{uid_prefix}-{_:08d}" for _ in itertools.count())
+        self._nodes = {ROOT_NODE_UID: self._create_node(ROOT_NODE_UID, "Root folder", "FOLDER")}
+        self._children = {ROOT_NODE_UID: []}
+        self._parents = {}
+        self._data = {}
+        self._filters = {}
+        self._routes = [
+            ("GET", r"/", self._info_get),
+            ("GET", r"/version", self._version_get),
+            ("GET", r"/search", self._search),
+            ("GET", r"/help/(?P<what>[^/]+)", self._help),
+            ("POST", r"/login", self._login),
+            ("GET", r"/nodes", self._nodes_get),
+            ("GET", r"/node/(?P<uid>[^/]+)", self._node_get),
+            ("GET", r"/node/(?P<uid>[^/]+)/children", self._node_get_children),
+            ("GET", r"/node/(?P<uid>[^/]+)/parent", self._node_get_parent),
+            ("PUT", r"/node", self._node_add),
+            ("DELETE", r"/node/(?P<uid>[^/]+)", self._node_delete),
+            ("DELETE", r"/node", self._nodes_delete),
+            ("GET", r"/config/(?P<uid>[^/]+)", self._data_get),
+            ("PUT", r"/config", self._config_add),
+            ("POST", r"/config", self._config_update),
+            ("GET", r"/tags", self._tags_get),
+            ("POST", r"/tags", self._tags_add),
+            ("DELETE", r"/tags", self._tags_delete),
+            ("GET", r"/take-snapshot/(?P<uid>[^/]+)", self._take_snapshot_get),
+            ("PUT", r"/take-snapshot/(?P<uid>[^/]+)", self._take_snapshot_save),
+            ("GET", r"/snapshot/(?P<uid>[^/]+)", self._data_get),
+            ("PUT", r"/snapshot", self._snapshot_add),
+            ("POST", r"/snapshot", self._snapshot_update),
+            ("GET", r"/snapshots", self._snapshots_get),
+            ("GET", r"/composite-snapshot/(?P<uid>[^/]+)", self._data_get),
+            ("GET", r"/composite-snapshot/(?P<uid>[^/]+)/nodes", self._composite_snapshot_get_nodes),
+            ("GET", r"/composite-snapshot/(?P<uid>[^/]+)/items", self._composite_snapshot_get_items),
+            ("PUT", r"/composite-snapshot", self._composite_snapshot_add),
+            ("POST", r"/composite-snapshot", self._composite_snapshot_update),
+            ("POST", r"/composite-snapshot-consistency-check", self._composite_snapshot_consistency_check),
+            ("POST", r"/restore/node", self._restore_node),
+            ("POST", r"/restore/items", self._restore_items),
+            ("GET", r"/compare/(?P<uid>[^/]+)", self._compare),
+            ("PUT", r"/filter", self._filter_add),
+            ("GET", r"/filters", self._filters_get),
+            ("DELETE", r"/filter/(?P<name>.+)", self._filter_delete),
+            ("POST", r"/move", self._structure_move),
+            ("POST", r"/copy", self._structure_copy),
+            ("GET", r"/path/(?P<uid>[^/]+)", self._structure_path_get),
+            ("GET", r"/path", self._structure_path_nodes),
+        ]
+        self._routes = [(m, re.compile(f"{p}$"), f) for m, p, f in self._routes]
+
+    # =============================================================================================
+    #                         TRANSPORTS
+    # =============================================================================================
+
+    def handle(self, request, path):
+        """
+        Process the request and return the response (``httpx.Response``). The method is called
+        while the lock is held, so the state of the server may be modified by concurrent requests.
+        """
+        params = dict(request.url.params)
+        body = json.loads(request.content) if request.content else None
+        for method, pattern, func in self._routes:
+            match = pattern.match(path)
+            if method == request.method and match:
+                try:
+                    response = func(body=body, params=params, **match.groupdict())
+                except ResponseError as ex:
+                    return httpx.Response(ex.status_code, json={"error": str(ex)})
+                if isinstance(response, str):
+                    return httpx.Response(200, text=response)
+                return httpx.Response(200, json=response)
+        return httpx.Response(404, json={"error": f"Unsupported request: {request.method} {path}"})
+
+    def _process(self, request):
+        path = unquote(request.url.path)[len(self._prefix) :] or "/"
+        with self._lock:
+            self.requests.append((request.method, path, dict(request.url.params)))
+            return self.handle(request, path)
+
+    def handler(self, request):
+        """
+        Request handler for the threaded client. The latency is simulated by blocking the calling thread.
+        """
+        if self.latency:
+            time.sleep(self.latency)
+        return self._process(request)
+
+    async def async_handler(self, request):
+        """
+        Request handler for the async client. The latency is simulated using ``asyncio.sleep()``.
+        """
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._process(request)
+
+    def transport(self):
+        """
+        Returns the transport for the threaded client.
+        """
+        return httpx.MockTransport(self.handler)
+
+    def async_transport(self):
+        """
+        Returns the transport for the async client.
+        """
+        return httpx.MockTransport(self.async_handler)
+
+    @property
+    def n_requests(self):
+        """
+        Number of processed requests.
+        """
+        return len(self.requests)
+
+    def count(self, method, path):
+        """
+        Returns the number of requests with the method and path.
+        """
+        return len([_ for _ in self.requests if _[:2] == (method, path)])
+
+    # =============================================================================================
+    #                         FAILURE INJECTION
+    # =============================================================================================
+
+    def node_rejected(self, node):
+        """
+        Returns True if the node sent by the client (the request to create or update the node)
+        is rejected with the status code 400. All nodes are accepted by default.
+        """
+        return False
+
+    def restore_pv(self, item):
+        """
+        Restore the PV of the snapshot item. Returns False if the PV can not be restored.
+        The handler may raise ``ResponseError`` to reject the whole request. All PVs are
+        restored by default.
+        """
+        return True
+
+    # =============================================================================================
+    #                         POPULATING THE SERVER
+    # =============================================================================================
+
+    def create_folder(self, path):
+        """
+        Create the folder and the missing parent folders. Returns the folder node.
+        """
+        parent_uid = ROOT_NODE_UID
+        for name in [_ for _ in path.split("/") if _]:
+            nodes = [self._nodes[_] for _ in self._children[parent_uid] if self._nodes[_]["name"] == name]
+            nodes = [_ for _ in nodes if _["nodeType"] == "FOLDER"]
+            node = nodes[0] if nodes else self._add(parent_uid, {"name": name, "nodeType": "FOLDER"})
+            parent_uid = node["uniqueId"]
+        return self._nodes[parent_uid]
+
+    def create_config(self, path, *, n_pvs=0, pv_names=None):
+        """
+        Create the configuration node with ``n_pvs`` PVs or the PVs ``pv_names``. The missing
+        folders are created. Returns the configuration node.
+        """
+        folder, name = path.rstrip("/").rsplit("/", 1)
+        parent = self.create_folder(folder)
+        pv_names = [f"{name}:PV{_:06d}" for _ in range(n_pvs)] if pv_names is None else pv_names
+        pv_list = [{"pvName": _, "readOnly": False} for _ in pv_names]
+        node = self._add(parent["uniqueId"], {"name": name, "nodeType": "CONFIGURATION"}, {"pvList": pv_list})
+        return node
+
+    def create_snapshot(self, config_uid, *, name, array_size=0):
+        """
+        Create the snapshot of the configuration. If ``array_size`` is greater than 0, then
+        the values are arrays of ``array_size`` elements. Returns the snapshot node.
+        """
+        items = self._snapshot_items(config_uid, array_size=array_size)
+        return self._add(config_uid, {"name": name, "nodeType": "SNAPSHOT"}, {"snapshotItems": items})
+
+    def create_composite_snapshot(self, path, *, snapshot_uids):
+        """
+        Create the composite snapshot that references the snapshots ``snapshot_uids``. The missing
+        folders are created. Returns the composite snapshot node.
+        """
+        folder, name = path.rstrip("/").rsplit("/", 1)
+        parent = self.create_folder(folder)
+        node = {"name": name, "nodeType": "COMPOSITE_SNAPSHOT"}
+        return self._add(parent["uniqueId"], node, {"referencedSnapshotNodes": list(snapshot_uids)})
+
+    def update_node(self, uid, **kwargs):
+        """
+        Modify the node (e.g. the name or the description) and its data as if the node
+        was updated by another client. Returns the node.
+        """
+        node = {**self._node(uid), **{k: v for k, v in kwargs.items() if k != "data"}}
+        return self._update(node, kwargs.get("data", self._data.get(uid, None)), validate=False)
+
+    # =============================================================================================
+    #                         INSPECTING THE SERVER
+    # =============================================================================================
+
+    def uid_get(self, path, *, node_type=None):
+        """
+        Returns UID of the node with the path or None if the node does not exist.
+        """
+        for uid, node in self._nodes.items():
+            if uid != ROOT_NODE_UID and (node_type is None or node["nodeType"] == node_type):
+                if self._path(uid) == path:
+                    return uid
+        return None
+
+    def node_get(self, uid):
+        """
+        Returns the node.
+        """
+        return self._node(uid)
+
+    def data_get(self, uid):
+        """
+        Returns the data of the node (configuration, snapshot or composite snapshot) or None.
+        """
+        return self._data.get(uid, None)
+
+    def parent_get(self, uid):
+        """
+        Returns UID of the parent node.
+        """
+        return self._parents.get(uid, None)
+
+    def path_get(self, uid):
+        """
+        Returns the path of the node.
+        """
+        return self._path(uid)
+
+    def tree(self):
+        """
+        Returns the dictionary ``{node path: (node type, description, data)}``. The UIDs in
+        the data are replaced with paths, so the trees of different servers may be compared.
+        """
+        tree = {}
+        for uid, node in self._nodes.items():
+            if uid == ROOT_NODE_UID:
+                continue
+            data = {k: v for k, v in (self._data.get(uid, None) or {}).items() if k != "uniqueId"}
+            if "referencedSnapshotNodes" in data:
+                data["referencedSnapshotNodes"] = [self._path(_) for _ in data["referencedSnapshotNodes"]]
+            tree[self._path(uid)] = (node["nodeType"], node.get("description", None), data)
+        return tree
+
+    # =============================================================================================
+    #                         INTERNAL METHODS
+    # =============================================================================================
+
+    @staticmethod
+    def _create_node(uid, name, node_type, **kwargs):
+        timestamp = int(time.time() * 1000)
+        node = {"uniqueId": uid, "name": name, "nodeType": node_type, "userName": "mock", "tags": []}
+        node.update({"created": timestamp, "lastModified": timestamp, "lastModifiedDate": timestamp})
+        node.update(kwargs)
+        return node
+
+    def _node(self, uid):
+        if uid not in self._nodes:
+            raise _NotFound(uid)
+        return self._nodes[uid]
+
+    def _validate(self, node):
+        if self.node_rejected(node):
+            raise ResponseError(400, f"Invalid node: {node.get('name', None)!r}")
+
+    def _add(self, parent_uid, node, data=None, *, validate=False):
+        self._node(parent_uid)
+        if validate:
+            self._validate(node)
+        uid = next(self._uids)
+        fields = {k: v for k, v in node.items() if k not in ("uniqueId", "name", "nodeType")}
+        node = self._create_node(uid, node["name"], node["nodeType"], **fields)
+        self._nodes[uid], self._children[uid], self._parents[uid] = node, [], parent_uid
+        self._children[parent_uid].append(uid)
+        if data is not None:
+            self._data[uid] = {**data, "uniqueId": uid}
+        return node
+
+    def _update(self, node, data, *, validate=True):
+        uid = node["uniqueId"]
+        stored = self._node(uid)
+        if validate:
+            self._validate(node)
+        stored.update({k: v for k, v in node.items() if k in ("name", "description")})
+        # The modification time is changed even if the node is updated within the same millisecond
+        timestamp = max(int(time.time() * 1000), stored["lastModifiedDate"] + 1)
+        stored["lastModifiedDate"] = stored["lastModified"] = timestamp
+        if data is not None:
+            self._data[uid] = {**data, "uniqueId": uid}
+        return stored
+
+    def _delete(self, uid):
+        for child_uid in list(self._children.get(uid, [])):
+            self._delete(child_uid)
+        parent_uid = self._parents.pop(uid, None)
+        if parent_uid is not None:
+            self._children[parent_uid].remove(uid)
+        self._nodes.pop(uid, None)
+        self._children.pop(uid, None)
+        self._data.pop(uid, None)
+
+    def _path(self, uid):
+        names = []
+        while uid != ROOT_NODE_UID:
+            names.append(self._node(uid)["name"])
+            uid = self._parents[uid]
+        return "/" + "/".join(reversed(names))
+
+    def _snapshot_items(self, config_uid, *, array_size=0):
+        items = []
+        for n, pv in enumerate(self._data[config_uid]["pvList"]):
+            if array_size:
+                value = {"type": {"name": "VDoubleArray", "version": 1}, "value": [float(n)] * array_size}
+            else:
+                value = {"type": {"name": "VDouble", "version": 1}, "value": float(n)}
+            value["alarm"] = {"severity": "NONE", "status": "NONE", "name": "NO_ALARM"}
+            value["time"] = {"unixSec": 1760000000, "nanoSec": 0, "userTag": 0}
+            items.append({"configPv": pv, "value": value})
+        return items
+
+    # =============================================================================================
+    #                         REQUEST HANDLERS
+    # =============================================================================================
+
+    def _info_get(self, **kwargs):
+        return {"name": "mock-save-and-restore", "version": "0.0.0", "elastic": {"status": "Connected"}}
+
+    def _version_get(self, **kwargs):
+        return "mock-save-and-restore version 0.0.0"
+
+    def _search(self, *, params, **kwargs):
+        nodes = list(self._nodes.values())
+        if "name" in params:
+            nodes = [_ for _ in nodes if params["name"].lower() in _["name"].lower()]
+        if "type" in params:
+            nodes = [_ for _ in nodes if _["nodeType"] in params["type"].split(",")]
+        if "tags" in params:
+            nodes = [_ for _ in nodes if params["tags"] in [t["name"] for t in _["tags"]]]
+        start, size = int(params.get("from", 0)), int(params.get("size", 30))
+        return {"hitCount": len(nodes), "nodes": nodes[start : start + size]}
+
+    def _help(self, *, what, **kwargs):
+        return f"<html><body>Help: {what}</body></html>"
+
+    def _login(self, *, body, **kwargs):
+        return {"userName": body["username"], "roles": ["ROLE_USER"]}
+
+    def _nodes_get(self, *, body, **kwargs):
+        return [self._nodes[_] for _ in body if _ in self._nodes]
+
+    def _node_get(self, *, uid, **kwargs):
+        return self._node(uid)
+
+    def _node_get_children(self, *, uid, **kwargs):
+        self._node(uid)
+        return [self._nodes[_] for _ in self._children[uid]]
+
+    def _node_get_parent(self, *, uid, **kwargs):
+        self._node(uid)
+        return self._nodes[self._parents.get(uid, ROOT_NODE_UID)]
+
+    def _node_add(self, *, body, params, **kwargs):
+        return self._add(params["parentNodeId"], body, validate=True)
+
+    def _node_delete(self, *, uid, **kwargs):
+        self._node(uid)
+        self._delete(uid)
+        return ""
+
+    def _nodes_delete(self, *, body, **kwargs):
+        for uid in body:
+            self._delete(uid)
+        return ""
+
+    def _data_get(self, *, uid, **kwargs):
+        self._node(uid)
+        return self._data[uid]
+
+    def _config_add(self, *, body, params, **kwargs):
+        node = self._add(
+            params["parentNodeId"],
+            {"nodeType": "CONFIGURATION", **body["configurationNode"]},
+            body["configurationData"],
+            validate=True,
+        )
+        return {"configurationNode": node, "configurationData": self._data[node["uniqueId"]]}
+
+    def _config_update(self, *, body, **kwargs):
+        node = self._update(body["configurationNode"], body["configurationData"])
+        return {"configurationNode": node, "configurationData": self._data[node["uniqueId"]]}
+
+    def _tags_get(self, **kwargs):
+        tags = {t["name"]: t for node in self._nodes.values() for t in node["tags"]}
+        return list(tags.values())
+
+    def _tags_add(self, *, body, **kwargs):
+        nodes = [self._node(_) for _ in body["uniqueNodeIds"]]
+        for node in nodes:
+            node["tags"] = [_ for _ in node["tags"] if _["name"] != body["tag"]["name"]] + [body["tag"]]
+        return nodes
+
+    def _tags_delete(self, *, body, **kwargs):
+        nodes = [self._node(_) for _ in body["uniqueNodeIds"]]
+        for node in nodes:
+            node["tags"] = [_ for _ in node["tags"] if _["name"] != body["tag"]["name"]]
+        return nodes
+
+    def _take_snapshot_get(self, *, uid, **kwargs):
+        self._node(uid)
+        return self._snapshot_items(uid)
+
+    def _take_snapshot_save(self, *, uid, params, **kwargs):
+        name = params.get("name", None) or time.strftime("%Y-%m-%d %H:%M:%S")
+        node = {"name": name, "nodeType": "SNAPSHOT", "description": params.get("comment", None) or ""}
+        node = self._add(uid, node, {"snapshotItems": self._snapshot_items(uid)})
+        return {"snapshotNode": node, "snapshotData": self._data[node["uniqueId"]]}
+
+    def _snapshot_add(self, *, body, params, **kwargs):
+        node = self._add(
+            params["parentNodeId"],
+            {"nodeType": "SNAPSHOT", **body["snapshotNode"]},
+            body["snapshotData"],
+            validate=True,
+        )
+        return {"snapshotNode": node, "snapshotData": self._data[node["uniqueId"]]}
+
+    def _snapshot_update(self, *, body, **kwargs):
+        node = self._update(body["snapshotNode"], body["snapshotData"])
+        return {"snapshotNode": node, "snapshotData": self._data[node["uniqueId"]]}
+
+    def _snapshots_get(self, **kwargs):
+        return [_ for _ in self._nodes.values() if _["nodeType"] == "SNAPSHOT"]
+
+    def _composite_snapshot_get_nodes(self, *, uid, **kwargs):
+        self._node(uid)
+        return [self._node(_) for _ in self._data[uid]["referencedSnapshotNodes"]]
+
+    def _composite_snapshot_get_items(self, *, uid, **kwargs):
+        items = []
+        for node in self._composite_snapshot_get_nodes(uid=uid):
+            if node["nodeType"] == "COMPOSITE_SNAPSHOT":
+                items.extend(self._composite_snapshot_get_items(uid=node["uniqueId"]))
+            else:
+                items.extend(self._data[node["uniqueId"]]["snapshotItems"])
+        return items
+
+    def _composite_snapshot_add(self, *, body, params, **kwargs):
+        node = self._add(
+            params["parentNodeId"],
+            {"nodeType": "COMPOSITE_SNAPSHOT", **body["compositeSnapshotNode"]},
+            body["compositeSnapshotData"],
+            validate=True,
+        )
+        return {"compositeSnapshotNode": node, "compositeSnapshotData": self._data[node["uniqueId"]]}
+
+    def _composite_snapshot_update(self, *, body, **kwargs):
+        node = self._update(body["compositeSnapshotNode"], body["compositeSnapshotData"])
+        return {"compositeSnapshotNode": node, "compositeSnapshotData": self._data[node["uniqueId"]]}
+
+    def _composite_snapshot_consistency_check(self, *, body, **kwargs):
+        pv_names = {}
+        for uid in body:
+            node = self._node(uid)
+            if node["nodeType"] == "COMPOSITE_SNAPSHOT":
+                items = self._composite_snapshot_get_items(uid=uid)
+            else:
+                items = self._data[uid]["snapshotItems"]
+            for item in items:
+                pv_names.setdefault(item["configPv"]["pvName"], set()).add(uid)
+        return [{"pvName": k, "snapshotNodes": sorted(v)} for k, v in pv_names.items() if len(v) > 1]
+
+    def _restore_node(self, *, params, **kwargs):
+        self._node(params["nodeId"])
+        return []
+
+    def _restore_items(self, *, body, **kwargs):
+        self.restored.append([_["configPv"]["pvName"] for _ in body])
+        return [_ for _ in body if not self.restore_pv(_)]
+
+    def _compare(self, *, uid, **kwargs):
+        node = self._node(uid)
+        if node["nodeType"] == "COMPOSITE_SNAPSHOT":
+            items = self._composite_snapshot_get_items(uid=uid)
+        else:
+            items = self._data[uid]["snapshotItems"]
+        return [
+            {"pvName": _["configPv"]["pvName"], "equal": True, "compare": {}, "storedValue": _.get("value", None)}
+            for _ in items
+        ]
+
+    def _filter_add(self, *, body, **kwargs):
+        self._filters[body["name"]] = body
+        return body
+
+    def _filters_get(self, **kwargs):
+        return list(self._filters.values())
+
+    def _filter_delete(self, *, name, **kwargs):
+        self._filters.pop(name, None)
+        return ""
+
+    def _structure_move(self, *, body, params, **kwargs):
+        new_parent_uid = self._node(params["to"])["uniqueId"]
+        for uid in body:
+            self._children[self._parents[uid]].remove(uid)
+            self._children[new_parent_uid].append(uid)
+            self._parents[uid] = new_parent_uid
+        return self._node(new_parent_uid)
+
+    def _structure_copy(self, *, body, params, **kwargs):
+        def copy(uid, parent_uid):
+            node = self._node(uid)
+            data = self._data.get(uid, None)
+            data = {k: v for k, v in data.items() if k != "uniqueId"} if data is not None else None
+            new_node = self._add(parent_uid, node, data)
+            for child_uid in list(self._children[uid]):
+                copy(child_uid, new_node["uniqueId"])
+            return new_node
+
+        return [copy(uid, params["to"]) for uid in body]
+
+    def _structure_path_get(self, *, uid, **kwargs):
+        return self._path(uid)
+
+    def _structure_path_nodes(self, *, params, **kwargs):
+        nodes = [_ for uid, _ in self._nodes.items() if uid != ROOT_NODE_UID and self._path(uid) == params["path"]]
+        if not nodes:
+            raise _NotFound(params["path"])
+        return nodes
+
+
+def snapshot_items(*pv_names):
+    """
+    Returns the list of snapshot items for the PVs.
+    """
+    return [{"configPv": {"pvName": _}, "value": {"type": {"name": "VDouble"}, "value": 1.0}} for _ in pv_names]
+
+
+def pv_names(items):
+    """
+    Returns the list of PV names of the snapshot items.
+    """
+    return [_["configPv"]["pvName"] for _ in items]
+
+
+def call_api(library, server, method, *args, api_kwargs=None, **kwargs):
+    """
+    Create the API object (``library`` is ``"THREADS"`` or ``"ASYNC"``) that sends the requests
+    to the mock server and call the API method. The arguments that are mock servers are replaced
+    with the API objects that send the requests to those servers (e.g. the source of
+    ``tree_replicate()``). ``api_kwargs`` are passed to the constructors of the API objects.
+    """
+    api_kwargs = api_kwargs or {}
+    servers = {id(_): _ for _ in [server, *args, *kwargs.values()] if isinstance(_, MockServer)}
+    connected = {}
+
+    def call():
+        def connect(value):
+            return connected[id(value)] if isinstance(value, MockServer) else value
+
+        return getattr(connect(server), method)(*map(connect, args), **{k: connect(v) for k, v in kwargs.items()})
+
+    if library == "THREADS":
+        with contextlib.ExitStack() as stack:
+            for uid, _server in servers.items():
+                SR = SaveRestoreAPI_Threads(base_url=_server.base_url, transport=_server.transport(), **api_kwargs)
+                connected[uid] = stack.enter_context(SR)
+            return call()
+
+    elif library == "ASYNC":
+
+        async def testing():
+            async with contextlib.AsyncExitStack() as stack:
+                for uid, _server in servers.items():
+                    transport = _server.async_transport()
+                    SR = SaveRestoreAPI_Async(base_url=_server.base_url, transport=transport, **api_kwargs)
+                    connected[uid] = await stack.enter_async_context(SR)
+                return await call()
+
+        return asyncio.run(testing())
+
+    else:
+        raise ValueError(f"Unknown library: {library!r}")
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+import save_and_restore_api._autosave
+from save_and_restore_api import (
+    AutosaveFormatError,
+    autosave_parse_lines,
+    autosave_read_file,
+    autosave_read_pv_names,
+)
+
+_data_dir = os.path.join(os.path.split(__file__)[0], "data")
+
+_AUTOSAVE_TEXT = """\
+# autosave R5.3	Automatically generated - DO NOT MODIFY - 210623-182305
+PV:scalar 1.5
+PV:string "quoted string"
+PV:string_unquoted string with spaces
+PV:empty
+PV:array @array@ { "1" "2" "3" }
+PV:array_escaped @array@ { "a \\"b\\"" "c\\\\d" }
+PV:array_multiline @array@ { "1"
+  "2"
+  "3" }
+PV:array_empty @array@ {  }
+#PV:disconnected 5
+! 1 channel(s) not connected - or not all gets were successful
+<END>
+"""
+
+
+def test_autosave_parse_lines_01():
+    """
+    ``autosave_parse_lines()``: scalar, string and array values.
+    """
+    records = list(autosave_parse_lines(_AUTOSAVE_TEXT.splitlines(keepends=True)))
+    assert records == [
+        ("PV:scalar", "1.5"),
+        ("PV:string", "quoted string"),
+        ("PV:string_unquoted", "string with spaces"),
+        ("PV:empty", ""),
+        ("PV:array", ["1", "2", "3"]),
+        ("PV:array_escaped", ['a "b"', "c\\d"]),
+        ("PV:array_multiline", ["1", "2", "3"]),
+        ("PV:array_empty", []),
+    ]
+
+
+# fmt: off
+@pytest.mark.parametrize("text, check_end, msg", [
+    ("PV:a 1\n", True, "<END> marker is missing"),
+    ("PV:a 1\n<END>\nPV:b 2\n", True, "<END> marker is missing"),
+    ("PV:a @array@ { \"1\" \n<END>\n", True, "incomplete array value of PV 'PV:a'"),
+    ("PV:a @array@ { 1 2 }\n<END>\n", False, "incomplete array value of PV 'PV:a'"),
+])
+# fmt: on
+def test_autosave_parse_lines_02_fail(text, check_end, msg):
+    """
+    ``autosave_parse_lines()``: incomplete files and invalid arrays.
+    """
+    with pytest.raises(AutosaveFormatError, match=msg):
+        list(autosave_parse_lines(text.splitlines(keepends=True), check_end=check_end))
+
+
+def test_autosave_parse_lines_03():
+    """
+    ``autosave_parse_lines()``: the check for <END> marker is disabled; combined files.
+    """
+    assert list(autosave_parse_lines(["PV:a 1\n"], check_end=False)) == [("PV:a", "1")]
+    lines = ["PV:a 1\n", "<END>\n", "PV:b 2\n", "<END>\n", "\n"]
+    assert list(autosave_parse_lines(lines)) == [("PV:a", "1"), ("PV:b", "2")]
+
+
+@pytest.mark.parametrize("file_name, n_pvs", [("auto_settings_3.sav", 3), ("auto_settings_17.sav", 17)])
+def test_autosave_read_file_01(file_name, n_pvs):
+    """
+    ``autosave_read_file()``: read files from the test data directory.
+    """
+    records = list(autosave_read_file(os.path.join(_data_dir, file_name)))
+    assert len(records) == n_pvs
+    if file_name == "auto_settings_3.sav":
+        assert records[0] == ("XF:03IDC-ES{Det:Eig1M}cam1:Gain", "1")
+
+
+def test_autosave_read_file_02_fail(tmp_path):
+    """
+    ``autosave_read_file()``: the file name is included in the error message.
+    """
+    file_name = tmp_path / "incomplete.sav"
+    file_name.write_text("PV:a 1\n")
+    with pytest.raises(AutosaveFormatError, match="incomplete.sav"):
+        list(autosave_read_file(file_name))
+
+
+def test_autosave_read_pv_names_01(tmp_path):
+    """
+    ``autosave_read_pv_names()``: PV names match the names returned by the streaming parser.
+    """
+    file_name = tmp_path / "auto_settings.sav"
+    file_name.write_text(_AUTOSAVE_TEXT)
+    pv_names = [_[0] for _ in autosave_parse_lines(_AUTOSAVE_TEXT.splitlines(keepends=True))]
+    assert autosave_read_pv_names(file_name) == pv_names
+
+    # Windows line endings
+    file_name.write_bytes(_AUTOSAVE_TEXT.replace("\n", "\r\n").encode())
+    assert autosave_read_pv_names(file_name) == pv_names
+
+    for name, n_pvs in (("auto_settings_3.sav", 3), ("auto_settings_17.sav", 17)):
+        records = list(autosave_read_file(os.path.join(_data_dir, name)))
+        assert autosave_read_pv_names(os.path.join(_data_dir, name)) == [_[0] for _ in records]
+        assert len(records) == n_pvs
+
+
+def test_autosave_read_pv_names_02(tmp_path, monkeypatch):
+    """
+    ``autosave_read_pv_names()``: large files are split at line boundaries and scanned in parallel.
+    """
+    monkeypatch.setattr(save_and_restore_api._autosave, "_PARALLEL_SCAN_CHUNK_SIZE", 1000)
+    pv_names = [f"PV:name{n}" for n in range(2000)]
+    file_name = tmp_path / "auto_settings.sav"
+    file_name.write_text("".join(f"{_} {n}\n" for n, _ in enumerate(pv_names)) + "<END>\n")
+    assert autosave_read_pv_names(file_name, max_workers=3) == pv_names
+    assert autosave_read_pv_names(file_name, max_workers=1) == pv_names
+
+
+# fmt: off
+@pytest.mark.parametrize("text, check_end, result", [
+    ("", False, []),
+    ("", True, AutosaveFormatError),
+    ("PV:a 1\n", True, AutosaveFormatError),
+    ("PV:a 1\n<END>\nPV:b 2", True, AutosaveFormatError),
+    ("PV:a 1\n", False, ["PV:a"]),
+    ("PV:a 1\n<END>\n\n", True, ["PV:a"]),
+])
+# fmt: on
+def test_autosave_read_pv_names_03(tmp_path, text, check_end, result):
+    """
+    ``autosave_read_pv_names()``: empty and incomplete files.
+    """
+    file_name = tmp_path / "auto_settings.sav"
+    file_name.write_text(text)
+    if isinstance(result, list):
+        assert autosave_read_pv_names(file_name, check_end=check_end) == result
+    else:
+        with pytest.raises(result, match="<END> marker is missing"):
+            autosave_read_pv_names(file_name, check_end=check_end)
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+# Modules that must not be imported unless the CLI tool communicates with the server
+_HEAVY_MODULES = ("httpx", "asyncio", "pprint", "save_and_restore_api._api_base", "save_and_restore_api._autosave")
+
+# Maximum import time of the CLI module relative to the import time of 'httpx'. The CLI module
+#   imports 'httpx' if the API is imported at startup, so the ratio is greater than 1.
+_MAX_IMPORT_TIME_RATIO = 0.75
+
+
+def _import_times(code):
+    """
+    Execute the code using ``python -X importtime`` and return the dictionary
+    ``{module: cumulative import time (us)}``.
+    """
+    p = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=False
+    )
+    times = {}
+    for line in p.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, module = line.split("|")
+            if cumulative.strip().isdigit():
+                times[module.strip()] = int(cumulative)
+    return times
+
+
+# fmt: off
+@pytest.mark.parametrize("args", [
+    ["--help"],
+    ["CONFIG", "GET", "--help"],
+    ["CONFIG", "GET", "--config-name", "/config"],
+    ["--base-url", "http://localhost:8080/save-restore", "CONFIG", "ADD"],
+    ["--base-url", "http://localhost:8080/save-restore", "REPLICATE", "--node-name", "/detectors"],
+])
+# fmt: on
+def test_cli_startup_01(args):
+    """
+    'save-and-restore' CLI tool: the modules needed only to communicate with the server
+    are not imported when help is printed or the parameters are invalid.
+    """
+    code = f"import sys; sys.argv = ['save-and-restore'] + {args!r}; "
+    code += "from save_and_restore_api.tools.cli import main; main()"
+    times = _import_times(code)
+    assert "save_and_restore_api.tools.cli" in times
+    assert not [_ for _ in _HEAVY_MODULES if _ in times]
+
+
+def test_cli_startup_02():
+    """
+    'save-and-restore' CLI tool: import time of the CLI module does not exceed the threshold.
+    The best of multiple runs is used to reduce the effect of the system load.
+    """
+    cli_times, httpx_times = [], []
+    for _ in range(3):
+        times = _import_times("import save_and_restore_api.tools.cli; import httpx")
+        cli_times.append(times["save_and_restore_api.tools.cli"])
+        httpx_times.append(times["httpx"])
+    assert min(cli_times) < _MAX_IMPORT_TIME_RATIO * min(httpx_times), (cli_times, httpx_times)
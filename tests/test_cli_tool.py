@@ -6,6 +6,7 @@ import subprocess
 import pytest
 
 from save_and_restore_api import SaveRestoreAPI as SaveRestoreAPI_Threads
+from save_and_restore_api.tools.cli import compare_pv_lists
 
 from .common import (
     _select_auth,
@@ -306,3 +307,138 @@ def test_cli_tool_config_get_01(
     params = params + [f"--config-name={config_name}"]
 
     assert sp_call(params) == exit_code
+
+
+# fmt: off
+@pytest.mark.parametrize("use_manifest", [False, True])
+@pytest.mark.parametrize("fld_create, exit_code", [
+    (True, EXIT_CODE_SUCCESS),
+    (False, EXIT_CODE_OPERATION_FAILED),
+])
+# fmt: on
+def test_cli_tool_config_sync_01(
+    clear_sar,  # noqa: F811
+    monkeypatch,
+    tmp_path,
+    use_manifest,
+    fld_create,
+    exit_code,
+):
+    """
+    Test for CONFIG SYNC command: add new and update existing configs listed in the manifest
+    or found in the directory tree.
+    """
+    create_root_folder()
+
+    monkeypatch.setenv("SAVE_AND_RESTORE_API_BASE_URL", _BASE_URL)
+    monkeypatch.setenv("SAVE_AND_RESTORE_API_USER_NAME", user_username)
+    monkeypatch.setenv("SAVE_AND_RESTORE_API_USER_PASSWORD", user_password)
+
+    data_dir = os.path.join(os.path.split(__file__)[0], "data")
+    config_folder = f"/{root_folder_node_name}/sync"
+    file_names = {
+        "Config 17": "auto_settings_17.sav",
+        "imaging/Config 3": "auto_settings_3.sav",
+        "imaging/eiger/Config 17": "auto_settings_17.sav",
+    }
+    n_pvs = {"auto_settings_17.sav": 17, "auto_settings_3.sav": 3}
+
+    for name, file_name in file_names.items():
+        path = tmp_path / "autosave" / f"{name}.sav"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(open(os.path.join(data_dir, file_name)).read())
+
+    if use_manifest:
+        manifest = tmp_path / "manifest.csv"
+        lines = ["# Config name, file name"]
+        lines += [f"{config_folder}/{name},autosave/{name}.sav" for name in file_names]
+        manifest.write_text("\n".join(lines))
+        params_src = [f"--manifest={manifest}"]
+    else:
+        params_src = [f"--dir={tmp_path / 'autosave'}", f"--config-name={config_folder}"]
+
+    params = ["save-and-restore"] + (["--create-folders=ON"] if fld_create else [])
+    params = params + ["CONFIG", "SYNC", "--max-concurrency=2"] + params_src
+
+    # The first call creates the configs, the second call updates them
+    for _ in range(2):
+        assert sp_call(params) == exit_code
+
+    with SaveRestoreAPI_Threads(base_url=base_url, timeout=10) as SR:
+        for name, file_name in file_names.items():
+            config_name = f"{config_folder}/{name}"
+            if exit_code == EXIT_CODE_SUCCESS:
+                nodes = SR.structure_path_nodes(config_name)
+                assert len(nodes) == 1
+                response = SR.config_get(nodes[0]["uniqueId"])
+                assert len(response["pvList"]) == n_pvs[file_name]
+            else:
+                with pytest.raises(SR.HTTPClientError):
+                    SR.structure_path_nodes(config_name)
+
+    # Exactly one of '--manifest' and '--dir' must be specified
+    assert sp_call(["save-and-restore", "CONFIG", "SYNC"]) == EXIT_CODE_CLI_PARAMETER_ERROR
+
+
+def test_compare_pv_lists_01():
+    """
+    ``compare_pv_lists()``: added, removed and modified PVs. The order of PVs is ignored.
+    """
+    pv_list_old = [
+        {"pvName": "PV:a", "readbackPvName": None, "readOnly": False},
+        {"pvName": "PV:b"},
+        {"pvName": "PV:c", "readbackPvName": "PV:c_RBV"},
+        {"pvName": "PV:d", "comparison": {"comparisonMode": "ABSOLUTE", "tolerance": 0.1}},
+    ]
+    pv_list_new = [
+        {"pvName": "PV:e"},
+        {"pvName": "PV:d", "comparison": {"comparisonMode": "ABSOLUTE", "tolerance": 0.2}},
+        {"pvName": "PV:c"},
+        {"pvName": "PV:a"},
+    ]
+    assert compare_pv_lists(pv_list_old, pv_list_new) == {
+        "added": ["PV:e"],
+        "removed": ["PV:b"],
+        "modified": ["PV:c", "PV:d"],
+    }
+    assert compare_pv_lists(pv_list_old, list(reversed(pv_list_old))) == {
+        "added": [],
+        "removed": [],
+        "modified": [],
+    }
+
+
+# fmt: off
+@pytest.mark.parametrize("operation", ["UPDATE", "ADD-OR-UPDATE"])
+# fmt: on
+def test_cli_tool_config_update_02(
+    clear_sar,  # noqa: F811
+    monkeypatch,
+    operation,
+):
+    """
+    CONFIG UPDATE and CONFIG ADD-OR-UPDATE: the config node is not updated if the list of PVs
+    is not changed.
+    """
+    create_root_folder()
+
+    monkeypatch.setenv("SAVE_AND_RESTORE_API_BASE_URL", _BASE_URL)
+    monkeypatch.setenv("SAVE_AND_RESTORE_API_USER_NAME", user_username)
+    monkeypatch.setenv("SAVE_AND_RESTORE_API_USER_PASSWORD", user_password)
+
+    config_name = f"/{root_folder_node_name}/Test Config 1"
+    file_name = os.path.join(os.path.split(__file__)[0], "data", "auto_settings_17.sav")
+    params = ["save-and-restore", "CONFIG", "ADD", f"--config-name={config_name}", f"--file-name={file_name}"]
+    assert sp_call(params) == EXIT_CODE_SUCCESS
+
+    with SaveRestoreAPI_Threads(base_url=base_url, timeout=10) as SR:
+        config_uid = SR.structure_path_nodes(config_name)[0]["uniqueId"]
+        node_before = SR.node_get(config_uid)
+
+        params = ["save-and-restore", "CONFIG", operation]
+        params = params + [f"--config-name={config_name}", f"--file-name={file_name}"]
+        result = subprocess.run(params, capture_output=True, text=True)
+        assert result.returncode == EXIT_CODE_SUCCESS
+        assert "PVs added: 0, removed: 0, modified: 0" in result.stdout
+        assert "Config node is up to date" in result.stdout
+        assert SR.node_get(config_uid)["lastModified"] == node_before["lastModified"]
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from save_and_restore_api import SaveRestoreAPI as SaveRestoreAPI_Threads
+from save_and_restore_api.aio import SaveRestoreAPI as SaveRestoreAPI_Async
+
+_base_url = "http://localhost:8080/save-restore"
+
+
+def _handler(request):
+    if request.url.path.endswith("/missing"):
+        return httpx.Response(404, json={"error": "Node not found"})
+    return httpx.Response(200, json={"uniqueId": request.url.path.split("/")[-1], "method": request.method})
+
+
+def _run_concurrent(library, calls, *, coalesce_requests=True, n_expected=None):
+    """
+    Execute the API calls (list of ``(method_name, args)``) concurrently. The server blocks
+    the requests until all the calls are waiting for the responses. Returns the results
+    (or exceptions), the list of the received requests and the coalescing counters.
+    """
+    requests = []
+    n_expected = len(calls) if n_expected is None else n_expected
+
+    def ready(SR):
+        info = SR.coalesce_info()
+        return info["requests"] + info["coalesced"] >= n_expected
+
+    if library == "THREADS":
+        release = threading.Event()
+
+        def handler(request):
+            requests.append(request)
+            assert release.wait(timeout=5)
+            return _handler(request)
+
+        def call(SR, name, args):
+            try:
+                return getattr(SR, name)(*args)
+            except Exception as ex:
+                return ex
+
+        transport = httpx.MockTransport(handler)
+        with SaveRestoreAPI_Threads(
+            base_url=_base_url, transport=transport, coalesce_requests=coalesce_requests
+        ) as SR:
+            with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+                futures = [executor.submit(call, SR, name, args) for name, args in calls]
+                while coalesce_requests and not ready(SR):
+                    time.sleep(0.001)
+                time.sleep(0.01)
+                release.set()
+                results = [_.result() for _ in futures]
+            return results, requests, SR.coalesce_info()
+    else:
+
+        async def testing():
+            release = asyncio.Event()
+
+            async def handler(request):
+                requests.append(request)
+                await release.wait()
+                return _handler(request)
+
+            transport = httpx.MockTransport(handler)
+            async with SaveRestoreAPI_Async(
+                base_url=_base_url, transport=transport, coalesce_requests=coalesce_requests
+            ) as SR:
+                tasks = [asyncio.ensure_future(getattr(SR, name)(*args)) for name, args in calls]
+                while coalesce_requests and not ready(SR):
+                    await asyncio.sleep(0.001)
+                await asyncio.sleep(0.01)
+                release.set()
+                results = await asyncio.gather(*tasks, return_exceptions=True)
+                return results, requests, SR.coalesce_info()
+
+        return asyncio.run(testing())
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_coalesce_01(library):
+    """
+    Identical concurrent GET requests share a single request and its decoded result.
+    Requests with different URLs or parameters are sent separately.
+    """
+    calls = [("node_get", ("uid-1",))] * 10 + [("node_get", ("uid-2",))] * 5
+    calls += [("node_get_children", ("uid-1",))] * 3 + [("node_get", (["uid-1", "uid-2"],))] * 2
+
+    results, requests, info = _run_concurrent(library, calls)
+
+    assert len(requests) == 4
+    assert info == {"requests": 4, "coalesced": 16}
+    assert all(_ is results[0] for _ in results[:10])
+    assert results[0] == {"uniqueId": "uid-1", "method": "GET"}
+    assert all(_ is results[10] for _ in results[10:15])
+    assert results[10]["uniqueId"] == "uid-2"
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_coalesce_02(library):
+    """
+    Coalescing: the exception raised by the shared request is raised by all the waiting calls.
+    The completed requests are not reused by the following calls.
+    """
+    results, requests, info = _run_concurrent(library, [("node_get", ("missing",))] * 5)
+    assert len(requests) == 1 and info == {"requests": 1, "coalesced": 4}
+    assert all(isinstance(_, SaveRestoreAPI_Threads.HTTPClientError) for _ in results)
+
+    with SaveRestoreAPI_Threads(
+        base_url=_base_url, transport=httpx.MockTransport(_handler), coalesce_requests=True
+    ) as SR:
+        assert SR.node_get("uid-1") is not SR.node_get("uid-1")
+        assert SR.coalesce_info() == {"requests": 2, "coalesced": 0}
+        assert SR._coalesce_inflight == {}
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_coalesce_03(library):
+    """
+    Coalescing: requests other than GET and requests sent while coalescing is disabled
+    (default) are not coalesced.
+    """
+    calls = [("node_delete", ("uid-1",))] * 3
+    results, requests, info = _run_concurrent(library, calls, n_expected=0)
+    assert len(requests) == 3 and info == {"requests": 0, "coalesced": 0}
+
+    calls = [("node_get", ("uid-1",))] * 3
+    results, requests, info = _run_concurrent(library, calls, coalesce_requests=False)
+    assert len(requests) == 3 and info == {"requests": 0, "coalesced": 0}
+    assert results[0] == results[1] and results[0] is not results[1]
+
+
+def test_coalesce_04():
+    """
+    Coalescing (async): cancelling one of the waiting calls does not cancel the shared request.
+    """
+
+    async def testing():
+        release, requests = asyncio.Event(), []
+
+        async def handler(request):
+            requests.append(request)
+            await release.wait()
+            return _handler(request)
+
+        transport = httpx.MockTransport(handler)
+        async with SaveRestoreAPI_Async(base_url=_base_url, transport=transport, coalesce_requests=True) as SR:
+            tasks = [asyncio.ensure_future(SR.node_get("uid-1")) for _ in range(3)]
+            await asyncio.sleep(0.01)
+            tasks[0].cancel()
+            await asyncio.sleep(0.01)
+            release.set()
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+
+            assert isinstance(results[0], asyncio.CancelledError)
+            assert results[1] is results[2] and results[1]["uniqueId"] == "uid-1"
+            assert len(requests) == 1 and SR._coalesce_inflight == {}
+
+    asyncio.run(testing())
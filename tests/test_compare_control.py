@@ -107,3 +107,105 @@ def test_compare_01(clear_sar, ioc, library, usesetauth):  # noqa: F811
                 assert pv_sim_D["liveValue"]["value"] == 200
 
         asyncio.run(testing())
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_snapshots_diff_01(clear_sar, ioc, library):  # noqa: F811
+    """
+    Basic tests for the 'snapshots_diff' API.
+    """
+    root_folder_uid = create_root_folder()
+
+    if not _is_async(library):
+        with SaveRestoreAPI_Threads(base_url=base_url, timeout=10) as SR:
+            auth = _select_auth(SR=SR, usesetauth=True)
+
+            configurationNode = {"name": "Test Config"}
+            configurationData = {"pvList": [{"pvName": _} for _ in ioc_pvs.keys()]}
+
+            response = SR.config_add(
+                root_folder_uid,
+                configurationNode=configurationNode,
+                configurationData=configurationData,
+                **auth
+            )
+            config_uid = response["configurationNode"]["uniqueId"]
+
+            response = SR.take_snapshot_save(config_uid, name="Snapshot 1", **auth)
+            shot_uid_1 = response["snapshotData"]["uniqueId"]
+
+            caput("simulated:C", 100)
+
+            response = SR.take_snapshot_save(config_uid, name="Snapshot 2", **auth)
+            shot_uid_2 = response["snapshotData"]["uniqueId"]
+
+            diff = SR.snapshots_diff(shot_uid_1, shot_uid_1)
+            assert diff.is_equal
+            assert len(diff) == len(ioc_pvs)
+
+            diff = SR.snapshots_diff(shot_uid_1, shot_uid_2)
+            assert not diff.is_equal
+            assert diff.different == ["simulated:C"]
+            assert diff.only_in_first == diff.only_in_second == []
+            results = diff.to_list(only_different=True)
+            assert results[0]["value1"]["value"] == 3
+            assert results[0]["value2"]["value"] == 100
+
+            diff = SR.snapshots_diff(shot_uid_1, shot_uid_2, tolerance=100)
+            assert diff.is_equal
+            diff = SR.snapshots_diff(shot_uid_1, shot_uid_2, tolerance=10, compareMode="RELATIVE")
+            assert not diff.is_equal
+            diff = SR.snapshots_diff(shot_uid_1, shot_uid_2, tolerance=40, compareMode="RELATIVE")
+            assert diff.is_equal
+
+            # Compare the stored snapshot with the live values (loaded data)
+            diff = SR.snapshots_diff(shot_uid_2, SR.take_snapshot_get(config_uid))
+            assert diff.is_equal
+
+            with pytest.raises(SR.RequestParameterError):
+                SR.snapshots_diff(shot_uid_1, shot_uid_2, compareMode="UNSUPPORTED")
+
+    else:
+        async def testing():
+            async with SaveRestoreAPI_Async(base_url=base_url, timeout=2) as SR:
+                auth = _select_auth(SR=SR, usesetauth=True)
+
+                configurationNode = {"name": "Test Config"}
+                configurationData = {"pvList": [{"pvName": _} for _ in ioc_pvs.keys()]}
+
+                response = await SR.config_add(
+                    root_folder_uid,
+                    configurationNode=configurationNode,
+                    configurationData=configurationData,
+                    **auth
+                )
+                config_uid = response["configurationNode"]["uniqueId"]
+
+                response = await SR.take_snapshot_save(config_uid, name="Snapshot 1", **auth)
+                shot_uid_1 = response["snapshotData"]["uniqueId"]
+
+                caput("simulated:C", 100)
+
+                response = await SR.take_snapshot_save(config_uid, name="Snapshot 2", **auth)
+                shot_uid_2 = response["snapshotData"]["uniqueId"]
+
+                diff = await SR.snapshots_diff(shot_uid_1, shot_uid_1)
+                assert diff.is_equal
+                assert len(diff) == len(ioc_pvs)
+
+                diff = await SR.snapshots_diff(shot_uid_1, shot_uid_2)
+                assert not diff.is_equal
+                assert diff.different == ["simulated:C"]
+
+                diff = await SR.snapshots_diff(shot_uid_1, shot_uid_2, tolerance=100)
+                assert diff.is_equal
+
+                diff = await SR.snapshots_diff(shot_uid_2, await SR.take_snapshot_get(config_uid))
+                assert diff.is_equal
+
+                with pytest.raises(SR.RequestParameterError):
+                    await SR.snapshots_diff(shot_uid_1, shot_uid_2, compareMode="UNSUPPORTED")
+
+        asyncio.run(testing())
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from save_and_restore_api import RequestEvent, RequestStatsCollector, RetryPolicy
+from save_and_restore_api import SaveRestoreAPI as SaveRestoreAPI_Threads
+from save_and_restore_api._instrumentation import _url_template
+from save_and_restore_api.aio import SaveRestoreAPI as SaveRestoreAPI_Async
+
+_base_url = "http://localhost:8080/save-restore"
+
+
+def _handler(request):
+    if request.url.path.endswith("/missing"):
+        return httpx.Response(404, json={"error": "Not found"})
+    if request.url.path.endswith("/children"):
+        return httpx.Response(200, json=[{"uniqueId": str(_), "nodeType": "SNAPSHOT"} for _ in range(10)])
+    return httpx.Response(200, json={"name": "Save-And-Restore"})
+
+
+# fmt: off
+@pytest.mark.parametrize("url, template", [
+    ("/", "/"),
+    ("/nodes", "/nodes"),
+    ("/node/abc-123", "/node/{uniqueNodeId}"),
+    ("/node/abc-123/children", "/node/{uniqueNodeId}/children"),
+    ("/config?parentNodeId=abc-123", "/config"),
+    ("/composite-snapshot/abc-123/items", "/composite-snapshot/{uniqueId}/items"),
+    ("/filter/name%20with%20spaces", "/filter/{name}"),
+])
+# fmt: on
+def test_url_template_01(url, template):
+    """
+    ``_url_template()``: basic tests.
+    """
+    assert _url_template(url) == template
+
+
+def test_request_stats_collector_01():
+    """
+    ``RequestStatsCollector``: statistics and percentiles.
+    """
+    stats = RequestStatsCollector(buckets=[0.01, 0.1, 1])
+    assert stats.buckets[-1] == float("inf")
+
+    for n in range(100):
+        event = RequestEvent(method="get", url=f"/node/{n}")
+        event.attempts, event.status_code = 1, 200
+        event.durations["network"] = 0.05 if n < 90 else 0.5
+        stats(event)
+    event = RequestEvent(method="PUT", url="/node")
+    event.attempts, event.error = 1, "HTTPServerError"
+    event.durations["network"] = 0.005
+    stats(event)
+
+    summary = stats.summary()
+    endpoints = [(_["method"], _["url_template"]) for _ in summary]
+    assert endpoints == [("GET", "/node/{uniqueNodeId}"), ("PUT", "/node")]
+    s = summary[0]
+    assert s["count"] == 100 and s["errors"] == 0
+    assert s["total"] == pytest.approx(9.5)
+    assert s["p50"] == pytest.approx(0.1)
+    assert s["p99"] == pytest.approx(0.5)
+    assert s["histogram"] == [0, 90, 10, 0]
+    assert summary[1]["errors"] == 1
+
+    assert "/node/{uniqueNodeId}" in stats.report()
+    stats.reset()
+    assert stats.summary() == []
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_request_hooks_01(library):
+    """
+    Request hooks: events for successful, failed, retried and streaming requests.
+    """
+    events, stats = [], RequestStatsCollector()
+    policy = RetryPolicy(max_attempts=2, backoff_factor=0.01, status_codes=(404,))
+
+    def check_events():
+        assert [(_.method, _.url_template, _.status_code, _.error, _.attempts) for _ in events] == [
+            ("GET", "/", 200, None, 1),
+            ("GET", "/node/{uniqueNodeId}/children", 200, None, 1),
+            ("GET", "/missing", 404, "HTTPClientError", 2),
+            ("GET", "/node/{uniqueNodeId}/children", 200, None, 1),
+        ]
+        assert all(_.bytes_received > 0 for _ in events)
+        assert events[2].durations["retry_wait"] > 0
+        assert sum(_["count"] for _ in stats.summary()) == 4
+
+    if library == "THREADS":
+        transport = httpx.MockTransport(_handler)
+        with SaveRestoreAPI_Threads(
+            base_url=_base_url, transport=transport, retry_policy=policy, request_hooks=[stats]
+        ) as SR:
+            SR.request_hook_add(events.append)
+            SR.info_get()
+            SR.node_get_children("abc-123")
+            with pytest.raises(SR.HTTPClientError):
+                SR.send_request("GET", "/missing")
+            assert len(list(SR._send_request_stream("GET", "/node/abc-123/children"))) == 10
+            check_events()
+
+            SR.request_hook_remove(events.append)
+            SR.info_get()
+            assert len(events) == 4
+            with pytest.raises(SR.RequestParameterError):
+                SR.request_hook_remove(events.append)
+    else:
+
+        async def testing():
+            async def async_handler(request):
+                return _handler(request)
+
+            transport = httpx.MockTransport(async_handler)
+            async with SaveRestoreAPI_Async(
+                base_url=_base_url, transport=transport, retry_policy=policy, request_hooks=[stats]
+            ) as SR:
+                SR.request_hook_add(events.append)
+                await SR.info_get()
+                await SR.node_get_children("abc-123")
+                with pytest.raises(SR.HTTPClientError):
+                    await SR.send_request("GET", "/missing")
+                assert len([_ async for _ in SR._send_request_stream("GET", "/node/abc-123/children")]) == 10
+                check_events()
+
+        asyncio.run(testing())
+
+
+def test_request_hooks_02_fail():
+    """
+    Request hooks: invalid hooks and exceptions raised by hooks.
+    """
+
+    def failing_hook(event):
+        raise RuntimeError("Hook failed")
+
+    transport = httpx.MockTransport(_handler)
+    with SaveRestoreAPI_Threads(base_url=_base_url, transport=transport, request_hooks=[failing_hook]) as SR:
+        with pytest.raises(SR.RequestParameterError, match="must be callable"):
+            SR.request_hook_add("not-a-hook")
+        # Exceptions raised by the hooks are ignored
+        assert SR.info_get() == {"name": "Save-And-Restore"}
+
+
+# fmt: off
+@pytest.mark.parametrize("SR_class", [SaveRestoreAPI_Threads, SaveRestoreAPI_Async])
+@pytest.mark.parametrize("request_hooks, msg", [
+    (["not-a-hook"], "must be callable"),
+    ([print, None], "must be callable"),
+    (print, "Invalid 'request_hooks'"),
+    ("hook", "Invalid 'request_hooks'"),
+])
+# fmt: on
+def test_request_hooks_03_fail(SR_class, request_hooks, msg):
+    """
+    ``request_hooks`` parameter of the constructor: invalid values.
+    """
+    with pytest.raises(SR_class.RequestParameterError, match=msg):
+        SR_class(base_url=_base_url, request_hooks=request_hooks)
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from save_and_restore_api._json_stream import _JSONArrayStreamParser
+
+_items = [
+    {"configPv": {"pvName": f"PV:{n}"}, "value": {"value": n * 1.5e-3, "text": 'a"]},{'}} for n in range(50)
+] + [123456, -1.5e10, True, None, "text", [1, [2, 3]]]
+
+
+def _parse(document, *, key, chunk_size):
+    parser, items = _JSONArrayStreamParser(key=key), []
+    for n in range(0, len(document), chunk_size):
+        items.extend(parser.feed(document[n : n + chunk_size]))
+    items.extend(parser.close())
+    return items
+
+
+# fmt: off
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 100000])
+@pytest.mark.parametrize("key, document", [
+    (None, json.dumps(_items)),
+    (None, json.dumps(_items, indent=2)),
+    ("snapshotItems", json.dumps({"uniqueId": "abc", "snapshotItems": _items})),
+    ("snapshotItems", json.dumps({"a": {"b": [1, "]"]}, "snapshotItems": _items, "c": 10}, indent=2)),
+])
+# fmt: on
+def test_json_array_stream_parser_01(key, document, chunk_size):
+    """
+    ``_JSONArrayStreamParser``: parse the document split into chunks of different size.
+    """
+    assert _parse(document, key=key, chunk_size=chunk_size) == _items
+
+
+# fmt: off
+@pytest.mark.parametrize("key, document", [
+    (None, "[]"),
+    (None, " [ ] "),
+    ("snapshotItems", '{"snapshotItems": []}'),
+])
+# fmt: on
+def test_json_array_stream_parser_02(key, document):
+    """
+    ``_JSONArrayStreamParser``: empty arrays.
+    """
+    assert _parse(document, key=key, chunk_size=1) == []
+
+
+# fmt: off
+@pytest.mark.parametrize("key, document, msg", [
+    (None, "[1, 2", "Incomplete JSON document"),
+    (None, "[1 2]", "Expecting ','"),
+    (None, '{"a": 1}', "Expecting '\\['"),
+    (None, "[1, ]", "Expecting value"),
+    (None, '[{"a": 1]', "Expecting ','"),
+    ("snapshotItems", "[1, 2]", "Expecting '{'"),
+    ("snapshotItems", '{"a": 1}', "Key 'snapshotItems' is not found"),
+    ("snapshotItems", '{"a": 1', "Key 'snapshotItems' is not found"),
+    ("snapshotItems", '{1: 2}', "Expecting property name"),
+])
+# fmt: on
+def test_json_array_stream_parser_03_fail(key, document, msg):
+    """
+    ``_JSONArrayStreamParser``: invalid documents.
+    """
+    with pytest.raises(json.JSONDecodeError, match=msg):
+        _parse(document, key=key, chunk_size=2)
+
+
+# fmt: off
+@pytest.mark.parametrize("key", [None, "snapshotItems"])
+# fmt: on
+def test_json_array_stream_parser_04(key):
+    """
+    ``_JSONArrayStreamParser``: a multi-MB element is received in small chunks. The element is
+    decoded only once, after it is completely received.
+    """
+    element = {
+        "values": [[n, n * 0.5, f'text \\"{n}\\" ' + "]}{["] for n in range(50000)],
+        "text": "a\\\\" * 500000,
+        "nested": [[[{"a": [1, "]"]}]]] * 10000,
+    }
+    items = [element, "text", 10]
+    document = json.dumps({"uniqueId": "abc", "snapshotItems": items} if key else items)
+    assert len(document) > 3_000_000
+
+    n_decoded = 0
+
+    class _Decoder(json.JSONDecoder):
+        def raw_decode(self, s, idx=0):
+            nonlocal n_decoded
+            n_decoded += 1
+            return super().raw_decode(s, idx)
+
+    parser, results = _JSONArrayStreamParser(key=key), []
+    parser._decoder = _Decoder()
+    for n in range(0, len(document), 100):
+        results.extend(parser.feed(document[n : n + 100]))
+    results.extend(parser.close())
+
+    assert results == items
+    assert n_decoded == (6 if key else 3)
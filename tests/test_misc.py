@@ -3,6 +3,7 @@ from __future__ import annotations
 import asyncio
 import importlib.metadata
 
+import httpx
 import pytest
 
 import save_and_restore_api
@@ -121,6 +122,61 @@ def test_version_get_01(library):
         asyncio.run(testing())
 
 
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_connection_params_01(library):
+    """
+    Tests for the connection pool parameters, shared transport and shared client.
+    """
+    if not _is_async(library):
+        with SaveRestoreAPI_Threads(
+            base_url=base_url, timeout=2, max_connections=5, max_keepalive_connections=2, keepalive_expiry=1
+        ) as SR:
+            info = SR.info_get()
+            assert info["name"] == "service-save-and-restore"
+
+        # Shared transport is not closed when the client is closed
+        transport = httpx.HTTPTransport()
+        for _ in range(2):
+            with SaveRestoreAPI_Threads(base_url=base_url, timeout=2, transport=transport) as SR:
+                info = SR.info_get()
+                assert info["name"] == "service-save-and-restore"
+        transport.close()
+
+        # Shared client is not closed when the API object is closed
+        with httpx.Client(base_url=base_url, timeout=2) as client:
+            for _ in range(2):
+                with SaveRestoreAPI_Threads(base_url=base_url, client=client) as SR:
+                    info = SR.info_get()
+                    assert info["name"] == "service-save-and-restore"
+            assert not client.is_closed
+
+    else:
+        async def testing():
+            async with SaveRestoreAPI_Async(
+                base_url=base_url, timeout=2, max_connections=5, max_keepalive_connections=2, keepalive_expiry=1
+            ) as SR:
+                info = await SR.info_get()
+                assert info["name"] == "service-save-and-restore"
+
+            transport = httpx.AsyncHTTPTransport()
+            for _ in range(2):
+                async with SaveRestoreAPI_Async(base_url=base_url, timeout=2, transport=transport) as SR:
+                    info = await SR.info_get()
+                    assert info["name"] == "service-save-and-restore"
+            await transport.aclose()
+
+            async with httpx.AsyncClient(base_url=base_url, timeout=2) as client:
+                for _ in range(2):
+                    async with SaveRestoreAPI_Async(base_url=base_url, client=client) as SR:
+                        info = await SR.info_get()
+                        assert info["name"] == "service-save-and-restore"
+                assert not client.is_closed
+
+        asyncio.run(testing())
+
+
 # =============================================================================================
 #                         TESTS FOR SEARCH-CONTROLLER API METHODS
 # =============================================================================================
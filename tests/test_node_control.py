@@ -115,6 +115,65 @@ def test_nodes_get_01(clear_sar, library, usesetauth):  # noqa: F811
         asyncio.run(testing())
 
 
+# fmt: off
+@pytest.mark.parametrize("chunk_size, max_concurrency", [(1, 1), (2, 4), (3, 2), (100, 4)])
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_nodes_get_bulk_01(clear_sar, library, chunk_size, max_concurrency):  # noqa: F811
+    """
+    Basic tests for the 'nodes_get_bulk' API.
+    """
+    root_folder_uid = create_root_folder()
+    n_nodes = 7
+
+    if not _is_async(library):
+        with SaveRestoreAPI_Threads(base_url=base_url, timeout=2) as SR:
+            _select_auth(SR=SR, usesetauth=True)
+
+            node_uids = []
+            for n in range(n_nodes):
+                response = SR.node_add(root_folder_uid, node={"name": f"Folder {n}", "nodeType": "FOLDER"})
+                node_uids.append(response["uniqueId"])
+            node_uids = list(reversed(node_uids))
+
+            response = SR.nodes_get_bulk(node_uids, chunk_size=chunk_size, max_concurrency=max_concurrency)
+            assert response["errors"] == []
+            assert [_["uniqueId"] for _ in response["nodes"]] == node_uids
+
+            response = SR.nodes_get_bulk([], chunk_size=chunk_size, max_concurrency=max_concurrency)
+            assert response == {"nodes": [], "errors": []}
+
+            with pytest.raises(SR.RequestParameterError, match="chunk_size"):
+                SR.nodes_get_bulk(node_uids, chunk_size=0)
+
+    else:
+        async def testing():
+            async with SaveRestoreAPI_Async(base_url=base_url, timeout=2) as SR:
+                _select_auth(SR=SR, usesetauth=True)
+
+                node_uids = []
+                for n in range(n_nodes):
+                    response = await SR.node_add(
+                        root_folder_uid, node={"name": f"Folder {n}", "nodeType": "FOLDER"}
+                    )
+                    node_uids.append(response["uniqueId"])
+                node_uids = list(reversed(node_uids))
+
+                response = await SR.nodes_get_bulk(
+                    node_uids, chunk_size=chunk_size, max_concurrency=max_concurrency
+                )
+                assert response["errors"] == []
+                assert [_["uniqueId"] for _ in response["nodes"]] == node_uids
+
+                response = await SR.nodes_get_bulk([], chunk_size=chunk_size, max_concurrency=max_concurrency)
+                assert response == {"nodes": [], "errors": []}
+
+                with pytest.raises(SR.RequestParameterError, match="chunk_size"):
+                    await SR.nodes_get_bulk(node_uids, chunk_size=0)
+
+        asyncio.run(testing())
+
+
 
 # fmt: off
 @pytest.mark.parametrize("usesetauth", [True, False])
@@ -403,3 +462,169 @@ def test_node_get_parent_01(clear_sar, library, usesetauth):  # noqa: F811
                 assert response["nodeType"] == "FOLDER"
 
         asyncio.run(testing())
+
+
+# fmt: off
+@pytest.mark.parametrize("max_depth, node_types, n_expected", [
+    (None, None, 10),
+    (1, None, 2),
+    (2, None, 8),
+    (None, "CONFIGURATION", 6),
+    (None, ["FOLDER"], 4),
+    (2, "CONFIGURATION", 4),
+])
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_walk_01(clear_sar, library, max_depth, node_types, n_expected):  # noqa: F811
+    """
+    Basic tests for the 'walk' API. The tree contains 2 folders in the root folder,
+    each folder contains a subfolder and 2 config nodes, each subfolder contains 1 config node.
+    """
+    root_folder_uid = create_root_folder()
+
+    def create_tree(SR):
+        for n in range(2):
+            folder = SR.node_add(root_folder_uid, node={"name": f"Folder {n}", "nodeType": "FOLDER"})
+            subfolder = SR.node_add(folder["uniqueId"], node={"name": "Subfolder", "nodeType": "FOLDER"})
+            for m in range(2):
+                SR.node_add(folder["uniqueId"], node={"name": f"Config {m}", "nodeType": "CONFIGURATION"})
+            SR.node_add(subfolder["uniqueId"], node={"name": "Config", "nodeType": "CONFIGURATION"})
+
+    with SaveRestoreAPI_Threads(base_url=base_url, timeout=2) as SR:
+        _select_auth(SR=SR, usesetauth=True)
+        create_tree(SR)
+
+    if not _is_async(library):
+        with SaveRestoreAPI_Threads(base_url=base_url, timeout=2) as SR:
+            nodes = list(SR.walk(root_folder_uid, max_depth=max_depth, node_types=node_types, max_concurrency=3))
+            assert len(nodes) == n_expected
+            assert len({_[1]["uniqueId"] for _ in nodes}) == n_expected
+            if node_types:
+                node_types = [node_types] if isinstance(node_types, str) else node_types
+                assert all(_[1]["nodeType"] in node_types for _ in nodes)
+
+            # Check parent UIDs
+            for parent_uid, node in nodes:
+                assert SR.node_get_parent(node["uniqueId"])["uniqueId"] == parent_uid
+
+            with pytest.raises(SR.RequestParameterError, match="max_depth"):
+                list(SR.walk(root_folder_uid, max_depth=0))
+
+    else:
+        async def testing():
+            async with SaveRestoreAPI_Async(base_url=base_url, timeout=2) as SR:
+                nodes = [
+                    _ async for _ in SR.walk(
+                        root_folder_uid, max_depth=max_depth, node_types=node_types, max_concurrency=3
+                    )
+                ]
+                assert len(nodes) == n_expected
+                assert len({_[1]["uniqueId"] for _ in nodes}) == n_expected
+
+                for parent_uid, node in nodes:
+                    assert (await SR.node_get_parent(node["uniqueId"]))["uniqueId"] == parent_uid
+
+                with pytest.raises(SR.RequestParameterError, match="max_depth"):
+                    [_ async for _ in SR.walk(root_folder_uid, max_depth=0)]
+
+        asyncio.run(testing())
+
+# =============================================================================================
+#                         TESTS FOR NODE CACHE
+# =============================================================================================
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_node_cache_01(clear_sar, library):  # noqa: F811
+    """
+    Basic tests for the node cache: cache hits and invalidation of the cached data
+    by the API calls that modify nodes.
+    """
+    root_folder_uid = create_root_folder()
+
+    if not _is_async(library):
+        with SaveRestoreAPI_Threads(base_url=base_url, timeout=2, node_cache_size=100) as SR:
+            _select_auth(SR=SR, usesetauth=True)
+
+            response = SR.node_add(root_folder_uid, node={"name": "Child Folder", "nodeType": "FOLDER"})
+            folder_uid = response["uniqueId"]
+
+            for _ in range(3):
+                assert len(SR.node_get_children(root_folder_uid)) == 1
+                assert SR.node_get(folder_uid)["name"] == "Child Folder"
+            info = SR.node_cache_info()
+            assert info["hits"] == 4
+            assert info["misses"] == 2
+
+            # Adding a node invalidates the list of children of the parent
+            SR.node_add(root_folder_uid, node={"name": "Child Config", "nodeType": "CONFIGURATION"})
+            assert len(SR.node_get_children(root_folder_uid)) == 2
+
+            # Tags are included in the cached node metadata
+            SR.tags_add(uniqueNodeIds=[folder_uid], tag={"name": "test tag"})
+            assert [_["name"] for _ in SR.node_get(folder_uid)["tags"]] == ["test tag"]
+
+            # Deleted node is removed from the cache
+            SR.node_delete(folder_uid)
+            assert len(SR.node_get_children(root_folder_uid)) == 1
+            with pytest.raises(SR.HTTPClientError):
+                SR.node_get(folder_uid)
+
+            SR.node_cache_clear()
+            assert SR.node_cache_info()["currsize"] == 0
+
+        with SaveRestoreAPI_Threads(base_url=base_url, timeout=2) as SR:
+            assert SR.node_cache_info() is None
+
+    else:
+        async def testing():
+            async with SaveRestoreAPI_Async(base_url=base_url, timeout=2, node_cache_size=100) as SR:
+                _select_auth(SR=SR, usesetauth=True)
+
+                response = await SR.node_add(root_folder_uid, node={"name": "Child Folder", "nodeType": "FOLDER"})
+                folder_uid = response["uniqueId"]
+
+                for _ in range(3):
+                    assert len(await SR.node_get_children(root_folder_uid)) == 1
+                    assert (await SR.node_get(folder_uid))["name"] == "Child Folder"
+                info = SR.node_cache_info()
+                assert info["hits"] == 4
+                assert info["misses"] == 2
+
+                await SR.node_add(root_folder_uid, node={"name": "Child Config", "nodeType": "CONFIGURATION"})
+                assert len(await SR.node_get_children(root_folder_uid)) == 2
+
+                await SR.tags_add(uniqueNodeIds=[folder_uid], tag={"name": "test tag"})
+                assert [_["name"] for _ in (await SR.node_get(folder_uid))["tags"]] == ["test tag"]
+
+                await SR.node_delete(folder_uid)
+                assert len(await SR.node_get_children(root_folder_uid)) == 1
+                with pytest.raises(SR.HTTPClientError):
+                    await SR.node_get(folder_uid)
+
+                SR.node_cache_clear()
+                assert SR.node_cache_info()["currsize"] == 0
+
+        asyncio.run(testing())
+
+
+# fmt: off
+@pytest.mark.parametrize("kwargs, msg", [
+    ({"node_cache_size": -1}, "Invalid 'node_cache_size'"),
+    ({"node_cache_size": 1.5}, "Invalid 'node_cache_size'"),
+    ({"node_cache_size": True}, "Invalid 'node_cache_size'"),
+    ({"node_cache_size": None}, "Invalid 'node_cache_size'"),
+    ({"node_cache_size": 10, "node_cache_ttl": -1}, "Invalid 'node_cache_ttl'"),
+    ({"node_cache_size": 10, "node_cache_ttl": "60"}, "Invalid 'node_cache_ttl'"),
+])
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_node_cache_02_fail(library, kwargs, msg):
+    """
+    Invalid parameters of the node cache are rejected by the constructor.
+    """
+    SR_class = SaveRestoreAPI_Async if _is_async(library) else SaveRestoreAPI_Threads
+    with pytest.raises(SR_class.RequestParameterError, match=msg):
+        SR_class(base_url=base_url, **kwargs)
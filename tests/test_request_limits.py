@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from save_and_restore_api import RequestLimits
+from save_and_restore_api import SaveRestoreAPI as SaveRestoreAPI_Threads
+from save_and_restore_api.aio import SaveRestoreAPI as SaveRestoreAPI_Async
+
+from .mock_server import MockServer, base_url
+
+
+class _Server(MockServer):
+    """
+    Mock server that counts the requests in progress. The requests take ``latency`` seconds.
+    The server contains ``n_nodes`` folders, the UIDs of the folders are listed in ``uids``.
+    """
+
+    def __init__(self, latency=0.01, n_nodes=40):
+        super().__init__(latency=latency)
+        self.uids = [self.create_folder(f"/folder-{n}")["uniqueId"] for n in range(n_nodes)]
+        self.in_progress = {"GET": 0, "DELETE": 0}
+        self.max_in_progress = {"GET": 0, "DELETE": 0}
+        self.times = []
+
+    def _start(self, request):
+        with self._lock:
+            self.times.append(time.monotonic())
+            self.in_progress[request.method] += 1
+            n = self.in_progress[request.method]
+            self.max_in_progress[request.method] = max(self.max_in_progress[request.method], n)
+
+    def _complete(self, request):
+        with self._lock:
+            self.in_progress[request.method] -= 1
+
+    def handler(self, request):
+        self._start(request)
+        try:
+            return super().handler(request)
+        finally:
+            self._complete(request)
+
+    async def async_handler(self, request):
+        self._start(request)
+        try:
+            return await super().async_handler(request)
+        finally:
+            self._complete(request)
+
+
+def _run_calls(library, server, calls, **kwargs):
+    """
+    Execute the API calls (list of ``(method_name, args)``) concurrently. Returns the results and
+    the statistics returned by ``request_limits_info()``.
+    """
+    if library == "THREADS":
+        transport = server.transport()
+        with SaveRestoreAPI_Threads(base_url=base_url, transport=transport, **kwargs) as SR:
+            with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+                futures = [executor.submit(getattr(SR, name), *args) for name, args in calls]
+                results = [_.result() for _ in futures]
+            return results, SR.request_limits_info()
+    else:
+
+        async def testing():
+            transport = server.async_transport()
+            async with SaveRestoreAPI_Async(base_url=base_url, transport=transport, **kwargs) as SR:
+                results = await asyncio.gather(*[getattr(SR, name)(*args) for name, args in calls])
+                return results, SR.request_limits_info()
+
+        return asyncio.run(testing())
+
+
+# fmt: off
+@pytest.mark.parametrize("params, msg", [
+    ({"max_concurrency": 0}, "Invalid 'max_concurrency'"),
+    ({"max_concurrency": 1.5}, "Invalid 'max_concurrency'"),
+    ({"rate": 0}, "Invalid 'rate'"),
+    ({"rate": 10, "burst": 0}, "Invalid 'burst'"),
+])
+# fmt: on
+def test_request_limits_01_fail(params, msg):
+    """
+    ``RequestLimits``: invalid parameters.
+    """
+    with pytest.raises(ValueError, match=msg):
+        RequestLimits(**params)
+
+
+# fmt: off
+@pytest.mark.parametrize("request_limits, msg", [
+    ({"other": RequestLimits()}, "Invalid group of requests"),
+    ({"read": 10}, "Invalid limits of the group 'read'"),
+    (10, "Invalid 'request_limits'"),
+])
+# fmt: on
+def test_request_limits_02_fail(request_limits, msg):
+    """
+    ``request_limits`` parameter of the constructor: invalid values.
+    """
+    with pytest.raises(SaveRestoreAPI_Threads.RequestParameterError, match=msg):
+        SaveRestoreAPI_Threads(base_url=base_url, request_limits=request_limits)
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_request_limits_03(library):
+    """
+    The number of concurrent requests is limited separately for read and write requests.
+    The requests are not limited by default.
+    """
+    def calls(server):
+        return [("node_get", (_,)) for _ in server.uids[:30]] + [("node_delete", (_,)) for _ in server.uids[30:]]
+
+    server = _Server()
+    results, info = _run_calls(library, server, calls(server))
+    assert len(results) == 40 and info is None
+    assert server.max_in_progress["GET"] > 5
+
+    server = _Server()
+    request_limits = {"read": RequestLimits(max_concurrency=5), "write": RequestLimits(max_concurrency=2)}
+    results, info = _run_calls(library, server, calls(server), request_limits=request_limits)
+    assert [_["uniqueId"] for _ in results[:30]] == server.uids[:30]
+    assert server.max_in_progress == {"GET": 5, "DELETE": 2}
+
+    assert info["read"]["max_concurrency"] == 5 and info["write"]["max_concurrency"] == 2
+    assert info["read"]["requests"] == 30 and info["write"]["requests"] == 10
+    assert info["read"]["in_progress"] == 0 and info["read"]["queued"] == 0
+    assert info["read"]["delayed"] >= 20 and info["read"]["max_queued"] > 5
+    assert 0 < info["read"]["max_wait_time"] <= info["read"]["wait_time"]
+
+    server = _Server()
+    request_limits = {"write": RequestLimits(max_concurrency=1)}
+    results, info = _run_calls(library, server, calls(server), request_limits=request_limits)
+    assert server.max_in_progress["GET"] > 5 and server.max_in_progress["DELETE"] == 1
+    assert set(info) == {"write"}
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_request_limits_04(library):
+    """
+    The rate of requests is limited using the token bucket: ``burst`` requests are sent at once,
+    then the requests are sent at the average rate.
+    """
+    server = _Server(latency=0)
+    calls = [("node_get", (_,)) for _ in server.uids[:25]]
+    results, info = _run_calls(library, server, calls, request_limits=RequestLimits(rate=100, burst=5))
+
+    assert len(results) == 25
+    assert server.times[-1] - server.times[0] >= 0.18
+    assert server.times[4] - server.times[0] < 0.05
+    assert info["read"]["delayed"] >= 19 and info["read"]["rate"] == 100
+
+
+def test_request_limits_05():
+    """
+    Request limits (async): the cancelled requests waiting in the queue are removed from the queue.
+    The waiting time is included in the request event (``limit_wait`` phase).
+    """
+    server, events = _Server(latency=0.05), []
+
+    async def testing():
+        transport = server.async_transport()
+        request_limits = RequestLimits(max_concurrency=1)
+        async with SaveRestoreAPI_Async(
+            base_url=base_url, transport=transport, request_limits=request_limits, request_hooks=[events.append]
+        ) as SR:
+            tasks = [asyncio.ensure_future(SR.node_get(_)) for _ in server.uids[:5]]
+            await asyncio.sleep(0.01)
+            assert SR.request_limits_info()["read"]["queued"] == 4
+            for task in tasks[1:4]:
+                task.cancel()
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+
+            assert results[0]["uniqueId"] == server.uids[0] and results[4]["uniqueId"] == server.uids[4]
+            info = SR.request_limits_info()["read"]
+            assert info["queued"] == 0 and info["in_progress"] == 0 and info["requests"] == 2
+
+            SR.request_limits_info_reset()
+            assert SR.request_limits_info()["read"]["requests"] == 0
+            assert (await SR.node_get(server.uids[5]))["uniqueId"] == server.uids[5]
+
+    asyncio.run(testing())
+
+    assert len(events) == 3
+    assert events[1].durations["limit_wait"] >= 0.04
+    assert events[0].durations["limit_wait"] < 0.04
+
+
+def test_request_limits_06():
+    """
+    Request limits (async): the tokens reserved by the cancelled requests waiting for the token
+    are returned to the bucket, so the following requests are not delayed by the cancelled requests.
+    """
+    server = _Server(latency=0)
+
+    async def testing():
+        transport = server.async_transport()
+        request_limits = RequestLimits(rate=10, burst=1)
+        async with SaveRestoreAPI_Async(
+            base_url=base_url, transport=transport, request_limits=request_limits
+        ) as SR:
+            tasks = [asyncio.ensure_future(SR.node_get(_)) for _ in server.uids[:10]]
+            await asyncio.sleep(0.01)
+            assert SR.request_limits_info()["read"]["queued"] == 9
+            for task in tasks[1:]:
+                task.cancel()
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            assert results[0]["uniqueId"] == server.uids[0]
+            assert all(isinstance(_, asyncio.CancelledError) for _ in results[1:])
+
+            t0 = time.monotonic()
+            assert (await SR.node_get(server.uids[10]))["uniqueId"] == server.uids[10]
+            assert time.monotonic() - t0 < 0.3
+
+            info = SR.request_limits_info()["read"]
+            assert info["queued"] == 0 and info["in_progress"] == 0 and info["requests"] == 2
+
+    asyncio.run(testing())
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_request_limits_07(library):
+    """
+    The request limits are not held while the application iterates over the items of the streaming
+    request, so the API methods called inside the loop are not blocked (``max_concurrency=1``).
+    """
+    server = _Server(latency=0)
+    config_uid = server.create_config("/config", n_pvs=100)["uniqueId"]
+    snapshot_uid = server.create_snapshot(config_uid, name="snapshot")["uniqueId"]
+    request_limits, uids = RequestLimits(max_concurrency=1), []
+
+    if library == "THREADS":
+
+        def testing():
+            with SaveRestoreAPI_Threads(
+                base_url=base_url, transport=server.transport(), request_limits=request_limits
+            ) as SR:
+                for _ in SR.snapshot_get_items_stream(snapshot_uid):
+                    uids.append(SR.node_get(config_uid)["uniqueId"])
+
+        thread = threading.Thread(target=testing, daemon=True)
+        thread.start()
+        thread.join(timeout=10)
+        assert not thread.is_alive()
+    else:
+
+        async def testing():
+            async with SaveRestoreAPI_Async(
+                base_url=base_url, transport=server.async_transport(), request_limits=request_limits
+            ) as SR:
+                async for _ in SR.snapshot_get_items_stream(snapshot_uid):
+                    uids.append((await SR.node_get(config_uid))["uniqueId"])
+
+        asyncio.run(asyncio.wait_for(testing(), timeout=10))
+
+    assert uids == [config_uid] * 100
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import pytest
+
+from save_and_restore_api import SaveRestoreAPI as SaveRestoreAPI_Threads
+
+from .mock_server import MockServer, call_api, pv_names
+
+
+class _Server(MockServer):
+    """
+    The snapshot and the composite snapshot contain the PVs ``PV0`` .. ``PV9`` and ``PV-FAIL``.
+    The PVs ``different`` are not equal to the stored values (the PVs missing in the snapshot
+    are also compared), ``PV-FAIL`` can not be restored.
+    """
+
+    def __init__(self, different=("PV3", "PV5", "PV-FAIL")):
+        super().__init__()
+        self.different = set(different)
+        config = self.create_config("/folder/config", pv_names=[*[f"PV{n}" for n in range(10)], "PV-FAIL"])
+        snapshot = self.create_snapshot(config["uniqueId"], name="snapshot")
+        composite = self.create_composite_snapshot("/folder/composite", snapshot_uids=[snapshot["uniqueId"]])
+        self.uids = {_["name"]: _["uniqueId"] for _ in (config, snapshot, composite)}
+
+    def _compare(self, **kwargs):
+        results = super()._compare(**kwargs)
+        missing = sorted(self.different - {_["pvName"] for _ in results})
+        results += [{"pvName": _} for _ in missing]
+        return [{**_, "equal": _["pvName"] not in self.different} for _ in results]
+
+    def restore_pv(self, item):
+        return "FAIL" not in item["configPv"]["pvName"]
+
+
+# fmt: off
+@pytest.mark.parametrize("node", ["snapshot", "composite"])
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_restore_differences_01(library, node):
+    """
+    ``restore_differences()``: only the PVs that are not equal to the stored values are restored.
+    The comparison parameters are passed to ``compare()``.
+    """
+    server = _Server()
+    kwargs = {"tolerance": 0.1, "compareMode": "RELATIVE", "skipReadback": True}
+    result = call_api(library, server, "restore_differences", server.uids[node], **kwargs)
+
+    assert result["dry_run"] is False
+    assert result["n_compared"] == 11 and result["n_equal"] == 8
+    assert sorted(pv_names(result["different"])) == ["PV-FAIL", "PV3", "PV5"]
+    assert sorted(pv_names(result["restored"])) == ["PV3", "PV5"]
+    assert sorted(pv_names(result["not_restored"])) == ["PV-FAIL"]
+    assert result["missing"] == []
+
+    compare_params = next(_[2] for _ in server.requests if _[1].startswith("/compare/"))
+    assert compare_params == {"tolerance": "0.1", "compareMode": "RELATIVE", "skipReadback": "true"}
+    assert server.count("POST", "/restore/items") == 1
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_restore_differences_02(library):
+    """
+    ``restore_differences()``: dry run, no differences, PVs missing in the snapshot items.
+    """
+    server = _Server()
+    result = call_api(library, server, "restore_differences", server.uids["snapshot"], dry_run=True)
+    assert result["dry_run"] is True
+    assert sorted(pv_names(result["different"])) == ["PV-FAIL", "PV3", "PV5"]
+    assert result["restored"] == [] and result["not_restored"] == []
+    assert server.count("POST", "/restore/items") == 0
+
+    # The snapshot items are not loaded if there are no differences
+    server = _Server(different=())
+    uid = server.uids["snapshot"]
+    result = call_api(library, server, "restore_differences", uid)
+    assert result["n_equal"] == 11 and result["different"] == [] and result["restored"] == []
+    assert [_[1] for _ in server.requests] == [f"/node/{uid}", f"/compare/{uid}"]
+
+    server = _Server(different=("PV3", "PV-UNKNOWN"))
+    result = call_api(library, server, "restore_differences", server.uids["snapshot"])
+    assert sorted(pv_names(result["restored"])) == ["PV3"] and result["missing"] == ["PV-UNKNOWN"]
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_restore_differences_03_fail(library):
+    """
+    ``restore_differences()``: the node is not a snapshot. No PVs are compared or restored.
+    """
+    server = _Server()
+    with pytest.raises(SaveRestoreAPI_Threads.RequestParameterError, match="is not a snapshot"):
+        call_api(library, server, "restore_differences", server.uids["config"])
+    assert [_[1] for _ in server.requests] == [f"/node/{server.uids['config']}"]
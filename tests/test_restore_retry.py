@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from save_and_restore_api import RetryPolicy
+from save_and_restore_api import SaveRestoreAPI as SaveRestoreAPI_Threads
+
+from .mock_server import MockServer, ResponseError, call_api, pv_names, snapshot_items
+
+
+class _Server(MockServer):
+    """
+    The PV with the name ``<name>:FAIL<n>`` is not restored by the first ``n`` requests, the PV
+    ``<name>:BAD`` is never restored. ``responses`` - list of status codes returned instead
+    of restoring the PVs by the first requests.
+    """
+
+    def __init__(self, responses=()):
+        super().__init__()
+        self.responses = list(responses)
+        self.attempts = {}
+
+    def _restore_items(self, **kwargs):
+        if self.responses:
+            raise ResponseError(self.responses.pop(0), "Request failed")
+        return super()._restore_items(**kwargs)
+
+    def restore_pv(self, item):
+        pv_name = item["configPv"]["pvName"]
+        self.attempts[pv_name] = self.attempts.get(pv_name, 0) + 1
+        n_failures = int(pv_name.split(":FAIL")[1]) if ":FAIL" in pv_name else 0
+        return not pv_name.endswith(":BAD") and self.attempts[pv_name] > n_failures
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_restore_items_retry_01(library):
+    """
+    ``restore_items_retry()``: only the items that were not restored are sent again.
+    """
+    items = snapshot_items("PV1", "PV2", "PV3:FAIL1", "PV4:FAIL2", "PV5:FAIL4", "PV6:BAD")
+    server = _Server()
+    policy = RetryPolicy(max_attempts=4, backoff_factor=0.001, jitter=0)
+
+    result = call_api(library, server, "restore_items_retry", items, retry_policy=policy)
+
+    assert sorted(pv_names(result["restored_first_try"])) == ["PV1", "PV2"]
+    assert sorted(pv_names(result["restored_on_retry"])) == ["PV3:FAIL1", "PV4:FAIL2"]
+    assert sorted(pv_names(result["failed"])) == ["PV5:FAIL4", "PV6:BAD"]
+    assert result["attempts"] == 4 and result["errors"] == []
+    assert [sorted(_) for _ in server.restored] == [
+        sorted(pv_names(items)),
+        ["PV3:FAIL1", "PV4:FAIL2", "PV5:FAIL4", "PV6:BAD"],
+        ["PV4:FAIL2", "PV5:FAIL4", "PV6:BAD"],
+        ["PV5:FAIL4", "PV6:BAD"],
+    ]
+    # The items are passed to the report as sent by the application
+    assert result["restored_first_try"][0] is items[0]
+
+    server = _Server()
+    result = call_api(library, server, "restore_items_retry", items[:2])
+    assert result["attempts"] == 1 and len(result["restored_first_try"]) == 2
+    assert result["restored_on_retry"] == [] and result["failed"] == []
+
+    server = _Server()
+    result = call_api(library, server, "restore_items_retry", [])
+    assert result["attempts"] == 0 and server.restored == []
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_restore_items_retry_02(library):
+    """
+    ``restore_items_retry()``: failed requests are retried, except the requests rejected by
+    the server with 4xx status codes.
+    """
+    items = snapshot_items("PV1", "PV2:FAIL1")
+    policy = RetryPolicy(max_attempts=5, backoff_factor=0.001, jitter=0)
+
+    server = _Server(responses=[503, 500])
+    result = call_api(library, server, "restore_items_retry", items, retry_policy=policy)
+    assert result["attempts"] == 4 and server.count("POST", "/restore/items") == 4
+    assert [_["attempt"] for _ in result["errors"]] == [1, 2]
+    assert isinstance(result["errors"][0]["error"], SaveRestoreAPI_Threads.HTTPServerError)
+    assert sorted(pv_names(result["restored_on_retry"])) == ["PV1", "PV2:FAIL1"]
+    assert result["restored_first_try"] == [] and result["failed"] == []
+
+    server = _Server(responses=[401])
+    result = call_api(library, server, "restore_items_retry", items, retry_policy=policy)
+    assert result["attempts"] == 1 and sorted(pv_names(result["failed"])) == ["PV1", "PV2:FAIL1"]
+    assert isinstance(result["errors"][0]["error"], SaveRestoreAPI_Threads.HTTPClientError)
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_restore_items_retry_03(library):
+    """
+    ``restore_items_retry()``: the items are not retried after the deadline.
+    """
+    server = _Server()
+    policy = RetryPolicy(max_attempts=100, backoff_factor=0.05, backoff_max=0.05, jitter=0)
+
+    t = time.monotonic()
+    items = snapshot_items("PV1", "PV2:BAD")
+    result = call_api(library, server, "restore_items_retry", items, retry_policy=policy, deadline=0.2)
+    duration = time.monotonic() - t
+
+    assert 0.2 <= duration < 1
+    assert 3 <= result["attempts"] <= 6
+    assert sorted(pv_names(result["failed"])) == ["PV2:BAD"]
+
+
+# fmt: off
+@pytest.mark.parametrize("kwargs, msg", [
+    ({"retry_policy": 3}, "Invalid 'retry_policy'"),
+    ({"deadline": 0}, "Invalid 'deadline'"),
+    ({"deadline": "10"}, "Invalid 'deadline'"),
+    ({"snapshotItems": [{"value": 1}]}, "Invalid snapshot item"),
+])
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_restore_items_retry_04_fail(library, kwargs, msg):
+    """
+    ``restore_items_retry()``: invalid parameters. No requests are sent.
+    """
+    params = {"snapshotItems": snapshot_items("PV1")}
+    params.update(kwargs)
+    server = _Server()
+    with pytest.raises(SaveRestoreAPI_Threads.RequestParameterError, match=msg):
+        call_api(library, server, "restore_items_retry", **params)
+    assert server.requests == []
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import re
+
+import pytest
+
+from save_and_restore_api import RestorePlan
+from save_and_restore_api import SaveRestoreAPI as SaveRestoreAPI_Threads
+
+from .mock_server import MockServer, ResponseError, call_api, pv_names, snapshot_items
+
+
+class _Server(MockServer):
+    """
+    The PVs with names containing ``FAIL`` are not restored, the requests containing PVs with
+    names containing ``ERROR`` are rejected.
+    """
+
+    def __init__(self):
+        super().__init__(latency=0.001)
+
+    def restore_pv(self, item):
+        if "ERROR" in item["configPv"]["pvName"]:
+            raise ResponseError(500, "Restore failed")
+        return "FAIL" not in item["configPv"]["pvName"]
+
+
+def test_restore_plan_01():
+    """
+    ``RestorePlan``: the items are assigned to the first matching stage, the order of the items
+    is preserved.
+    """
+    items = snapshot_items("SR:PS1:I", "QUAD:1:I", "SR:PS2:I", "VAC:GV1", "BEND:1:I", "OTHER", "QUAD:2:I")
+    plan = RestorePlan(
+        {
+            "ps": "*:PS?:*",
+            "magnets": [re.compile(r"^QUAD:"), "BEND:*"],
+            "vacuum": lambda item: item["configPv"]["pvName"].startswith("VAC:"),
+        }
+    )
+    assert plan.stage_names == ["ps", "magnets", "vacuum", "default"]
+    stages, unmatched = plan.split(items)
+    assert [(name, pv_names(items)) for name, items in stages] == [
+        ("ps", ["SR:PS1:I", "SR:PS2:I"]),
+        ("magnets", ["QUAD:1:I", "BEND:1:I", "QUAD:2:I"]),
+        ("vacuum", ["VAC:GV1"]),
+        ("default", ["OTHER"]),
+    ]
+    assert unmatched == []
+
+    plan = RestorePlan([("magnets", "QUAD:*"), ("ps", "*PS*")], default_stage=None)
+    stages, unmatched = plan.split(items)
+    assert [name for name, _ in stages] == ["magnets", "ps"]
+    assert pv_names(unmatched) == ["VAC:GV1", "BEND:1:I", "OTHER"]
+
+
+# fmt: off
+@pytest.mark.parametrize("stages, kwargs, msg", [
+    ({"ps": 10}, {}, "Invalid selector of the stage 'ps'"),
+    ({"ps": []}, {}, "Invalid selector of the stage 'ps'"),
+    ({"": "*"}, {}, "Invalid stage name"),
+    ([("ps", "*"), ("ps", "*")], {}, "Invalid stage name"),
+    (["ps"], {}, "Invalid stage"),
+    ({"ps": "*"}, {"default_stage": "ps"}, "Invalid 'default_stage'"),
+])
+# fmt: on
+def test_restore_plan_02_fail(stages, kwargs, msg):
+    """
+    ``RestorePlan``: invalid parameters.
+    """
+    with pytest.raises(ValueError, match=msg):
+        RestorePlan(stages, **kwargs)
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_restore_items_staged_01(library):
+    """
+    ``restore_items_staged()``: the stages are restored in order using chunked requests, the lists
+    of items that were not restored are merged.
+    """
+    names = [*[f"QUAD:{n}:I" for n in range(10)], *[f"SR:PS{n}:I" for n in range(5)], "QUAD:FAIL", "PS:FAIL"]
+    items = snapshot_items(*names)
+    plan = RestorePlan({"ps": "*PS*", "magnets": "QUAD:*", "empty": "NONE:*"})
+    server = _Server()
+
+    result = call_api(library, server, "restore_items_staged", items, plan, chunk_size=3, max_concurrency=4)
+
+    assert [_["name"] for _ in result["stages"]] == ["ps", "magnets", "empty", "default"]
+    assert [_["status"] for _ in result["stages"]] == ["completed"] * 4
+    assert [(_["n_items"], _["n_chunks"], _["n_not_restored"]) for _ in result["stages"]] == [
+        (6, 2, 1),
+        (11, 4, 1),
+        (0, 0, 0),
+        (0, 0, 0),
+    ]
+    assert all(_["duration"] >= _["max_request_duration"] >= 0 for _ in result["stages"])
+    assert sorted(pv_names(result["not_restored"])) == ["PS:FAIL", "QUAD:FAIL"]
+    assert result["skipped"] == [] and result["errors"] == []
+
+    # All requests of the 'ps' stage are sent before the requests of the 'magnets' stage
+    assert len(server.restored) == 6
+    assert all("PS" in _ for chunk in server.restored[:2] for _ in chunk)
+    assert all(_.startswith("QUAD:") for chunk in server.restored[2:] for _ in chunk)
+    assert all(len(_) <= 3 for _ in server.restored)
+
+
+# fmt: off
+@pytest.mark.parametrize("stop_on_error", [True, False])
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_restore_items_staged_02(library, stop_on_error):
+    """
+    ``restore_items_staged()``: failed requests are reported in the list of errors. The remaining
+    stages are skipped if ``stop_on_error`` is True. The unmatched items are not restored
+    if ``default_stage`` is None.
+    """
+    items = snapshot_items("PS:1", "PS:ERROR", "PS:2", "QUAD:1", "QUAD:2", "OTHER")
+    plan = RestorePlan({"ps": "PS:*", "magnets": "QUAD:*"}, default_stage=None)
+    server = _Server()
+
+    kwargs = {"chunk_size": 2, "max_concurrency": 2, "stop_on_error": stop_on_error}
+    result = call_api(library, server, "restore_items_staged", items, plan, **kwargs)
+
+    assert len(result["errors"]) == 1
+    error = result["errors"][0]
+    assert error["stage"] == "ps" and pv_names(error["snapshotItems"]) == ["PS:1", "PS:ERROR"]
+    assert isinstance(error["error"], SaveRestoreAPI_Threads.HTTPServerError)
+    assert result["stages"][0]["status"] == "failed"
+    if stop_on_error:
+        assert result["stages"][1]["status"] == "skipped"
+        assert pv_names(result["skipped"]) == ["OTHER", "QUAD:1", "QUAD:2"]
+        assert len(server.restored) == 2
+    else:
+        assert result["stages"][1]["status"] == "completed"
+        assert pv_names(result["skipped"]) == ["OTHER"]
+        assert len(server.restored) == 3
+
+
+# fmt: off
+@pytest.mark.parametrize("kwargs, msg", [
+    ({"plan": {"ps": "*"}}, "Invalid 'plan'"),
+    ({"chunk_size": 0}, "Invalid 'chunk_size'"),
+    ({"max_concurrency": 0}, "Invalid 'max_concurrency'"),
+    ({"snapshotItems": [{"value": 1}]}, "Invalid snapshot item"),
+])
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_restore_items_staged_03_fail(library, kwargs, msg):
+    """
+    ``restore_items_staged()``: invalid parameters. No requests are sent.
+    """
+    params = {"snapshotItems": snapshot_items("PS:1"), "plan": RestorePlan({"ps": "PS:*"})}
+    params.update(kwargs)
+    server = _Server()
+    with pytest.raises(SaveRestoreAPI_Threads.RequestParameterError, match=msg):
+        call_api(library, server, "restore_items_staged", **params)
+    assert server.requests == []
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from save_and_restore_api import RetryPolicy
+from save_and_restore_api import SaveRestoreAPI as SaveRestoreAPI_Threads
+from save_and_restore_api.aio import SaveRestoreAPI as SaveRestoreAPI_Async
+
+_base_url = "http://localhost:8080/save-restore"
+
+
+def _create_handler(failures):
+    """
+    Create the handler for ``httpx.MockTransport``. The first requests fail with errors from
+    the list ``failures`` (status code or exception), then the requests succeed.
+    Returns the handler and the list of the received requests.
+    """
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if len(requests) <= len(failures):
+            failure = failures[len(requests) - 1]
+            if isinstance(failure, Exception):
+                raise failure
+            return httpx.Response(failure, json={"error": "Request failed"})
+        return httpx.Response(200, json={"name": "Save-And-Restore"})
+
+    return handler, requests
+
+
+def test_retry_policy_01():
+    """
+    ``RetryPolicy``: selection of retryable requests and delays.
+    """
+    request = httpx.Request("GET", _base_url)
+    response_503 = httpx.Response(503, request=request, headers={"Retry-After": "2"})
+    response_400 = httpx.Response(400, request=request)
+    status_503 = httpx.HTTPStatusError("", request=request, response=response_503)
+    status_400 = httpx.HTTPStatusError("", request=request, response=response_400)
+
+    policy = RetryPolicy()
+    assert policy.max_attempts == 3
+    assert policy.is_retryable(method="GET", exception=httpx.ConnectError("")) is True
+    assert policy.is_retryable(method="GET", exception=httpx.ReadTimeout("")) is True
+    assert policy.is_retryable(method="GET", exception=status_503) is True
+    assert policy.is_retryable(method="GET", exception=status_400) is False
+    assert policy.is_retryable(method="GET", exception=ValueError()) is False
+    assert policy.is_retryable(method="PUT", exception=httpx.ConnectError("")) is False
+    assert policy.is_retryable(method="POST", exception=status_503) is False
+
+    policy = RetryPolicy(methods=["get", "put"], retry_on_timeout=False, retry_on_connection_error=False)
+    assert policy.is_retryable(method="PUT", exception=status_503) is True
+    assert policy.is_retryable(method="PUT", exception=httpx.ReadTimeout("")) is False
+    assert policy.is_retryable(method="PUT", exception=httpx.ConnectError("")) is False
+
+    policy = RetryPolicy(backoff_factor=1, backoff_max=3, jitter=0)
+    assert [policy.get_delay(attempt=_) for _ in range(1, 5)] == [1, 2, 3, 3]
+    assert policy.get_delay(attempt=1, exception=status_503) == 2
+
+    policy = RetryPolicy(backoff_factor=1, jitter=0.5)
+    for _ in range(100):
+        assert 2 <= policy.get_delay(attempt=3) <= 4
+
+
+# fmt: off
+@pytest.mark.parametrize("params, msg", [
+    ({"max_attempts": 0}, "Invalid 'max_attempts'"),
+    ({"backoff_factor": -1}, "Invalid 'backoff_factor'"),
+    ({"jitter": 1.5}, "Invalid 'jitter'"),
+])
+# fmt: on
+def test_retry_policy_02_fail(params, msg):
+    """
+    ``RetryPolicy``: invalid parameters.
+    """
+    with pytest.raises(ValueError, match=msg):
+        RetryPolicy(**params)
+
+
+# fmt: off
+@pytest.mark.parametrize("SR_class", [SaveRestoreAPI_Threads, SaveRestoreAPI_Async])
+@pytest.mark.parametrize("retry_policy", [3, True, {"max_attempts": 3}, RetryPolicy])
+# fmt: on
+def test_retry_policy_03_fail(SR_class, retry_policy):
+    """
+    ``retry_policy`` parameter of the constructor: invalid values.
+    """
+    with pytest.raises(SR_class.RequestParameterError, match="Invalid 'retry_policy'"):
+        SR_class(base_url=_base_url, retry_policy=retry_policy)
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_retry_01(library):
+    """
+    Retrying requests: transient errors, exhausted attempts, non-idempotent requests, counters.
+    """
+    policy = RetryPolicy(max_attempts=3, backoff_factor=0.01)
+    failures = [httpx.ConnectError("Connection refused"), 503]
+
+    if library == "THREADS":
+        handler, requests = _create_handler(failures)
+        transport = httpx.MockTransport(handler)
+        with SaveRestoreAPI_Threads(base_url=_base_url, transport=transport, retry_policy=policy) as SR:
+            assert SR.info_get() == {"name": "Save-And-Restore"}
+            assert len(requests) == 3
+            assert SR.retry_info() == {"retries": 2, "recovered": 1, "exhausted": 0}
+
+            # PUT requests are not retried
+            requests.clear()
+            with pytest.raises(SR.HTTPRequestError):
+                SR.send_request("PUT", "/node", body_json={})
+            assert len(requests) == 1
+
+            # The number of attempts is exceeded
+            requests.clear()
+            failures.extend([503] * 3)
+            with pytest.raises(SR.HTTPServerError):
+                SR.info_get()
+            assert len(requests) == 3
+            assert SR.retry_info() == {"retries": 4, "recovered": 1, "exhausted": 1}
+
+            SR.retry_info_reset()
+            assert SR.retry_info() == {"retries": 0, "recovered": 0, "exhausted": 0}
+
+        # Requests are not retried by default
+        handler, requests = _create_handler(failures)
+        transport = httpx.MockTransport(handler)
+        with SaveRestoreAPI_Threads(base_url=_base_url, transport=transport) as SR:
+            with pytest.raises(SR.HTTPRequestError):
+                SR.info_get()
+            assert len(requests) == 1
+
+    else:
+        async def testing():
+            handler, requests = _create_handler(failures)
+
+            async def async_handler(request):
+                return handler(request)
+
+            transport = httpx.MockTransport(async_handler)
+            async with SaveRestoreAPI_Async(base_url=_base_url, transport=transport, retry_policy=policy) as SR:
+                assert await SR.info_get() == {"name": "Save-And-Restore"}
+                assert len(requests) == 3
+                assert SR.retry_info() == {"retries": 2, "recovered": 1, "exhausted": 0}
+
+                requests.clear()
+                with pytest.raises(SR.HTTPRequestError):
+                    await SR.send_request("PUT", "/node", body_json={})
+                assert len(requests) == 1
+
+                requests.clear()
+                failures.extend([503] * 3)
+                with pytest.raises(SR.HTTPServerError):
+                    await SR.info_get()
+                assert len(requests) == 3
+                assert SR.retry_info() == {"retries": 4, "recovered": 1, "exhausted": 1}
+
+        asyncio.run(testing())
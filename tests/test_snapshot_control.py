@@ -329,6 +329,78 @@ def test_snapshot_add_01(clear_sar, library, usesetauth):  # noqa: F811
         asyncio.run(testing())
 
 
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_snapshot_get_items_stream_01(clear_sar, library):  # noqa: F811
+    """
+    Basic tests for the 'snapshot_get_items_stream' and 'snapshots_get_stream' API.
+    The streamed data must match the data returned by 'snapshot_get' and 'snapshots_get'.
+    """
+    root_folder_uid = create_root_folder()
+
+    if not _is_async(library):
+        with SaveRestoreAPI_Threads(base_url=base_url, timeout=10) as SR:
+            auth = _select_auth(SR=SR, usesetauth=True)
+
+            configurationNode = {"name": "Test Config"}
+            configurationData = {"pvList": [{"pvName": _} for _ in ioc_pvs.keys()]}
+            response = SR.config_add(
+                root_folder_uid, configurationNode=configurationNode, configurationData=configurationData, **auth
+            )
+            config_uid = response["configurationNode"]["uniqueId"]
+
+            response = SR.take_snapshot_save(config_uid, **auth)
+            shot_uid = response["snapshotNode"]["uniqueId"]
+
+            items = list(SR.snapshot_get_items_stream(shot_uid))
+            assert len(items) == len(ioc_pvs)
+            assert items == SR.snapshot_get(shot_uid)["snapshotItems"]
+
+            # Stop the iteration before all items are received
+            for n, _ in enumerate(SR.snapshot_get_items_stream(shot_uid)):
+                if n >= 2:
+                    break
+
+            nodes = list(SR.snapshots_get_stream())
+            assert nodes == SR.snapshots_get()
+            assert shot_uid in [_["uniqueId"] for _ in nodes]
+
+            with pytest.raises(SR.HTTPClientError):
+                list(SR.snapshot_get_items_stream("non-existing-uid"))
+
+    else:
+        async def testing():
+            async with SaveRestoreAPI_Async(base_url=base_url, timeout=2) as SR:
+                auth = _select_auth(SR=SR, usesetauth=True)
+
+                configurationNode = {"name": "Test Config"}
+                configurationData = {"pvList": [{"pvName": _} for _ in ioc_pvs.keys()]}
+                response = await SR.config_add(
+                    root_folder_uid,
+                    configurationNode=configurationNode,
+                    configurationData=configurationData,
+                    **auth
+                )
+                config_uid = response["configurationNode"]["uniqueId"]
+
+                response = await SR.take_snapshot_save(config_uid, **auth)
+                shot_uid = response["snapshotNode"]["uniqueId"]
+
+                items = [_ async for _ in SR.snapshot_get_items_stream(shot_uid)]
+                assert len(items) == len(ioc_pvs)
+                assert items == (await SR.snapshot_get(shot_uid))["snapshotItems"]
+
+                nodes = [_ async for _ in SR.snapshots_get_stream()]
+                assert nodes == await SR.snapshots_get()
+                assert shot_uid in [_["uniqueId"] for _ in nodes]
+
+                with pytest.raises(SR.HTTPClientError):
+                    [_ async for _ in SR.snapshot_get_items_stream("non-existing-uid")]
+
+        asyncio.run(testing())
+
+
 # =============================================================================================
 #                     TESTS FOR SNAPSHOT-RESTORE-CONTROLLER API METHODS
 # =============================================================================================
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import pytest
+
+from save_and_restore_api import SnapshotDiff, SnapshotTable
+
+
+def _create_item(pv_name, value):
+    return {
+        "configPv": {"pvName": pv_name},
+        "value": {"type": {"name": "VDouble"}, "value": value, "alarm": {"severity": "NONE"}},
+    }
+
+
+_items1 = [
+    _create_item("PV:A", 1.0),
+    _create_item("PV:B", 10),
+    _create_item("PV:C", [1.0, 2.0]),
+    _create_item("PV:D", "text"),
+    _create_item("PV:E", float("nan")),
+    _create_item("PV:F", 5.0),
+    _create_item("PV:G", [1, 2]),
+    _create_item("PV:H", 1.0),
+    _create_item("PV:ONLY_1", 1.0),
+]
+
+_items2 = [
+    _create_item("PV:ONLY_2", 1.0),
+    _create_item("PV:H", [1.0]),
+    _create_item("PV:G", [1, 2, 3]),
+    _create_item("PV:F", "text"),
+    _create_item("PV:E", float("nan")),
+    _create_item("PV:D", "text"),
+    _create_item("PV:C", [1.0, 2.01]),
+    _create_item("PV:B", 10),
+    _create_item("PV:A", 1.05),
+]
+
+
+# fmt: off
+@pytest.mark.parametrize("tolerance, compareMode, different", [
+    (None, None, ["PV:A", "PV:C", "PV:F", "PV:G", "PV:H"]),
+    (0, "ABSOLUTE", ["PV:A", "PV:C", "PV:F", "PV:G", "PV:H"]),
+    (0.1, "ABSOLUTE", ["PV:F", "PV:G", "PV:H"]),
+    (0.04, "ABSOLUTE", ["PV:A", "PV:F", "PV:G", "PV:H"]),
+    (0.04, "RELATIVE", ["PV:A", "PV:F", "PV:G", "PV:H"]),
+    (0.06, "RELATIVE", ["PV:F", "PV:G", "PV:H"]),
+])
+# fmt: on
+def test_snapshot_diff_01(tolerance, compareMode, different):
+    """
+    ``SnapshotDiff``: basic test.
+    """
+    diff = SnapshotDiff(_items1, _items2, tolerance=tolerance, compareMode=compareMode)
+    assert diff.pv_names == tuple(_["configPv"]["pvName"] for _ in _items1[:-1])
+    assert len(diff) == len(_items1) - 1
+    assert diff.different == different
+    assert [not _ for _ in diff.equal] == [_ in different for _ in diff.pv_names]
+    assert diff.only_in_first == ["PV:ONLY_1"]
+    assert diff.only_in_second == ["PV:ONLY_2"]
+    assert not diff.is_equal
+
+    assert list(diff.index1) == list(range(len(_items1) - 1))
+    assert list(diff.index2) == list(range(len(_items2) - 1, 0, -1))
+
+    results = diff.to_list(only_different=True)
+    assert [_["pvName"] for _ in results] == different
+    assert results[-1] == {
+        "pvName": "PV:H", "equal": False, "value1": _items1[7]["value"], "value2": _items2[1]["value"]
+    }
+    assert len(diff.to_list()) == len(diff)
+
+
+def test_snapshot_diff_02():
+    """
+    ``SnapshotDiff``: different representations of snapshots, identical snapshots.
+    """
+    table = SnapshotTable.from_items(_items1)
+    for snapshot in (_items1, {"snapshotItems": _items1}, table):
+        diff = SnapshotDiff(table, snapshot)
+        assert diff.is_equal
+        assert diff.table1 is table
+
+    # Duplicate PV names: the first item is used
+    diff = SnapshotDiff(_items1 + [_create_item("PV:A", 2.0)], _items1)
+    assert diff.is_equal
+
+
+# fmt: off
+@pytest.mark.parametrize("params, msg", [
+    ({"tolerance": -1}, "Invalid 'tolerance'"),
+    ({"tolerance": "1"}, "Invalid 'tolerance'"),
+    ({"compareMode": "UNSUPPORTED"}, "Invalid 'compareMode'"),
+])
+# fmt: on
+def test_snapshot_diff_03_fail(params, msg):
+    """
+    ``SnapshotDiff``: invalid parameters.
+    """
+    with pytest.raises(ValueError, match=msg):
+        SnapshotDiff(_items1, _items2, **params)
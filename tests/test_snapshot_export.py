@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+
+import httpx
+import pytest
+
+import save_and_restore_api._snapshot_export as snapshot_export
+from save_and_restore_api import SaveRestoreAPI as SaveRestoreAPI_Threads
+from save_and_restore_api import SnapshotExportWriter
+from save_and_restore_api.aio import SaveRestoreAPI as SaveRestoreAPI_Async
+
+_base_url = "http://localhost:8080/save-restore"
+
+
+def _create_item(pv_name, value, *, type_name="VDouble", severity="NONE", unix_sec=1760000000, nano_sec=0):
+    return {
+        "configPv": {"pvName": pv_name, "readOnly": False},
+        "value": {
+            "type": {"name": type_name, "version": 1},
+            "value": value,
+            "alarm": {"severity": severity, "status": "NONE", "name": "NO_ALARM"},
+            "time": {"unixSec": unix_sec, "nanoSec": nano_sec, "userTag": 0},
+        },
+    }
+
+
+_items = [
+    _create_item("PV:DOUBLE", 10.5, severity="MINOR", nano_sec=500000000),
+    _create_item("PV:INT", 10, type_name="VInt"),
+    _create_item("PV:DOUBLE_ARRAY", [1.5, 2.5, 3.5], type_name="VDoubleArray", severity="MAJOR"),
+    _create_item("PV:STRING", "some text", type_name="VString"),
+    _create_item("PV:ENUM", {"index": 1, "labels": ["a", "b"]}, type_name="VEnum"),
+    {"configPv": {"pvName": "PV:NO_VALUE", "readOnly": True}},
+]
+
+# Expected rows: (pv_name, value, value_array, value_text, severity, unix_sec, nano_sec)
+_rows = [
+    ("PV:DOUBLE", 10.5, None, None, "MINOR", 1760000000, 500000000),
+    ("PV:INT", 10.0, None, None, "NONE", 1760000000, 0),
+    ("PV:DOUBLE_ARRAY", math.nan, [1.5, 2.5, 3.5], None, "MAJOR", 1760000000, 0),
+    ("PV:STRING", math.nan, None, "some text", "NONE", 1760000000, 0),
+    ("PV:ENUM", math.nan, None, '{"index": 1, "labels": ["a", "b"]}', "NONE", 1760000000, 0),
+    ("PV:NO_VALUE", math.nan, None, None, None, None, None),
+]
+
+
+def _read_file(file_name, file_format):
+    """
+    Read the exported file. Returns the dictionary {column name: list of values}. The missing
+    values in HDF5 files are converted to None.
+    """
+    if file_format == "parquet":
+        import pyarrow.parquet as pq
+
+        return pq.read_table(file_name).to_pydict()
+    elif file_format == "arrow":
+        import pyarrow as pa
+
+        with pa.ipc.open_file(file_name) as reader:
+            return reader.read_all().to_pydict()
+    else:
+        import h5py
+
+        with h5py.File(file_name, "r") as f:
+            data = {}
+            for name, ctype, fill in snapshot_export._COLUMNS:
+                if ctype == "str":
+                    data[name] = [_ or None for _ in f[name].asstr()[:]]
+                elif ctype == "f8[]":
+                    data[name] = [_.tolist() or None for _ in f[name][:]]
+                elif ctype in ("i8", "i4"):
+                    data[name] = [None if _ == fill else int(_) for _ in f[name][:]]
+                else:
+                    data[name] = f[name][:].tolist()
+            # Timestamps are missing if 'nano_sec' is missing
+            data["unix_sec"] = [None if ns is None else s for s, ns in zip(data["unix_sec"], data["nano_sec"])]
+            return data
+
+
+def _check_rows(data, snapshots):
+    """
+    Check the contents of the exported file. ``snapshots`` is the list of (UID, name) of
+    the snapshots that contain all the items from ``_items``.
+    """
+    expected = [(uid, name) + row for uid, name in snapshots for row in _rows]
+    assert len(data["pv_name"]) == len(expected)
+    columns = ("pv_name", "value", "value_array", "value_text", "severity", "unix_sec", "nano_sec")
+    rows = list(zip(data["snapshot_uid"], data["snapshot_name"], *[data[_] for _ in columns]))
+    for row, row_expected in zip(rows, expected):
+        assert row[:3] == row_expected[:3]
+        assert (math.isnan(row[3]) and math.isnan(row_expected[3])) or row[3] == row_expected[3]
+        assert row[4:] == row_expected[4:]
+    assert data["value_type"][:2] == ["VDouble", "VInt"]
+    assert data["status"][0] == "NONE" and data["alarm_name"][0] == "NO_ALARM"
+
+
+# fmt: off
+@pytest.mark.parametrize("file_format, extension", [
+    ("parquet", ".parquet"),
+    ("arrow", ".arrow"),
+    ("hdf5", ".h5"),
+])
+@pytest.mark.parametrize("chunk_size", [1, 4, 10000])
+# fmt: on
+def test_snapshot_export_writer_01(tmp_path, file_format, extension, chunk_size):
+    """
+    ``SnapshotExportWriter``: write the items in chunks and read the file.
+    """
+    pytest.importorskip("h5py" if file_format == "hdf5" else "pyarrow")
+
+    file_name = tmp_path / f"snapshots{extension}"
+    with SnapshotExportWriter(file_name, chunk_size=chunk_size) as writer:
+        assert writer.file_format == file_format
+        for n in range(2):
+            for item in _items:
+                writer.append(item, snapshot_uid=f"uid-{n}", snapshot_name=f"snapshot-{n}")
+        assert writer.n_items == 2 * len(_items)
+    writer.close()
+
+    _check_rows(_read_file(file_name, file_format), [("uid-0", "snapshot-0"), ("uid-1", "snapshot-1")])
+
+    with pytest.raises(RuntimeError, match="closed"):
+        writer.append(_items[0], snapshot_uid="uid-0")
+
+
+def test_snapshot_export_writer_02_fail(tmp_path, monkeypatch):
+    """
+    ``SnapshotExportWriter``: invalid parameters and missing packages.
+    """
+    with pytest.raises(ValueError, match="Invalid 'chunk_size'"):
+        SnapshotExportWriter(tmp_path / "snapshots.parquet", chunk_size=0)
+    with pytest.raises(ValueError, match="Failed to select the file format"):
+        SnapshotExportWriter(tmp_path / "snapshots.csv")
+    with pytest.raises(ValueError, match="Unsupported file format"):
+        SnapshotExportWriter(tmp_path / "snapshots.parquet", file_format="csv")
+
+    monkeypatch.setattr(snapshot_export, "pa", None)
+    monkeypatch.setattr(snapshot_export, "h5py", None)
+    with pytest.raises(ImportError, match="pyarrow"):
+        SnapshotExportWriter(tmp_path / "snapshots.parquet")
+    with pytest.raises(ImportError, match="h5py"):
+        SnapshotExportWriter(tmp_path / "snapshots.dat", file_format="hdf5")
+    with pytest.raises(ValueError, match="PV name"):
+        snapshot_export._export_row({"value": {}})
+
+
+_snapshot_nodes = {
+    "snapshot-uid-1": {"uniqueId": "snapshot-uid-1", "name": "Snapshot 1", "nodeType": "SNAPSHOT"},
+    "snapshot-uid-2": {"uniqueId": "snapshot-uid-2", "name": "Snapshot 2", "nodeType": "SNAPSHOT"},
+}
+_children = {
+    "folder-uid": [{"uniqueId": "config-uid", "name": "Config", "nodeType": "CONFIGURATION"}],
+    "config-uid": list(_snapshot_nodes.values()),
+}
+
+
+def _handler(request):
+    path = request.url.path[len("/save-restore") :]
+    if path == "/nodes":
+        return httpx.Response(200, json=[_snapshot_nodes[_] for _ in json.loads(request.content)])
+    if path.startswith("/node/") and path.endswith("/children"):
+        return httpx.Response(200, json=_children.get(path.split("/")[2], []))
+    if path == "/search":
+        # One node per page to test loading of multiple pages
+        start, nodes = int(request.url.params["from"]), list(_snapshot_nodes.values())
+        return httpx.Response(200, json={"hitCount": len(nodes), "nodes": nodes[start : start + 1]})
+    if path.startswith("/snapshot/"):
+        return httpx.Response(200, json={"uniqueId": path.split("/")[2], "snapshotItems": _items})
+    return httpx.Response(404, json={"error": "Not found"})
+
+
+# fmt: off
+@pytest.mark.parametrize("params", [
+    {"uniqueIds": ["snapshot-uid-1", "snapshot-uid-2"]},
+    {"folderId": "folder-uid"},
+    {"tag": "golden"},
+])
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_snapshots_export_01(tmp_path, library, params):
+    """
+    ``snapshots_export()``: export the snapshots selected by UIDs, by folder and by tag.
+    """
+    pytest.importorskip("pyarrow")
+
+    file_name = tmp_path / "snapshots.parquet"
+    snapshots = [("snapshot-uid-1", "Snapshot 1"), ("snapshot-uid-2", "Snapshot 2")]
+
+    def check_result(result):
+        assert [_["uniqueId"] for _ in result["snapshots"]] == [_[0] for _ in snapshots]
+        assert result["items"] == 2 * len(_items)
+        _check_rows(_read_file(file_name, "parquet"), snapshots)
+
+    if library == "THREADS":
+        with SaveRestoreAPI_Threads(base_url=_base_url, transport=httpx.MockTransport(_handler)) as SR:
+            check_result(SR.snapshots_export(file_name, chunk_size=4, **params))
+    else:
+
+        async def testing():
+            async def async_handler(request):
+                return _handler(request)
+
+            transport = httpx.MockTransport(async_handler)
+            async with SaveRestoreAPI_Async(base_url=_base_url, transport=transport) as SR:
+                check_result(await SR.snapshots_export(file_name, chunk_size=4, **params))
+
+        asyncio.run(testing())
+
+
+# fmt: off
+@pytest.mark.parametrize("params, msg", [
+    ({}, "Exactly one of the parameters"),
+    ({"uniqueIds": ["snapshot-uid-1"], "tag": "golden"}, "Exactly one of the parameters"),
+    ({"tag": "golden", "chunk_size": 0}, "Invalid 'chunk_size'"),
+    ({"tag": "golden", "file_format": "csv"}, "Unsupported file format"),
+])
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_snapshots_export_02_fail(tmp_path, library, params, msg):
+    """
+    ``snapshots_export()``: invalid parameters. No requests are sent and no file is created.
+    """
+    file_name = tmp_path / "snapshots.parquet"
+    transport = httpx.MockTransport(lambda request: pytest.fail("The request was sent"))
+
+    if library == "THREADS":
+        with SaveRestoreAPI_Threads(base_url=_base_url, transport=transport) as SR:
+            with pytest.raises(SR.RequestParameterError, match=msg):
+                SR.snapshots_export(file_name, **params)
+    else:
+
+        async def testing():
+            async with SaveRestoreAPI_Async(base_url=_base_url, transport=transport) as SR:
+                with pytest.raises(SR.RequestParameterError, match=msg):
+                    await SR.snapshots_export(file_name, **params)
+
+        asyncio.run(testing())
+
+    assert not file_name.exists()
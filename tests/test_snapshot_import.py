@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from save_and_restore_api import SaveRestoreAPI as SaveRestoreAPI_Threads
+
+from .mock_server import ROOT_NODE_UID, MockServer, call_api, snapshot_items
+
+
+def _create_snapshot(config_name, name, *, pv_names=("PV1", "PV2"), **kwargs):
+    items = snapshot_items(*pv_names)
+    node = {"uniqueId": f"src-{name}", "name": name, "description": f"Description of {name}", "userName": "src"}
+    return {"configName": config_name, "snapshotNode": node, "snapshotData": {"snapshotItems": items}, **kwargs}
+
+
+class _Server(MockServer):
+    """
+    The folder ``/existing`` exists. Snapshots with names starting with ``fail`` are rejected.
+    """
+
+    def __init__(self):
+        super().__init__(latency=0.001)
+        self.create_folder("/existing")
+
+    def node_rejected(self, node):
+        # The fields set by the source server are not sent
+        assert not {"uniqueId", "userName"} & set(node)
+        return node["name"].startswith("fail")
+
+
+def _import(library, server, snapshots, **kwargs):
+    if library == "ASYNC":
+        # The async version accepts asynchronous iterables
+        async def async_snapshots(snapshots):
+            for snapshot in snapshots:
+                yield snapshot
+
+        snapshots = async_snapshots(snapshots)
+    return call_api(library, server, "snapshots_import_bulk", snapshots, **kwargs)
+
+
+# fmt: off
+@pytest.mark.parametrize("max_concurrency", [1, 4])
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_snapshots_import_bulk_01(library, max_concurrency):
+    """
+    ``snapshots_import_bulk()``: the missing folders and configurations are created once,
+    the snapshots are added to the configurations.
+    """
+    server = _Server()
+    snapshots = [_create_snapshot("/existing/new/config-1", f"snapshot-{n}") for n in range(10)]
+    snapshots += [_create_snapshot("existing/new/config-2/", f"snapshot-{n}", pv_names=["PV3"]) for n in range(5)]
+    snapshots += [_create_snapshot("/other/config-1", "snapshot-0")]
+
+    result = _import(library, server, snapshots, max_concurrency=max_concurrency)
+
+    assert len(result["snapshots"]) == 16
+    assert result["skipped"] == [] and result["errors"] == []
+    assert server.count("PUT", "/node") == 2  # '/existing/new' and '/other'
+    assert server.count("PUT", "/config") == 3
+    assert server.count("PUT", "/snapshot") == 16
+    config_uids = [server.uid_get(f"/existing/new/config-{n}") for n in (1, 2)]
+    assert server.parent_get(config_uids[0]) == server.uid_get("/existing/new")
+    assert server.data_get(config_uids[0])["pvList"] == [{"pvName": "PV1"}, {"pvName": "PV2"}]
+    assert server.data_get(config_uids[1])["pvList"] == [{"pvName": "PV3"}]
+    assert server.parent_get(server.uid_get("/other")) == ROOT_NODE_UID
+    assert server.uid_get("/existing/new/config-2/snapshot-4") is not None
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_snapshots_import_bulk_02(tmp_path, library):
+    """
+    ``snapshots_import_bulk()``: the import is resumed from the checkpoint file. The incomplete
+    last line of the file is ignored.
+    """
+    checkpoint = tmp_path / "import.checkpoint"
+    snapshots = [_create_snapshot("/existing/config", f"snapshot-{n}") for n in range(6)]
+    snapshots.append(_create_snapshot("/existing/config", "snapshot-x", key="custom-key"))
+
+    server = _Server()
+    result = _import(library, server, snapshots[:3], checkpoint=str(checkpoint))
+    assert len(result["snapshots"]) == 3
+    with open(checkpoint, "a") as f:
+        f.write('{"key": "/existing/config/snapshot-3", "uniq')  # Interrupted write
+
+    server = _Server()
+    result = _import(library, server, snapshots, checkpoint=str(checkpoint))
+    assert result["skipped"] == [f"/existing/config/snapshot-{n}" for n in range(3)]
+    names = sorted(_["name"] for _ in result["snapshots"])
+    assert names == ["snapshot-3", "snapshot-4", "snapshot-5", "snapshot-x"]
+    assert server.count("PUT", "/snapshot") == 4
+
+    server = _Server()
+    result = _import(library, server, snapshots, checkpoint=str(checkpoint))
+    assert len(result["skipped"]) == 7 and "custom-key" in result["skipped"]
+    assert result["snapshots"] == [] and server.requests == []
+
+    with open(checkpoint) as f:
+        lines = f.read().splitlines()
+    assert len(lines) == 8 and "custom-key" in [json.loads(_)["key"] for _ in lines[4:]]
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_snapshots_import_bulk_03_fail(tmp_path, library):
+    """
+    ``snapshots_import_bulk()``: invalid and rejected snapshots are reported in the list of errors,
+    failed snapshots are not saved in the checkpoint file.
+    """
+    checkpoint = tmp_path / "import.checkpoint"
+    snapshots = [
+        _create_snapshot("/existing/config", "snapshot-1"),
+        _create_snapshot("/existing/config", "fail-1"),
+        {"configName": "/existing/config", "snapshotNode": {"name": "no-data"}},
+        _create_snapshot("///", "invalid-path"),
+        _create_snapshot("/missing/config", "snapshot-2"),
+    ]
+
+    server = _Server()
+    result = _import(library, server, snapshots, checkpoint=str(checkpoint), create_nodes=False)
+
+    assert result["snapshots"] == []
+    errors = {_["key"]: _["error"] for _ in result["errors"]}
+    assert len(result["errors"]) == 5
+    assert isinstance(errors["/existing/config/snapshot-1"], RuntimeError)
+    assert isinstance(errors["/existing/config/fail-1"], RuntimeError)
+    assert isinstance(errors["/missing/config/snapshot-2"], RuntimeError)
+    assert "does not exist" in str(errors["/missing/config/snapshot-2"])
+    assert len([_ for _ in result["errors"] if _["key"] is None]) == 2
+    assert server.count("PUT", "/snapshot") == 0
+
+    server = _Server()
+    result = _import(library, server, snapshots, checkpoint=str(checkpoint))
+
+    assert sorted(_["name"] for _ in result["snapshots"]) == ["snapshot-1", "snapshot-2"]
+    errors = {_["key"]: _["error"] for _ in result["errors"]}
+    assert isinstance(errors["/existing/config/fail-1"], SaveRestoreAPI_Threads.HTTPClientError)
+    assert isinstance(errors[None], SaveRestoreAPI_Threads.RequestParameterError)
+    with open(checkpoint) as f:
+        assert len(f.read().splitlines()) == 2
+
+
+# fmt: off
+@pytest.mark.parametrize("max_concurrency", [0, -1, 1.5, None])
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_snapshots_import_bulk_04_fail(tmp_path, library, max_concurrency):
+    """
+    ``snapshots_import_bulk()``: invalid parameters. No requests are sent.
+    """
+    server = _Server()
+    snapshots = [_create_snapshot("/existing/config", "snapshot-1")]
+    with pytest.raises(SaveRestoreAPI_Threads.RequestParameterError, match="Invalid 'max_concurrency'"):
+        _import(library, server, snapshots, max_concurrency=max_concurrency)
+    assert server.requests == []
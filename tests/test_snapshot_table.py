@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import copy
+import math
+
+import pytest
+
+from save_and_restore_api import SnapshotTable
+
+
+def _create_item(pv_name, value, *, type_name="VDouble", severity="NONE", unix_sec=1760000000, nano_sec=0):
+    return {
+        "configPv": {"pvName": pv_name, "readOnly": False},
+        "value": {
+            "type": {"name": type_name, "version": 1},
+            "value": value,
+            "alarm": {"severity": severity, "status": "NONE", "name": "NO_ALARM"},
+            "time": {"unixSec": unix_sec, "nanoSec": nano_sec, "userTag": 0},
+            "display": {"units": "mm"},
+        },
+    }
+
+
+_items = [
+    _create_item("PV:DOUBLE", 10.5, severity="MINOR", nano_sec=500000000),
+    _create_item("PV:INT", 10, type_name="VInt"),
+    _create_item("PV:DOUBLE_ARRAY", [1.5, 2.5, 3.5], type_name="VDoubleArray", severity="MAJOR"),
+    _create_item("PV:INT_ARRAY", [1, 2, 3], type_name="VIntArray"),
+    _create_item("PV:STRING", "some text", type_name="VString"),
+    _create_item("PV:STRING_ARRAY", ["a", "b"], type_name="VStringArray"),
+    _create_item("PV:LONG", 2**60, type_name="VLong"),
+    {"configPv": {"pvName": "PV:NO_VALUE", "readOnly": True}},
+]
+
+
+def test_snapshot_table_01():
+    """
+    ``SnapshotTable``: basic test. Create the table and convert it back to the list of items.
+    """
+    items = copy.deepcopy(_items)
+    table = SnapshotTable.from_items(items)
+    assert items == _items, "The original items were modified"
+
+    assert len(table) == len(_items)
+    assert table.to_items() == _items
+    assert table.to_snapshot_data() == {"snapshotItems": _items}
+    assert [type(_["value"]["value"]) for _ in table.to_items()[:2]] == [float, int]
+    assert table[1] == _items[1]
+    assert table[-1] == _items[-1]
+    assert list(table) == _items
+
+    table = SnapshotTable.from_snapshot_data({"uniqueId": "some-uid", "snapshotItems": _items})
+    assert table.to_items() == _items
+
+    # The items are appended incrementally, the index of the PV names is updated
+    table = SnapshotTable()
+    table.append(_items[0])
+    assert table.index(_items[0]["configPv"]["pvName"]) == 0
+    for item in _items[1:]:
+        table.append(item)
+    assert table.to_items() == _items
+    assert table.index(_items[-1]["configPv"]["pvName"]) == len(_items) - 1
+
+
+def test_snapshot_table_02():
+    """
+    ``SnapshotTable``: columns.
+    """
+    table = SnapshotTable.from_items(_items)
+
+    assert table.pv_names == tuple(_["configPv"]["pvName"] for _ in _items)
+    assert table.index("PV:INT") == 1
+    with pytest.raises(KeyError):
+        table.index("PV:NON_EXISTING")
+
+    values = list(table.values)
+    assert values[:2] == [10.5, 10.0]
+    assert all(math.isnan(_) for _ in values[2:])
+
+    assert list(table.is_array) == [False, False, True, True, False, False, False, False]
+    assert list(table.array_value(2)) == [1.5, 2.5, 3.5]
+    assert list(table.array_value(3)) == [1, 2, 3]
+    assert table.array_value(0) is None
+    assert table.array_value(5) is None
+
+    assert table.severities == ["MINOR", "NONE", "MAJOR", "NONE", "NONE", "NONE", "NONE", None]
+
+    timestamps = list(table.timestamps)
+    assert timestamps[0] == pytest.approx(1760000000.5)
+    assert timestamps[1] == 1760000000
+    assert math.isnan(timestamps[-1])
+
+
+def test_snapshot_table_03_fail():
+    """
+    ``SnapshotTable``: invalid items.
+    """
+    with pytest.raises(ValueError, match="does not contain the PV name"):
+        SnapshotTable.from_items([{"value": {"value": 10}}])
+    with pytest.raises(ValueError, match="does not contain the PV name"):
+        SnapshotTable().append({"configPv": {}})
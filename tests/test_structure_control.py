@@ -215,3 +215,106 @@ def test_structure_path_01(clear_sar, library, usesetauth):  # noqa: F811
                 assert len(response) == 2
 
         asyncio.run(testing())
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_tree_index_01(clear_sar, library):  # noqa: F811
+    """
+    Basic tests for the local tree index: loading the index, path lookups and incremental
+    updates of the index by 'node_add', 'structure_move' and 'node_delete' API.
+    """
+    root_folder_uid = create_root_folder()
+    root_path = "/" + root_folder_node_name
+
+    if not _is_async(library):
+        with SaveRestoreAPI_Threads(base_url=base_url, timeout=10) as SR:
+            auth = {"auth": SR.auth_gen(username="admin", password="adminPass")}
+
+            response = SR.node_add(root_folder_uid, node={"name": "Folder1", "nodeType": "FOLDER"}, **auth)
+            folder1_uid = response["uniqueId"]
+            response = SR.config_add(
+                folder1_uid, configurationNode={"name": "Config1"}, configurationData={"pvList": []}, **auth
+            )
+            config1_uid = response["configurationNode"]["uniqueId"]
+
+            assert SR.tree_index is None
+            index = SR.tree_index_load(root_folder_uid)
+            assert SR.tree_index is index
+            assert index.root_path == root_path
+            assert len(index) == 2
+
+            assert index.uid_get(root_path + "/Folder1") == folder1_uid
+            assert index.parent_get(config1_uid) == folder1_uid
+            assert index.path_get(config1_uid) == root_path + "/Folder1/Config1"
+            assert index.covers(root_path + "/Folder1/NonExisting")
+            assert not index.covers("/NonExisting")
+
+            response = SR.structure_path_nodes(root_path + "/Folder1/Config1")
+            assert [_["uniqueId"] for _ in response] == [config1_uid]
+
+            # The index is updated by the API calls
+            response = SR.node_add(folder1_uid, node={"name": "Folder2", "nodeType": "FOLDER"}, **auth)
+            folder2_uid = response["uniqueId"]
+            assert index.path_get(folder2_uid) == root_path + "/Folder1/Folder2"
+
+            SR.structure_move([config1_uid], newParentNodeId=folder2_uid, **auth)
+            assert index.path_get(config1_uid) == root_path + "/Folder1/Folder2/Config1"
+            assert SR.structure_path_get(config1_uid) == index.path_get(config1_uid)
+
+            SR.node_delete(folder2_uid, **auth)
+            assert folder2_uid not in index
+            assert config1_uid not in index
+            assert len(index) == 1
+
+            SR.tree_index_clear()
+            assert SR.tree_index is None
+
+    else:
+        async def testing():
+            async with SaveRestoreAPI_Async(base_url=base_url, timeout=2) as SR:
+                auth = {"auth": SR.auth_gen(username="admin", password="adminPass")}
+
+                response = await SR.node_add(
+                    root_folder_uid, node={"name": "Folder1", "nodeType": "FOLDER"}, **auth
+                )
+                folder1_uid = response["uniqueId"]
+                response = await SR.config_add(
+                    folder1_uid, configurationNode={"name": "Config1"}, configurationData={"pvList": []}, **auth
+                )
+                config1_uid = response["configurationNode"]["uniqueId"]
+
+                assert SR.tree_index is None
+                index = await SR.tree_index_load(root_folder_uid)
+                assert SR.tree_index is index
+                assert index.root_path == root_path
+                assert len(index) == 2
+
+                assert index.uid_get(root_path + "/Folder1") == folder1_uid
+                assert index.parent_get(config1_uid) == folder1_uid
+                assert index.path_get(config1_uid) == root_path + "/Folder1/Config1"
+                assert index.covers(root_path + "/Folder1/NonExisting")
+                assert not index.covers("/NonExisting")
+
+                response = await SR.structure_path_nodes(root_path + "/Folder1/Config1")
+                assert [_["uniqueId"] for _ in response] == [config1_uid]
+
+                # The index is updated by the API calls
+                response = await SR.node_add(folder1_uid, node={"name": "Folder2", "nodeType": "FOLDER"}, **auth)
+                folder2_uid = response["uniqueId"]
+                assert index.path_get(folder2_uid) == root_path + "/Folder1/Folder2"
+
+                await SR.structure_move([config1_uid], newParentNodeId=folder2_uid, **auth)
+                assert index.path_get(config1_uid) == root_path + "/Folder1/Folder2/Config1"
+                assert await SR.structure_path_get(config1_uid) == index.path_get(config1_uid)
+
+                await SR.node_delete(folder2_uid, **auth)
+                assert folder2_uid not in index
+                assert config1_uid not in index
+                assert len(index) == 1
+
+                SR.tree_index_clear()
+                assert SR.tree_index is None
+
+        asyncio.run(testing())
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from save_and_restore_api import SaveRestoreAPI as SaveRestoreAPI_Threads
+from save_and_restore_api.aio import SaveRestoreAPI as SaveRestoreAPI_Async
+from save_and_restore_api.tools.cli import create_missing_folders, load_tree_index
+
+from .mock_server import MockServer, base_url
+
+
+class _Server(MockServer):
+    """
+    Mock server with the tree of nodes: ``/a/b/config`` and ``/c``.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.create_config("/a/b/config")
+        self.create_folder("/c")
+
+    def path_requests(self):
+        return [_[2]["path"] for _ in self.requests if _[1] == "/path"]
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_tree_index_local_01(library):
+    """
+    ``structure_path_nodes()``: the paths inside the indexed subtree are found without sending
+    requests to the server. The paths of the missing nodes inside the subtree raise
+    ``HTTPClientError`` (404), the paths outside the subtree are sent to the server.
+    """
+    server = _Server()
+    folder_uid, config_uid = server.uid_get("/a"), server.uid_get("/a/b/config")
+
+    def check_results(nodes, ex_missing, ex_outside):
+        assert [_["uniqueId"] for _ in nodes] == [config_uid]
+        assert ex_missing.value.response.status_code == 404
+        assert ex_outside.value.response.status_code == 404
+        assert server.path_requests() == ["/c/missing"]
+
+    if library == "THREADS":
+        with SaveRestoreAPI_Threads(base_url=base_url, transport=server.transport()) as SR:
+            SR.tree_index_load(folder_uid)
+            server.requests.clear()
+
+            nodes = SR.structure_path_nodes("/a/b/config")
+            with pytest.raises(SR.HTTPClientError) as ex_missing:
+                SR.structure_path_nodes("/a/b/missing")
+            with pytest.raises(SR.HTTPClientError) as ex_outside:
+                SR.structure_path_nodes("/c/missing")
+            check_results(nodes, ex_missing, ex_outside)
+    else:
+
+        async def testing():
+            transport = server.async_transport()
+            async with SaveRestoreAPI_Async(base_url=base_url, transport=transport) as SR:
+                await SR.tree_index_load(folder_uid)
+                server.requests.clear()
+
+                nodes = await SR.structure_path_nodes("/a/b/config")
+                with pytest.raises(SR.HTTPClientError) as ex_missing:
+                    await SR.structure_path_nodes("/a/b/missing")
+                with pytest.raises(SR.HTTPClientError) as ex_outside:
+                    await SR.structure_path_nodes("/c/missing")
+                check_results(nodes, ex_missing, ex_outside)
+
+        asyncio.run(testing())
+
+
+# fmt: off
+@pytest.mark.parametrize("folder_name, index_path, path_requests", [
+    ("/a/b/d/e", "/a/b", ["/a/b/d/e", "/a/b/d", "/a/b"]),
+    ("/a/b", "/a/b", ["/a/b", "/a/b"]),
+    ("/x/y/z", None, ["/x/y/z", "/x/y", "/x", "/x/y/z", "/x"]),
+])
+# fmt: on
+def test_tree_index_cli_01(folder_name, index_path, path_requests):
+    """
+    CLI: the tree index of the deepest existing folder is loaded by ``load_tree_index()``. The folders
+    inside the indexed subtree are found and created by ``create_missing_folders()`` without looking
+    them up on the server. The folders inside a missing folder are not looked up.
+    """
+    server = _Server()
+
+    async def testing():
+        transport = server.async_transport()
+        async with SaveRestoreAPI_Async(base_url=base_url, transport=transport) as SR:
+            index = await load_tree_index(SR, folder_name)
+            assert (index.root_path if index else None) == index_path
+
+            node_uid = await create_missing_folders(SR, folder_name, create_folders=True)
+            assert server.path_get(node_uid) == folder_name
+            if index is not None and index.root_path != folder_name:
+                assert index.uid_get(folder_name) == node_uid
+
+    asyncio.run(testing())
+    assert server.path_requests() == path_requests
+
+
+def _detectors_server():
+    """
+    Mock server with 50 configurations with 10 snapshots each in the folder ``/detectors/imaging``.
+    """
+    server = MockServer()
+    for n in range(50):
+        config_uid = server.create_config(f"/detectors/imaging/config-{n}")["uniqueId"]
+        for m in range(10):
+            server.create_snapshot(config_uid, name=f"snapshot-{m}")
+    return server
+
+
+def _children_requests(server):
+    return len([_ for _ in server.requests if _[1].endswith("/children")])
+
+
+# fmt: off
+@pytest.mark.parametrize("folders_only, n_children_requests, n_nodes", [
+    (False, 52, 551),
+    (True, 2, 51),
+])
+# fmt: on
+def test_tree_index_folders_01(folders_only, n_children_requests, n_nodes):
+    """
+    ``tree_index_load()``: the children of the configurations are not listed if ``folders_only``
+    is True. The paths of the snapshots are then looked up on the server.
+    """
+    server = _detectors_server()
+    with SaveRestoreAPI_Threads(base_url=base_url, transport=server.transport()) as SR:
+        index = SR.tree_index_load(server.uid_get("/detectors"), folders_only=folders_only)
+        assert _children_requests(server) == n_children_requests
+        assert len(index) == n_nodes and index.folders_only == folders_only
+
+        server.requests.clear()
+        nodes = SR.structure_path_nodes("/detectors/imaging/config-0")
+        assert [_["uniqueId"] for _ in nodes] == [server.uid_get("/detectors/imaging/config-0")]
+        assert server.n_requests == 0
+
+        snapshot_uid = server.uid_get("/detectors/imaging/config-0/snapshot-0")
+        nodes = SR.structure_path_nodes("/detectors/imaging/config-0/snapshot-0")
+        assert [_["uniqueId"] for _ in nodes] == [snapshot_uid]
+        assert server.n_requests == (1 if folders_only else 0)
+
+
+# fmt: off
+@pytest.mark.parametrize("folder_name, index_path, n_children_requests, n_requests", [
+    ("/detectors/imaging", None, 0, 1),
+    ("/detectors/imaging/new/folder", "/detectors/imaging", 1, 7),
+])
+# fmt: on
+def test_tree_index_cli_02(folder_name, index_path, n_children_requests, n_requests):
+    """
+    CLI: ``create_missing_folders()`` loads the tree index only if the folder is missing. Only the
+    folders are traversed, the snapshots in the existing folders are not listed.
+    """
+    server = _detectors_server()
+
+    async def testing():
+        async with SaveRestoreAPI_Async(base_url=base_url, transport=server.async_transport()) as SR:
+            node_uid = await create_missing_folders(SR, folder_name, create_folders=True, load_index=True)
+            assert server.path_get(node_uid) == folder_name
+            assert (SR.tree_index.root_path if SR.tree_index else None) == index_path
+
+    asyncio.run(testing())
+    assert _children_requests(server) == n_children_requests
+    assert server.n_requests == n_requests
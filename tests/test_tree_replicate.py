@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import pytest
+
+from save_and_restore_api import SaveRestoreAPI as SaveRestoreAPI_Threads
+
+from .mock_server import ROOT_NODE_UID, MockServer, call_api
+
+
+class _Server(MockServer):
+    """
+    The nodes with names starting with ``fail`` are rejected. The UIDs of the nodes start with ``name``.
+    """
+
+    def __init__(self, name):
+        super().__init__(latency=0.001, uid_prefix=name)
+
+    def node_rejected(self, node):
+        return node["name"].startswith("fail")
+
+
+def _create_source():
+    """
+    Create the source server:
+
+    /folder-A/config-1/snapshot-1, snapshot-2
+    /folder-A/sub-folder/config-2/snapshot-3
+    /folder-A/composite-1 (snapshot-1, snapshot-3)
+    /folder-A/composite-2 (composite-1, snapshot-2)
+    /folder-B/config-3
+    """
+    src = _Server("src")
+    src.update_node(src.create_folder("/folder-A")["uniqueId"], description="A")
+    config_1 = src.create_config("/folder-A/config-1", pv_names=["PV1"])["uniqueId"]
+    config_2 = src.create_config("/folder-A/sub-folder/config-2", pv_names=["PV2"])["uniqueId"]
+    src.create_config("/folder-B/config-3")
+    snapshots = [
+        src.create_snapshot(config_1, name="snapshot-1")["uniqueId"],
+        src.create_snapshot(config_1, name="snapshot-2")["uniqueId"],
+        src.create_snapshot(config_2, name="snapshot-3")["uniqueId"],
+    ]
+    # The composite snapshot is listed before the referenced composite snapshot
+    composite_2 = src.create_composite_snapshot("/folder-A/composite-2", snapshot_uids=[])["uniqueId"]
+    refs = [snapshots[0], snapshots[2]]
+    composite_1 = src.create_composite_snapshot("/folder-A/composite-1", snapshot_uids=refs)["uniqueId"]
+    src.update_node(composite_2, data={"referencedSnapshotNodes": [composite_1, snapshots[1]]})
+    return src
+
+
+def _replicate(library, src, dst, uniqueNodeId, **kwargs):
+    return call_api(library, dst, "tree_replicate", src, uniqueNodeId, **kwargs)
+
+
+def _subtree(tree, path, new_path=""):
+    """
+    Returns the subtree of the nodes in the folder ``path`` moved to the folder ``new_path``.
+    """
+    subtree = {}
+    for k, (node_type, description, data) in tree.items():
+        if k.startswith(path):
+            if "referencedSnapshotNodes" in data:
+                data = {"referencedSnapshotNodes": [new_path + _ for _ in data["referencedSnapshotNodes"]]}
+            subtree[new_path + k] = (node_type, description, data)
+    return subtree
+
+
+# fmt: off
+@pytest.mark.parametrize("max_concurrency", [1, 8])
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_tree_replicate_01(tmp_path, library, max_concurrency):
+    """
+    ``tree_replicate()``: replicate the subtree, then repeat the replication incrementally.
+    """
+    uid_map = str(tmp_path / "replication.jsonl")
+    src, dst = _create_source(), _Server("dst")
+    folder_uid = dst.create_folder("/replicated")["uniqueId"]
+
+    folder_a = src.uid_get("/folder-A")
+    result = _replicate(library, src, dst, folder_a, parentNodeId=folder_uid, uid_map=uid_map)
+
+    assert result["errors"] == []
+    assert len(result["added"]) == 9 and result["updated"] == result["unchanged"] == []
+    expected = _subtree(src.tree(), "/folder-A", "/replicated")
+    assert {k: v for k, v in dst.tree().items() if k != "/replicated"} == expected
+    assert all(dst.node_get(result["uid_map"][_])["name"] == src.node_get(_)["name"] for _ in result["added"])
+
+    # Nothing is modified
+    dst.requests.clear()
+    result = _replicate(library, src, dst, folder_a, parentNodeId=folder_uid, uid_map=uid_map)
+    assert result["errors"] == [] and result["added"] == result["updated"] == []
+    assert len(result["unchanged"]) == 9
+    assert dst.requests == []
+
+    # Modify and add the nodes on the source server
+    snapshot_2 = src.uid_get("/folder-A/config-1/snapshot-2")
+    src.update_node(snapshot_2, description="Modified", data={"snapshotItems": []})
+    new_uid = src.create_config("/folder-A/sub-folder/config-4")["uniqueId"]
+    result = _replicate(library, src, dst, folder_a, parentNodeId=folder_uid, uid_map=uid_map)
+    assert result["errors"] == []
+    assert result["added"] == [new_uid] and result["updated"] == [snapshot_2]
+    assert len(result["unchanged"]) == 8
+    expected = _subtree(src.tree(), "/folder-A", "/replicated")
+    assert {k: v for k, v in dst.tree().items() if k != "/replicated"} == expected
+
+    with open(uid_map) as f:
+        assert len(f.read().splitlines()) == 11
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_tree_replicate_02(library):
+    """
+    ``tree_replicate()``: replicate the whole tree (the children of the root node).
+    """
+    src, dst = _create_source(), _Server("dst")
+    result = _replicate(library, src, dst, ROOT_NODE_UID)
+    assert result["errors"] == [] and len(result["added"]) == 11
+    assert result["uid_map"][ROOT_NODE_UID] == ROOT_NODE_UID
+    assert dst.tree() == src.tree()
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_tree_replicate_03_fail(tmp_path, library):
+    """
+    ``tree_replicate()``: the nodes rejected by the destination server and the composite snapshots
+    that reference snapshots outside the subtree are reported as errors. The subtrees of failed
+    nodes are skipped. The failed nodes are copied by the next replication.
+    """
+    uid_map = str(tmp_path / "replication.jsonl")
+    src, dst = _create_source(), _Server("dst")
+    sub_folder = src.uid_get("/folder-A/sub-folder")
+    src.update_node(sub_folder, name="fail-folder")
+
+    folder_a = src.uid_get("/folder-A")
+    result = _replicate(library, src, dst, folder_a, uid_map=uid_map)
+
+    # 'composite-1' references 'snapshot-3' from the failed folder, 'composite-2' references 'composite-1'
+    failed = {sub_folder, src.uid_get("/folder-A/composite-1"), src.uid_get("/folder-A/composite-2")}
+    assert {_["uniqueId"] for _ in result["errors"]} == failed
+    assert isinstance(result["errors"][0]["error"], SaveRestoreAPI_Threads.HTTPClientError)
+    assert all(isinstance(_["error"], RuntimeError) for _ in result["errors"][1:])
+    assert len(result["added"]) == 4
+    assert "/folder-A/config-1/snapshot-2" in dst.tree() and "/folder-A/fail-folder" not in dst.tree()
+
+    src.update_node(sub_folder, name="sub-folder")
+    result = _replicate(library, src, dst, folder_a, uid_map=uid_map)
+    assert result["errors"] == [] and len(result["added"]) == 5 and len(result["unchanged"]) == 4
+    assert dst.tree() == _subtree(src.tree(), "/folder-A")
+
+
+# fmt: off
+@pytest.mark.parametrize("params, msg", [
+    ({"source": "invalid"}, "Invalid 'source'"),
+    ({"uniqueNodeId": ""}, "Invalid 'uniqueNodeId'"),
+    ({"max_concurrency": 0}, "Invalid 'max_concurrency'"),
+])
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_tree_replicate_04_fail(library, params, msg):
+    """
+    ``tree_replicate()``: invalid parameters. No requests are sent.
+    """
+    server = _Server("dst")
+    params = {"source": server, "uniqueNodeId": "node-uid", **params}
+    with pytest.raises(SaveRestoreAPI_Threads.RequestParameterError, match=msg):
+        call_api(library, server, "tree_replicate", **params)
+    assert server.requests == []